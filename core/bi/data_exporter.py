@@ -5,7 +5,7 @@ BI Data Exporter
 Export BI Views data to CSV and Excel formats for Power BI.
 
 This module provides:
-- Export to CSV with Arabic support
+- Export to CSV with Arabic support (native COPY, parallel per view)
 - Export to Excel with multiple sheets
 - Batch export of all views
 - Export history tracking
@@ -16,15 +16,20 @@ Date: February 2026
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
-from core.database import select_all
+from core.database import select_iter
 from core.logging import app_logger
 
 
+# Parallel CSV exports; kept below the connection pool size (5)
+DEFAULT_EXPORT_WORKERS = 4
+
+
 @dataclass
 class ExportResult:
     """Result of an export operation."""
@@ -35,6 +40,7 @@ class ExportResult:
     file_size: int  # in bytes
     export_time: datetime
     error: str = ""
+    method: str = ""  # CSV writer used: "copy" or "python"
 
 
 class BIDataExporter:
@@ -71,16 +77,23 @@ class BIDataExporter:
         view_name: str,
         output_path: Optional[str] = None,
         encoding: str = "utf-8-sig",
-        delimiter: str = ","
+        delimiter: str = ",",
+        native: bool = True
     ) -> ExportResult:
         """
         Export a BI View to CSV file.
 
+        By default PostgreSQL writes the CSV itself (COPY ... TO STDOUT).
+        Pass native=False when the Python formatting is needed (e.g.
+        datetimes as 'YYYY-MM-DD HH:MM:SS'); it is also used as a fallback
+        if COPY fails.
+
         Args:
             view_name: Name of the view to export
             output_path: Custom output file path
             encoding: File encoding (utf-8-sig for Excel Arabic support)
             delimiter: CSV delimiter character
+            native: Use COPY instead of formatting rows in Python
 
         Returns:
             ExportResult with operation details
@@ -89,16 +102,150 @@ class BIDataExporter:
         filename = f"{view_name}_{timestamp.strftime('%Y%m%d_%H%M%S')}.csv"
         file_path = output_path or str(self._export_path / filename)
 
+        if native:
+            result = self._export_csv_copy(
+                view_name, file_path, timestamp, encoding, delimiter
+            )
+            if result.success:
+                self._export_history.append(result)
+                return result
+            app_logger.warning(
+                f"COPY export of {view_name} failed ({result.error}), "
+                f"falling back to Python formatter"
+            )
+
+        return self._export_csv_formatted(
+            view_name, file_path, timestamp, encoding, delimiter
+        )
+
+    def export_views_csv(
+        self,
+        views: List[str],
+        max_workers: int = DEFAULT_EXPORT_WORKERS
+    ) -> List[ExportResult]:
+        """
+        Export several BI Views to CSV in parallel.
+
+        Each worker uses its own pooled connection and COPY stream.
+
+        Args:
+            views: View names to export
+            max_workers: Number of concurrent exports
+
+        Returns:
+            List of ExportResult, in the order of views
+        """
+        if not views:
+            return []
+
+        workers = max(1, min(max_workers, len(views)))
+        if workers == 1:
+            return [self.export_to_csv(v) for v in views]
+
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix="bi_export") as pool:
+            return list(pool.map(self.export_to_csv, views))
+
+    def _export_csv_copy(
+        self,
+        view_name: str,
+        file_path: str,
+        timestamp: datetime,
+        encoding: str,
+        delimiter: str
+    ) -> ExportResult:
+        """Export a view with COPY (SELECT ...) TO STDOUT straight into the file."""
         try:
-            # Fetch data from view using safe identifier quoting
+            from psycopg2 import sql as psql
+            from core.database.connection import get_pooled_connection
+
+            copy_sql = psql.SQL(
+                "COPY (SELECT * FROM {}.{}) TO STDOUT "
+                "WITH (FORMAT csv, HEADER true, DELIMITER {})"
+            ).format(
+                psql.Identifier("bi_views"),
+                psql.Identifier(view_name),
+                psql.Literal(delimiter)
+            )
+
+            with get_pooled_connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    # Text-mode file: psycopg2 decodes from the client
+                    # encoding and the file adds the utf-8-sig BOM
+                    with open(file_path, 'w', encoding=encoding, newline='') as f:
+                        # Rendered with the cursor: pooled connections are
+                        # proxies that psycopg2's as_string() does not accept
+                        cursor.copy_expert(copy_sql.as_string(cursor), f)
+                    row_count = max(cursor.rowcount, 0)
+                finally:
+                    cursor.close()
+                conn.rollback()
+
+            result = ExportResult(
+                success=True,
+                file_path=file_path,
+                view_name=view_name,
+                row_count=row_count,
+                file_size=os.path.getsize(file_path),
+                export_time=timestamp,
+                method="copy"
+            )
+            app_logger.info(f"Exported {view_name} to CSV (COPY): {row_count} rows")
+            return result
+
+        except Exception as e:
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+            return ExportResult(
+                success=False,
+                file_path=file_path,
+                view_name=view_name,
+                row_count=0,
+                file_size=0,
+                export_time=timestamp,
+                error=str(e)
+            )
+
+    def _export_csv_formatted(
+        self,
+        view_name: str,
+        file_path: str,
+        timestamp: datetime,
+        encoding: str,
+        delimiter: str
+    ) -> ExportResult:
+        """Export a view by formatting each row in Python (fallback path)."""
+        try:
+            # Stream data from view using safe identifier quoting
             from psycopg2 import sql as psql
             safe_sql = psql.SQL("SELECT * FROM {}.{}").format(
                 psql.Identifier("bi_views"),
                 psql.Identifier(view_name)
             )
-            columns, rows = select_all(safe_sql)
+
+            row_count = 0
+            columns = None
+            with open(file_path, 'w', encoding=encoding, newline='') as f:
+                for batch_columns, rows in select_iter(safe_sql):
+                    if columns is None:
+                        # Write header
+                        columns = batch_columns
+                        f.write(delimiter.join(columns) + '\n')
+
+                    # Write data rows
+                    f.writelines(
+                        _format_csv_row(row, delimiter) + '\n' for row in rows
+                    )
+                    row_count += len(rows)
 
             if not columns:
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
                 return ExportResult(
                     success=False,
                     file_path=file_path,
@@ -109,32 +256,6 @@ class BIDataExporter:
                     error="No data or view not found"
                 )
 
-            # Write CSV file
-            with open(file_path, 'w', encoding=encoding, newline='') as f:
-                # Write header
-                f.write(delimiter.join(columns) + '\n')
-
-                # Write data rows
-                for row in rows:
-                    # Handle None values and format data
-                    formatted = []
-                    for val in row:
-                        if val is None:
-                            formatted.append('')
-                        elif isinstance(val, (int, float)):
-                            formatted.append(str(val))
-                        elif isinstance(val, datetime):
-                            formatted.append(val.strftime('%Y-%m-%d %H:%M:%S'))
-                        else:
-                            # فحص علامات الاقتباس قبل الاستبدال (RFC 4180)
-                            str_val = str(val)
-                            needs_quoting = delimiter in str_val or '"' in str_val or '\n' in str_val
-                            str_val = str_val.replace('"', '""')
-                            if needs_quoting:
-                                str_val = f'"{str_val}"'
-                            formatted.append(str_val)
-                    f.write(delimiter.join(formatted) + '\n')
-
             # Get file size
             file_size = os.path.getsize(file_path)
 
@@ -142,12 +263,13 @@ class BIDataExporter:
                 success=True,
                 file_path=file_path,
                 view_name=view_name,
-                row_count=len(rows),
+                row_count=row_count,
                 file_size=file_size,
-                export_time=timestamp
+                export_time=timestamp,
+                method="python"
             )
 
-            app_logger.info(f"Exported {view_name} to CSV: {len(rows)} rows")
+            app_logger.info(f"Exported {view_name} to CSV: {row_count} rows")
             self._export_history.append(result)
             return result
 
@@ -194,6 +316,7 @@ class BIDataExporter:
                 from openpyxl import Workbook
                 from openpyxl.styles import Font, PatternFill, Alignment
                 from openpyxl.utils import get_column_letter
+                from openpyxl.cell import WriteOnlyCell
             except ImportError:
                 return ExportResult(
                     success=False,
@@ -205,7 +328,8 @@ class BIDataExporter:
                     error="openpyxl is not installed. Run: pip install openpyxl"
                 )
 
-            wb = Workbook()
+            # Write-only workbook: rows are streamed to disk, not kept in memory
+            wb = Workbook(write_only=True)
             total_rows = 0
 
             # Style definitions
@@ -213,10 +337,6 @@ class BIDataExporter:
             header_fill = PatternFill(start_color="2563EB", end_color="2563EB", fill_type="solid")
             header_alignment = Alignment(horizontal="center", vertical="center")
 
-            # Remove default sheet
-            if "Sheet" in wb.sheetnames:
-                del wb["Sheet"]
-
             # Export each view to a sheet
             for view_name in views:
                 try:
@@ -225,43 +345,40 @@ class BIDataExporter:
                         psql.Identifier("bi_views"),
                         psql.Identifier(view_name)
                     )
-                    columns, rows = select_all(safe_sql)
-
-                    if not columns:
-                        continue
-
-                    # Create sheet (truncate name to 31 chars for Excel limit)
-                    sheet_name = view_name[:31]
-                    ws = wb.create_sheet(title=sheet_name)
-
-                    # Write header row with styling
-                    for col_idx, col_name in enumerate(columns, 1):
-                        cell = ws.cell(row=1, column=col_idx, value=col_name)
-                        cell.font = header_font
-                        cell.fill = header_fill
-                        cell.alignment = header_alignment
 
-                    # Write data rows
-                    for row_idx, row in enumerate(rows, 2):
-                        for col_idx, val in enumerate(row, 1):
-                            if isinstance(val, datetime):
-                                ws.cell(row=row_idx, column=col_idx, value=val)
-                            else:
-                                ws.cell(row=row_idx, column=col_idx, value=val)
-
-                    # Auto-adjust column widths
-                    for col_idx, col_name in enumerate(columns, 1):
-                        max_length = len(str(col_name))
-                        for row in rows[:100]:  # Sample first 100 rows
-                            cell_value = str(row[col_idx - 1]) if row[col_idx - 1] else ""
-                            max_length = max(max_length, len(cell_value))
-                        adjusted_width = min(max_length + 2, 50)
-                        ws.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
-
-                    # Freeze header row
-                    ws.freeze_panes = "A2"
-
-                    total_rows += len(rows)
+                    ws = None
+                    for columns, rows in select_iter(safe_sql):
+                        if ws is None:
+                            # Create sheet (truncate name to 31 chars for Excel limit)
+                            ws = wb.create_sheet(title=view_name[:31])
+
+                            # Column widths must be set before the first row
+                            # in write-only mode: size from the first batch
+                            for col_idx, col_name in enumerate(columns, 1):
+                                max_length = len(str(col_name))
+                                for row in rows[:100]:  # Sample first 100 rows
+                                    cell_value = str(row[col_idx - 1]) if row[col_idx - 1] else ""
+                                    max_length = max(max_length, len(cell_value))
+                                adjusted_width = min(max_length + 2, 50)
+                                ws.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
+
+                            # Freeze header row
+                            ws.freeze_panes = "A2"
+
+                            # Write header row with styling
+                            header = []
+                            for col_name in columns:
+                                cell = WriteOnlyCell(ws, value=col_name)
+                                cell.font = header_font
+                                cell.fill = header_fill
+                                cell.alignment = header_alignment
+                                header.append(cell)
+                            ws.append(header)
+
+                        # Write data rows
+                        for row in rows:
+                            ws.append(row)
+                        total_rows += len(rows)
 
                 except Exception as e:
                     app_logger.warning(f"Failed to export view {view_name}: {e}")
@@ -270,14 +387,10 @@ class BIDataExporter:
             # Add metadata sheet if requested
             if include_metadata:
                 ws_meta = wb.create_sheet(title="Export Info", index=0)
-                ws_meta["A1"] = "Export Date"
-                ws_meta["B1"] = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-                ws_meta["A2"] = "Views Exported"
-                ws_meta["B2"] = ", ".join(views)
-                ws_meta["A3"] = "Total Rows"
-                ws_meta["B3"] = total_rows
-                ws_meta["A4"] = "Generated By"
-                ws_meta["B4"] = "INTEGRA BI Module"
+                ws_meta.append(["Export Date", timestamp.strftime('%Y-%m-%d %H:%M:%S')])
+                ws_meta.append(["Views Exported", ", ".join(views)])
+                ws_meta.append(["Total Rows", total_rows])
+                ws_meta.append(["Generated By", "INTEGRA BI Module"])
 
             # Save workbook
             wb.save(file_path)
@@ -310,15 +423,14 @@ class BIDataExporter:
                 error=error_msg
             )
 
-    def export_all_views_csv(self) -> List[ExportResult]:
-        """Export all BI Views to individual CSV files."""
+    def export_all_views_csv(
+        self,
+        max_workers: int = DEFAULT_EXPORT_WORKERS
+    ) -> List[ExportResult]:
+        """Export all BI Views to individual CSV files (in parallel)."""
         from .views_manager import SQL_VIEWS
 
-        results = []
-        for view_name in SQL_VIEWS.keys():
-            result = self.export_to_csv(view_name)
-            results.append(result)
-        return results
+        return self.export_views_csv(list(SQL_VIEWS.keys()), max_workers)
 
     def export_all_views_excel(self, output_path: Optional[str] = None) -> ExportResult:
         """Export all BI Views to a single Excel file."""
@@ -369,6 +481,28 @@ class BIDataExporter:
         return deleted_count
 
 
+def _format_csv_row(row, delimiter: str) -> str:
+    """Format one result row as a CSV line (without line ending)."""
+    formatted = []
+    for val in row:
+        # Handle None values and format data
+        if val is None:
+            formatted.append('')
+        elif isinstance(val, (int, float)):
+            formatted.append(str(val))
+        elif isinstance(val, datetime):
+            formatted.append(val.strftime('%Y-%m-%d %H:%M:%S'))
+        else:
+            # فحص علامات الاقتباس قبل الاستبدال (RFC 4180)
+            str_val = str(val)
+            needs_quoting = delimiter in str_val or '"' in str_val or '\n' in str_val
+            str_val = str_val.replace('"', '""')
+            if needs_quoting:
+                str_val = f'"{str_val}"'
+            formatted.append(str_val)
+    return delimiter.join(formatted)
+
+
 # =============================================================================
 # Singleton Instance
 # =============================================================================
@@ -232,10 +232,12 @@ class ExportScheduler:
                     result = exporter.export_all_views_excel()
             else:
                 if self._config.views_to_export:
-                    results = [exporter.export_to_csv(v) for v in self._config.views_to_export]
+                    results = exporter.export_views_csv(self._config.views_to_export)
                 else:
                     results = exporter.export_all_views_csv()
-                result = results[0] if results else None
+                # Report the first failure, otherwise the first result
+                failed = [r for r in results if not r.success]
+                result = failed[0] if failed else (results[0] if results else None)
 
             self._last_export = datetime.now()
 
@@ -15,6 +15,7 @@ from .connection import (
 from .queries import (
     select_all,
     select_one,
+    select_iter,
     insert,
     insert_returning_id,
     update,
@@ -23,9 +24,17 @@ from .queries import (
     delete_returning_count,
     get_scalar,
     get_count,
-    execute_query
+    execute_query,
+    insert_many,
+    upsert_many,
+    execute_many,
+    transaction,
+    savepoint,
+    TransactionError
 )
 
+from .listener import get_change_listener
+
 __all__ = [
     # Connection
     'connect',
@@ -36,6 +45,7 @@ __all__ = [
     # Queries
     'select_all',
     'select_one',
+    'select_iter',
     'insert',
     'insert_returning_id',
     'update',
@@ -44,5 +54,13 @@ __all__ = [
     'delete_returning_count',
     'get_scalar',
     'get_count',
-    'execute_query'
+    'execute_query',
+    'insert_many',
+    'upsert_many',
+    'execute_many',
+    'transaction',
+    'savepoint',
+    'TransactionError',
+    # Change notifications
+    'get_change_listener'
 ]
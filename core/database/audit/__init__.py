@@ -9,6 +9,9 @@ Usage:
     # Setup (run once)
     setup_audit_system(["employees", "payroll"])
 
+    # Store only changed fields for a wide, busy table
+    get_audit_manager().enable_audit("employees", mode="diff")
+
     # Get history
     history = get_audit_history("employees", record_id=123)
 
@@ -22,7 +25,9 @@ from .audit_manager import (
     get_audit_manager,
     get_audit_history,
     setup_audit_system,
+    rebuild_snapshots,
     DEFAULT_AUDITED_TABLES,
+    AUDIT_CAPTURE_MODES,
 )
 from .audit_setup import initialize_audit
 
@@ -32,5 +37,7 @@ __all__ = [
     'get_audit_history',
     'setup_audit_system',
     'initialize_audit',
+    'rebuild_snapshots',
     'DEFAULT_AUDITED_TABLES',
+    'AUDIT_CAPTURE_MODES',
 ]
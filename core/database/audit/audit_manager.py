@@ -5,10 +5,11 @@ Track all changes to sensitive database tables.
 
 Features:
 - Log all INSERT, UPDATE, DELETE operations
-- Store old and new values (JSONB)
+- Store old and new values (JSONB): full rows or changed keys only
 - Track user who made the change
 - Query audit history with filters
 - Statistics and maintenance
+- Monthly range partitions (retention drops whole partitions)
 
 Usage:
     from core.database.audit import AuditManager, get_audit_history
@@ -26,12 +27,12 @@ Usage:
 """
 
 import threading
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+from datetime import date, datetime, timedelta
 
 from psycopg2 import sql as psycopg2_sql
 
-from core.database import select_all, get_scalar, get_count, execute_query
+from core.database import select_all, select_iter, get_scalar, get_count, execute_query
 from core.database.connection import get_connection, return_connection
 from core.logging import app_logger
 
@@ -48,14 +49,27 @@ DEFAULT_AUDITED_TABLES = [
 ]
 
 
-# SQL for creating audit schema and table
+# Monthly partitions are created this many months ahead of time
+AUDIT_PARTITION_MONTHS_AHEAD = 3
+
+# Columns of audit.logged_actions (used when moving rows between tables)
+AUDIT_COLUMNS = (
+    "id", "schema_name", "table_name", "record_id", "action_type",
+    "old_data", "new_data", "changed_fields", "action_timestamp",
+    "db_user", "app_user", "app_user_id", "client_ip", "session_id", "notes",
+)
+
+# SQL for creating audit schema and table (range-partitioned by month)
 AUDIT_SCHEMA_SQL = """
 -- Create audit schema if not exists
 CREATE SCHEMA IF NOT EXISTS audit;
 
--- Create audit log table
+-- Shared id sequence (kept when migrating from the unpartitioned table)
+CREATE SEQUENCE IF NOT EXISTS audit.logged_actions_id_seq;
+
+-- Create audit log table, partitioned by month on action_timestamp
 CREATE TABLE IF NOT EXISTS audit.logged_actions (
-    id BIGSERIAL PRIMARY KEY,
+    id BIGINT NOT NULL DEFAULT nextval('audit.logged_actions_id_seq'),
     schema_name TEXT NOT NULL,
     table_name TEXT NOT NULL,
     record_id INTEGER,
@@ -63,16 +77,23 @@ CREATE TABLE IF NOT EXISTS audit.logged_actions (
     old_data JSONB,
     new_data JSONB,
     changed_fields TEXT[],
-    action_timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    action_timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     db_user TEXT DEFAULT current_user,
     app_user TEXT,
     app_user_id INTEGER,
     client_ip INET,
     session_id TEXT,
-    notes TEXT
-);
+    notes TEXT,
+    PRIMARY KEY (id, action_timestamp)
+) PARTITION BY RANGE (action_timestamp);
 
--- Create indexes for faster queries
+ALTER SEQUENCE audit.logged_actions_id_seq OWNED BY audit.logged_actions.id;
+
+-- Catches rows outside the monthly partitions (moved out when the month's partition is created)
+CREATE TABLE IF NOT EXISTS audit.logged_actions_default
+    PARTITION OF audit.logged_actions DEFAULT;
+
+-- Create indexes for faster queries (created on every partition)
 CREATE INDEX IF NOT EXISTS idx_audit_table_name ON audit.logged_actions(table_name);
 CREATE INDEX IF NOT EXISTS idx_audit_record_id ON audit.logged_actions(record_id);
 CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit.logged_actions(action_timestamp DESC);
@@ -80,6 +101,178 @@ CREATE INDEX IF NOT EXISTS idx_audit_action_type ON audit.logged_actions(action_
 CREATE INDEX IF NOT EXISTS idx_audit_app_user_id ON audit.logged_actions(app_user_id);
 CREATE INDEX IF NOT EXISTS idx_audit_table_record ON audit.logged_actions(table_name, record_id);
 CREATE INDEX IF NOT EXISTS idx_audit_table_timestamp ON audit.logged_actions(table_name, action_timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_timestamp_id ON audit.logged_actions(action_timestamp DESC, id DESC);
+"""
+
+# SQL for the daily rollup (counts per day/table/action/user)
+AUDIT_ROLLUP_SQL = """
+CREATE TABLE IF NOT EXISTS audit.daily_rollup (
+    day DATE NOT NULL,
+    table_name TEXT NOT NULL,
+    action_type TEXT NOT NULL,
+    app_user_id INTEGER NOT NULL DEFAULT 0,   -- 0 = no application user
+    action_count BIGINT NOT NULL,
+    PRIMARY KEY (day, table_name, action_type, app_user_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_audit_rollup_user ON audit.daily_rollup(app_user_id, day);
+
+-- Single row: last complete day included in daily_rollup
+CREATE TABLE IF NOT EXISTS audit.rollup_state (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    rolled_through DATE,
+    refreshed_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Roll up complete days not yet in daily_rollup (today stays live).
+-- The last rolled day is recomputed to pick up late commits.
+CREATE OR REPLACE FUNCTION audit.refresh_daily_rollup()
+RETURNS INTEGER AS $$
+DECLARE
+    v_through DATE;
+    v_start DATE;
+    v_rows INTEGER;
+BEGIN
+    SELECT rolled_through INTO v_through FROM audit.rollup_state;
+    IF v_through >= current_date - 1 THEN
+        RETURN 0;
+    END IF;
+
+    -- One refresh at a time; re-check after waiting
+    PERFORM pg_advisory_xact_lock(hashtext('audit.refresh_daily_rollup'));
+    SELECT rolled_through INTO v_through FROM audit.rollup_state;
+    IF v_through >= current_date - 1 THEN
+        RETURN 0;
+    END IF;
+
+    v_start := COALESCE(
+        v_through,
+        (SELECT MIN(action_timestamp)::DATE FROM audit.logged_actions),
+        current_date
+    );
+
+    DELETE FROM audit.daily_rollup WHERE day >= v_start AND day < current_date;
+
+    INSERT INTO audit.daily_rollup (day, table_name, action_type, app_user_id, action_count)
+    SELECT action_timestamp::DATE, table_name, action_type, COALESCE(app_user_id, 0), COUNT(*)
+    FROM audit.logged_actions
+    WHERE action_timestamp >= v_start AND action_timestamp < current_date
+    GROUP BY 1, 2, 3, 4;
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+
+    INSERT INTO audit.rollup_state (id, rolled_through, refreshed_at)
+    VALUES (TRUE, current_date - 1, now())
+    ON CONFLICT (id) DO UPDATE
+        SET rolled_through = EXCLUDED.rolled_through,
+            refreshed_at = EXCLUDED.refreshed_at;
+
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# SQL for creating partition maintenance functions
+AUDIT_PARTITION_FUNCTIONS_SQL = """
+-- Create the monthly partition containing p_month (no-op if it exists)
+CREATE OR REPLACE FUNCTION audit.create_partition(p_month DATE)
+RETURNS BOOLEAN AS $$
+DECLARE
+    v_start DATE := date_trunc('month', p_month)::DATE;
+    v_end DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::DATE;
+    v_partition TEXT := 'logged_actions_p' || to_char(p_month, 'YYYYMM');
+BEGIN
+    IF to_regclass(format('audit.%I', v_partition)) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    -- Build it standalone, move this month's rows out of the default
+    -- partition, then attach (attaching fails if default still has them)
+    EXECUTE format(
+        'CREATE TABLE audit.%I (LIKE audit.logged_actions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        v_partition
+    );
+    EXECUTE format(
+        'WITH moved AS ('
+        ' DELETE FROM audit.logged_actions_default'
+        ' WHERE action_timestamp >= %L AND action_timestamp < %L'
+        ' RETURNING *)'
+        ' INSERT INTO audit.%I SELECT * FROM moved',
+        v_start, v_end, v_partition
+    );
+    EXECUTE format(
+        'ALTER TABLE audit.logged_actions ATTACH PARTITION audit.%I FOR VALUES FROM (%L) TO (%L)',
+        v_partition, v_start, v_end
+    );
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create partitions for the current month and p_months_ahead months after it
+CREATE OR REPLACE FUNCTION audit.ensure_partitions(p_months_ahead INTEGER DEFAULT 3)
+RETURNS INTEGER AS $$
+DECLARE
+    v_created INTEGER := 0;
+BEGIN
+    FOR i IN 0..p_months_ahead LOOP
+        IF audit.create_partition((date_trunc('month', now()) + make_interval(months => i))::DATE) THEN
+            v_created := v_created + 1;
+        END IF;
+    END LOOP;
+    RETURN v_created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Detach and drop every monthly partition that ends on or before p_cutoff
+CREATE OR REPLACE FUNCTION audit.drop_partitions_before(p_cutoff TIMESTAMPTZ)
+RETURNS TABLE (partition_name TEXT, estimated_rows BIGINT) AS $$
+DECLARE
+    r RECORD;
+BEGIN
+    FOR r IN
+        SELECT c.relname, c.reltuples
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'audit.logged_actions'::regclass
+          AND c.relname ~ '^logged_actions_p[0-9]{6}$'
+        ORDER BY c.relname
+    LOOP
+        -- Sorted by month: stop at the first partition still in retention
+        EXIT WHEN to_date(substr(r.relname, 17), 'YYYYMM') + INTERVAL '1 month' > p_cutoff;
+
+        EXECUTE format('ALTER TABLE audit.logged_actions DETACH PARTITION audit.%I', r.relname);
+        EXECUTE format('DROP TABLE audit.%I', r.relname);
+
+        partition_name := r.relname;
+        estimated_rows := GREATEST(r.reltuples, 0)::BIGINT;
+        RETURN NEXT;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# SQL for moving an unpartitioned audit.logged_actions out of the way
+AUDIT_LEGACY_RENAME_SQL = """
+DO $$
+DECLARE
+    v_seq TEXT := pg_get_serial_sequence('audit.logged_actions', 'id');
+    r RECORD;
+BEGIN
+    -- Keep the id sequence alive when the legacy table is dropped
+    IF v_seq IS NOT NULL THEN
+        EXECUTE format('ALTER SEQUENCE %s OWNED BY NONE', v_seq);
+    END IF;
+
+    ALTER TABLE audit.logged_actions RENAME TO logged_actions_legacy;
+
+    -- Free the index names for the partitioned table
+    FOR r IN
+        SELECT indexname FROM pg_indexes
+        WHERE schemaname = 'audit' AND tablename = 'logged_actions_legacy'
+    LOOP
+        EXECUTE format('ALTER INDEX audit.%I RENAME TO %I', r.indexname, r.indexname || '_legacy');
+    END LOOP;
+END
+$$;
 """
 
 # SQL for creating audit trigger function
@@ -147,6 +340,250 @@ $$ LANGUAGE plpgsql SECURITY DEFINER;
 """
 
 
+# Capture modes for enable_audit():
+#   full      - row trigger, full OLD/NEW snapshots (audit.log_changes)
+#   diff      - row trigger, UPDATE stores only changed keys (audit.log_changes_diff)
+#   statement - statement triggers with transition tables, diffs
+#               computed set-based per statement (audit.log_changes_statement)
+AUDIT_CAPTURE_MODES = ("full", "diff", "statement")
+
+# SQL for the diff and statement capture functions
+AUDIT_CAPTURE_FUNCTIONS_SQL = """
+CREATE OR REPLACE FUNCTION audit.log_changes_diff()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_old JSONB;
+    v_new JSONB;
+    v_old_data JSONB;
+    v_new_data JSONB;
+    v_changed TEXT[];
+    v_record_id INTEGER;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        v_record_id := OLD.id;
+        v_old_data := to_jsonb(OLD);
+    ELSIF TG_OP = 'INSERT' THEN
+        v_record_id := NEW.id;
+        v_new_data := to_jsonb(NEW);
+    ELSE
+        v_record_id := NEW.id;
+        v_old := to_jsonb(OLD);
+        v_new := to_jsonb(NEW);
+
+        -- Changed keys only (same columns on both sides, no outer join)
+        SELECT array_agg(n.key),
+               jsonb_object_agg(n.key, v_old -> n.key),
+               jsonb_object_agg(n.key, n.value)
+        INTO v_changed, v_old_data, v_new_data
+        FROM jsonb_each(v_new) AS n(key, value)
+        WHERE v_old -> n.key IS DISTINCT FROM n.value;
+
+        IF v_changed IS NULL THEN
+            RETURN NULL;  -- No-op update, nothing to log
+        END IF;
+    END IF;
+
+    INSERT INTO audit.logged_actions (
+        schema_name, table_name, record_id, action_type,
+        old_data, new_data, changed_fields,
+        db_user, app_user, app_user_id
+    ) VALUES (
+        TG_TABLE_SCHEMA, TG_TABLE_NAME, v_record_id, TG_OP,
+        v_old_data, v_new_data, v_changed,
+        current_user,
+        current_setting('app.current_user', true),
+        NULLIF(current_setting('app.current_user_id', true), '')::INTEGER
+    );
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Statement-level: transition tables old_rows / new_rows
+CREATE OR REPLACE FUNCTION audit.log_changes_statement()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_app_user TEXT := current_setting('app.current_user', true);
+    v_app_user_id INTEGER := NULLIF(current_setting('app.current_user_id', true), '')::INTEGER;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO audit.logged_actions (
+            schema_name, table_name, record_id, action_type,
+            new_data, db_user, app_user, app_user_id
+        )
+        SELECT TG_TABLE_SCHEMA, TG_TABLE_NAME, (n.j ->> 'id')::INTEGER, TG_OP,
+               n.j, current_user, v_app_user, v_app_user_id
+        FROM (SELECT to_jsonb(r) AS j FROM new_rows r) AS n;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO audit.logged_actions (
+            schema_name, table_name, record_id, action_type,
+            old_data, db_user, app_user, app_user_id
+        )
+        SELECT TG_TABLE_SCHEMA, TG_TABLE_NAME, (o.j ->> 'id')::INTEGER, TG_OP,
+               o.j, current_user, v_app_user, v_app_user_id
+        FROM (SELECT to_jsonb(r) AS j FROM old_rows r) AS o;
+
+    ELSE
+        INSERT INTO audit.logged_actions (
+            schema_name, table_name, record_id, action_type,
+            old_data, new_data, changed_fields,
+            db_user, app_user, app_user_id
+        )
+        SELECT TG_TABLE_SCHEMA, TG_TABLE_NAME, (n.j ->> 'id')::INTEGER, TG_OP,
+               d.old_data, d.new_data, d.changed,
+               current_user, v_app_user, v_app_user_id
+        FROM (SELECT to_jsonb(r) AS j FROM new_rows r) AS n
+        JOIN (SELECT to_jsonb(r) AS j FROM old_rows r) AS o
+            ON o.j -> 'id' = n.j -> 'id'
+        CROSS JOIN LATERAL (
+            SELECT array_agg(k.key) AS changed,
+                   jsonb_object_agg(k.key, o.j -> k.key) AS old_data,
+                   jsonb_object_agg(k.key, k.value) AS new_data
+            FROM jsonb_each(n.j) AS k(key, value)
+            WHERE o.j -> k.key IS DISTINCT FROM k.value
+        ) AS d
+        WHERE d.changed IS NOT NULL;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+"""
+
+
+def _audit_trigger_names(table_name: str) -> List[str]:
+    """All trigger names enable_audit() may create for a table."""
+    base = f"audit_trigger_{table_name}"
+    return [base, f"{base}_ins", f"{base}_upd", f"{base}_del"]
+
+
+def build_audit_trigger_sql(
+    table_name: str,
+    schema: str = "public",
+    mode: str = "full"
+) -> psycopg2_sql.Composed:
+    """
+    Build the SQL that (re)creates the audit triggers of a table.
+
+    Args:
+        table_name: Table to audit
+        schema: Schema name
+        mode: Capture mode (see AUDIT_CAPTURE_MODES)
+
+    Returns:
+        Composed SQL (drops any previous audit triggers first)
+    """
+    if mode not in AUDIT_CAPTURE_MODES:
+        raise ValueError(f"Unknown audit capture mode: {mode}")
+
+    target = psycopg2_sql.SQL("{}.{}").format(
+        psycopg2_sql.Identifier(schema),
+        psycopg2_sql.Identifier(table_name),
+    )
+    statements = [
+        psycopg2_sql.SQL("DROP TRIGGER IF EXISTS {} ON {};").format(
+            psycopg2_sql.Identifier(name), target
+        )
+        for name in _audit_trigger_names(table_name)
+    ]
+
+    if mode == "statement":
+        base = f"audit_trigger_{table_name}"
+        for suffix, event, referencing in (
+            ("_ins", "INSERT", "NEW TABLE AS new_rows"),
+            ("_upd", "UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+            ("_del", "DELETE", "OLD TABLE AS old_rows"),
+        ):
+            statements.append(psycopg2_sql.SQL(
+                " CREATE TRIGGER {trigger} AFTER " + event + " ON {target}"
+                " REFERENCING " + referencing +
+                " FOR EACH STATEMENT EXECUTE FUNCTION audit.log_changes_statement();"
+            ).format(
+                trigger=psycopg2_sql.Identifier(base + suffix),
+                target=target,
+            ))
+    else:
+        function = "audit.log_changes_diff" if mode == "diff" else "audit.log_changes"
+        statements.append(psycopg2_sql.SQL(
+            " CREATE TRIGGER {trigger}"
+            " AFTER INSERT OR UPDATE OR DELETE ON {target}"
+            " FOR EACH ROW EXECUTE FUNCTION " + function + "();"
+        ).format(
+            trigger=psycopg2_sql.Identifier(f"audit_trigger_{table_name}"),
+            target=target,
+        ))
+
+    return psycopg2_sql.Composed(statements)
+
+
+def rebuild_snapshots(changes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Turn a record's audit trail into full before/after rows.
+
+    Works for any mix of capture modes: INSERT starts a snapshot and
+    every UPDATE's new_data (a diff or a full row) is applied on top.
+    If the trail does not start with an INSERT (audit enabled later,
+    or purged), snapshots contain only the fields seen so far.
+
+    Args:
+        changes: Audit records of one record, oldest first
+
+    Returns:
+        Copies of the records with old_data/new_data as full rows
+    """
+    rebuilt = []
+    current: Optional[Dict[str, Any]] = None
+
+    for change in changes:
+        old_data = change.get("old_data") or {}
+        new_data = change.get("new_data") or {}
+        action = change.get("action_type")
+        record = dict(change)
+
+        if action == "INSERT":
+            current = dict(new_data)
+            record["old_data"] = None
+            record["new_data"] = dict(current)
+        elif action == "UPDATE":
+            before = {**(current or {}), **old_data}
+            current = {**before, **new_data}
+            record["old_data"] = before
+            record["new_data"] = dict(current)
+        else:  # DELETE
+            record["old_data"] = {**(current or {}), **old_data}
+            record["new_data"] = None
+            current = None
+
+        rebuilt.append(record)
+
+    return rebuilt
+
+
+# relkind of audit.logged_actions ('p' = partitioned, 'r' = plain, no row = missing)
+_TABLE_KIND_SQL = """
+    SELECT c.relkind::TEXT
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = 'audit' AND c.relname = 'logged_actions'
+"""
+
+
+def _add_month(month: date) -> date:
+    """First day of the month after month."""
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _month_starts(first: date, last: date) -> List[date]:
+    """First days of every month from first to last (inclusive)."""
+    months = []
+    month = first.replace(day=1)
+    while month <= last:
+        months.append(month)
+        month = _add_month(month)
+    return months
+
+
 # Thread-safe singleton
 _lock = threading.Lock()
 _instance: Optional["AuditManager"] = None
@@ -186,11 +623,31 @@ class AuditManager:
 
             cursor = conn.cursor()
 
-            # Create schema and table
-            cursor.execute(AUDIT_SCHEMA_SQL)
+            cursor.execute("CREATE SCHEMA IF NOT EXISTS audit")
+            cursor.execute(_TABLE_KIND_SQL)
+            row = cursor.fetchone()
+            legacy = row is not None and row[0] != "p"
+
+            # Create partitioned table (an unpartitioned one is left as is)
+            if legacy:
+                app_logger.warning(
+                    "audit.logged_actions is not partitioned; "
+                    "run AuditManager.migrate_to_partitioned() to convert it"
+                )
+            else:
+                cursor.execute(AUDIT_SCHEMA_SQL)
 
-            # Create trigger function
+            # Create partition maintenance, rollup and trigger functions
+            cursor.execute(AUDIT_PARTITION_FUNCTIONS_SQL)
+            cursor.execute(AUDIT_ROLLUP_SQL)
             cursor.execute(AUDIT_TRIGGER_FUNCTION_SQL)
+            cursor.execute(AUDIT_CAPTURE_FUNCTIONS_SQL)
+
+            if not legacy:
+                cursor.execute(
+                    "SELECT audit.ensure_partitions(%s)",
+                    (AUDIT_PARTITION_MONTHS_AHEAD,)
+                )
 
             conn.commit()
             app_logger.info("Audit tables and trigger function created successfully")
@@ -209,17 +666,200 @@ class AuditManager:
                 cursor.close()
             return_connection(conn)
 
-    def enable_audit(self, table_name: str, schema: str = "public") -> bool:
+    def is_partitioned(self) -> bool:
+        """
+        Check if audit.logged_actions is the partitioned table.
+
+        Returns:
+            True if partitioned, False if missing or unpartitioned
+        """
+        try:
+            return get_scalar(_TABLE_KIND_SQL) == "p"
+        except Exception as e:
+            app_logger.error(f"Failed to check audit partitioning: {e}")
+            return False
+
+    def ensure_partitions(self, months_ahead: int = AUDIT_PARTITION_MONTHS_AHEAD) -> int:
+        """
+        Create monthly partitions ahead of time.
+        Run on startup and with maintenance; rows for months without a
+        partition land in the default partition until it is created.
+
+        Args:
+            months_ahead: Months after the current one to cover
+
+        Returns:
+            Number of partitions created, or -1 on error
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = get_connection()
+            if conn is None:
+                return -1
+
+            cursor = conn.cursor()
+            cursor.execute("SELECT audit.ensure_partitions(%s)", (months_ahead,))
+            created = cursor.fetchone()[0]
+            conn.commit()
+
+            if created:
+                app_logger.info(f"Created {created} audit partitions")
+            return created
+
+        except Exception as e:
+            app_logger.error(f"Failed to create audit partitions: {e}")
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception as rb_err:
+                    app_logger.warning(f"Rollback failed: {rb_err}")
+            return -1
+        finally:
+            if cursor:
+                cursor.close()
+            return_connection(conn)
+
+    def migrate_to_partitioned(self, drop_legacy: bool = True) -> int:
+        """
+        Convert an unpartitioned audit.logged_actions to monthly partitions.
+
+        The old table is renamed to audit.logged_actions_legacy and the
+        partitioned table takes its place (same id sequence), so triggers
+        keep logging during the migration. Rows are then moved one month
+        per transaction, newest first. Safe to re-run after an
+        interruption: it resumes with the rows left in the legacy table.
+
+        Args:
+            drop_legacy: Drop the legacy table once it is empty
+
+        Returns:
+            Number of rows moved, or -1 on error
+        """
+        conn = None
+        cursor = None
+        moved = 0
+        try:
+            conn = get_connection()
+            if conn is None:
+                return -1
+
+            cursor = conn.cursor()
+            cursor.execute(_TABLE_KIND_SQL)
+            row = cursor.fetchone()
+
+            # Step 1: swap tables (one transaction)
+            if row is not None and row[0] != "p":
+                app_logger.info("Migrating audit.logged_actions to monthly partitions...")
+                cursor.execute(AUDIT_LEGACY_RENAME_SQL)
+                cursor.execute(AUDIT_SCHEMA_SQL)
+                cursor.execute(AUDIT_PARTITION_FUNCTIONS_SQL)
+                cursor.execute(AUDIT_ROLLUP_SQL)
+                cursor.execute(AUDIT_TRIGGER_FUNCTION_SQL)
+                cursor.execute(AUDIT_CAPTURE_FUNCTIONS_SQL)
+                cursor.execute(
+                    "SELECT audit.ensure_partitions(%s)",
+                    (AUDIT_PARTITION_MONTHS_AHEAD,)
+                )
+                conn.commit()
+
+            cursor.execute("SELECT to_regclass('audit.logged_actions_legacy') IS NOT NULL")
+            if not cursor.fetchone()[0]:
+                conn.commit()
+                return 0
+
+            # Step 2: partitions for the legacy date range
+            cursor.execute(
+                "SELECT date_trunc('month', MIN(action_timestamp))::DATE,"
+                " date_trunc('month', MAX(action_timestamp))::DATE"
+                " FROM audit.logged_actions_legacy"
+            )
+            first_month, last_month = cursor.fetchone()
+            months = _month_starts(first_month, last_month) if first_month else []
+            for month in months:
+                cursor.execute("SELECT audit.create_partition(%s)", (month,))
+            conn.commit()
+
+            # Step 3: move rows, one month per transaction
+            columns = psycopg2_sql.SQL(", ").join(
+                psycopg2_sql.Identifier(c) for c in AUDIT_COLUMNS
+            )
+            move_sql = psycopg2_sql.SQL(
+                "WITH moved AS ("
+                " DELETE FROM audit.logged_actions_legacy"
+                " WHERE action_timestamp >= %s AND action_timestamp < %s"
+                " RETURNING {columns})"
+                " INSERT INTO audit.logged_actions ({columns})"
+                " SELECT {columns} FROM moved"
+            ).format(columns=columns)
+
+            for month in reversed(months):
+                cursor.execute(move_sql, (month, _add_month(month)))
+                moved += cursor.rowcount
+                conn.commit()
+                app_logger.info(f"Audit migration: {month:%Y-%m} moved ({moved} rows so far)")
+
+            # Rows without a timestamp go to the default partition
+            null_sql = psycopg2_sql.SQL(
+                "WITH moved AS ("
+                " DELETE FROM audit.logged_actions_legacy"
+                " WHERE action_timestamp IS NULL"
+                " RETURNING {columns})"
+                " INSERT INTO audit.logged_actions ({columns})"
+                " SELECT {select} FROM moved"
+            ).format(
+                columns=columns,
+                select=psycopg2_sql.SQL(", ").join(
+                    psycopg2_sql.SQL("COALESCE(action_timestamp, 'epoch')")
+                    if c == "action_timestamp" else psycopg2_sql.Identifier(c)
+                    for c in AUDIT_COLUMNS
+                ),
+            )
+            cursor.execute(null_sql)
+            moved += cursor.rowcount
+            conn.commit()
+
+            if drop_legacy:
+                cursor.execute("SELECT EXISTS (SELECT 1 FROM audit.logged_actions_legacy)")
+                if not cursor.fetchone()[0]:
+                    cursor.execute("DROP TABLE audit.logged_actions_legacy")
+                    conn.commit()
+
+            app_logger.info(f"Audit partition migration complete: {moved} rows moved")
+            return moved
+
+        except Exception as e:
+            app_logger.error(f"Failed to migrate audit table to partitions: {e}")
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception as rb_err:
+                    app_logger.warning(f"Rollback failed: {rb_err}")
+            return -1
+        finally:
+            if cursor:
+                cursor.close()
+            return_connection(conn)
+
+    def enable_audit(self, table_name: str, schema: str = "public", mode: str = "full") -> bool:
         """
         Enable audit logging for a table by creating a trigger.
 
         Args:
             table_name: Table to audit
             schema: Schema name (default: public)
+            mode: Capture mode - "full" (complete OLD/NEW rows), "diff"
+                (UPDATE stores only changed keys) or "statement"
+                (statement triggers with transition tables, for bulk
+                updates; stores diffs like "diff")
 
         Returns:
             True if successful
         """
+        if mode not in AUDIT_CAPTURE_MODES:
+            app_logger.error(f"Unknown audit capture mode for {table_name}: {mode}")
+            return False
+
         conn = None
         cursor = None
         try:
@@ -230,21 +870,14 @@ class AuditManager:
 
             cursor = conn.cursor()
 
-            trigger_name = f"audit_trigger_{table_name}"
-            trigger_sql = psycopg2_sql.SQL(
-                "DROP TRIGGER IF EXISTS {trigger} ON {schema}.{table};"
-                " CREATE TRIGGER {trigger}"
-                " AFTER INSERT OR UPDATE OR DELETE ON {schema}.{table}"
-                " FOR EACH ROW EXECUTE FUNCTION audit.log_changes();"
-            ).format(
-                trigger=psycopg2_sql.Identifier(trigger_name),
-                schema=psycopg2_sql.Identifier(schema),
-                table=psycopg2_sql.Identifier(table_name),
-            )
-            cursor.execute(trigger_sql)
+            if mode != "full":
+                # Installs set up before capture modes existed
+                cursor.execute(AUDIT_CAPTURE_FUNCTIONS_SQL)
+
+            cursor.execute(build_audit_trigger_sql(table_name, schema, mode))
 
             conn.commit()
-            app_logger.info(f"Audit enabled for {schema}.{table_name}")
+            app_logger.info(f"Audit enabled for {schema}.{table_name} ({mode})")
             return True
 
         except Exception as e:
@@ -280,14 +913,14 @@ class AuditManager:
 
             cursor = conn.cursor()
 
-            trigger_name = f"audit_trigger_{table_name}"
-            drop_sql = psycopg2_sql.SQL(
-                "DROP TRIGGER IF EXISTS {} ON {}.{};"
-            ).format(
-                psycopg2_sql.Identifier(trigger_name),
-                psycopg2_sql.Identifier(schema),
-                psycopg2_sql.Identifier(table_name),
-            )
+            drop_sql = psycopg2_sql.Composed([
+                psycopg2_sql.SQL("DROP TRIGGER IF EXISTS {} ON {}.{};").format(
+                    psycopg2_sql.Identifier(trigger_name),
+                    psycopg2_sql.Identifier(schema),
+                    psycopg2_sql.Identifier(table_name),
+                )
+                for trigger_name in _audit_trigger_names(table_name)
+            ])
             cursor.execute(drop_sql)
 
             conn.commit()
@@ -363,38 +996,17 @@ class AuditManager:
             limit: Max records
             offset: Offset for pagination
 
+        from_date/to_date limit the scan to the matching monthly
+        partitions; without them partitions are read newest first and
+        the scan stops once the page is filled.
+
         Returns:
             List of audit records as dicts
         """
         try:
-            conditions: List[str] = []
-            params: List[Any] = []
-
-            if table_name:
-                conditions.append("table_name = %s")
-                params.append(table_name)
-
-            if record_id is not None:
-                conditions.append("record_id = %s")
-                params.append(record_id)
-
-            if action_type:
-                conditions.append("action_type = %s")
-                params.append(action_type.upper())
-
-            if user_id is not None:
-                conditions.append("app_user_id = %s")
-                params.append(user_id)
-
-            if from_date:
-                conditions.append("action_timestamp >= %s")
-                params.append(from_date)
-
-            if to_date:
-                conditions.append("action_timestamp <= %s")
-                params.append(to_date)
-
-            where_clause = " AND ".join(conditions) if conditions else "TRUE"
+            where_clause, params = self._build_filters(
+                table_name, record_id, action_type, user_id, from_date, to_date
+            )
             params.extend([limit, offset])
 
             # Build query using psycopg2.sql to avoid f-string SQL patterns
@@ -422,10 +1034,214 @@ class AuditManager:
             app_logger.error(f"Failed to get audit history: {e}")
             return []
 
+    def get_audit_page(
+        self,
+        table_name: Optional[str] = None,
+        record_id: Optional[int] = None,
+        action_type: Optional[str] = None,
+        user_id: Optional[int] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 100
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, int]]]:
+        """
+        Get one page of audit history with keyset (cursor) pagination.
+
+        Pages are ordered newest first on (action_timestamp, id) and each
+        page continues after the last row of the previous one, so deep
+        pages cost the same as the first (no OFFSET scan).
+
+        Args:
+            table_name, record_id, action_type, user_id, from_date, to_date:
+                Same filters as get_audit_history()
+            after: Cursor returned with the previous page (None = first page)
+            limit: Page size
+
+        Returns:
+            Tuple of (records, cursor for the next page or None at the end)
+        """
+        try:
+            where_clause, params = self._build_filters(
+                table_name, record_id, action_type, user_id, from_date, to_date
+            )
+            if after is not None:
+                # The plain timestamp bound lets the planner prune partitions
+                where_clause += (
+                    " AND action_timestamp <= %s"
+                    " AND (action_timestamp, id) < (%s, %s)"
+                )
+                params.extend([after[0], after[0], after[1]])
+            params.append(limit + 1)
+
+            query = psycopg2_sql.SQL(
+                "SELECT id, schema_name, table_name, record_id,"
+                " action_type, old_data, new_data, changed_fields,"
+                " action_timestamp, db_user, app_user, app_user_id,"
+                " notes"
+                " FROM audit.logged_actions"
+                " WHERE {where}"
+                " ORDER BY action_timestamp DESC, id DESC"
+                " LIMIT %s"
+            ).format(where=psycopg2_sql.SQL(where_clause))
+
+            columns, rows = select_all(query, tuple(params))
+            if not rows:
+                return [], None
+
+            records = [dict(zip(columns, row)) for row in rows[:limit]]
+            next_cursor = None
+            if len(rows) > limit:
+                last = records[-1]
+                next_cursor = (last["action_timestamp"], last["id"])
+            return records, next_cursor
+
+        except Exception as e:
+            app_logger.error(f"Failed to get audit page: {e}")
+            return [], None
+
+    def _build_filters(
+        self,
+        table_name: Optional[str] = None,
+        record_id: Optional[int] = None,
+        action_type: Optional[str] = None,
+        user_id: Optional[int] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+    ) -> Tuple[str, List[Any]]:
+        """
+        Build the WHERE clause shared by history queries and exports.
+
+        Returns:
+            Tuple of (where clause, params list)
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+
+        if table_name:
+            conditions.append("table_name = %s")
+            params.append(table_name)
+
+        if record_id is not None:
+            conditions.append("record_id = %s")
+            params.append(record_id)
+
+        if action_type:
+            conditions.append("action_type = %s")
+            params.append(action_type.upper())
+
+        if user_id is not None:
+            conditions.append("app_user_id = %s")
+            params.append(user_id)
+
+        if from_date:
+            conditions.append("action_timestamp >= %s")
+            params.append(from_date)
+
+        if to_date:
+            conditions.append("action_timestamp <= %s")
+            params.append(to_date)
+
+        where_clause = " AND ".join(conditions) if conditions else "TRUE"
+        return where_clause, params
+
+    def iter_audit_history(
+        self,
+        table_name: Optional[str] = None,
+        record_id: Optional[int] = None,
+        action_type: Optional[str] = None,
+        user_id: Optional[int] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        batch_size: int = 2000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream audit history in batches (server-side cursor).
+
+        Same filters as get_audit_history(), without a row limit.
+
+        Yields:
+            Lists of audit records as dicts
+        """
+        where_clause, params = self._build_filters(
+            table_name, record_id, action_type, user_id, from_date, to_date
+        )
+        query = psycopg2_sql.SQL(
+            "SELECT id, schema_name, table_name, record_id,"
+            " action_type, old_data, new_data, changed_fields,"
+            " action_timestamp, db_user, app_user, app_user_id,"
+            " notes"
+            " FROM audit.logged_actions"
+            " WHERE {where}"
+            " ORDER BY action_timestamp DESC"
+        ).format(where=psycopg2_sql.SQL(where_clause))
+
+        for columns, rows in select_iter(query, tuple(params), batch_size):
+            if rows:
+                yield [dict(zip(columns, row)) for row in rows]
+
+    def export_audit_history_csv(
+        self,
+        file_path: str,
+        table_name: Optional[str] = None,
+        action_type: Optional[str] = None,
+        user_id: Optional[int] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+    ) -> int:
+        """
+        Export audit history to a CSV file (utf-8-sig for Excel).
+
+        Rows are streamed from the database, so memory use does not
+        grow with the size of the audit log.
+
+        Returns:
+            Number of exported rows, or -1 on error
+        """
+        import csv
+        import json
+
+        fields = [
+            "id", "action_timestamp", "schema_name", "table_name",
+            "record_id", "action_type", "changed_fields",
+            "app_user", "app_user_id", "db_user", "old_data", "new_data",
+        ]
+        count = 0
+        try:
+            with open(file_path, "w", encoding="utf-8-sig", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(fields)
+                for batch in self.iter_audit_history(
+                    table_name=table_name,
+                    action_type=action_type,
+                    user_id=user_id,
+                    from_date=from_date,
+                    to_date=to_date,
+                ):
+                    for record in batch:
+                        row = []
+                        for field in fields:
+                            value = record.get(field)
+                            if field in ("old_data", "new_data") and value is not None:
+                                value = json.dumps(value, ensure_ascii=False, default=str)
+                            elif field == "changed_fields":
+                                value = ", ".join(value or [])
+                            row.append(value)
+                        writer.writerow(row)
+                    count += len(batch)
+
+            app_logger.info(f"Exported {count} audit records to {file_path}")
+            return count
+
+        except Exception as e:
+            app_logger.error(f"Failed to export audit history: {e}")
+            return -1
+
     def get_record_changes(
         self,
         table_name: str,
-        record_id: int
+        record_id: int,
+        full_snapshots: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Get all changes for a specific record.
@@ -433,11 +1249,37 @@ class AuditManager:
         Args:
             table_name: Table name
             record_id: Record ID
+            full_snapshots: Rebuild complete before/after rows from the
+                stored diffs ("diff"/"statement" capture modes)
 
         Returns:
-            List of changes
+            List of changes (newest first)
         """
-        return self.get_audit_history(table_name, record_id=record_id)
+        if not full_snapshots:
+            return self.get_audit_history(table_name, record_id=record_id)
+
+        try:
+            # Whole trail, oldest first, to replay the diffs
+            sql = """
+                SELECT id, schema_name, table_name, record_id,
+                       action_type, old_data, new_data, changed_fields,
+                       action_timestamp, db_user, app_user, app_user_id,
+                       notes
+                FROM audit.logged_actions
+                WHERE table_name = %s AND record_id = %s
+                ORDER BY action_timestamp, id
+            """
+            columns, rows = select_all(sql, (table_name, record_id))
+            if not rows:
+                return []
+
+            changes = rebuild_snapshots([dict(zip(columns, row)) for row in rows])
+            changes.reverse()
+            return changes
+
+        except Exception as e:
+            app_logger.error(f"Failed to rebuild record changes: {e}")
+            return []
 
     def get_user_activity(
         self,
@@ -506,6 +1348,36 @@ class AuditManager:
             app_logger.error(f"Failed to get audited tables: {e}")
             return []
 
+    def get_capture_modes(self) -> Dict[str, str]:
+        """
+        Get the capture mode of every audited table.
+
+        Returns:
+            Dict of table name -> "full", "diff" or "statement"
+        """
+        try:
+            sql = """
+                SELECT DISTINCT event_object_table, action_statement
+                FROM information_schema.triggers
+                WHERE trigger_name LIKE 'audit_trigger_%'
+                  AND action_statement LIKE '%audit.log_changes%'
+            """
+            columns, rows = select_all(sql)
+
+            modes: Dict[str, str] = {}
+            for table, statement in rows or []:
+                if "log_changes_statement" in statement:
+                    modes[table] = "statement"
+                elif "log_changes_diff" in statement:
+                    modes[table] = "diff"
+                else:
+                    modes[table] = "full"
+            return modes
+
+        except Exception as e:
+            app_logger.error(f"Failed to get audit capture modes: {e}")
+            return {}
+
     def get_audit_statistics(
         self,
         days: int = 30
@@ -513,50 +1385,45 @@ class AuditManager:
         """
         Get audit statistics for dashboard display.
 
+        Complete days are read from audit.daily_rollup (refreshed here
+        when stale) and only today's rows are counted live, so the cost
+        does not grow with the size of the log. The period starts at
+        midnight `days` days ago.
+
         Args:
             days: Number of days to include
 
         Returns:
             Dict with statistics
         """
-        from_date = datetime.now() - timedelta(days=days)
+        from_day = (datetime.now() - timedelta(days=days)).date()
+        recent_date = datetime.now() - timedelta(days=1)
 
         try:
-            # Total records
-            total_sql = """
-                SELECT COUNT(*) FROM audit.logged_actions
-                WHERE action_timestamp >= %s
-            """
-            total = get_scalar(total_sql, (from_date,)) or 0
-
-            # By action type
-            action_sql = """
-                SELECT action_type, COUNT(*)
-                FROM audit.logged_actions
-                WHERE action_timestamp >= %s
-                GROUP BY action_type
-                ORDER BY COUNT(*) DESC
-            """
-            _, action_rows = select_all(action_sql, (from_date,))
-            by_action = {row[0]: row[1] for row in action_rows} if action_rows else {}
-
-            # By table
-            table_sql = """
-                SELECT table_name, COUNT(*)
-                FROM audit.logged_actions
-                WHERE action_timestamp >= %s
-                GROUP BY table_name
-                ORDER BY COUNT(*) DESC
-            """
-            _, table_rows = select_all(table_sql, (from_date,))
-            by_table = {row[0]: row[1] for row in table_rows} if table_rows else {}
-
-            # Recent activity (last 24 hours)
+            if self.refresh_daily_rollup() >= 0:
+                rows = self._rollup_statistics_rows(from_day)
+            else:
+                rows = self._scan_statistics_rows(from_day)
+
+            total = 0
+            by_action: Dict[str, int] = {}
+            by_table: Dict[str, int] = {}
+            for action, table, grouping_id, count in rows:
+                if grouping_id == 3:        # ()
+                    total = count
+                elif grouping_id == 1:      # (action_type)
+                    by_action[action] = count
+                else:                       # (table_name)
+                    by_table[table] = count
+
+            by_action = dict(sorted(by_action.items(), key=lambda kv: kv[1], reverse=True))
+            by_table = dict(sorted(by_table.items(), key=lambda kv: kv[1], reverse=True))
+
+            # Recent activity (last 24 hours, index range scan)
             recent_sql = """
                 SELECT COUNT(*) FROM audit.logged_actions
                 WHERE action_timestamp >= %s
             """
-            recent_date = datetime.now() - timedelta(days=1)
             recent = get_scalar(recent_sql, (recent_date,)) or 0
 
             return {
@@ -579,6 +1446,166 @@ class AuditManager:
                 "audited_tables": [],
             }
 
+    def _rollup_statistics_rows(self, from_day: date) -> List[Tuple]:
+        """
+        Per action, per table and overall counts since from_day.
+
+        Returns:
+            Rows of (action_type, table_name, grouping_id, count)
+        """
+        stats_sql = """
+            WITH counts AS (
+                SELECT table_name, action_type, action_count AS n
+                FROM audit.daily_rollup
+                WHERE day >= %s AND day < current_date
+                UNION ALL
+                SELECT table_name, action_type, COUNT(*)
+                FROM audit.logged_actions
+                WHERE action_timestamp >= GREATEST(%s, current_date)
+                GROUP BY table_name, action_type
+            )
+            SELECT
+                action_type,
+                table_name,
+                GROUPING(action_type, table_name),
+                SUM(n)::BIGINT
+            FROM counts
+            GROUP BY GROUPING SETS ((action_type), (table_name), ())
+        """
+        _, rows = select_all(stats_sql, (from_day, from_day))
+        return [row for row in rows or [] if row[3]]
+
+    def _scan_statistics_rows(self, from_day: date) -> List[Tuple]:
+        """Same as _rollup_statistics_rows, counted from the log itself."""
+        stats_sql = """
+            SELECT
+                action_type,
+                table_name,
+                GROUPING(action_type, table_name),
+                COUNT(*)
+            FROM audit.logged_actions
+            WHERE action_timestamp >= %s
+            GROUP BY GROUPING SETS ((action_type), (table_name), ())
+        """
+        _, rows = select_all(stats_sql, (from_day,))
+        return [row for row in rows or [] if row[3]]
+
+    def setup_daily_rollup(self) -> bool:
+        """
+        Create the daily rollup table and refresh function.
+        Safe to run repeatedly.
+
+        Returns:
+            True if successful
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = get_connection()
+            if conn is None:
+                return False
+
+            cursor = conn.cursor()
+            cursor.execute(AUDIT_ROLLUP_SQL)
+            conn.commit()
+            return True
+
+        except Exception as e:
+            app_logger.error(f"Failed to setup audit rollup: {e}")
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception as rb_err:
+                    app_logger.warning(f"Rollback failed: {rb_err}")
+            return False
+        finally:
+            if cursor:
+                cursor.close()
+            return_connection(conn)
+
+    def refresh_daily_rollup(self) -> int:
+        """
+        Add complete days to audit.daily_rollup.
+        Cheap when already current (one row read); the first run rolls
+        up the whole log.
+
+        Returns:
+            Number of rollup rows written, or -1 on error
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = get_connection()
+            if conn is None:
+                return -1
+
+            cursor = conn.cursor()
+            cursor.execute("SELECT audit.refresh_daily_rollup()")
+            written = cursor.fetchone()[0]
+            conn.commit()
+
+            if written:
+                app_logger.info(f"Audit daily rollup refreshed ({written} rows)")
+            return written
+
+        except Exception as e:
+            app_logger.error(f"Failed to refresh audit rollup: {e}")
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception as rb_err:
+                    app_logger.warning(f"Rollback failed: {rb_err}")
+            return -1
+        finally:
+            if cursor:
+                cursor.close()
+            return_connection(conn)
+
+    def get_daily_activity(
+        self,
+        days: int = 30,
+        table_name: Optional[str] = None,
+        user_id: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get daily action counts from the rollup (complete days only).
+
+        Args:
+            days: Number of days to include
+            table_name: Filter by table name
+            user_id: Filter by user (0 = changes without an app user)
+
+        Returns:
+            List of dicts: day, table_name, action_type, app_user_id, count
+        """
+        if self.refresh_daily_rollup() < 0:
+            return []
+
+        where_clause = "day >= %s"
+        params: List[Any] = [(datetime.now() - timedelta(days=days)).date()]
+        if table_name:
+            where_clause += " AND table_name = %s"
+            params.append(table_name)
+        if user_id is not None:
+            where_clause += " AND app_user_id = %s"
+            params.append(user_id)
+
+        try:
+            query = psycopg2_sql.SQL(
+                "SELECT day, table_name, action_type, app_user_id,"
+                " action_count AS count"
+                " FROM audit.daily_rollup"
+                " WHERE {where}"
+                " ORDER BY day, table_name, action_type, app_user_id"
+            ).format(where=psycopg2_sql.SQL(where_clause))
+
+            columns, rows = select_all(query, tuple(params))
+            return [dict(zip(columns, row)) for row in rows] if rows else []
+
+        except Exception as e:
+            app_logger.error(f"Failed to get daily audit activity: {e}")
+            return []
+
     def get_total_count(
         self,
         table_name: Optional[str] = None,
@@ -594,26 +1621,12 @@ class AuditManager:
             Total record count
         """
         try:
-            conditions: List[str] = []
-            params: List[Any] = []
-
-            if table_name:
-                conditions.append("table_name = %s")
-                params.append(table_name)
-
-            if action_type:
-                conditions.append("action_type = %s")
-                params.append(action_type.upper())
-
-            if from_date:
-                conditions.append("action_timestamp >= %s")
-                params.append(from_date)
-
-            if to_date:
-                conditions.append("action_timestamp <= %s")
-                params.append(to_date)
-
-            where_clause = " AND ".join(conditions) if conditions else "TRUE"
+            where_clause, params = self._build_filters(
+                table_name=table_name,
+                action_type=action_type,
+                from_date=from_date,
+                to_date=to_date,
+            )
 
             count_sql = psycopg2_sql.SQL(
                 "SELECT COUNT(*) FROM audit.logged_actions WHERE {where}"
@@ -629,11 +1642,16 @@ class AuditManager:
         Remove audit records older than specified days.
         Use for database maintenance.
 
+        On the partitioned table whole monthly partitions are detached
+        and dropped (no row-by-row DELETE), so records are kept until
+        their entire month is older than the cutoff. Also creates the
+        upcoming partitions.
+
         Args:
             days: Keep records newer than this many days
 
         Returns:
-            Number of records deleted
+            Number of records deleted (estimated for dropped partitions)
         """
         conn = None
         cursor = None
@@ -644,14 +1662,46 @@ class AuditManager:
                 return 0
 
             cursor = conn.cursor()
+            cursor.execute(_TABLE_KIND_SQL)
+            row = cursor.fetchone()
+
+            if row is None or row[0] != "p":
+                # Unpartitioned table (not migrated yet)
+                cursor.execute(
+                    "DELETE FROM audit.logged_actions WHERE action_timestamp < %s",
+                    (cutoff,)
+                )
+                deleted = cursor.rowcount
+                conn.commit()
+                app_logger.info(f"Purged {deleted} audit records older than {days} days")
+                return deleted
+
             cursor.execute(
-                "DELETE FROM audit.logged_actions WHERE action_timestamp < %s",
+                "SELECT partition_name, estimated_rows"
+                " FROM audit.drop_partitions_before(%s)",
                 (cutoff,)
             )
-            deleted = cursor.rowcount
+            dropped = cursor.fetchall()
+            deleted = sum(rows for _, rows in dropped)
+
+            # Stragglers in the default partition (small)
+            cursor.execute(
+                "DELETE FROM audit.logged_actions_default WHERE action_timestamp < %s",
+                (cutoff,)
+            )
+            deleted += cursor.rowcount
+
+            cursor.execute(
+                "SELECT audit.ensure_partitions(%s)",
+                (AUDIT_PARTITION_MONTHS_AHEAD,)
+            )
             conn.commit()
 
-            app_logger.info(f"Purged {deleted} audit records older than {days} days")
+            app_logger.info(
+                f"Purged ~{deleted} audit records older than {days} days "
+                f"({len(dropped)} partitions dropped"
+                f"{': ' + ', '.join(name for name, _ in dropped) if dropped else ''})"
+            )
             return deleted
 
         except Exception as e:
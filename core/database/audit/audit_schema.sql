@@ -1,8 +1,13 @@
 -- =================================================================
 -- INTEGRA Audit Trail Schema
 -- =================================================================
--- Creates the audit schema, logged_actions table, and indexes
--- for tracking all changes to sensitive database tables.
+-- Creates the audit schema, the monthly-partitioned logged_actions
+-- table, its indexes and the partition maintenance functions.
+--
+-- Partitions are named logged_actions_pYYYYMM. Retention drops whole
+-- partitions (audit.drop_partitions_before) instead of DELETE.
+-- Existing unpartitioned tables are converted by
+-- AuditManager.migrate_to_partitioned().
 --
 -- Run this ONCE during initial database setup.
 -- =================================================================
@@ -10,9 +15,12 @@
 -- Create audit schema
 CREATE SCHEMA IF NOT EXISTS audit;
 
--- Create the main audit log table
+-- Shared id sequence (kept when migrating from the unpartitioned table)
+CREATE SEQUENCE IF NOT EXISTS audit.logged_actions_id_seq;
+
+-- Create the main audit log table, range-partitioned by month
 CREATE TABLE IF NOT EXISTS audit.logged_actions (
-    id              BIGSERIAL PRIMARY KEY,
+    id              BIGINT NOT NULL DEFAULT nextval('audit.logged_actions_id_seq'),
     schema_name     TEXT NOT NULL,
     table_name      TEXT NOT NULL,
     record_id       INTEGER,
@@ -20,16 +28,24 @@ CREATE TABLE IF NOT EXISTS audit.logged_actions (
     old_data        JSONB,
     new_data        JSONB,
     changed_fields  TEXT[],
-    action_timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    action_timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     db_user         TEXT DEFAULT current_user,
     app_user        TEXT,
     app_user_id     INTEGER,
     client_ip       INET,
     session_id      TEXT,
-    notes           TEXT
-);
+    notes           TEXT,
+    PRIMARY KEY (id, action_timestamp)
+) PARTITION BY RANGE (action_timestamp);
+
+ALTER SEQUENCE audit.logged_actions_id_seq OWNED BY audit.logged_actions.id;
 
--- Performance indexes
+-- Rows outside the monthly partitions land here until their
+-- partition is created (audit.create_partition moves them)
+CREATE TABLE IF NOT EXISTS audit.logged_actions_default
+    PARTITION OF audit.logged_actions DEFAULT;
+
+-- Performance indexes (defined on the parent, created on every partition)
 CREATE INDEX IF NOT EXISTS idx_audit_table_name
     ON audit.logged_actions(table_name);
 
@@ -52,6 +68,10 @@ CREATE INDEX IF NOT EXISTS idx_audit_table_record
 CREATE INDEX IF NOT EXISTS idx_audit_table_timestamp
     ON audit.logged_actions(table_name, action_timestamp DESC);
 
+-- Keyset pagination on (action_timestamp, id)
+CREATE INDEX IF NOT EXISTS idx_audit_timestamp_id
+    ON audit.logged_actions(action_timestamp DESC, id DESC);
+
 -- Comment on table
 COMMENT ON TABLE audit.logged_actions IS
     'Audit trail - tracks all INSERT/UPDATE/DELETE on monitored tables';
@@ -67,3 +87,154 @@ COMMENT ON COLUMN audit.logged_actions.changed_fields IS
 
 COMMENT ON COLUMN audit.logged_actions.app_user IS
     'Application-level username (set via SET LOCAL app.current_user)';
+
+-- =================================================================
+-- Partition maintenance
+-- =================================================================
+
+-- Create the monthly partition containing p_month (no-op if it exists)
+CREATE OR REPLACE FUNCTION audit.create_partition(p_month DATE)
+RETURNS BOOLEAN AS $$
+DECLARE
+    v_start     DATE := date_trunc('month', p_month)::DATE;
+    v_end       DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::DATE;
+    v_partition TEXT := 'logged_actions_p' || to_char(p_month, 'YYYYMM');
+BEGIN
+    IF to_regclass(format('audit.%I', v_partition)) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    -- Build it standalone, move this month's rows out of the default
+    -- partition, then attach (attaching fails if default still has them)
+    EXECUTE format(
+        'CREATE TABLE audit.%I (LIKE audit.logged_actions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        v_partition
+    );
+    EXECUTE format(
+        'WITH moved AS ('
+        ' DELETE FROM audit.logged_actions_default'
+        ' WHERE action_timestamp >= %L AND action_timestamp < %L'
+        ' RETURNING *)'
+        ' INSERT INTO audit.%I SELECT * FROM moved',
+        v_start, v_end, v_partition
+    );
+    EXECUTE format(
+        'ALTER TABLE audit.logged_actions ATTACH PARTITION audit.%I FOR VALUES FROM (%L) TO (%L)',
+        v_partition, v_start, v_end
+    );
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create partitions for the current month and p_months_ahead months after it
+CREATE OR REPLACE FUNCTION audit.ensure_partitions(p_months_ahead INTEGER DEFAULT 3)
+RETURNS INTEGER AS $$
+DECLARE
+    v_created INTEGER := 0;
+BEGIN
+    FOR i IN 0..p_months_ahead LOOP
+        IF audit.create_partition((date_trunc('month', now()) + make_interval(months => i))::DATE) THEN
+            v_created := v_created + 1;
+        END IF;
+    END LOOP;
+    RETURN v_created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Detach and drop every monthly partition that ends on or before p_cutoff
+CREATE OR REPLACE FUNCTION audit.drop_partitions_before(p_cutoff TIMESTAMPTZ)
+RETURNS TABLE (partition_name TEXT, estimated_rows BIGINT) AS $$
+DECLARE
+    r RECORD;
+BEGIN
+    FOR r IN
+        SELECT c.relname, c.reltuples
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'audit.logged_actions'::regclass
+          AND c.relname ~ '^logged_actions_p[0-9]{6}$'
+        ORDER BY c.relname
+    LOOP
+        -- Sorted by month: stop at the first partition still in retention
+        EXIT WHEN to_date(substr(r.relname, 17), 'YYYYMM') + INTERVAL '1 month' > p_cutoff;
+
+        EXECUTE format('ALTER TABLE audit.logged_actions DETACH PARTITION audit.%I', r.relname);
+        EXECUTE format('DROP TABLE audit.%I', r.relname);
+
+        partition_name := r.relname;
+        estimated_rows := GREATEST(r.reltuples, 0)::BIGINT;
+        RETURN NEXT;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT audit.ensure_partitions(3);
+
+-- =================================================================
+-- Daily rollup (dashboard statistics)
+-- =================================================================
+
+CREATE TABLE IF NOT EXISTS audit.daily_rollup (
+    day             DATE NOT NULL,
+    table_name      TEXT NOT NULL,
+    action_type     TEXT NOT NULL,
+    app_user_id     INTEGER NOT NULL DEFAULT 0,   -- 0 = no application user
+    action_count    BIGINT NOT NULL,
+    PRIMARY KEY (day, table_name, action_type, app_user_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_audit_rollup_user
+    ON audit.daily_rollup(app_user_id, day);
+
+-- Single row: last complete day included in daily_rollup
+CREATE TABLE IF NOT EXISTS audit.rollup_state (
+    id              BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    rolled_through  DATE,
+    refreshed_at    TIMESTAMP WITH TIME ZONE
+);
+
+-- Roll up complete days not yet in daily_rollup (today stays live).
+-- The last rolled day is recomputed to pick up late commits.
+CREATE OR REPLACE FUNCTION audit.refresh_daily_rollup()
+RETURNS INTEGER AS $$
+DECLARE
+    v_through   DATE;
+    v_start     DATE;
+    v_rows      INTEGER;
+BEGIN
+    SELECT rolled_through INTO v_through FROM audit.rollup_state;
+    IF v_through >= current_date - 1 THEN
+        RETURN 0;
+    END IF;
+
+    -- One refresh at a time; re-check after waiting
+    PERFORM pg_advisory_xact_lock(hashtext('audit.refresh_daily_rollup'));
+    SELECT rolled_through INTO v_through FROM audit.rollup_state;
+    IF v_through >= current_date - 1 THEN
+        RETURN 0;
+    END IF;
+
+    v_start := COALESCE(
+        v_through,
+        (SELECT MIN(action_timestamp)::DATE FROM audit.logged_actions),
+        current_date
+    );
+
+    DELETE FROM audit.daily_rollup WHERE day >= v_start AND day < current_date;
+
+    INSERT INTO audit.daily_rollup (day, table_name, action_type, app_user_id, action_count)
+    SELECT action_timestamp::DATE, table_name, action_type, COALESCE(app_user_id, 0), COUNT(*)
+    FROM audit.logged_actions
+    WHERE action_timestamp >= v_start AND action_timestamp < current_date
+    GROUP BY 1, 2, 3, 4;
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+
+    INSERT INTO audit.rollup_state (id, rolled_through, refreshed_at)
+    VALUES (TRUE, current_date - 1, now())
+    ON CONFLICT (id) DO UPDATE
+        SET rolled_through = EXCLUDED.rolled_through,
+            refreshed_at = EXCLUDED.refreshed_at;
+
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
@@ -13,7 +13,7 @@ Usage:
     initialize_audit()
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from core.logging import app_logger
 from .audit_manager import (
@@ -26,19 +26,28 @@ from .audit_manager import (
 def initialize_audit(
     tables: Optional[List[str]] = None,
     skip_if_exists: bool = True,
+    migrate: bool = False,
+    capture_modes: Optional[Dict[str, str]] = None,
 ) -> bool:
     """
     Initialize the audit system during application startup.
 
     Steps:
     1. Check if audit schema exists
-    2. Create schema + table if needed
-    3. Create/update trigger function
-    4. Enable triggers on specified tables
+    2. Create schema + partitioned table if needed
+    3. Create/update trigger and partition functions
+    4. Create upcoming monthly partitions
+    5. Bring the daily rollup up to date
+    6. Enable triggers on specified tables
 
     Args:
         tables: Tables to audit (default: DEFAULT_AUDITED_TABLES)
         skip_if_exists: If True, skip schema creation if already set up
+        migrate: Convert an unpartitioned audit table to partitions
+            (moves every row; slow on large audit trails)
+        capture_modes: Per-table capture mode ("full", "diff" or
+            "statement"); unlisted tables are enabled as "full" and
+            keep their mode if already audited
 
     Returns:
         True if audit system is ready
@@ -52,7 +61,10 @@ def initialize_audit(
         # Check if already set up
         if skip_if_exists and manager.is_audit_setup():
             app_logger.info("Audit system already initialized")
-            _ensure_triggers(manager, tables)
+            _ensure_partitions(manager, migrate)
+            if manager.setup_daily_rollup():
+                manager.refresh_daily_rollup()
+            _ensure_triggers(manager, tables, capture_modes or {})
             return True
 
         # Full setup
@@ -62,8 +74,10 @@ def initialize_audit(
             app_logger.error("Failed to create audit schema/tables")
             return False
 
+        manager.refresh_daily_rollup()
+
         # Enable triggers
-        _ensure_triggers(manager, tables)
+        _ensure_triggers(manager, tables, capture_modes or {})
 
         app_logger.info("Audit system initialization complete")
         return True
@@ -73,13 +87,32 @@ def initialize_audit(
         return False
 
 
-def _ensure_triggers(manager: AuditManager, tables: List[str]) -> None:
-    """Enable audit triggers on all specified tables."""
-    current = set(manager.get_audited_tables())
+def _ensure_partitions(manager: AuditManager, migrate: bool) -> None:
+    """Create upcoming partitions (migrating an unpartitioned table if asked)."""
+    if not manager.is_partitioned():
+        if not migrate:
+            app_logger.warning(
+                "audit.logged_actions is not partitioned; "
+                "call initialize_audit(migrate=True) to convert it"
+            )
+            return
+        if manager.migrate_to_partitioned() < 0:
+            app_logger.error("Audit partition migration failed")
+            return
+
+    manager.ensure_partitions()
+
+
+def _ensure_triggers(manager: AuditManager, tables: List[str], capture_modes: Dict[str, str]) -> None:
+    """Enable audit triggers on all specified tables (in the requested mode)."""
+    current = manager.get_capture_modes()
 
     for table in tables:
-        if table not in current:
-            if manager.enable_audit(table):
-                app_logger.info(f"Audit trigger enabled for: {table}")
+        # Unlisted tables keep whatever mode they were enabled with
+        mode = capture_modes.get(table)
+        if table not in current or (mode and current[table] != mode):
+            mode = mode or "full"
+            if manager.enable_audit(table, mode=mode):
+                app_logger.info(f"Audit trigger enabled for: {table} ({mode})")
             else:
                 app_logger.warning(f"Could not enable audit for: {table}")
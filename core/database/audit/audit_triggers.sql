@@ -126,3 +126,117 @@ DROP TRIGGER IF EXISTS audit_trigger_nationalities ON public.nationalities;
 CREATE TRIGGER audit_trigger_nationalities
     AFTER INSERT OR UPDATE OR DELETE ON public.nationalities
     FOR EACH ROW EXECUTE FUNCTION audit.log_changes();
+
+-- =================================================================
+-- Lightweight capture modes (AuditManager.enable_audit(mode=...))
+-- =================================================================
+--   diff      - row trigger; UPDATE stores only the changed keys
+--               (old/new values), no-op updates are skipped
+--   statement - AFTER ... FOR EACH STATEMENT triggers with transition
+--               tables (old_rows / new_rows); one set-based INSERT per
+--               statement, diffs like "diff"
+--
+-- Full rows are rebuilt on demand by replaying the diffs
+-- (AuditManager.get_record_changes(..., full_snapshots=True)).
+-- =================================================================
+
+CREATE OR REPLACE FUNCTION audit.log_changes_diff()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_old JSONB;
+    v_new JSONB;
+    v_old_data JSONB;
+    v_new_data JSONB;
+    v_changed TEXT[];
+    v_record_id INTEGER;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        v_record_id := OLD.id;
+        v_old_data := to_jsonb(OLD);
+    ELSIF TG_OP = 'INSERT' THEN
+        v_record_id := NEW.id;
+        v_new_data := to_jsonb(NEW);
+    ELSE
+        v_record_id := NEW.id;
+        v_old := to_jsonb(OLD);
+        v_new := to_jsonb(NEW);
+
+        -- Changed keys only (same columns on both sides, no outer join)
+        SELECT array_agg(n.key),
+               jsonb_object_agg(n.key, v_old -> n.key),
+               jsonb_object_agg(n.key, n.value)
+        INTO v_changed, v_old_data, v_new_data
+        FROM jsonb_each(v_new) AS n(key, value)
+        WHERE v_old -> n.key IS DISTINCT FROM n.value;
+
+        IF v_changed IS NULL THEN
+            RETURN NULL;  -- No-op update, nothing to log
+        END IF;
+    END IF;
+
+    INSERT INTO audit.logged_actions (
+        schema_name, table_name, record_id, action_type,
+        old_data, new_data, changed_fields,
+        db_user, app_user, app_user_id
+    ) VALUES (
+        TG_TABLE_SCHEMA, TG_TABLE_NAME, v_record_id, TG_OP,
+        v_old_data, v_new_data, v_changed,
+        current_user,
+        current_setting('app.current_user', true),
+        NULLIF(current_setting('app.current_user_id', true), '')::INTEGER
+    );
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Statement-level: transition tables old_rows / new_rows
+CREATE OR REPLACE FUNCTION audit.log_changes_statement()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_app_user TEXT := current_setting('app.current_user', true);
+    v_app_user_id INTEGER := NULLIF(current_setting('app.current_user_id', true), '')::INTEGER;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO audit.logged_actions (
+            schema_name, table_name, record_id, action_type,
+            new_data, db_user, app_user, app_user_id
+        )
+        SELECT TG_TABLE_SCHEMA, TG_TABLE_NAME, (n.j ->> 'id')::INTEGER, TG_OP,
+               n.j, current_user, v_app_user, v_app_user_id
+        FROM (SELECT to_jsonb(r) AS j FROM new_rows r) AS n;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO audit.logged_actions (
+            schema_name, table_name, record_id, action_type,
+            old_data, db_user, app_user, app_user_id
+        )
+        SELECT TG_TABLE_SCHEMA, TG_TABLE_NAME, (o.j ->> 'id')::INTEGER, TG_OP,
+               o.j, current_user, v_app_user, v_app_user_id
+        FROM (SELECT to_jsonb(r) AS j FROM old_rows r) AS o;
+
+    ELSE
+        INSERT INTO audit.logged_actions (
+            schema_name, table_name, record_id, action_type,
+            old_data, new_data, changed_fields,
+            db_user, app_user, app_user_id
+        )
+        SELECT TG_TABLE_SCHEMA, TG_TABLE_NAME, (n.j ->> 'id')::INTEGER, TG_OP,
+               d.old_data, d.new_data, d.changed,
+               current_user, v_app_user, v_app_user_id
+        FROM (SELECT to_jsonb(r) AS j FROM new_rows r) AS n
+        JOIN (SELECT to_jsonb(r) AS j FROM old_rows r) AS o
+            ON o.j -> 'id' = n.j -> 'id'
+        CROSS JOIN LATERAL (
+            SELECT array_agg(k.key) AS changed,
+                   jsonb_object_agg(k.key, o.j -> k.key) AS old_data,
+                   jsonb_object_agg(k.key, k.value) AS new_data
+            FROM jsonb_each(n.j) AS k(key, value)
+            WHERE o.j -> k.key IS DISTINCT FROM k.value
+        ) AS d
+        WHERE d.changed IS NOT NULL;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
@@ -14,6 +14,11 @@ from .pool import (
     is_pool_initialized,
     check_pool_health
 )
+from .health_monitor import (
+    ConnectionHealthMonitor,
+    get_health_monitor,
+    get_cached_connection_status
+)
 
 __all__ = [
     # Connection management
@@ -29,5 +34,9 @@ __all__ = [
     'get_pooled_connection',
     'get_pool_status',
     'is_pool_initialized',
-    'check_pool_health'
+    'check_pool_health',
+    # Background health monitor
+    'ConnectionHealthMonitor',
+    'get_health_monitor',
+    'get_cached_connection_status'
 ]
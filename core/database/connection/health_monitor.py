@@ -0,0 +1,184 @@
+"""
+Connection Health Monitor
+=========================
+Shared background connection-health service.
+
+Pings the database on a worker thread (never on the Qt main thread),
+backs off exponentially while the database is unreachable, caches the
+last known state and publishes changes through a Qt signal.
+
+Usage:
+    from core.database.connection import get_health_monitor
+
+    monitor = get_health_monitor()
+    monitor.signals.status_changed.connect(on_status_changed)
+    monitor.start()
+
+    # Cached state, no database round-trip
+    monitor.is_connected   # True / False / None (not checked yet)
+"""
+
+import threading
+from datetime import datetime
+from typing import Optional
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+HEALTH_CHECK_INTERVAL = 5.0     # Seconds between pings while connected
+HEALTH_MAX_INTERVAL = 60.0      # Backoff ceiling while disconnected
+
+
+class ConnectionHealthSignals(QObject):
+    """Signals for UI subscribers (delivered on the receiver's thread)."""
+    status_changed = pyqtSignal(bool)       # connected
+
+
+class ConnectionHealthMonitor:
+    """
+    Background database health checker.
+
+    One instance is shared by the whole application (see
+    get_health_monitor()); UI elements subscribe to
+    signals.status_changed instead of polling.
+    """
+
+    def __init__(
+        self,
+        interval: float = HEALTH_CHECK_INTERVAL,
+        max_interval: float = HEALTH_MAX_INTERVAL
+    ):
+        self.interval = interval
+        self.max_interval = max_interval
+
+        self._signals = ConnectionHealthSignals()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        self._connected: Optional[bool] = None
+        self._last_checked: Optional[datetime] = None
+        self._last_changed: Optional[datetime] = None
+        self._failures = 0
+
+    @property
+    def signals(self) -> ConnectionHealthSignals:
+        """Signals for UI integration."""
+        return self._signals
+
+    @property
+    def is_connected(self) -> Optional[bool]:
+        """Last known state (None until the first check finishes)."""
+        with self._lock:
+            return self._connected
+
+    @property
+    def last_checked(self) -> Optional[datetime]:
+        """Time of the last completed check."""
+        with self._lock:
+            return self._last_checked
+
+    @property
+    def is_running(self) -> bool:
+        """Is the monitor thread running?"""
+        return self._running
+
+    def start(self) -> None:
+        """Start the monitor thread (no-op if already running)."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._wake.clear()
+            if self._thread is not None and self._thread.is_alive():
+                # Stopped but not exited yet: the same thread keeps going
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="db_health_monitor", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the monitor thread."""
+        with self._lock:
+            self._running = False
+        self._wake.set()
+
+    def check_now(self) -> None:
+        """Request an immediate check (e.g. after reconnecting)."""
+        self._wake.set()
+
+    def get_status(self) -> dict:
+        """Get cached status information."""
+        with self._lock:
+            return {
+                "connected": self._connected,
+                "last_checked": self._last_checked,
+                "last_changed": self._last_changed,
+                "consecutive_failures": self._failures,
+                "next_check_seconds": self._next_interval(),
+            }
+
+    def _next_interval(self) -> float:
+        """Interval until the next ping (exponential backoff on failure)."""
+        if self._failures == 0:
+            return self.interval
+        return min(self.interval * (2 ** self._failures), self.max_interval)
+
+    def _run(self) -> None:
+        """Worker loop."""
+        while self._running:
+            connected = self._ping()
+
+            with self._lock:
+                changed = connected != self._connected
+                self._connected = connected
+                self._last_checked = datetime.now()
+                if changed:
+                    self._last_changed = self._last_checked
+                self._failures = 0 if connected else self._failures + 1
+                wait = self._next_interval()
+
+            if changed:
+                try:
+                    self._signals.status_changed.emit(connected)
+                except RuntimeError:
+                    # Signals object deleted during shutdown
+                    return
+
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def _ping(self) -> bool:
+        """Run the actual health check (blocking, worker thread only)."""
+        try:
+            from .connection_checker import is_connected
+            return bool(is_connected())
+        except Exception:
+            return False
+
+
+# Thread-safe singleton
+_monitor: Optional[ConnectionHealthMonitor] = None
+_monitor_lock = threading.Lock()
+
+
+def get_health_monitor() -> ConnectionHealthMonitor:
+    """Get the shared ConnectionHealthMonitor instance."""
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = ConnectionHealthMonitor()
+    return _monitor
+
+
+def get_cached_connection_status() -> Optional[bool]:
+    """
+    Last known connection state without touching the database.
+
+    Returns:
+        True/False, or None if no check has completed yet
+    """
+    return get_health_monitor().is_connected
@@ -0,0 +1,43 @@
+"""
+Database Change Listener Module
+===============================
+LISTEN/NOTIFY push notifications for notifications, tasks,
+calendar_events and the employee data tables.
+
+Usage:
+    from core.database.listener import get_change_listener
+
+    listener = get_change_listener()
+    listener.signals.tasks_changed.connect(on_tasks_changed)
+    listener.start()
+"""
+
+from .change_listener import (
+    DatabaseChangeListener,
+    DatabaseChangeSignals,
+    connect_until_destroyed,
+    get_change_listener,
+    setup_change_notifications,
+    unread_delta,
+    NOTIFICATIONS_CHANNEL,
+    TASKS_CHANNEL,
+    CALENDAR_CHANNEL,
+    DATA_CHANNEL,
+    DATA_TABLES,
+    WATCHED_TABLES,
+)
+
+__all__ = [
+    'DatabaseChangeListener',
+    'DatabaseChangeSignals',
+    'connect_until_destroyed',
+    'get_change_listener',
+    'setup_change_notifications',
+    'unread_delta',
+    'NOTIFICATIONS_CHANNEL',
+    'TASKS_CHANNEL',
+    'CALENDAR_CHANNEL',
+    'DATA_CHANNEL',
+    'DATA_TABLES',
+    'WATCHED_TABLES',
+]
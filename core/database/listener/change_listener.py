@@ -0,0 +1,497 @@
+"""
+Database Change Listener
+========================
+Push notifications from PostgreSQL via LISTEN/NOTIFY.
+
+Triggers on notifications, tasks and calendar_events (see
+change_notify.sql) send a small JSON payload with pg_notify(); the
+employee data tables send one {"table", "op"} payload per statement, and
+event_attendees one {"table", "op", "event_ids"} payload per statement
+on the calendar channel. One
+dedicated connection LISTENs on those channels on a worker thread and
+turns every notification into:
+
+- an EventBus event (TASK_CREATED, NOTIFICATION_READ, EVENT_UPDATED, ...)
+- a Qt signal for UI subscribers (delivered on the receiver's thread)
+
+so unread counts and boards update when data changes instead of
+polling on timers.
+
+Usage:
+    from core.database.listener import get_change_listener
+
+    listener = get_change_listener()
+    listener.signals.notifications_changed.connect(on_notification_change)
+    listener.start()
+"""
+
+import json
+import select
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from core.database.connection import (
+    get_connection,
+    return_connection,
+    get_connection_params
+)
+from core.logging import app_logger
+
+if TYPE_CHECKING:
+    from core.ai.orchestration import EventType
+
+# Payload -> EventType published on the EventBus (None: nothing to publish)
+EventTypeFor = Callable[[Dict[str, Any]], Optional["EventType"]]
+
+
+NOTIFICATIONS_CHANNEL = "integra_notifications"
+TASKS_CHANNEL = "integra_tasks"
+CALENDAR_CHANNEL = "integra_calendar"
+DATA_CHANNEL = "integra_data"
+
+CHANNELS = (NOTIFICATIONS_CHANNEL, TASKS_CHANNEL, CALENDAR_CHANNEL, DATA_CHANNEL)
+
+# Tables with statement-level notifications on DATA_CHANNEL
+DATA_TABLES = (
+    "employees", "companies", "departments", "job_titles",
+    "banks", "employee_statuses", "nationalities",
+)
+
+LISTEN_POLL_TIMEOUT = 5.0       # Seconds between stop checks while idle
+RECONNECT_INTERVAL = 2.0        # First reconnect delay
+RECONNECT_MAX_INTERVAL = 60.0   # Backoff ceiling while disconnected
+
+CHANGE_NOTIFY_SQL_FILE = Path(__file__).parent / "change_notify.sql"
+
+
+class DatabaseChangeSignals(QObject):
+    """Signals for UI subscribers (delivered on the receiver's thread)."""
+    listening_changed = pyqtSignal(bool)        # LISTEN connection up/down
+    notifications_changed = pyqtSignal(dict)    # payload
+    tasks_changed = pyqtSignal(dict)            # payload
+    calendar_changed = pyqtSignal(dict)         # payload
+    data_changed = pyqtSignal(dict)             # {"table", "op"} of employee data tables
+
+
+# Triggers created by change_notify.sql: (table, trigger name)
+CHANGE_NOTIFY_TRIGGERS = (
+    ("notifications", "trigger_notifications_notify"),
+    ("tasks", "trigger_tasks_notify"),
+    ("calendar_events", "trigger_calendar_events_notify"),
+    ("event_attendees", "trigger_event_attendees_insert_notify"),
+    ("event_attendees", "trigger_event_attendees_update_notify"),
+    ("event_attendees", "trigger_event_attendees_delete_notify"),
+    ("event_attendees", "trigger_event_attendees_truncate_notify"),
+) + tuple((table, f"trigger_{table}_notify") for table in DATA_TABLES)
+
+# Tables whose changes are pushed on some channel
+WATCHED_TABLES = frozenset(table for table, _ in CHANGE_NOTIFY_TRIGGERS)
+
+# Watched tables that exist but have no notify trigger yet
+_MISSING_TRIGGERS_SQL = """
+    SELECT DISTINCT c.relname
+    FROM unnest(%s::text[], %s::text[]) AS t(table_name, trigger_name)
+    JOIN pg_class c ON c.oid = to_regclass(t.table_name)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM pg_trigger tg
+        WHERE tg.tgrelid = c.oid AND tg.tgname = t.trigger_name
+    )
+    UNION ALL
+    SELECT f.name
+    FROM unnest(ARRAY[
+        'integra_notify_change()',
+        'integra_notify_table_change()',
+        'integra_notify_attendee_change()'
+    ]) AS f(name)
+    WHERE to_regprocedure(f.name) IS NULL
+"""
+
+
+def get_missing_change_notifications(cursor: Any) -> List[str]:
+    """Watched tables (or the trigger function) not set up yet."""
+    tables, triggers = zip(*CHANGE_NOTIFY_TRIGGERS)
+    cursor.execute(_MISSING_TRIGGERS_SQL, (list(tables), list(triggers)))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def setup_change_notifications(force: bool = False) -> bool:
+    """
+    Create the notify trigger function and triggers if missing.
+
+    Checks pg_trigger first, so on an installed database this is a
+    single catalog query and no DDL runs. Tables that do not exist yet
+    are skipped.
+
+    Args:
+        force: Recreate the function and triggers even if present
+
+    Returns:
+        True if the triggers are in place
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_connection()
+        if conn is None:
+            return False
+        cursor = conn.cursor()
+        if not force:
+            missing = get_missing_change_notifications(cursor)
+            conn.rollback()
+            if not missing:
+                return True
+            app_logger.info(f"Installing change notification triggers: {', '.join(missing)}")
+        cursor.execute(CHANGE_NOTIFY_SQL_FILE.read_text(encoding="utf-8"))
+        conn.commit()
+        app_logger.info("Change notification triggers installed")
+        return True
+    except Exception as e:
+        if conn:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+        app_logger.error(f"Failed to install change notification triggers: {e}")
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            return_connection(conn)
+
+
+def connect_until_destroyed(signal: Any, slot: Callable, owner: QObject) -> Callable[[], None]:
+    """
+    Connect a listener signal to a slot for the lifetime of a widget.
+
+    The shared listener outlives screens: the connection is removed when
+    the owner is destroyed, or earlier by calling the returned function
+    (e.g. from closeEvent).
+
+    Returns:
+        Function that disconnects (safe to call more than once)
+    """
+    connected = [True]
+
+    def disconnect(*_args: Any) -> None:
+        if not connected[0]:
+            return
+        connected[0] = False
+        try:
+            signal.disconnect(slot)
+        except (TypeError, RuntimeError):
+            pass
+
+    signal.connect(slot)
+    owner.destroyed.connect(disconnect)
+    return disconnect
+
+
+def _is_unread(row: Optional[Dict[str, Any]]) -> bool:
+    """Does a notification row count towards the unread badge?"""
+    if not row:
+        return False
+    return (
+        not row.get("is_read")
+        and not row.get("is_archived")
+        and row.get("deleted_at") is None
+    )
+
+
+def unread_delta(payload: Dict[str, Any]) -> int:
+    """
+    Change of the unread notification count caused by one payload.
+
+    Args:
+        payload: Payload from the notifications channel
+
+    Returns:
+        -1, 0 or 1
+    """
+    return int(_is_unread(payload.get("new"))) - int(_is_unread(payload.get("old")))
+
+
+def _notification_event_type(payload: Dict[str, Any]) -> Optional["EventType"]:
+    """Map a notifications payload to an EventType (or None)."""
+    from core.ai.orchestration import EventType
+
+    op = payload.get("op")
+    new = payload.get("new") or {}
+    old = payload.get("old") or {}
+
+    if op == "INSERT":
+        return EventType.NOTIFICATION_CREATED
+    if op == "DELETE":
+        return EventType.NOTIFICATION_DISMISSED
+    if new.get("is_read") and not old.get("is_read"):
+        return EventType.NOTIFICATION_READ
+    if (new.get("is_archived") and not old.get("is_archived")) or (
+        new.get("deleted_at") is not None and old.get("deleted_at") is None
+    ):
+        return EventType.NOTIFICATION_DISMISSED
+    return None
+
+
+def _task_event_type(payload: Dict[str, Any]) -> Optional["EventType"]:
+    """Map a tasks payload to an EventType."""
+    from core.ai.orchestration import EventType
+
+    op = payload.get("op")
+    if op == "INSERT":
+        return EventType.TASK_CREATED
+    if op == "DELETE":
+        return EventType.TASK_DELETED
+
+    new = payload.get("new") or {}
+    old = payload.get("old") or {}
+    if new.get("status") == "completed" and old.get("status") != "completed":
+        return EventType.TASK_COMPLETED
+    if new.get("assigned_to") is not None and new.get("assigned_to") != old.get("assigned_to"):
+        return EventType.TASK_ASSIGNED
+    return EventType.TASK_UPDATED
+
+
+def _calendar_event_type(payload: Dict[str, Any]) -> Optional["EventType"]:
+    """Map a calendar_events / event_attendees payload to an EventType."""
+    from core.ai.orchestration import EventType
+
+    if payload.get("table") == "event_attendees":
+        # Attendee rows changed: the events in "event_ids" were updated
+        return EventType.EVENT_UPDATED
+    return {
+        "INSERT": EventType.EVENT_CREATED,
+        "UPDATE": EventType.EVENT_UPDATED,
+        "DELETE": EventType.EVENT_DELETED,
+    }.get(payload.get("op") or "")
+
+
+class DatabaseChangeListener:
+    """
+    Dedicated LISTEN connection on a background thread.
+
+    One instance is shared by the whole application (see
+    get_change_listener()). EventBus handlers run on the listener
+    thread; UI code should connect to the Qt signals instead.
+    """
+
+    def __init__(
+        self,
+        channels: Tuple[str, ...] = CHANNELS,
+        poll_timeout: float = LISTEN_POLL_TIMEOUT,
+        reconnect_interval: float = RECONNECT_INTERVAL,
+        max_reconnect_interval: float = RECONNECT_MAX_INTERVAL,
+        publish_events: bool = True
+    ):
+        self.channels = tuple(channels)
+        self.poll_timeout = poll_timeout
+        self.reconnect_interval = reconnect_interval
+        self.max_reconnect_interval = max_reconnect_interval
+        self.publish_events = publish_events
+
+        self._signals = DatabaseChangeSignals()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._conn: Optional[Any] = None      # psycopg2 connection while listening
+
+        self._listening = False
+        self._failures = 0
+        self._received = 0
+        self._last_received: Optional[datetime] = None
+        self._triggers_checked = False
+
+        self._dispatch: Dict[str, Tuple[Any, EventTypeFor]] = {
+            NOTIFICATIONS_CHANNEL: (self._signals.notifications_changed, _notification_event_type),
+            TASKS_CHANNEL: (self._signals.tasks_changed, _task_event_type),
+            CALENDAR_CHANNEL: (self._signals.calendar_changed, _calendar_event_type),
+            DATA_CHANNEL: (self._signals.data_changed, lambda _payload: None),
+        }
+
+    @property
+    def signals(self) -> DatabaseChangeSignals:
+        """Signals for UI integration."""
+        return self._signals
+
+    @property
+    def is_listening(self) -> bool:
+        """Is the LISTEN connection currently up?"""
+        with self._lock:
+            return self._listening
+
+    @property
+    def is_running(self) -> bool:
+        """Is the listener thread running?"""
+        return self._running
+
+    def start(self) -> None:
+        """Start the listener thread (no-op if already running)."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._wake.clear()
+            if self._thread is not None and self._thread.is_alive():
+                # Stopped but not exited yet: the same thread keeps going
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="db_change_listener", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the listener thread and close the LISTEN connection."""
+        with self._lock:
+            self._running = False
+        self._wake.set()
+
+    def get_status(self) -> dict:
+        """Get listener status information."""
+        with self._lock:
+            return {
+                "listening": self._listening,
+                "channels": list(self.channels),
+                "received": self._received,
+                "last_received": self._last_received,
+                "consecutive_failures": self._failures,
+            }
+
+    # ───────────────────────────────────────────────────────────
+    # Worker thread
+    # ───────────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        """Worker loop: connect, LISTEN, dispatch, reconnect on failure."""
+        while self._running:
+            try:
+                self._connect()
+                self._set_listening(True)
+                self._failures = 0
+                self._listen_loop()
+            except Exception as e:
+                if self._running:
+                    app_logger.warning(f"Change listener connection lost: {e}")
+                self._failures += 1
+            finally:
+                self._close()
+                self._set_listening(False)
+
+            if not self.is_running:
+                break
+            delay = min(
+                self.reconnect_interval * (2 ** max(self._failures - 1, 0)),
+                self.max_reconnect_interval
+            )
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def _connect(self) -> None:
+        """Open the dedicated autocommit connection and LISTEN."""
+        import psycopg2
+
+        # Normally installed at startup; only a catalog check here
+        if not self._triggers_checked:
+            self._triggers_checked = setup_change_notifications()
+
+        conn = psycopg2.connect(**get_connection_params())
+        conn.autocommit = True
+        cursor = conn.cursor()
+        for channel in self.channels:
+            cursor.execute(f'LISTEN "{channel}"')
+        cursor.close()
+        self._conn = conn
+        app_logger.info(f"Listening on {', '.join(self.channels)}")
+
+    def _listen_loop(self) -> None:
+        """Wait on the socket and dispatch notifications until stopped."""
+        conn = self._conn
+        if conn is None:
+            raise RuntimeError("Change listener is not connected")
+        while self._running:
+            readable, _, _ = select.select([conn], [], [], self.poll_timeout)
+            if not readable:
+                continue
+            conn.poll()
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                self._handle(notify.channel, notify.payload)
+
+    def _close(self) -> None:
+        """Close the LISTEN connection."""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _set_listening(self, listening: bool) -> None:
+        """Update the listening flag and emit on change."""
+        with self._lock:
+            changed = listening != self._listening
+            self._listening = listening
+        if changed:
+            try:
+                self._signals.listening_changed.emit(listening)
+            except RuntimeError:
+                # Signals object deleted during shutdown
+                pass
+
+    def _handle(self, channel: str, raw_payload: str) -> None:
+        """Decode one notification and fan it out."""
+        entry = self._dispatch.get(channel)
+        if entry is None:
+            return
+        signal, event_type_for = entry
+
+        try:
+            payload = json.loads(raw_payload) if raw_payload else {}
+        except ValueError:
+            app_logger.warning(f"Invalid payload on {channel}: {raw_payload[:200]}")
+            return
+
+        with self._lock:
+            self._received += 1
+            self._last_received = datetime.now()
+
+        try:
+            signal.emit(payload)
+        except RuntimeError:
+            return
+
+        if self.publish_events:
+            self._publish(event_type_for, payload)
+
+    def _publish(self, event_type_for: EventTypeFor, payload: Dict[str, Any]) -> None:
+        """Publish the payload on the EventBus."""
+        try:
+            event_type = event_type_for(payload)
+            if event_type is None:
+                return
+            from core.ai.orchestration import Event, get_event_bus
+            get_event_bus().publish(Event(
+                type=event_type,
+                data=payload,
+                source="db_listener"
+            ))
+        except Exception as e:
+            app_logger.error(f"Change listener EventBus publish failed: {e}")
+
+
+# Thread-safe singleton
+_listener: Optional[DatabaseChangeListener] = None
+_listener_lock = threading.Lock()
+
+
+def get_change_listener() -> DatabaseChangeListener:
+    """Get the shared DatabaseChangeListener instance."""
+    global _listener
+    if _listener is None:
+        with _listener_lock:
+            if _listener is None:
+                _listener = DatabaseChangeListener()
+    return _listener
@@ -0,0 +1,193 @@
+-- ============================================================
+-- INTEGRA - Change Notifications (LISTEN/NOTIFY)
+-- إرسال إشعار فوري عند تغيير الإشعارات والمهام وأحداث التقويم
+-- وجداول بيانات الموظفين (لتحديث كاش التقارير)
+-- ============================================================
+--
+-- Payload (JSON, kept small - NOTIFY payloads are limited to 8000 bytes):
+--   {"table": "tasks", "op": "UPDATE", "id": 12,
+--    "new": {"status": "completed", ...}, "old": {"status": "pending", ...}}
+--
+-- Only the columns passed as trigger arguments (after the channel name)
+-- are included in "new"/"old".
+--
+-- Employee data tables use statement-level triggers on integra_data
+-- (one {"table": "employees", "op": "UPDATE"} per statement, so bulk
+-- imports do not flood the channel).
+--
+-- event_attendees uses statement-level triggers with transition tables
+-- on integra_calendar, one payload per statement with the affected events:
+--   {"table": "event_attendees", "op": "INSERT", "event_ids": [4, 7]}
+-- "event_ids" is left out when a statement touches more than 500 events
+-- (or on TRUNCATE); listeners then reload everything.
+
+CREATE OR REPLACE FUNCTION integra_notify_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_channel TEXT := TG_ARGV[0];
+    v_keys TEXT[] := TG_ARGV[1:TG_NARGS - 1];
+    v_new JSONB;
+    v_old JSONB;
+    v_payload JSONB;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COALESCE(jsonb_object_agg(key, value), '{}'::jsonb) INTO v_new
+        FROM jsonb_each(to_jsonb(NEW)) WHERE key = ANY(v_keys);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT COALESCE(jsonb_object_agg(key, value), '{}'::jsonb) INTO v_old
+        FROM jsonb_each(to_jsonb(OLD)) WHERE key = ANY(v_keys);
+    END IF;
+
+    v_payload := jsonb_build_object(
+        'table', TG_TABLE_NAME,
+        'op', TG_OP,
+        'id', CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END
+    );
+    IF v_new IS NOT NULL THEN
+        v_payload := v_payload || jsonb_build_object('new', v_new);
+    END IF;
+    IF v_old IS NOT NULL THEN
+        v_payload := v_payload || jsonb_build_object('old', v_old);
+    END IF;
+
+    PERFORM pg_notify(v_channel, v_payload::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION integra_notify_table_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify(
+        TG_ARGV[0],
+        jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP)::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION integra_notify_attendee_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_event_ids INTEGER[];
+    v_payload JSONB;
+BEGIN
+    -- Each trigger declares only the transition tables of its operation
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT event_id) INTO v_event_ids FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT event_id) INTO v_event_ids FROM old_rows;
+    ELSE
+        SELECT array_agg(event_id) INTO v_event_ids FROM (
+            SELECT event_id FROM new_rows
+            UNION
+            SELECT event_id FROM old_rows
+        ) AS changed;
+    END IF;
+
+    IF v_event_ids IS NULL THEN
+        RETURN NULL;  -- Statement changed no rows
+    END IF;
+
+    v_payload := jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP);
+    IF cardinality(v_event_ids) <= 500 THEN
+        v_payload := v_payload || jsonb_build_object('event_ids', to_jsonb(v_event_ids));
+    END IF;
+
+    PERFORM pg_notify(TG_ARGV[0], v_payload::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ═══════════════════════════════════════════════════════════════
+-- Triggers (only on tables that exist in this database)
+-- ═══════════════════════════════════════════════════════════════
+DO $$
+BEGIN
+    IF to_regclass('notifications') IS NOT NULL THEN
+        DROP TRIGGER IF EXISTS trigger_notifications_notify ON notifications;
+        CREATE TRIGGER trigger_notifications_notify
+            AFTER INSERT OR UPDATE OR DELETE ON notifications
+            FOR EACH ROW
+            EXECUTE FUNCTION integra_notify_change(
+                'integra_notifications',
+                'user_id', 'notification_type', 'priority',
+                'is_read', 'is_archived', 'deleted_at'
+            );
+    END IF;
+
+    IF to_regclass('tasks') IS NOT NULL THEN
+        DROP TRIGGER IF EXISTS trigger_tasks_notify ON tasks;
+        CREATE TRIGGER trigger_tasks_notify
+            AFTER INSERT OR UPDATE OR DELETE ON tasks
+            FOR EACH ROW
+            EXECUTE FUNCTION integra_notify_change(
+                'integra_tasks',
+                'status', 'priority', 'assigned_to', 'category', 'due_date'
+            );
+    END IF;
+
+    IF to_regclass('calendar_events') IS NOT NULL THEN
+        DROP TRIGGER IF EXISTS trigger_calendar_events_notify ON calendar_events;
+        CREATE TRIGGER trigger_calendar_events_notify
+            AFTER INSERT OR UPDATE OR DELETE ON calendar_events
+            FOR EACH ROW
+            EXECUTE FUNCTION integra_notify_change(
+                'integra_calendar',
+                'event_type', 'status', 'employee_id',
+                'start_datetime', 'end_datetime'
+            );
+    END IF;
+
+    -- Transition tables allow only one event per trigger
+    IF to_regclass('event_attendees') IS NOT NULL THEN
+        DROP TRIGGER IF EXISTS trigger_event_attendees_insert_notify ON event_attendees;
+        CREATE TRIGGER trigger_event_attendees_insert_notify
+            AFTER INSERT ON event_attendees
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION integra_notify_attendee_change('integra_calendar');
+
+        DROP TRIGGER IF EXISTS trigger_event_attendees_update_notify ON event_attendees;
+        CREATE TRIGGER trigger_event_attendees_update_notify
+            AFTER UPDATE ON event_attendees
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION integra_notify_attendee_change('integra_calendar');
+
+        DROP TRIGGER IF EXISTS trigger_event_attendees_delete_notify ON event_attendees;
+        CREATE TRIGGER trigger_event_attendees_delete_notify
+            AFTER DELETE ON event_attendees
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION integra_notify_attendee_change('integra_calendar');
+
+        DROP TRIGGER IF EXISTS trigger_event_attendees_truncate_notify ON event_attendees;
+        CREATE TRIGGER trigger_event_attendees_truncate_notify
+            AFTER TRUNCATE ON event_attendees
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION integra_notify_table_change('integra_calendar');
+    END IF;
+END;
+$$;
+
+DO $$
+DECLARE
+    v_table TEXT;
+BEGIN
+    FOREACH v_table IN ARRAY ARRAY[
+        'employees', 'companies', 'departments', 'job_titles',
+        'banks', 'employee_statuses', 'nationalities'
+    ] LOOP
+        IF to_regclass(v_table) IS NOT NULL THEN
+            EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trigger_' || v_table || '_notify', v_table);
+            EXECUTE format(
+                'CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I '
+                'FOR EACH STATEMENT EXECUTE FUNCTION integra_notify_table_change(%L)',
+                'trigger_' || v_table || '_notify', v_table, 'integra_data'
+            );
+        END IF;
+    END LOOP;
+END;
+$$;
@@ -4,16 +4,19 @@ Database Queries Module
 Handles all database query operations.
 """
 
-from .select_query import select_all, select_one
+from .select_query import select_all, select_one, select_iter
 from .insert_query import insert, insert_returning_id
 from .update_query import update, update_returning_count
 from .delete_query import delete, delete_returning_count
 from .scalar_query import get_scalar, get_count
 from .execute_query import execute_query
+from .batch_query import insert_many, upsert_many, execute_many
+from .transaction import transaction, savepoint, TransactionError
 
 __all__ = [
     'select_all',
     'select_one',
+    'select_iter',
     'insert',
     'insert_returning_id',
     'update',
@@ -22,5 +25,11 @@ __all__ = [
     'delete_returning_count',
     'get_scalar',
     'get_count',
-    'execute_query'
+    'execute_query',
+    'insert_many',
+    'upsert_many',
+    'execute_many',
+    'transaction',
+    'savepoint',
+    'TransactionError'
 ]
@@ -0,0 +1,202 @@
+"""
+Batch Query Handler
+===================
+Handles multi-row INSERT/UPSERT and repeated statements in one round-trip
+per page instead of one statement and one commit per row.
+"""
+
+from typing import Any, Iterable, Optional, Sequence
+
+from psycopg2 import sql as psycopg2_sql
+from psycopg2.extras import execute_values, execute_batch
+
+from core.logging import app_logger
+
+from .transaction import (
+    acquire_connection,
+    commit_connection,
+    rollback_connection,
+    release_connection
+)
+
+
+DEFAULT_PAGE_SIZE = 500     # Rows per VALUES list / batch round-trip
+
+
+def _table_identifier(table_name: str) -> psycopg2_sql.Identifier:
+    """Build an identifier for 'table' or 'schema.table'."""
+    return psycopg2_sql.Identifier(*table_name.split(".", 1))
+
+
+def _column_list(columns: Iterable[str]) -> psycopg2_sql.Composed:
+    """Build a comma-separated identifier list."""
+    return psycopg2_sql.SQL(", ").join(psycopg2_sql.Identifier(c) for c in columns)
+
+
+def _run_values(label: str, query: psycopg2_sql.Composed, rows: Iterable[Sequence[Any]], page_size: int) -> int:
+    """
+    Run an execute_values statement page by page.
+
+    Args:
+        label: Name used in log messages
+        query: psycopg2.sql.Composed with a single VALUES %s placeholder
+        rows: Sequence of row tuples
+        page_size: Rows per statement
+
+    Returns:
+        int: Total affected rows or -1 if error
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+
+    conn = None
+    owned = True
+    cursor = None
+    try:
+        conn, owned = acquire_connection()
+        if conn is None:
+            app_logger.error(f"{label} failed: no database connection")
+            return -1
+        cursor = conn.cursor()
+        # Rendered with the cursor: pooled connections are proxies that
+        # psycopg2's as_string() does not accept
+        query_string = query.as_string(cursor)
+
+        count = 0
+        for start in range(0, len(rows), page_size):
+            page = rows[start:start + page_size]
+            # One statement per page so rowcount covers the whole page
+            execute_values(cursor, query_string, page, page_size=len(page))
+            count += max(cursor.rowcount, 0)
+
+        commit_connection(conn, owned)
+        return count
+    except Exception as e:
+        if conn:
+            rollback_connection(conn, owned, e)
+        app_logger.error(f"{label} error: {e}")
+        return -1
+    finally:
+        if cursor:
+            cursor.close()
+        release_connection(conn, owned)
+
+
+def insert_many(
+    table_name: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> int:
+    """
+    Insert many rows with multi-row VALUES lists.
+
+    Args:
+        table_name: Target table ('table' or 'schema.table')
+        columns: Column names, in row order
+        rows: Sequence of row tuples
+        page_size: Rows per INSERT statement
+
+    Returns:
+        int: Number of inserted rows or -1 if error
+    """
+    query = psycopg2_sql.SQL("INSERT INTO {} ({}) VALUES %s").format(
+        _table_identifier(table_name),
+        _column_list(columns)
+    )
+    return _run_values("INSERT MANY", query, rows, page_size)
+
+
+def upsert_many(
+    table_name: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    key_columns: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> int:
+    """
+    Insert many rows, updating existing rows on key conflict.
+
+    Args:
+        table_name: Target table ('table' or 'schema.table')
+        columns: Column names, in row order
+        rows: Sequence of row tuples
+        key_columns: Conflict target (unique/primary key columns)
+        update_columns: Columns to update on conflict
+                        (default: all non-key columns; empty means DO NOTHING)
+        page_size: Rows per INSERT statement
+
+    Returns:
+        int: Number of inserted or updated rows or -1 if error
+    """
+    if update_columns is None:
+        update_columns = [c for c in columns if c not in key_columns]
+
+    if update_columns:
+        action = psycopg2_sql.SQL("DO UPDATE SET {}").format(
+            psycopg2_sql.SQL(", ").join(
+                psycopg2_sql.SQL("{} = EXCLUDED.{}").format(
+                    psycopg2_sql.Identifier(c), psycopg2_sql.Identifier(c)
+                )
+                for c in update_columns
+            )
+        )
+    else:
+        action = psycopg2_sql.SQL("DO NOTHING")
+
+    query = psycopg2_sql.SQL(
+        "INSERT INTO {} ({}) VALUES %s ON CONFLICT ({}) {}"
+    ).format(
+        _table_identifier(table_name),
+        _column_list(columns),
+        _column_list(key_columns),
+        action
+    )
+    return _run_values("UPSERT MANY", query, rows, page_size)
+
+
+def execute_many(
+    query: str,
+    params_list: Iterable[Sequence[Any]],
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> bool:
+    """
+    Execute one statement for many parameter sets (UPDATE/DELETE loops).
+
+    Statements are sent in pages with execute_batch and committed once.
+
+    Args:
+        query: SQL query string
+        params_list: Sequence of parameter tuples
+        page_size: Statements per round-trip
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    params_list = list(params_list)
+    if not params_list:
+        return True
+
+    conn = None
+    owned = True
+    cursor = None
+    try:
+        conn, owned = acquire_connection()
+        if conn is None:
+            app_logger.error("EXECUTE MANY failed: no database connection")
+            return False
+        cursor = conn.cursor()
+        execute_batch(cursor, query, params_list, page_size=page_size)
+        commit_connection(conn, owned)
+        return True
+    except Exception as e:
+        if conn:
+            rollback_connection(conn, owned, e)
+        app_logger.error(f"EXECUTE MANY error: {e}")
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        release_connection(conn, owned)
@@ -4,9 +4,15 @@ DELETE Query Handler
 Handles DELETE queries.
 """
 
-from core.database.connection import get_connection, return_connection
 from core.logging import app_logger
 
+from .transaction import (
+    acquire_connection,
+    commit_connection,
+    rollback_connection,
+    release_connection
+)
+
 
 def delete(query, params=None):
     """
@@ -20,25 +26,26 @@ def delete(query, params=None):
         bool: True if successful, False otherwise
     """
     conn = None
+    owned = True
     cursor = None
     try:
-        conn = get_connection()
+        conn, owned = acquire_connection()
         if conn is None:
             app_logger.error("DELETE failed: no database connection")
             return False
         cursor = conn.cursor()
         cursor.execute(query, params)
-        conn.commit()
+        commit_connection(conn, owned)
         return True
     except Exception as e:
         if conn:
-            conn.rollback()
+            rollback_connection(conn, owned, e)
         app_logger.error(f"DELETE error: {e}")
         return False
     finally:
         if cursor:
             cursor.close()
-        return_connection(conn)
+        release_connection(conn, owned)
 
 
 def delete_returning_count(query, params=None):
@@ -53,9 +60,10 @@ def delete_returning_count(query, params=None):
         int: Number of deleted rows or -1 if error
     """
     conn = None
+    owned = True
     cursor = None
     try:
-        conn = get_connection()
+        conn, owned = acquire_connection()
         if conn is None:
             app_logger.error("DELETE COUNT failed: no database connection")
             return -1
@@ -63,15 +71,15 @@ def delete_returning_count(query, params=None):
         cursor.execute(query, params)
 
         count = cursor.rowcount
-        conn.commit()
+        commit_connection(conn, owned)
 
         return count
     except Exception as e:
         if conn:
-            conn.rollback()
+            rollback_connection(conn, owned, e)
         app_logger.error(f"DELETE COUNT error: {e}")
         return -1
     finally:
         if cursor:
             cursor.close()
-        return_connection(conn)
+        release_connection(conn, owned)
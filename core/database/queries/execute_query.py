@@ -4,9 +4,15 @@ Execute Query Handler
 Handles raw DDL/DML queries (CREATE, DROP, ALTER, etc.).
 """
 
-from core.database.connection import get_connection, return_connection
 from core.logging import app_logger
 
+from .transaction import (
+    acquire_connection,
+    commit_connection,
+    rollback_connection,
+    release_connection
+)
+
 
 def execute_query(query, params=None):
     """
@@ -22,22 +28,23 @@ def execute_query(query, params=None):
         bool: True if successful, False otherwise
     """
     conn = None
+    owned = True
     cursor = None
     try:
-        conn = get_connection()
+        conn, owned = acquire_connection()
         if conn is None:
             app_logger.error("EXECUTE failed: no database connection")
             return False
         cursor = conn.cursor()
         cursor.execute(query, params)
-        conn.commit()
+        commit_connection(conn, owned)
         return True
     except Exception as e:
         if conn:
-            conn.rollback()
+            rollback_connection(conn, owned, e)
         app_logger.error(f"EXECUTE error: {e}")
         return False
     finally:
         if cursor:
             cursor.close()
-        return_connection(conn)
+        release_connection(conn, owned)
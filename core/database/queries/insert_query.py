@@ -4,9 +4,15 @@ INSERT Query Handler
 Handles INSERT queries.
 """
 
-from core.database.connection import get_connection, return_connection
 from core.logging import app_logger
 
+from .transaction import (
+    acquire_connection,
+    commit_connection,
+    rollback_connection,
+    release_connection
+)
+
 
 def insert(query, params=None):
     """
@@ -20,25 +26,26 @@ def insert(query, params=None):
         bool: True if successful, False otherwise
     """
     conn = None
+    owned = True
     cursor = None
     try:
-        conn = get_connection()
+        conn, owned = acquire_connection()
         if conn is None:
             app_logger.error("INSERT failed: no database connection")
             return False
         cursor = conn.cursor()
         cursor.execute(query, params)
-        conn.commit()
+        commit_connection(conn, owned)
         return True
     except Exception as e:
         if conn:
-            conn.rollback()
+            rollback_connection(conn, owned, e)
         app_logger.error(f"INSERT error: {e}")
         return False
     finally:
         if cursor:
             cursor.close()
-        return_connection(conn)
+        release_connection(conn, owned)
 
 
 def insert_returning_id(query, params=None):
@@ -53,9 +60,10 @@ def insert_returning_id(query, params=None):
         int: New record ID or None if error
     """
     conn = None
+    owned = True
     cursor = None
     try:
-        conn = get_connection()
+        conn, owned = acquire_connection()
         if conn is None:
             app_logger.error("INSERT RETURNING failed: no database connection")
             return None
@@ -67,15 +75,15 @@ def insert_returning_id(query, params=None):
             app_logger.error("INSERT RETURNING returned no rows")
             return None
         new_id = result[0]
-        conn.commit()
+        commit_connection(conn, owned)
 
         return new_id
     except Exception as e:
         if conn:
-            conn.rollback()
+            rollback_connection(conn, owned, e)
         app_logger.error(f"INSERT RETURNING error: {e}")
         return None
     finally:
         if cursor:
             cursor.close()
-        return_connection(conn)
+        release_connection(conn, owned)
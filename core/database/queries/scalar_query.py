@@ -8,9 +8,14 @@ import re
 
 from psycopg2 import sql as psycopg2_sql
 
-from core.database.connection import get_connection, return_connection
 from core.logging import app_logger
 
+from .transaction import (
+    acquire_connection,
+    rollback_connection,
+    release_connection
+)
+
 
 # Pattern to detect potentially dangerous SQL in where clauses
 _UNSAFE_WHERE_PATTERN = re.compile(
@@ -31,9 +36,10 @@ def get_scalar(query, params=None):
         Single value or None if error/no result
     """
     conn = None
+    owned = True
     cursor = None
     try:
-        conn = get_connection()
+        conn, owned = acquire_connection()
         if conn is None:
             app_logger.error("SCALAR failed: no database connection")
             return None
@@ -44,12 +50,14 @@ def get_scalar(query, params=None):
 
         return result[0] if result else None
     except Exception as e:
+        if conn:
+            rollback_connection(conn, owned, e)
         app_logger.error(f"SCALAR error: {e}")
         return None
     finally:
         if cursor:
             cursor.close()
-        return_connection(conn)
+        release_connection(conn, owned)
 
 
 def get_count(table_name, where_clause=None, params=None):
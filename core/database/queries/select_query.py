@@ -4,9 +4,16 @@ SELECT Query Handler
 Handles SELECT queries.
 """
 
-from core.database.connection import get_connection, return_connection
+import uuid
+
 from core.logging import app_logger
 
+from .transaction import (
+    acquire_connection,
+    rollback_connection,
+    release_connection
+)
+
 
 def select_all(query, params=None):
     """
@@ -20,9 +27,10 @@ def select_all(query, params=None):
         tuple: (columns, rows) or ([], []) if error
     """
     conn = None
+    owned = True
     cursor = None
     try:
-        conn = get_connection()
+        conn, owned = acquire_connection()
         if conn is None:
             app_logger.error("SELECT failed: no database connection")
             return [], []
@@ -34,12 +42,14 @@ def select_all(query, params=None):
 
         return columns, rows
     except Exception as e:
+        if conn:
+            rollback_connection(conn, owned, e)
         app_logger.error(f"SELECT error: {e}")
         return [], []
     finally:
         if cursor:
             cursor.close()
-        return_connection(conn)
+        release_connection(conn, owned)
 
 
 def select_one(query, params=None):
@@ -54,9 +64,10 @@ def select_one(query, params=None):
         tuple or None
     """
     conn = None
+    owned = True
     cursor = None
     try:
-        conn = get_connection()
+        conn, owned = acquire_connection()
         if conn is None:
             app_logger.error("SELECT ONE failed: no database connection")
             return None
@@ -67,9 +78,77 @@ def select_one(query, params=None):
 
         return result
     except Exception as e:
+        if conn:
+            rollback_connection(conn, owned, e)
         app_logger.error(f"SELECT ONE error: {e}")
         return None
     finally:
         if cursor:
             cursor.close()
-        return_connection(conn)
+        release_connection(conn, owned)
+
+
+DEFAULT_BATCH_SIZE = 2000   # Rows per fetchmany() from the server-side cursor
+
+
+def select_iter(query, params=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Execute SELECT query and stream results in batches.
+
+    Uses a named (server-side) cursor so only one batch is held in
+    memory at a time. The first batch is always yielded, even when the
+    result is empty, so callers always receive the column names.
+
+    Args:
+        query: SQL query string (can be psycopg2.sql.Composed)
+        params: Query parameters (optional)
+        batch_size: Rows per batch
+
+    Yields:
+        tuple: (columns, rows) for each batch
+
+    Raises:
+        Exception: If the query fails after a batch was already yielded
+                   (a partial result cannot be reported as empty)
+    """
+    conn = None
+    owned = True
+    cursor = None
+    started = False
+    try:
+        conn, owned = acquire_connection()
+        if conn is None:
+            app_logger.error("SELECT ITER failed: no database connection")
+            return
+        cursor = conn.cursor(name=f"integra_iter_{uuid.uuid4().hex}")
+        cursor.itersize = batch_size
+        cursor.execute(query, params)
+
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows and started:
+                break
+            columns = [desc[0] for desc in cursor.description]
+            started = True
+            yield columns, rows
+            if len(rows) < batch_size:
+                break
+    except Exception as e:
+        if conn:
+            rollback_connection(conn, owned, e)
+        app_logger.error(f"SELECT ITER error: {e}")
+        if started:
+            raise
+    finally:
+        if cursor:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        if conn is not None and owned:
+            # End the read transaction that holds the server-side cursor
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+        release_connection(conn, owned)
@@ -0,0 +1,190 @@
+"""
+Transaction Handler
+===================
+Keeps one connection across several query helper calls.
+
+Inside a transaction() block every helper in core.database.queries
+(select_all, insert, update, insert_many, ...) runs on the same
+connection and nothing is committed until the block exits.
+
+Usage:
+    from core.database import transaction, insert, update
+
+    with transaction():
+        insert("INSERT INTO a (x) VALUES (%s)", (1,))
+        update("UPDATE b SET y = %s WHERE id = %s", (2, 3))
+    # Committed once here; rolled back if anything failed
+
+    with transaction():
+        for row in rows:
+            try:
+                with savepoint():
+                    insert(...)
+            except TransactionError:
+                pass    # Only this row is rolled back
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Tuple
+
+from core.database.connection import get_connection, return_connection
+from core.logging import app_logger
+
+
+class TransactionError(Exception):
+    """Raised when a helper call inside transaction() failed."""
+
+
+class Transaction:
+    """State of the active transaction on the current thread."""
+
+    def __init__(self, connection: Any):
+        self.connection = connection
+        self.error: Optional[BaseException] = None
+        self.savepoints = 0
+
+    @property
+    def failed(self) -> bool:
+        """True if any statement inside the transaction failed."""
+        return self.error is not None
+
+
+_local = threading.local()
+
+
+def get_current_transaction() -> Optional[Transaction]:
+    """
+    Get the active transaction for the current thread.
+
+    Returns:
+        Transaction or None
+    """
+    return getattr(_local, "transaction", None)
+
+
+@contextmanager
+def transaction() -> Iterator[Transaction]:
+    """
+    Run several query helpers on one connection and commit once.
+
+    Nested transaction() blocks join the outer transaction.
+
+    Yields:
+        Transaction object
+
+    Raises:
+        ConnectionError: If no database connection is available
+        TransactionError: If a helper call inside the block failed
+    """
+    current = get_current_transaction()
+    if current is not None:
+        yield current
+        return
+
+    conn = get_connection()
+    if conn is None:
+        raise ConnectionError("Transaction failed: no database connection")
+
+    tx = Transaction(conn)
+    _local.transaction = tx
+    try:
+        yield tx
+        if tx.failed:
+            raise TransactionError(f"Transaction rolled back: {tx.error}") from tx.error
+        conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception as e:
+            app_logger.error(f"ROLLBACK error: {e}")
+        raise
+    finally:
+        _local.transaction = None
+        return_connection(conn)
+
+
+@contextmanager
+def savepoint() -> Iterator[Transaction]:
+    """
+    Make part of a transaction() block fail on its own.
+
+    Statements inside the block are rolled back to a SAVEPOINT if any of
+    them fails; the rest of the transaction goes on. Outside a
+    transaction the block runs as its own transaction().
+
+    Yields:
+        Transaction object
+
+    Raises:
+        TransactionError: If a helper call inside the block failed (the
+            block is rolled back, the outer transaction is not)
+    """
+    tx = get_current_transaction()
+    if tx is None:
+        with transaction() as tx:
+            yield tx
+        return
+    if tx.failed:
+        raise TransactionError(f"Transaction already failed: {tx.error}") from tx.error
+
+    tx.savepoints += 1
+    name = f"integra_sp_{tx.savepoints}"
+    cursor = tx.connection.cursor()
+    try:
+        cursor.execute(f"SAVEPOINT {name}")
+        try:
+            yield tx
+            if tx.failed:
+                raise TransactionError(f"Savepoint rolled back: {tx.error}") from tx.error
+            cursor.execute(f"RELEASE SAVEPOINT {name}")
+        except Exception:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            tx.error = None
+            raise
+    finally:
+        cursor.close()
+
+
+# ═══════════════════════════════════════════════════════════════
+# Helpers used by the query handlers
+# ═══════════════════════════════════════════════════════════════
+
+def acquire_connection() -> Tuple[Any, bool]:
+    """
+    Get the connection a query helper should use.
+
+    Returns:
+        tuple: (connection, owned). owned is False when the connection
+        belongs to an active transaction() and must not be committed,
+        rolled back or returned by the helper.
+    """
+    tx = get_current_transaction()
+    if tx is not None:
+        return tx.connection, False
+    return get_connection(), True
+
+
+def commit_connection(conn: Any, owned: bool) -> None:
+    """Commit unless the connection belongs to an active transaction."""
+    if owned:
+        conn.commit()
+
+
+def rollback_connection(conn: Any, owned: bool, error: BaseException) -> None:
+    """Roll back, or mark the active transaction as failed."""
+    if owned:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        return
+    tx = get_current_transaction()
+    if tx is not None and tx.error is None:
+        tx.error = error
+
+
+def release_connection(conn: Any, owned: bool) -> None:
+    """Return the connection unless it belongs to an active transaction."""
+    if owned:
+        return_connection(conn)
@@ -4,9 +4,15 @@ UPDATE Query Handler
 Handles UPDATE queries.
 """
 
-from core.database.connection import get_connection, return_connection
 from core.logging import app_logger
 
+from .transaction import (
+    acquire_connection,
+    commit_connection,
+    rollback_connection,
+    release_connection
+)
+
 
 def update(query, params=None):
     """
@@ -20,25 +26,26 @@ def update(query, params=None):
         bool: True if successful, False otherwise
     """
     conn = None
+    owned = True
     cursor = None
     try:
-        conn = get_connection()
+        conn, owned = acquire_connection()
         if conn is None:
             app_logger.error("UPDATE failed: no database connection")
             return False
         cursor = conn.cursor()
         cursor.execute(query, params)
-        conn.commit()
+        commit_connection(conn, owned)
         return True
     except Exception as e:
         if conn:
-            conn.rollback()
+            rollback_connection(conn, owned, e)
         app_logger.error(f"UPDATE error: {e}")
         return False
     finally:
         if cursor:
             cursor.close()
-        return_connection(conn)
+        release_connection(conn, owned)
 
 
 def update_returning_count(query, params=None):
@@ -53,9 +60,10 @@ def update_returning_count(query, params=None):
         int: Number of affected rows or -1 if error
     """
     conn = None
+    owned = True
     cursor = None
     try:
-        conn = get_connection()
+        conn, owned = acquire_connection()
         if conn is None:
             app_logger.error("UPDATE COUNT failed: no database connection")
             return -1
@@ -63,15 +71,15 @@ def update_returning_count(query, params=None):
         cursor.execute(query, params)
 
         count = cursor.rowcount
-        conn.commit()
+        commit_connection(conn, owned)
 
         return count
     except Exception as e:
         if conn:
-            conn.rollback()
+            rollback_connection(conn, owned, e)
         app_logger.error(f"UPDATE COUNT error: {e}")
         return -1
     finally:
         if cursor:
             cursor.close()
-        return_connection(conn)
+        release_connection(conn, owned)
@@ -84,6 +84,20 @@ CREATE INDEX IF NOT EXISTS idx_calendar_events_recurring ON calendar_events(is_r
 -- فهرس للبحث في نطاق تاريخ معين
 CREATE INDEX IF NOT EXISTS idx_calendar_events_month ON calendar_events(DATE_TRUNC('month', start_datetime));
 
+-- فترة الحدث كنطاق زمني (للتحقق من التعارضات بفهرس GiST)
+-- حدث بدون نهاية = لحظة البداية فقط
+CREATE OR REPLACE FUNCTION calendar_event_period(p_start TIMESTAMP, p_end TIMESTAMP)
+RETURNS tsrange AS $$
+    SELECT CASE
+        WHEN p_end IS NULL OR p_end <= p_start THEN tsrange(p_start, p_start, '[]')
+        ELSE tsrange(p_start, p_end, '[)')
+    END
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE INDEX IF NOT EXISTS idx_calendar_events_period ON calendar_events
+    USING GIST (calendar_event_period(start_datetime, end_datetime))
+    WHERE status != 'cancelled';
+
 -- ═══════════════════════════════════════════════════════════════
 -- جدول تصنيفات التقويم (calendar_categories)
 -- ═══════════════════════════════════════════════════════════════
@@ -175,6 +189,21 @@ CREATE INDEX IF NOT EXISTS idx_event_attendees_event_id ON event_attendees(event
 CREATE INDEX IF NOT EXISTS idx_event_attendees_employee_id ON event_attendees(employee_id);
 CREATE INDEX IF NOT EXISTS idx_event_attendees_email ON event_attendees(email);
 
+-- ═══════════════════════════════════════════════════════════════
+-- جدول استثناءات التكرار (calendar_event_exceptions)
+-- تكرارات ملغاة أو معدلة لحدث متكرر (تُحسب بقية التكرارات عند العرض)
+-- ═══════════════════════════════════════════════════════════════
+CREATE TABLE IF NOT EXISTS calendar_event_exceptions (
+    id SERIAL PRIMARY KEY,
+    event_id INTEGER REFERENCES calendar_events(id) ON DELETE CASCADE NOT NULL,
+    occurrence_date DATE NOT NULL,  -- التاريخ الأصلي للتكرار
+    override_event_id INTEGER REFERENCES calendar_events(id) ON DELETE SET NULL,  -- NULL = تكرار ملغى
+    created_at TIMESTAMP DEFAULT NOW(),
+    UNIQUE (event_id, occurrence_date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_calendar_event_exceptions_override ON calendar_event_exceptions(override_event_id);
+
 -- ═══════════════════════════════════════════════════════════════
 -- جدول إعدادات التقويم (calendar_settings)
 -- ═══════════════════════════════════════════════════════════════
@@ -59,6 +59,12 @@ CREATE INDEX IF NOT EXISTS idx_tasks_assigned_to ON tasks(assigned_to);
 CREATE INDEX IF NOT EXISTS idx_tasks_employee_id ON tasks(employee_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_parent_task_id ON tasks(parent_task_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_is_recurring ON tasks(is_recurring) WHERE is_recurring = TRUE;
+-- المهام المتكررة المستحقة بترتيب (next_occurrence, id) للمعالجة على دفعات
+CREATE INDEX IF NOT EXISTS idx_tasks_next_occurrence ON tasks(next_occurrence, id) WHERE is_recurring = TRUE;
+-- نسخة واحدة فقط لكل مهمة أصلية وتاريخ تكرار (منع التكرار عند التعويض)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_recurring_occurrence
+    ON tasks(parent_task_id, (metadata->>'occurrence_date'))
+    WHERE metadata ? 'occurrence_date';
 
 -- ═══════════════════════════════════════════════════════════════
 -- جدول قائمة التحقق (task_checklist)
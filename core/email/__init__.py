@@ -22,6 +22,14 @@ from .email_cache import (
     search_cached_emails
 )
 
+from .email_sync import (
+    EmailSyncEngine,
+    MailTransport,
+    OutlookTransport,
+    InMemoryMailTransport,
+    SyncResult
+)
+
 from .email_models import (
     Email,
     EmailFolder,
@@ -46,6 +54,12 @@ __all__ = [
     'cache_emails',
     'get_cached_emails',
     'search_cached_emails',
+    # Incremental sync
+    'EmailSyncEngine',
+    'MailTransport',
+    'OutlookTransport',
+    'InMemoryMailTransport',
+    'SyncResult',
     # Models
     'Email',
     'EmailFolder',
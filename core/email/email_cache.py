@@ -4,7 +4,7 @@ Email Cache
 SQLite-based cache for offline email access.
 """
 
-from typing import Optional, List, Tuple
+from typing import Iterable, Optional, List, Set, Tuple
 from datetime import datetime, timedelta
 import sqlite3
 import os
@@ -12,6 +12,14 @@ import threading
 from pathlib import Path
 
 from .email_models import Email, EmailImportance
+from .search_normalizer import (
+    normalize_search_text,
+    build_match_query,
+    restore_snippet,
+    SNIPPET_START,
+    SNIPPET_END,
+    SNIPPET_ELLIPSIS,
+)
 from core.logging import app_logger
 
 
@@ -24,6 +32,8 @@ class EmailCache:
     - Fast search
     - AI analysis storage
     - Automatic cleanup of old emails
+    - Per-thread pooled connections in WAL mode (sync writes do not
+      block UI reads)
 
     Usage:
         cache = EmailCache()
@@ -37,6 +47,15 @@ class EmailCache:
     # Default cache settings
     DEFAULT_DB_PATH = "data/email_cache.db"
     MAX_CACHE_DAYS = 30  # Keep emails for 30 days
+    SCHEMA_VERSION = 2  # PRAGMA user_version (1: FTS5 search index, 2: lazy bodies)
+
+    # BM25 column weights: subject, sender, body
+    SEARCH_WEIGHTS = (10.0, 8.0, 1.0)
+
+    # Connection settings
+    CACHED_STATEMENTS = 256             # Prepared statements kept per connection
+    MMAP_SIZE = 256 * 1024 * 1024       # Memory-mapped I/O window
+    BUSY_TIMEOUT_MS = 5000              # Wait for a writer instead of failing
 
     def __new__(cls, db_path: Optional[str] = None):
         """Singleton pattern."""
@@ -51,6 +70,9 @@ class EmailCache:
             return
 
         self._db_path = db_path or self.DEFAULT_DB_PATH
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._connections = {}  # thread ident -> (thread, connection)
         self._ensure_directory()
         self._init_database()
         self._initialized = True
@@ -62,11 +84,64 @@ class EmailCache:
             os.makedirs(db_dir, exist_ok=True)
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection."""
-        conn = sqlite3.connect(self._db_path)
+        """
+        Get this thread's pooled connection (opened on first use).
+
+        Use as `with self._get_connection() as conn:` - the block commits
+        or rolls back but leaves the connection open for reuse.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+            with self._pool_lock:
+                self._prune_connections()
+                thread = threading.current_thread()
+                self._connections[thread.ident] = (thread, conn)
+        return conn
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(
+            self._db_path,
+            timeout=self.BUSY_TIMEOUT_MS / 1000,
+            cached_statements=self.CACHED_STATEMENTS,
+            # Only used by its own thread; close() may run on another
+            check_same_thread=False
+        )
         conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={int(self.MMAP_SIZE)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA busy_timeout={int(self.BUSY_TIMEOUT_MS)}")
+        # Used by the search index triggers
+        conn.create_function(
+            "integra_normalize", 1, normalize_search_text, deterministic=True
+        )
         return conn
 
+    def _prune_connections(self):
+        """Close connections owned by threads that have exited."""
+        for ident, (thread, conn) in list(self._connections.items()):
+            if not thread.is_alive():
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+                del self._connections[ident]
+
+    def close(self):
+        """Close all pooled connections (e.g. on application exit)."""
+        with self._pool_lock:
+            for _, conn in self._connections.values():
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._connections.clear()
+            self._local = threading.local()
+
     def _init_database(self):
         """Initialize database schema."""
         with self._get_connection() as conn:
@@ -78,6 +153,7 @@ class EmailCache:
                     subject TEXT,
                     body TEXT,
                     body_html TEXT,
+                    body_loaded INTEGER DEFAULT 1,
                     sender_name TEXT,
                     sender_email TEXT,
                     recipients_to TEXT,
@@ -123,110 +199,421 @@ class EmailCache:
                     last_sync TEXT
                 );
 
+                -- Incremental sync high-water marks (per Outlook folder)
+                CREATE TABLE IF NOT EXISTS folder_sync_state (
+                    folder_id TEXT PRIMARY KEY,
+                    folder_name TEXT,
+                    last_modified TEXT,
+                    boundary_ids TEXT,
+                    last_sync TEXT,
+                    synced_count INTEGER DEFAULT 0
+                );
+
                 -- Search index
                 CREATE INDEX IF NOT EXISTS idx_emails_subject ON emails(subject);
                 CREATE INDEX IF NOT EXISTS idx_emails_sender ON emails(sender_email);
                 CREATE INDEX IF NOT EXISTS idx_emails_received ON emails(received_time);
                 CREATE INDEX IF NOT EXISTS idx_emails_folder ON emails(folder_name);
+                CREATE INDEX IF NOT EXISTS idx_emails_folder_id ON emails(folder_id);
                 CREATE INDEX IF NOT EXISTS idx_emails_unread ON emails(is_read);
-
-                -- Full-text search
-                CREATE VIRTUAL TABLE IF NOT EXISTS emails_fts USING fts5(
-                    entry_id,
-                    subject,
-                    body,
-                    sender_name,
-                    sender_email,
-                    content='emails',
-                    content_rowid='rowid'
-                );
-
-                -- Triggers for FTS sync
-                CREATE TRIGGER IF NOT EXISTS emails_ai AFTER INSERT ON emails BEGIN
-                    INSERT INTO emails_fts(entry_id, subject, body, sender_name, sender_email)
-                    VALUES (new.entry_id, new.subject, new.body, new.sender_name, new.sender_email);
-                END;
-
-                CREATE TRIGGER IF NOT EXISTS emails_ad AFTER DELETE ON emails BEGIN
-                    INSERT INTO emails_fts(emails_fts, entry_id, subject, body, sender_name, sender_email)
-                    VALUES ('delete', old.entry_id, old.subject, old.body, old.sender_name, old.sender_email);
-                END;
-
-                CREATE TRIGGER IF NOT EXISTS emails_au AFTER UPDATE ON emails BEGIN
-                    INSERT INTO emails_fts(emails_fts, entry_id, subject, body, sender_name, sender_email)
-                    VALUES ('delete', old.entry_id, old.subject, old.body, old.sender_name, old.sender_email);
-                    INSERT INTO emails_fts(entry_id, subject, body, sender_name, sender_email)
-                    VALUES (new.entry_id, new.subject, new.body, new.sender_name, new.sender_email);
-                END;
             """)
+            self._migrate_schema(conn)
             conn.commit()
             app_logger.debug("Email cache database initialized")
 
+    def _migrate_schema(self, conn: sqlite3.Connection):
+        """Bring older cache files up to SCHEMA_VERSION (PRAGMA user_version)."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= self.SCHEMA_VERSION:
+            return
+
+        if version < 1:
+            self._init_search_index(conn)
+
+        if version < 2:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(emails)")}
+            if "body_loaded" not in columns:
+                conn.execute("ALTER TABLE emails ADD COLUMN body_loaded INTEGER DEFAULT 1")
+
+        conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _init_search_index(self, conn: sqlite3.Connection):
+        """
+        Create the FTS5 search index (normalized shadow copy).
+
+        emails_search holds Arabic-folded subject/sender/body keyed by
+        emails.rowid and is maintained by triggers. Flag/read updates do
+        not touch it. Older caches with the emails_fts table are migrated
+        and re-indexed once.
+        """
+        conn.executescript("""
+            DROP TRIGGER IF EXISTS emails_ai;
+            DROP TRIGGER IF EXISTS emails_ad;
+            DROP TRIGGER IF EXISTS emails_au;
+            DROP TABLE IF EXISTS emails_fts;
+            DROP TABLE IF EXISTS emails_search;
+
+            CREATE VIRTUAL TABLE emails_search USING fts5(
+                subject,
+                sender,
+                body,
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+
+            -- INSERT OR REPLACE does not fire DELETE triggers
+            CREATE TRIGGER IF NOT EXISTS emails_search_bi BEFORE INSERT ON emails BEGIN
+                DELETE FROM emails_search WHERE rowid IN (
+                    SELECT rowid FROM emails WHERE entry_id = new.entry_id
+                );
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS emails_search_ai AFTER INSERT ON emails BEGIN
+                INSERT INTO emails_search(rowid, subject, sender, body)
+                VALUES (
+                    new.rowid,
+                    integra_normalize(new.subject),
+                    integra_normalize(COALESCE(new.sender_name, '') || ' ' || COALESCE(new.sender_email, '')),
+                    integra_normalize(new.body)
+                );
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS emails_search_ad AFTER DELETE ON emails BEGIN
+                DELETE FROM emails_search WHERE rowid = old.rowid;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS emails_search_au
+            AFTER UPDATE OF subject, body, sender_name, sender_email ON emails BEGIN
+                DELETE FROM emails_search WHERE rowid = old.rowid;
+                INSERT INTO emails_search(rowid, subject, sender, body)
+                VALUES (
+                    new.rowid,
+                    integra_normalize(new.subject),
+                    integra_normalize(COALESCE(new.sender_name, '') || ' ' || COALESCE(new.sender_email, '')),
+                    integra_normalize(new.body)
+                );
+            END;
+
+            INSERT INTO emails_search(rowid, subject, sender, body)
+            SELECT
+                rowid,
+                integra_normalize(subject),
+                integra_normalize(COALESCE(sender_name, '') || ' ' || COALESCE(sender_email, '')),
+                integra_normalize(body)
+            FROM emails;
+        """)
+        app_logger.info("Email search index built")
+
+    _SAVE_EMAIL_SQL = """
+        INSERT OR REPLACE INTO emails (
+            entry_id, conversation_id, subject, body, body_html,
+            sender_name, sender_email, recipients_to, recipients_cc,
+            received_time, sent_time, is_read, is_flagged,
+            importance, has_attachments, folder_name, folder_id,
+            categories, ai_summary, ai_category, ai_priority,
+            body_loaded, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    """
+
+    # Incremental sync: header-only rows never overwrite a cached body
+    # (and AI fields are left alone on update)
+    _SYNC_EMAIL_SQL = """
+        INSERT INTO emails (
+            entry_id, conversation_id, subject, body, body_html,
+            sender_name, sender_email, recipients_to, recipients_cc,
+            received_time, sent_time, is_read, is_flagged,
+            importance, has_attachments, folder_name, folder_id,
+            categories, ai_summary, ai_category, ai_priority,
+            body_loaded, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(entry_id) DO UPDATE SET
+            conversation_id = excluded.conversation_id,
+            subject = excluded.subject,
+            body = CASE WHEN excluded.body_loaded = 1 THEN excluded.body ELSE emails.body END,
+            body_html = CASE WHEN excluded.body_loaded = 1 THEN excluded.body_html ELSE emails.body_html END,
+            body_loaded = MAX(emails.body_loaded, excluded.body_loaded),
+            sender_name = excluded.sender_name,
+            sender_email = excluded.sender_email,
+            recipients_to = excluded.recipients_to,
+            recipients_cc = excluded.recipients_cc,
+            received_time = excluded.received_time,
+            sent_time = excluded.sent_time,
+            is_read = excluded.is_read,
+            is_flagged = excluded.is_flagged,
+            importance = excluded.importance,
+            has_attachments = excluded.has_attachments,
+            folder_name = excluded.folder_name,
+            folder_id = excluded.folder_id,
+            categories = excluded.categories,
+            updated_at = CURRENT_TIMESTAMP
+    """
+
+    _SAVE_ATTACHMENT_SQL = """
+        INSERT INTO attachments (email_entry_id, filename, size, content_type, local_path)
+        VALUES (?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _email_params(email: Email) -> tuple:
+        """Parameters for _SAVE_EMAIL_SQL."""
+        return (
+            email.entry_id,
+            email.conversation_id,
+            email.subject,
+            email.body,
+            email.body_html,
+            email.sender_name,
+            email.sender_email,
+            ','.join(email.to),
+            ','.join(email.cc),
+            email.received_time.isoformat() if email.received_time else None,
+            email.sent_time.isoformat() if email.sent_time else None,
+            1 if email.is_read else 0,
+            1 if email.is_flagged else 0,
+            email.importance.value,
+            1 if email.has_attachments else 0,
+            email.folder_name,
+            email.folder_id,
+            ','.join(email.categories),
+            email.ai_summary,
+            email.ai_category,
+            email.ai_priority,
+            1 if email.body_loaded else 0
+        )
+
+    def _save_attachments(self, conn: sqlite3.Connection, emails: List[Email]):
+        """Replace stored attachments for emails that carry attachments."""
+        with_attachments = [e for e in emails if e.attachments]
+        if not with_attachments:
+            return
+        conn.executemany(
+            "DELETE FROM attachments WHERE email_entry_id = ?",
+            [(e.entry_id,) for e in with_attachments]
+        )
+        conn.executemany(self._SAVE_ATTACHMENT_SQL, [
+            (e.entry_id, att.filename, att.size, att.content_type, att.path)
+            for e in with_attachments
+            for att in e.attachments
+        ])
+
     def save_email(self, email: Email) -> bool:
         """Save a single email to cache."""
+        try:
+            with self._get_connection() as conn:
+                conn.execute(self._SAVE_EMAIL_SQL, self._email_params(email))
+                self._save_attachments(conn, [email])
+                return True
+
+        except Exception as e:
+            app_logger.error(f"Failed to save email to cache: {e}")
+            return False
+
+    def save_emails(self, emails: List[Email]) -> int:
+        """
+        Save multiple emails to cache in one transaction.
+
+        Returns:
+            Number of emails saved (0 if the batch failed)
+        """
+        emails = list(emails)
+        if not emails:
+            return 0
+
+        try:
+            with self._get_connection() as conn:
+                conn.executemany(
+                    self._SAVE_EMAIL_SQL,
+                    [self._email_params(email) for email in emails]
+                )
+                self._save_attachments(conn, emails)
+                return len(emails)
+
+        except Exception as e:
+            app_logger.error(f"Failed to save {len(emails)} emails to cache: {e}")
+            return 0
+
+    def save_synced_emails(self, emails: List[Email]) -> int:
+        """
+        Upsert emails from an incremental sync in one transaction.
+
+        Unlike save_emails, header-only emails (body_loaded=False) keep
+        the body already in the cache, and AI analysis is preserved.
+
+        Returns:
+            Number of emails saved (0 if the batch failed)
+        """
+        emails = list(emails)
+        if not emails:
+            return 0
+
+        try:
+            with self._get_connection() as conn:
+                conn.executemany(
+                    self._SYNC_EMAIL_SQL,
+                    [self._email_params(email) for email in emails]
+                )
+                self._save_attachments(conn, emails)
+                return len(emails)
+
+        except Exception as e:
+            app_logger.error(f"Failed to save {len(emails)} synced emails: {e}")
+            return 0
+
+    def save_body(self, entry_id: str, body: str, body_html: Optional[str] = None) -> bool:
+        """Store a lazily loaded body (re-indexes the email for search)."""
         try:
             with self._get_connection() as conn:
                 conn.execute("""
-                    INSERT OR REPLACE INTO emails (
-                        entry_id, conversation_id, subject, body, body_html,
-                        sender_name, sender_email, recipients_to, recipients_cc,
-                        received_time, sent_time, is_read, is_flagged,
-                        importance, has_attachments, folder_name, folder_id,
-                        categories, ai_summary, ai_category, ai_priority,
-                        updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, (
-                    email.entry_id,
-                    email.conversation_id,
-                    email.subject,
-                    email.body,
-                    email.body_html,
-                    email.sender_name,
-                    email.sender_email,
-                    ','.join(email.to),
-                    ','.join(email.cc),
-                    email.received_time.isoformat() if email.received_time else None,
-                    email.sent_time.isoformat() if email.sent_time else None,
-                    1 if email.is_read else 0,
-                    1 if email.is_flagged else 0,
-                    email.importance.value,
-                    1 if email.has_attachments else 0,
-                    email.folder_name,
-                    email.folder_id,
-                    ','.join(email.categories),
-                    email.ai_summary,
-                    email.ai_category,
-                    email.ai_priority
-                ))
+                    UPDATE emails SET
+                        body = ?,
+                        body_html = ?,
+                        body_loaded = 1,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE entry_id = ?
+                """, (body, body_html, entry_id))
+                return True
 
-                # Save attachments
-                if email.attachments:
-                    conn.execute("DELETE FROM attachments WHERE email_entry_id = ?", (email.entry_id,))
-                    for att in email.attachments:
-                        conn.execute("""
-                            INSERT INTO attachments (email_entry_id, filename, size, content_type, local_path)
-                            VALUES (?, ?, ?, ?, ?)
-                        """, (email.entry_id, att.filename, att.size, att.content_type, att.path))
+        except Exception as e:
+            app_logger.error(f"Failed to save email body: {e}")
+            return False
 
-                conn.commit()
+    def get_emails_without_body(self, limit: int = 50) -> List[Email]:
+        """Get header-only emails, newest first (for background body loading)."""
+        try:
+            with self._get_connection() as conn:
+                rows = conn.execute("""
+                    SELECT * FROM emails
+                    WHERE body_loaded = 0
+                    ORDER BY received_time DESC
+                    LIMIT ?
+                """, (limit,)).fetchall()
+                return [self._row_to_email(row) for row in rows]
+
+        except Exception as e:
+            app_logger.error(f"Failed to get emails without body: {e}")
+            return []
+
+    def delete_email(self, entry_id: str) -> bool:
+        """Remove an email (e.g. after deleting it in Outlook)."""
+        try:
+            with self._get_connection() as conn:
+                conn.execute("DELETE FROM attachments WHERE email_entry_id = ?", (entry_id,))
+                conn.execute("DELETE FROM emails WHERE entry_id = ?", (entry_id,))
                 return True
 
         except Exception as e:
-            app_logger.error(f"Failed to save email to cache: {e}")
+            app_logger.error(f"Failed to delete email from cache: {e}")
             return False
 
-    def save_emails(self, emails: List[Email]) -> int:
+    def delete_emails(self, entry_ids: Iterable[str]) -> int:
+        """Remove several emails in one transaction (sync reconciliation)."""
+        params = [(entry_id,) for entry_id in entry_ids]
+        if not params:
+            return 0
+
+        try:
+            with self._get_connection() as conn:
+                conn.executemany("DELETE FROM attachments WHERE email_entry_id = ?", params)
+                conn.executemany("DELETE FROM emails WHERE entry_id = ?", params)
+                return len(params)
+
+        except Exception as e:
+            app_logger.error(f"Failed to delete {len(params)} emails from cache: {e}")
+            return 0
+
+    def get_folder_entry_ids(self, folder_id: str) -> Set[str]:
+        """EntryIDs of the cached emails of one Outlook folder."""
+        try:
+            with self._get_connection() as conn:
+                rows = conn.execute(
+                    "SELECT entry_id FROM emails WHERE folder_id = ?",
+                    (folder_id,)
+                ).fetchall()
+                return {row[0] for row in rows}
+
+        except Exception as e:
+            app_logger.error(f"Failed to get cached emails of folder: {e}")
+            return set()
+
+    def get_sync_state(self, folder_id: str) -> Optional[dict]:
         """
-        Save multiple emails to cache.
+        Get the incremental sync high-water mark of a folder.
 
         Returns:
-            Number of emails saved
+            dict with last_modified (datetime), boundary_ids (set of
+            EntryIDs modified exactly at last_modified), last_sync and
+            synced_count; None if the folder was never synced
         """
-        saved = 0
-        for email in emails:
-            if self.save_email(email):
-                saved += 1
-        return saved
+        try:
+            with self._get_connection() as conn:
+                row = conn.execute(
+                    "SELECT * FROM folder_sync_state WHERE folder_id = ?",
+                    (folder_id,)
+                ).fetchone()
+
+        except Exception as e:
+            app_logger.error(f"Failed to get sync state: {e}")
+            return None
+
+        if not row:
+            return None
+        return {
+            'folder_id': row['folder_id'],
+            'folder_name': row['folder_name'],
+            'last_modified': datetime.fromisoformat(row['last_modified']) if row['last_modified'] else None,
+            'boundary_ids': set(row['boundary_ids'].split('\n')) if row['boundary_ids'] else set(),
+            'last_sync': datetime.fromisoformat(row['last_sync']) if row['last_sync'] else None,
+            'synced_count': row['synced_count'] or 0,
+        }
+
+    def save_sync_state(
+        self,
+        folder_id: str,
+        folder_name: Optional[str],
+        last_modified: Optional[datetime],
+        boundary_ids: set,
+        synced: int = 0
+    ) -> bool:
+        """Store the high-water mark of a folder after a sync pass."""
+        try:
+            with self._get_connection() as conn:
+                conn.execute("""
+                    INSERT INTO folder_sync_state (
+                        folder_id, folder_name, last_modified, boundary_ids,
+                        last_sync, synced_count
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(folder_id) DO UPDATE SET
+                        folder_name = excluded.folder_name,
+                        last_modified = excluded.last_modified,
+                        boundary_ids = excluded.boundary_ids,
+                        last_sync = excluded.last_sync,
+                        synced_count = folder_sync_state.synced_count + excluded.synced_count
+                """, (
+                    folder_id,
+                    folder_name,
+                    last_modified.isoformat() if last_modified else None,
+                    '\n'.join(sorted(boundary_ids)),
+                    datetime.now().isoformat(),
+                    synced
+                ))
+                return True
+
+        except Exception as e:
+            app_logger.error(f"Failed to save sync state: {e}")
+            return False
+
+    def reset_sync_state(self, folder_id: Optional[str] = None) -> bool:
+        """Forget high-water marks (next sync re-reads the folder)."""
+        try:
+            with self._get_connection() as conn:
+                if folder_id:
+                    conn.execute("DELETE FROM folder_sync_state WHERE folder_id = ?", (folder_id,))
+                else:
+                    conn.execute("DELETE FROM folder_sync_state")
+                return True
+
+        except Exception as e:
+            app_logger.error(f"Failed to reset sync state: {e}")
+            return False
 
     def get_email(self, entry_id: str) -> Optional[Email]:
         """Get a single email by ID."""
@@ -297,35 +684,117 @@ class EmailCache:
             folder_name: Filter by folder
 
         Returns:
-            List of matching emails
+            List of matching emails (best match first)
         """
-        emails = []
-
         try:
-            sql = """
-                SELECT e.* FROM emails e
-                JOIN emails_fts fts ON e.entry_id = fts.entry_id
-                WHERE emails_fts MATCH ?
-            """
-            params = [query]
+            results = self.search_ranked(query, limit=limit, folder_name=folder_name)
+        except sqlite3.Error as e:
+            app_logger.error(f"Search failed: {e}")
+            # Fallback to LIKE search
+            return self._search_like(query, limit, folder_name)
 
-            if folder_name:
-                sql += " AND e.folder_name = ?"
-                params.append(folder_name)
+        return [email for email, _, _ in results]
 
-            sql += " ORDER BY e.received_time DESC LIMIT ?"
-            params.append(limit)
+    def search_ranked(
+        self,
+        query: str,
+        limit: int = 50,
+        offset: int = 0,
+        folder_name: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        match_any: bool = False,
+        highlight: Tuple[str, str] = ("[", "]"),
+        snippet_tokens: int = 24
+    ) -> List[Tuple[Email, float, str]]:
+        """
+        Ranked full-text search over the whole cache.
 
-            with self._get_connection() as conn:
-                rows = conn.execute(sql, params).fetchall()
-                emails = [self._row_to_email(row) for row in rows]
+        Ranking is BM25 (subject > sender > body) with the recency and
+        importance boosts applied in SQL; every word is prefix-matched
+        after Arabic normalization.
 
-        except Exception as e:
-            app_logger.error(f"Search failed: {e}")
-            # Fallback to LIKE search
-            return self._search_like(query, limit, folder_name)
+        Args:
+            query: Free-text query
+            limit: Page size
+            offset: Rows to skip (pagination)
+            folder_name: Filter by folder
+            date_from: Received/sent on or after
+            date_to: Received/sent on or before
+            match_any: Match any word instead of all words
+            highlight: Markers placed around matched terms in the snippet
+            snippet_tokens: Approximate snippet length in tokens
 
-        return emails
+        Returns:
+            List of (email, score, snippet), best match first
+
+        Raises:
+            sqlite3.Error: If the FTS query fails
+        """
+        match = build_match_query(query, match_any=match_any)
+        if not match:
+            return []
+
+        now = datetime.now()
+        params = {
+            "match": match,
+            "w_subject": self.SEARCH_WEIGHTS[0],
+            "w_sender": self.SEARCH_WEIGHTS[1],
+            "w_body": self.SEARCH_WEIGHTS[2],
+            "day_ago": (now - timedelta(days=1)).isoformat(),
+            "week_ago": (now - timedelta(days=7)).isoformat(),
+            "snip_start": SNIPPET_START,
+            "snip_end": SNIPPET_END,
+            "snip_ellipsis": SNIPPET_ELLIPSIS,
+            "snip_tokens": max(1, min(snippet_tokens, 64)),
+            "limit": limit,
+            "offset": offset,
+        }
+
+        sql = """
+            SELECT e.*,
+                -bm25(emails_search, :w_subject, :w_sender, :w_body)
+                * CASE
+                    WHEN e.received_time >= :day_ago THEN 1.5
+                    WHEN e.received_time >= :week_ago THEN 1.2
+                    ELSE 1.0
+                  END
+                * CASE WHEN e.importance >= 2 THEN 1.3 ELSE 1.0 END AS search_score,
+                snippet(emails_search, 2, :snip_start, :snip_end,
+                        :snip_ellipsis, :snip_tokens) AS search_snippet
+            FROM emails_search
+            JOIN emails e ON e.rowid = emails_search.rowid
+            WHERE emails_search MATCH :match
+        """
+
+        if folder_name:
+            sql += " AND e.folder_name = :folder_name"
+            params["folder_name"] = folder_name
+
+        if date_from:
+            sql += " AND COALESCE(e.received_time, e.sent_time) >= :date_from"
+            params["date_from"] = date_from.isoformat()
+
+        if date_to:
+            sql += " AND COALESCE(e.received_time, e.sent_time) <= :date_to"
+            params["date_to"] = date_to.isoformat()
+
+        sql += (
+            " ORDER BY search_score DESC, e.received_time DESC"
+            " LIMIT :limit OFFSET :offset"
+        )
+
+        start_mark, end_mark = highlight
+        with self._get_connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+            return [
+                (
+                    self._row_to_email(row),
+                    row['search_score'],
+                    restore_snippet(row['body'], row['search_snippet'], start_mark, end_mark)
+                )
+                for row in rows
+            ]
 
     def _search_like(
         self,
@@ -367,6 +836,7 @@ class EmailCache:
             subject=row['subject'] or "",
             body=row['body'] or "",
             body_html=row['body_html'],
+            body_loaded=bool(row['body_loaded']) if row['body_loaded'] is not None else True,
             sender_name=row['sender_name'] or "",
             sender_email=row['sender_email'] or "",
             to=row['recipients_to'].split(',') if row['recipients_to'] else [],
@@ -492,6 +962,7 @@ class EmailCache:
                 conn.execute("DELETE FROM attachments")
                 conn.execute("DELETE FROM emails")
                 conn.execute("DELETE FROM folders")
+                conn.execute("DELETE FROM folder_sync_state")
                 conn.commit()
                 return True
 
@@ -105,6 +105,7 @@ class Email:
     subject: str = ""
     body: str = ""
     body_html: Optional[str] = None
+    body_loaded: bool = True  # False for header-only items from incremental sync
 
     # Sender
     sender_name: str = ""
@@ -119,6 +120,7 @@ class Email:
     received_time: Optional[datetime] = None
     sent_time: Optional[datetime] = None
     created_time: Optional[datetime] = None
+    modified_time: Optional[datetime] = None  # Outlook LastModificationTime
 
     # Status
     is_read: bool = False
@@ -0,0 +1,456 @@
+"""
+Email Sync
+==========
+Incremental (delta) Outlook -> EmailCache synchronisation.
+
+Instead of re-reading the newest N items of a folder on every refresh,
+the sync engine keeps a high-water mark per folder in EmailCache (the
+last LastModificationTime seen plus the EntryIDs modified at exactly
+that time) and asks the transport only for items changed since then.
+New and changed items are stored header-only; bodies are fetched
+lazily when an email is opened or analyzed, and the newest ones are
+backfilled after each sync so body text stays searchable.
+
+Deletions and moves do not show up as modified items, so each pass also
+reconciles the cached rows of the folder against the folder's current
+EntryIDs and drops the ones that are gone.
+
+The transport is pluggable: OutlookTransport talks to Outlook through
+win32com, InMemoryMailTransport is an in-process fake for running the
+engine without Outlook.
+
+Usage:
+    from core.email import EmailSyncEngine, OutlookTransport, get_email_cache
+
+    engine = EmailSyncEngine(get_email_cache(), OutlookTransport())
+    result = engine.sync_folder(FolderType.INBOX)
+    engine.load_pending_bodies()        # background body backfill
+    email = engine.ensure_body(email)   # when the email is opened
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .email_cache import EmailCache
+from .email_models import Email, EmailFolder, FolderType
+from .outlook_connector import parse_mail_item
+from core.logging import app_logger
+
+
+SYNC_PAGE_SIZE = 200            # Emails written per cache transaction
+INITIAL_SYNC_DAYS = 30          # First sync of a folder reaches back this far
+INITIAL_SYNC_LIMIT = 500        # ... and reads at most this many items
+BODY_BACKFILL_LIMIT = 50        # Bodies fetched in the background after each sync
+
+
+@dataclass
+class SyncResult:
+    """Result of one sync pass over a folder."""
+    folder_id: str
+    folder_name: str = ""
+    fetched: int = 0
+    saved: int = 0
+    removed: int = 0
+    initial: bool = False
+    high_water_mark: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+class MailTransport(ABC):
+    """
+    Source of mailbox changes used by EmailSyncEngine.
+
+    Implementations return header-only Email objects (body_loaded=False)
+    with modified_time set, and load bodies on demand.
+    """
+
+    @abstractmethod
+    def get_folder(self, folder: FolderType) -> Optional[EmailFolder]:
+        """Resolve a default folder (entry_id is used as the sync key)."""
+
+    @abstractmethod
+    def list_changes(
+        self,
+        folder: FolderType,
+        since: Optional[datetime],
+        limit: Optional[int] = None
+    ) -> Iterable[Email]:
+        """
+        Items of a folder modified at or after `since` (all items if None).
+
+        Transports may return items slightly older than `since` (Outlook
+        Restrict has minute precision); the engine filters them.
+        """
+
+    @abstractmethod
+    def list_entry_ids(self, folder: FolderType) -> Optional[Set[str]]:
+        """EntryIDs of all items currently in a folder (None on failure)."""
+
+    @abstractmethod
+    def load_body(self, entry_id: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Fetch (body, body_html) of one item, or None if it is gone."""
+
+
+class OutlookTransport(MailTransport):
+    """
+    Outlook Classic transport (win32com).
+
+    Uses Items.Restrict on LastModificationTime so only new or changed
+    items are enumerated, and never reads Body/HTMLBody while listing.
+
+    COM objects are thread-bound: pass the namespace of an existing
+    connection on the same thread, or let the transport dispatch its own
+    (the caller must have called pythoncom.CoInitialize()).
+    """
+
+    def __init__(self, namespace: Any = None) -> None:
+        self._namespace = namespace
+
+    def _get_namespace(self) -> Any:
+        if self._namespace is None:
+            import win32com.client
+            outlook = win32com.client.Dispatch("Outlook.Application")
+            self._namespace = outlook.GetNamespace("MAPI")
+        return self._namespace
+
+    @staticmethod
+    def _restrict_date(value: datetime) -> str:
+        """Date literal for Items.Restrict (minute precision)."""
+        return value.strftime("%m/%d/%Y %I:%M %p")
+
+    def get_folder(self, folder: FolderType) -> Optional[EmailFolder]:
+        try:
+            com_folder = self._get_namespace().GetDefaultFolder(folder.value)
+            return EmailFolder(
+                name=com_folder.Name,
+                folder_type=folder,
+                entry_id=com_folder.EntryID,
+            )
+        except Exception as e:
+            app_logger.error(f"Failed to get folder {folder}: {e}")
+            return None
+
+    def list_changes(
+        self,
+        folder: FolderType,
+        since: Optional[datetime],
+        limit: Optional[int] = None
+    ) -> Iterable[Email]:
+        com_folder = self._get_namespace().GetDefaultFolder(folder.value)
+        folder_name = com_folder.Name
+        folder_id = com_folder.EntryID
+
+        items = com_folder.Items
+        if since is not None:
+            # Minute precision: step back one minute, the engine dedupes
+            items = items.Restrict(
+                f"[LastModificationTime] >= '{self._restrict_date(since - timedelta(minutes=1))}'"
+            )
+            items.Sort("[LastModificationTime]", False)
+        else:
+            items = items.Restrict(
+                f"[ReceivedTime] >= '{self._restrict_date(datetime.now() - timedelta(days=INITIAL_SYNC_DAYS))}'"
+            )
+            items.Sort("[ReceivedTime]", True)
+
+        count = 0
+        for item in items:
+            if limit is not None and count >= limit:
+                break
+            email = parse_mail_item(item, folder_name, include_body=False)
+            if email is None:
+                continue
+            email.folder_id = folder_id
+            count += 1
+            yield email
+
+    def list_entry_ids(self, folder: FolderType) -> Optional[Set[str]]:
+        try:
+            com_folder = self._get_namespace().GetDefaultFolder(folder.value)
+            # A Table with only the EntryID column: no item is opened
+            table = com_folder.GetTable()
+            table.Columns.RemoveAll()
+            table.Columns.Add("EntryID")
+            entry_ids = set()
+            while not table.EndOfTable:
+                entry_ids.add(table.GetNextRow().Item("EntryID"))
+            return entry_ids
+        except Exception as e:
+            app_logger.error(f"Failed to list items of {folder}: {e}")
+            return None
+
+    def load_body(self, entry_id: str) -> Optional[Tuple[str, Optional[str]]]:
+        try:
+            item = self._get_namespace().GetItemFromID(entry_id)
+            return item.Body or "", getattr(item, 'HTMLBody', None)
+        except Exception as e:
+            app_logger.error(f"Failed to load email body: {e}")
+            return None
+
+
+class InMemoryMailTransport(MailTransport):
+    """
+    In-process fake mailbox (no Outlook required).
+
+    Usage:
+        transport = InMemoryMailTransport()
+        transport.add_email(FolderType.INBOX, email)
+        transport.update_email(email.entry_id, is_read=True)
+        engine = EmailSyncEngine(cache, transport)
+    """
+
+    def __init__(self) -> None:
+        self._folders: Dict[FolderType, Dict[str, Email]] = {}
+        self.list_calls = 0
+        self.body_loads = 0
+
+    def add_email(self, folder: FolderType, email: Email, modified: Optional[datetime] = None) -> Email:
+        """Add an item (modified defaults to now)."""
+        stored = replace(
+            email,
+            folder_name=folder.name.title(),
+            folder_id=f"fake-{folder.name.lower()}",
+            modified_time=modified or email.modified_time or datetime.now().replace(microsecond=0),
+        )
+        self._folders.setdefault(folder, {})[email.entry_id] = stored
+        return stored
+
+    def update_email(self, entry_id: str, modified: Optional[datetime] = None, **changes: Any) -> bool:
+        """Change fields of an item and bump its modification time."""
+        for items in self._folders.values():
+            if entry_id in items:
+                items[entry_id] = replace(
+                    items[entry_id],
+                    modified_time=modified or datetime.now().replace(microsecond=0),
+                    **changes
+                )
+                return True
+        return False
+
+    def remove_email(self, entry_id: str) -> bool:
+        """Delete an item."""
+        for items in self._folders.values():
+            if items.pop(entry_id, None) is not None:
+                return True
+        return False
+
+    def move_email(self, entry_id: str, folder: FolderType, modified: Optional[datetime] = None) -> bool:
+        """Move an item to another folder (bumps its modification time, like Outlook)."""
+        for items in self._folders.values():
+            if entry_id in items:
+                self.add_email(
+                    folder, items.pop(entry_id),
+                    modified=modified or datetime.now().replace(microsecond=0)
+                )
+                return True
+        return False
+
+    def get_folder(self, folder: FolderType) -> Optional[EmailFolder]:
+        return EmailFolder(
+            name=folder.name.title(),
+            folder_type=folder,
+            entry_id=f"fake-{folder.name.lower()}",
+        )
+
+    def list_changes(
+        self,
+        folder: FolderType,
+        since: Optional[datetime],
+        limit: Optional[int] = None
+    ) -> Iterable[Email]:
+        self.list_calls += 1
+        items = list(self._folders.get(folder, {}).values())
+        if since is not None:
+            # Same minute precision as Outlook's Restrict
+            floor = since.replace(second=0, microsecond=0) - timedelta(minutes=1)
+            items = [e for e in items if e.modified_time and e.modified_time >= floor]
+            items.sort(key=lambda e: e.modified_time or datetime.min)
+        else:
+            items.sort(key=lambda e: e.received_time or datetime.min, reverse=True)
+        if limit is not None:
+            items = items[:limit]
+        return [replace(e, body="", body_html=None, body_loaded=False) for e in items]
+
+    def list_entry_ids(self, folder: FolderType) -> Optional[Set[str]]:
+        return set(self._folders.get(folder, {}))
+
+    def load_body(self, entry_id: str) -> Optional[Tuple[str, Optional[str]]]:
+        self.body_loads += 1
+        for items in self._folders.values():
+            if entry_id in items:
+                return items[entry_id].body, items[entry_id].body_html
+        return None
+
+
+class EmailSyncEngine:
+    """
+    Incremental mailbox sync into EmailCache.
+
+    One engine per thread (COM transports are thread-bound); the cache
+    itself is thread-safe.
+    """
+
+    def __init__(self, cache: EmailCache, transport: MailTransport, page_size: int = SYNC_PAGE_SIZE):
+        self.cache = cache
+        self.transport = transport
+        self.page_size = page_size
+
+    def sync_folder(self, folder: FolderType = FolderType.INBOX) -> SyncResult:
+        """
+        Pull new and changed items of a folder into the cache.
+
+        Returns:
+            SyncResult (error is set if the pass failed; the high-water
+            mark is only advanced for pages that were saved)
+        """
+        info = self.transport.get_folder(folder)
+        if info is None or not info.entry_id:
+            return SyncResult(folder_id="", error=f"Folder {folder.name} not available")
+
+        result = SyncResult(folder_id=info.entry_id, folder_name=info.name)
+        state = self.cache.get_sync_state(info.entry_id)
+        since = state['last_modified'] if state else None
+        seen = set(state['boundary_ids']) if state else set()
+        result.initial = since is None
+
+        # Running mark, advanced page by page
+        mark, boundary = since, set(seen)
+
+        page: List[Email] = []
+        try:
+            changes = self.transport.list_changes(
+                folder, since, limit=INITIAL_SYNC_LIMIT if since is None else None
+            )
+            for email in changes:
+                modified = email.modified_time
+                if since is not None and modified is not None:
+                    if modified < since or (modified == since and email.entry_id in seen):
+                        continue  # Already synced
+                result.fetched += 1
+                page.append(email)
+                if len(page) >= self.page_size:
+                    mark, boundary = self._flush(result, page, mark, boundary)
+                    page = []
+
+            if page:
+                mark, boundary = self._flush(result, page, mark, boundary)
+            elif result.fetched == 0:
+                # Record the sync time even when nothing changed
+                self.cache.save_sync_state(info.entry_id, info.name, mark, boundary, 0)
+
+            result.removed = self._reconcile(folder, info.entry_id)
+
+        except Exception as e:
+            result.error = str(e)
+            app_logger.error(f"Email sync failed for {info.name}: {e}")
+
+        result.high_water_mark = mark
+        if result.saved or result.removed:
+            app_logger.info(
+                f"Email sync {info.name}: {result.saved} new/changed, "
+                f"{result.removed} removed"
+                f"{' (initial)' if result.initial else ''}"
+            )
+        return result
+
+    def _reconcile(self, folder: FolderType, folder_id: str) -> int:
+        """
+        Drop cached emails of a folder that are no longer in it.
+
+        Deleted and moved items never come back from list_changes(), so
+        the cached EntryIDs are compared with the folder's current ones.
+        A moved item is picked up again by the sync of its new folder.
+
+        Returns:
+            Number of emails removed from the cache
+        """
+        current = self.transport.list_entry_ids(folder)
+        if current is None:
+            return 0  # Listing failed: never treat that as "folder is empty"
+        gone = self.cache.get_folder_entry_ids(folder_id) - current
+        if not gone:
+            return 0
+        return self.cache.delete_emails(gone)
+
+    def _flush(
+        self,
+        result: SyncResult,
+        page: List[Email],
+        mark: Optional[datetime],
+        boundary: Set[str]
+    ) -> Tuple[Optional[datetime], Set[str]]:
+        """Save one page and advance the high-water mark."""
+        saved = self.cache.save_synced_emails(page)
+        if saved != len(page):
+            raise RuntimeError("Failed to save synced emails to cache")
+        result.saved += saved
+
+        for email in page:
+            modified = email.modified_time
+            if modified is None:
+                continue
+            if mark is None or modified > mark:
+                mark, boundary = modified, {email.entry_id}
+            elif modified == mark:
+                boundary.add(email.entry_id)
+
+        self.cache.save_sync_state(result.folder_id, result.folder_name, mark, boundary, saved)
+        return mark, boundary
+
+    def ensure_body(self, email: Email) -> Email:
+        """
+        Load the body of a header-only email (when opened or analyzed).
+
+        Returns:
+            The same Email with body/body_html filled in if available
+        """
+        if email.body_loaded:
+            return email
+
+        # The background backfill may already have stored it
+        cached = self.cache.get_email(email.entry_id)
+        if cached is not None and cached.body_loaded:
+            email.body, email.body_html = cached.body, cached.body_html
+            email.body_loaded = True
+            return email
+
+        loaded = self.transport.load_body(email.entry_id)
+        if loaded is None:
+            return email
+
+        email.body, email.body_html = loaded
+        email.body_loaded = True
+        self.cache.save_body(email.entry_id, email.body, email.body_html)
+        return email
+
+    def load_pending_bodies(
+        self,
+        limit: int = BODY_BACKFILL_LIMIT,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> int:
+        """
+        Fetch bodies of the newest header-only emails (background backfill,
+        so body text becomes searchable without opening every email).
+
+        Saving a body re-indexes the email in the FTS5 search index.
+
+        Args:
+            limit: Maximum number of bodies to fetch
+            should_stop: Polled between emails; stops the backfill early
+
+        Returns:
+            Number of bodies loaded
+        """
+        loaded = 0
+        for email in self.cache.get_emails_without_body(limit):
+            if should_stop is not None and should_stop():
+                break
+            if self.ensure_body(email).body_loaded:
+                loaded += 1
+        return loaded
@@ -26,6 +26,104 @@ except ImportError:
     pythoncom = None
 
 
+OL_MAIL_ITEM_CLASS = 43     # olMail
+OL_FLAG_MARKED = 2          # olFlagMarked
+
+
+def parse_pytime(pytime) -> Optional[datetime]:
+    """Parse a COM PyTime value to a naive datetime."""
+    if pytime is None:
+        return None
+    try:
+        return datetime(
+            pytime.year, pytime.month, pytime.day,
+            pytime.hour, pytime.minute, pytime.second
+        )
+    except Exception:
+        return None
+
+
+def parse_mail_item(item, folder_name: str, include_body: bool = True) -> Optional[Email]:
+    """
+    Parse an Outlook mail item to an Email object.
+
+    Args:
+        item: Outlook MailItem
+        folder_name: Folder name stored on the Email
+        include_body: Read Body/HTMLBody (the expensive part). When False
+            the Email is header-only and body_loaded is False.
+
+    Returns:
+        Email or None if the item is not a mail item
+    """
+    try:
+        # Check if it's a mail item
+        if item.Class != OL_MAIL_ITEM_CLASS:
+            return None
+
+        # Get attachments
+        attachments = []
+        has_attachments = item.Attachments.Count > 0
+
+        if has_attachments:
+            for att in item.Attachments:
+                try:
+                    attachments.append(EmailAttachment(
+                        filename=att.FileName,
+                        size=att.Size,
+                    ))
+                except Exception:
+                    continue
+
+        # Get recipients
+        to_list = []
+        cc_list = []
+        try:
+            for recipient in item.Recipients:
+                if recipient.Type == 1:  # To
+                    to_list.append(recipient.Address or recipient.Name)
+                elif recipient.Type == 2:  # CC
+                    cc_list.append(recipient.Address or recipient.Name)
+        except Exception:
+            pass
+
+        # Get categories
+        categories = []
+        try:
+            if item.Categories:
+                categories = [c.strip() for c in item.Categories.split(',')]
+        except Exception:
+            pass
+
+        return Email(
+            entry_id=item.EntryID,
+            conversation_id=getattr(item, 'ConversationID', None),
+            subject=item.Subject or "(بدون موضوع)",
+            body=(item.Body or "") if include_body else "",
+            body_html=getattr(item, 'HTMLBody', None) if include_body else None,
+            body_loaded=include_body,
+            sender_name=getattr(item, 'SenderName', ''),
+            sender_email=getattr(item, 'SenderEmailAddress', ''),
+            to=to_list,
+            cc=cc_list,
+            received_time=parse_pytime(item.ReceivedTime),
+            sent_time=parse_pytime(getattr(item, 'SentOn', None)),
+            created_time=parse_pytime(getattr(item, 'CreationTime', None)),
+            modified_time=parse_pytime(getattr(item, 'LastModificationTime', None)),
+            is_read=not item.UnRead,
+            is_flagged=item.FlagStatus == OL_FLAG_MARKED,
+            importance=EmailImportance(item.Importance),
+            attachments=attachments,
+            has_attachments=has_attachments,
+            folder_name=folder_name,
+            categories=categories
+        )
+
+    except Exception as e:
+        app_logger.debug(f"Error parsing mail item: {e}")
+        return None
+
+
 class OutlookConnector:
     """
     Connector for Outlook Classic.
@@ -72,6 +170,11 @@ class OutlookConnector:
         """Check if connected to Outlook."""
         return self._connected and self._outlook is not None
 
+    @property
+    def namespace(self):
+        """MAPI namespace of the current connection (None if not connected)."""
+        return self._namespace
+
     @property
     def account_name(self) -> Optional[str]:
         """Get current account name."""
@@ -378,82 +481,11 @@ class OutlookConnector:
 
     def _parse_mail_item(self, item, folder_name: str) -> Optional[Email]:
         """Parse Outlook mail item to Email object."""
-        try:
-            # Check if it's a mail item
-            if item.Class != 43:  # 43 = olMail
-                return None
-
-            # Get attachments
-            attachments = []
-            has_attachments = item.Attachments.Count > 0
-
-            if has_attachments:
-                for att in item.Attachments:
-                    try:
-                        attachments.append(EmailAttachment(
-                            filename=att.FileName,
-                            size=att.Size,
-                        ))
-                    except Exception:
-                        continue
-
-            # Get recipients
-            to_list = []
-            cc_list = []
-            try:
-                for recipient in item.Recipients:
-                    if recipient.Type == 1:  # To
-                        to_list.append(recipient.Address or recipient.Name)
-                    elif recipient.Type == 2:  # CC
-                        cc_list.append(recipient.Address or recipient.Name)
-            except Exception:
-                pass
-
-            # Get categories
-            categories = []
-            try:
-                if item.Categories:
-                    categories = [c.strip() for c in item.Categories.split(',')]
-            except Exception:
-                pass
-
-            return Email(
-                entry_id=item.EntryID,
-                conversation_id=getattr(item, 'ConversationID', None),
-                subject=item.Subject or "(بدون موضوع)",
-                body=item.Body or "",
-                body_html=getattr(item, 'HTMLBody', None),
-                sender_name=getattr(item, 'SenderName', ''),
-                sender_email=getattr(item, 'SenderEmailAddress', ''),
-                to=to_list,
-                cc=cc_list,
-                received_time=self._parse_datetime(item.ReceivedTime),
-                sent_time=self._parse_datetime(getattr(item, 'SentOn', None)),
-                created_time=self._parse_datetime(getattr(item, 'CreationTime', None)),
-                is_read=not item.UnRead,
-                is_flagged=item.FlagStatus == 2,  # 2 = olFlagMarked
-                importance=EmailImportance(item.Importance),
-                attachments=attachments,
-                has_attachments=has_attachments,
-                folder_name=folder_name,
-                categories=categories
-            )
-
-        except Exception as e:
-            app_logger.debug(f"Error parsing mail item: {e}")
-            return None
+        return parse_mail_item(item, folder_name)
 
     def _parse_datetime(self, pytime) -> Optional[datetime]:
         """Parse PyTime to datetime."""
-        if pytime is None:
-            return None
-        try:
-            return datetime(
-                pytime.year, pytime.month, pytime.day,
-                pytime.hour, pytime.minute, pytime.second
-            )
-        except Exception:
-            return None
+        return parse_pytime(pytime)
 
     def get_email_by_id(self, entry_id: str) -> Optional[Email]:
         """Get a single email by its EntryID."""
@@ -0,0 +1,161 @@
+"""
+Email Search Normalizer
+=======================
+Arabic-aware text folding for the email full-text index.
+
+The FTS5 index stores a normalized shadow copy of subject/sender/body
+(alef variants -> ا, ى -> ي, ة -> ه, ؤ -> و, ئ -> ي, diacritics and
+tatweel removed), and queries are folded the same way, so "مدرسة"
+matches "مَدْرَسَه" and "إجازة" matches "اجازه".
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+
+# Character folding (1:1)
+_FOLD = {
+    'أ': 'ا',  # أ -> ا
+    'إ': 'ا',  # إ -> ا
+    'آ': 'ا',  # آ -> ا
+    'ٱ': 'ا',  # ٱ -> ا
+    'ى': 'ي',  # ى -> ي
+    'ة': 'ه',  # ة -> ه
+    'ؤ': 'و',  # ؤ -> و
+    'ئ': 'ي',  # ئ -> ي
+}
+
+# Dropped characters: harakat, superscript alef, Quranic marks, tatweel
+_DROP = frozenset(
+    [chr(c) for c in range(0x064B, 0x0660)]
+    + ['ٰ', 'ـ']
+    + [chr(c) for c in range(0x06D6, 0x06EE)]
+)
+
+_TRANSLATE = {ord(k): v for k, v in _FOLD.items()}
+_TRANSLATE.update({ord(c): None for c in _DROP})
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+SNIPPET_START = "\x02"      # Highlight markers passed to snippet()
+SNIPPET_END = "\x03"
+SNIPPET_ELLIPSIS = "..."
+
+
+def normalize_search_text(text: Optional[str]) -> str:
+    """Fold text for indexing/searching (Arabic folding + diacritics)."""
+    if not text:
+        return ""
+    return text.translate(_TRANSLATE)
+
+
+def normalize_with_map(text: str) -> Tuple[str, List[int]]:
+    """
+    Fold text and keep the original position of every output character.
+
+    Returns:
+        (normalized, positions) where positions[i] is the index in text
+        of normalized[i]
+    """
+    chars = []
+    positions = []
+    for i, ch in enumerate(text):
+        if ch in _DROP:
+            continue
+        chars.append(_FOLD.get(ch, ch))
+        positions.append(i)
+    return "".join(chars), positions
+
+
+def build_match_query(query: str, prefix: bool = True, match_any: bool = False) -> str:
+    """
+    Build a safe FTS5 MATCH expression from free text.
+
+    Every word is quoted (so FTS5 operators in user input are literal)
+    and, with prefix=True, matched as a prefix ("اجاز" finds "اجازه").
+
+    Returns:
+        MATCH expression, or "" if the query has no searchable words
+    """
+    terms = _TOKEN_RE.findall(normalize_search_text(query))
+    if not terms:
+        return ""
+    star = "*" if prefix else ""
+    parts = [f'"{term}"{star}' for term in terms]
+    return (" OR " if match_any else " ").join(parts)
+
+
+def query_terms(query: str) -> List[str]:
+    """Normalized, lower-cased words of a query."""
+    return [t.lower() for t in _TOKEN_RE.findall(normalize_search_text(query))]
+
+
+def restore_snippet(
+    original: Optional[str],
+    snippet: Optional[str],
+    start_mark: str = "[",
+    end_mark: str = "]",
+) -> str:
+    """
+    Map a snippet() of the normalized column back onto the original text.
+
+    snippet() runs on the folded shadow copy; this finds the fragment
+    in the folded original and rebuilds it from the original characters
+    (diacritics, ة, أ ... preserved) with start_mark/end_mark around the
+    matched terms.
+
+    Args:
+        original: Original column text
+        snippet: Output of snippet(..., SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS, n)
+        start_mark: Highlight start in the returned text
+        end_mark: Highlight end in the returned text
+    """
+    if not snippet:
+        return ""
+
+    lead = snippet.startswith(SNIPPET_ELLIPSIS)
+    trail = snippet.endswith(SNIPPET_ELLIPSIS)
+    body = snippet[len(SNIPPET_ELLIPSIS) if lead else 0:]
+    if trail:
+        body = body[:-len(SNIPPET_ELLIPSIS)]
+
+    # Split into (text, highlighted) segments
+    segments = []
+    for i, part in enumerate(body.split(SNIPPET_START)):
+        if i == 0:
+            segments.append((part, False))
+            continue
+        inner, _, rest = part.partition(SNIPPET_END)
+        segments.append((inner, True))
+        segments.append((rest, False))
+
+    plain = "".join(text for text, _ in segments)
+    fallback = body.replace(SNIPPET_START, start_mark).replace(SNIPPET_END, end_mark)
+
+    if not original:
+        return fallback
+    normalized, positions = normalize_with_map(original)
+    offset = normalized.find(plain)
+    if offset < 0 or not plain:
+        return fallback
+
+    def to_original(index: int) -> int:
+        return positions[index] if index < len(positions) else len(original)
+
+    out = []
+    cursor = offset
+    for text, highlighted in segments:
+        if not text:
+            continue
+        start = to_original(cursor)
+        cursor += len(text)
+        end = to_original(cursor)
+        fragment = original[start:end]
+        out.append(f"{start_mark}{fragment}{end_mark}" if highlighted else fragment)
+
+    result = "".join(out)
+    if lead:
+        result = SNIPPET_ELLIPSIS + result
+    if trail:
+        result += SNIPPET_ELLIPSIS
+    return result
@@ -3,22 +3,46 @@ DB Importer
 ============
 Import cleaned Excel/CSV data into PostgreSQL database.
 Supports: append, replace, and upsert modes.
+
+All modes go through one bulk path:
+1. Validation pre-pass against the target table's column metadata
+   (rejected rows are reported, not raised).
+2. Valid rows are streamed with COPY FROM STDIN into a temp staging table.
+3. One set-based INSERT ... SELECT (ON CONFLICT for upsert) merges the
+   staging table into the target.
+
+Everything runs in a single transaction, so a failed import leaves the
+target table untouched.
 """
 
-from typing import Dict, List, Any, Optional
+import math
+from datetime import date, datetime, time
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Any, Optional, Iterator, Tuple, Callable
+
 from core.logging import app_logger
 
 
+STAGING_TABLE = "_integra_import_staging"
+COPY_CHUNK_ROWS = 5000       # Rows formatted per read() from the COPY stream
+MAX_REPORTED_ERRORS = 10     # Errors kept in the short "errors" list
+
+_INTEGER_TYPES = {"smallint", "integer", "bigint"}
+_NUMERIC_TYPES = {"numeric", "decimal", "real", "double precision", "money"}
+_TEXT_TYPES = {"character varying", "character", "text"}
+_TIMESTAMP_TYPES = {"timestamp without time zone", "timestamp with time zone"}
+
+
 class DBImporter:
     """Import tabular data into the database."""
 
-    def __init__(self):
-        self._last_result = None
+    def __init__(self) -> None:
+        self._last_result: Optional[Dict[str, Any]] = None
 
-    def import_data(self, df, table_name: str,
+    def import_data(self, df: Any, table_name: str,
                     column_mapping: Dict[str, str],
                     mode: str = "append",
-                    key_columns: List[str] = None) -> Dict[str, Any]:
+                    key_columns: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Import DataFrame into a database table.
 
@@ -33,8 +57,6 @@ class DBImporter:
             Dict with import results
         """
         try:
-            from core.database import select_all, insert
-
             # Apply column mapping
             df_mapped = df.rename(columns=column_mapping)
             valid_columns = list(column_mapping.values())
@@ -51,110 +73,161 @@ class DBImporter:
             app_logger.error(f"Import failed: {e}")
             return {"success": False, "message": str(e), "imported_rows": 0}
 
-    def _import_append(self, df, table_name: str,
+    def _import_append(self, df: Any, table_name: str,
                        columns: List[str]) -> Dict[str, Any]:
         """Insert new rows."""
-        from core.database import insert
-
-        imported = 0
-        errors = []
+        return self._bulk_import(df, table_name, columns, mode="append")
 
-        cols_str = ", ".join(columns)
-        placeholders = ", ".join(["%s"] * len(columns))
-        query = f"INSERT INTO {table_name} ({cols_str}) VALUES ({placeholders})"
-
-        for idx, row in df.iterrows():
-            try:
-                values = tuple(
-                    None if _is_nan(row[col]) else row[col]
-                    for col in columns
-                )
-                insert(query, values)
-                imported += 1
-            except Exception as e:
-                errors.append({"row": int(idx), "error": str(e)})
-
-        result = {
-            "success": True,
-            "mode": "append",
-            "table": table_name,
-            "imported_rows": imported,
-            "error_rows": len(errors),
-            "errors": errors[:10],  # First 10 errors
-        }
-        self._last_result = result
-        app_logger.info(f"Imported {imported} rows into {table_name}")
-        return result
-
-    def _import_replace(self, df, table_name: str,
+    def _import_replace(self, df: Any, table_name: str,
                         columns: List[str]) -> Dict[str, Any]:
-        """Truncate and insert."""
-        from core.database import insert, select_all
+        """Truncate and insert (in the same transaction)."""
+        return self._bulk_import(df, table_name, columns, mode="replace")
 
-        # Get current count
-        try:
-            _, rows = select_all(f"SELECT COUNT(*) FROM {table_name}")
-            old_count = rows[0][0] if rows else 0
-        except Exception:
-            old_count = 0
-
-        # Truncate
-        try:
-            insert(f"TRUNCATE TABLE {table_name} CASCADE")
-        except Exception as e:
-            return {"success": False, "message": f"Truncate failed: {e}"}
-
-        # Insert all
-        result = self._import_append(df, table_name, columns)
-        result["mode"] = "replace"
-        result["previous_rows"] = old_count
-        return result
-
-    def _import_upsert(self, df, table_name: str,
+    def _import_upsert(self, df: Any, table_name: str,
                        columns: List[str],
                        key_columns: List[str]) -> Dict[str, Any]:
         """Upsert (insert or update on conflict)."""
-        from core.database import insert
-
-        imported = 0
-        updated = 0
-        errors = []
-
-        cols_str = ", ".join(columns)
-        placeholders = ", ".join(["%s"] * len(columns))
-        key_str = ", ".join(key_columns)
-        update_cols = [c for c in columns if c not in key_columns]
-        update_str = ", ".join([f"{c} = EXCLUDED.{c}" for c in update_cols])
-
-        query = f"""
-            INSERT INTO {table_name} ({cols_str})
-            VALUES ({placeholders})
-            ON CONFLICT ({key_str}) DO UPDATE SET {update_str}
+        return self._bulk_import(df, table_name, columns, mode="upsert",
+                                 key_columns=key_columns)
+
+    def _bulk_import(self, df: Any, table_name: str, columns: List[str],
+                     mode: str,
+                     key_columns: Optional[List[str]] = None) -> Dict[str, Any]:
         """
+        Validate, COPY into staging, and merge into the target table.
 
-        for idx, row in df.iterrows():
-            try:
-                values = tuple(
-                    None if _is_nan(row[col]) else row[col]
-                    for col in columns
+        Args:
+            df: Mapped DataFrame (columns already renamed to DB columns)
+            table_name: Target table ('table' or 'schema.table')
+            columns: DB columns to import
+            mode: 'append', 'replace', or 'upsert'
+            key_columns: Conflict target for upsert mode
+
+        Returns:
+            Dict with import results
+        """
+        from psycopg2 import sql
+        from core.database.connection import get_connection, return_connection
+
+        key_columns = list(key_columns or [])
+        conn = None
+        cursor = None
+        try:
+            conn = get_connection()
+            if conn is None:
+                return {"success": False, "message": "No database connection",
+                        "imported_rows": 0}
+            cursor = conn.cursor()
+
+            schema, table = _split_table_name(table_name)
+            metadata = _get_column_metadata(cursor, schema, table)
+            if not metadata:
+                conn.rollback()
+                return {"success": False,
+                        "message": f"Table not found: {table_name}",
+                        "imported_rows": 0}
+
+            unknown = [c for c in columns + key_columns if c not in metadata]
+            if unknown:
+                conn.rollback()
+                return {"success": False,
+                        "message": f"Unknown columns in {table_name}: {', '.join(unknown)}",
+                        "imported_rows": 0}
+
+            valid_rows, rejects = validate_rows(df, columns, metadata, key_columns)
+
+            target = sql.Identifier(*([schema, table] if schema else [table]))
+            staging = sql.Identifier(STAGING_TABLE)
+            col_list = sql.SQL(", ").join(sql.Identifier(c) for c in columns)
+
+            previous_rows = None
+            if mode == "replace":
+                cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(target))
+                previous_rows = cursor.fetchone()[0]
+                cursor.execute(sql.SQL("TRUNCATE TABLE {} CASCADE").format(target))
+
+            # Staging table: same column types as the target, dropped on commit
+            cursor.execute(sql.SQL(
+                "CREATE TEMP TABLE {} ON COMMIT DROP AS "
+                "SELECT {} FROM {} WITH NO DATA"
+            ).format(staging, col_list, target))
+
+            # Rendered with the cursor: pooled connections are proxies that
+            # psycopg2's as_string() does not accept
+            cursor.copy_expert(
+                sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+                    staging, col_list
+                ).as_string(cursor),
+                _CopyStream(valid_rows),
+            )
+
+            merge = sql.SQL("INSERT INTO {} ({}) SELECT {} FROM {}").format(
+                target, col_list, col_list, staging
+            )
+            updated = 0
+            if mode == "upsert":
+                update_cols = [c for c in columns if c not in key_columns]
+                if update_cols:
+                    action = sql.SQL("DO UPDATE SET {}").format(
+                        sql.SQL(", ").join(
+                            sql.SQL("{} = EXCLUDED.{}").format(
+                                sql.Identifier(c), sql.Identifier(c)
+                            )
+                            for c in update_cols
+                        )
+                    )
+                else:
+                    action = sql.SQL("DO NOTHING")
+                merge = merge + sql.SQL(" ON CONFLICT ({}) {} RETURNING (xmax = 0)").format(
+                    sql.SQL(", ").join(sql.Identifier(c) for c in key_columns),
+                    action,
                 )
-                insert(query, values)
-                imported += 1
-            except Exception as e:
-                errors.append({"row": int(idx), "error": str(e)})
+                cursor.execute(merge)
+                flags = cursor.fetchall()
+                imported = sum(1 for (inserted,) in flags if inserted)
+                updated = len(flags) - imported
+            else:
+                cursor.execute(merge)
+                imported = cursor.rowcount
+
+            conn.commit()
+
+        except Exception as e:
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            app_logger.error(f"Bulk import into {table_name} failed: {e}")
+            return {"success": False, "mode": mode, "table": table_name,
+                    "message": str(e), "imported_rows": 0}
+        finally:
+            if cursor:
+                cursor.close()
+            return_connection(conn)
 
         result = {
             "success": True,
-            "mode": "upsert",
+            "mode": mode,
             "table": table_name,
             "imported_rows": imported,
-            "error_rows": len(errors),
-            "errors": errors[:10],
+            "error_rows": len(rejects),
+            "errors": rejects[:MAX_REPORTED_ERRORS],
+            "rejects": rejects,
         }
+        if mode == "upsert":
+            result["updated_rows"] = updated
+        if previous_rows is not None:
+            result["previous_rows"] = previous_rows
+
         self._last_result = result
+        app_logger.info(
+            f"Imported {imported} rows into {table_name} "
+            f"({mode}, {len(rejects)} rejected)"
+        )
         return result
 
-    def preview_mapping(self, df, column_mapping: Dict[str, str],
+    def preview_mapping(self, df: Any, column_mapping: Dict[str, str],
                         rows: int = 5) -> Dict[str, Any]:
         """
         Preview the mapped data before importing.
@@ -183,10 +256,250 @@ class DBImporter:
         return self._last_result
 
 
-def _is_nan(value) -> bool:
+# ============================================================
+# Validation pre-pass
+# ============================================================
+
+def validate_rows(df: Any, columns: List[str],
+                  metadata: Dict[str, Dict[str, Any]],
+                  key_columns: Optional[List[str]] = None
+                  ) -> Tuple[List[Tuple[Any, ...]], List[Dict[str, Any]]]:
+    """
+    Coerce DataFrame rows to the target column types.
+
+    Args:
+        df: Mapped DataFrame
+        columns: DB columns, in import order
+        metadata: Column metadata from _get_column_metadata()
+        key_columns: Upsert key columns (duplicates in the file are rejected)
+
+    Returns:
+        Tuple of (valid row tuples, list of {"row", "column", "error"} rejects)
+    """
+    converters = [_make_converter(metadata[col]) for col in columns]
+    key_positions = [columns.index(c) for c in (key_columns or []) if c in columns]
+
+    valid_rows: List[Tuple[Any, ...]] = []
+    rejects: List[Dict[str, Any]] = []
+    seen_keys: Dict[Tuple[Any, ...], Any] = {}
+
+    for idx, raw in zip(df.index, df.itertuples(index=False, name=None)):
+        row = []
+        error = None
+        for col, convert, value in zip(columns, converters, raw):
+            try:
+                row.append(convert(None if _is_nan(value) else value))
+            except (TypeError, ValueError, InvalidOperation) as e:
+                error = {"row": _row_label(idx), "column": col, "error": str(e)}
+                break
+
+        if error is None and key_positions:
+            key = tuple(row[i] for i in key_positions)
+            if key in seen_keys:
+                error = {
+                    "row": _row_label(idx),
+                    "column": ", ".join(key_columns or []),
+                    "error": f"Duplicate key in file (first seen at row {seen_keys[key]})",
+                }
+            else:
+                seen_keys[key] = _row_label(idx)
+
+        if error is None:
+            valid_rows.append(tuple(row))
+        else:
+            rejects.append(error)
+
+    return valid_rows, rejects
+
+
+def _make_converter(meta: Dict[str, Any]) -> Callable[[Any], Any]:
+    """Build a value converter for one target column."""
+    data_type = meta["data_type"]
+    required = meta["is_nullable"] == "NO" and meta["column_default"] is None
+    max_length = meta.get("character_maximum_length")
+
+    cast: Callable[[Any], Any]
+    if data_type in _INTEGER_TYPES:
+        cast = _to_int
+    elif data_type in _NUMERIC_TYPES:
+        cast = _to_decimal
+    elif data_type == "boolean":
+        cast = _to_bool
+    elif data_type == "date":
+        cast = _to_date
+    elif data_type in _TIMESTAMP_TYPES:
+        cast = _to_datetime
+    else:
+        cast = _to_text
+
+    def convert(value: Any) -> Any:
+        if value is None or (isinstance(value, str) and not value.strip()
+                             and data_type not in _TEXT_TYPES):
+            if required:
+                raise ValueError("Value is required")
+            return None
+        result = cast(value)
+        if max_length and isinstance(result, str) and len(result) > max_length:
+            raise ValueError(f"Value longer than {max_length} characters")
+        return result
+
+    return convert
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"Not an integer: {value}")
+        return int(value)
+    if isinstance(value, str):
+        value = value.strip().replace(",", "")
+        number = Decimal(value)
+        if number != number.to_integral_value():
+            raise ValueError(f"Not an integer: {value}")
+        return int(number)
+    return int(value)
+
+
+def _to_decimal(value: Any) -> Decimal:
+    if isinstance(value, str):
+        value = value.strip().replace(",", "")
+    return Decimal(str(value))
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in ("true", "t", "yes", "y", "1", "نعم"):
+            return True
+        if text in ("false", "f", "no", "n", "0", "لا"):
+            return False
+        raise ValueError(f"Not a boolean: {value}")
+    return bool(value)
+
+
+def _to_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if hasattr(value, "to_pydatetime"):
+        converted: datetime = value.to_pydatetime()
+        return converted.date()
+    return datetime.fromisoformat(str(value).strip()).date()
+
+
+def _to_datetime(value: Any) -> datetime:
+    if hasattr(value, "to_pydatetime"):
+        converted: datetime = value.to_pydatetime()
+        return converted
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, time())
+    return datetime.fromisoformat(str(value).strip())
+
+
+def _to_text(value: Any) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+# ============================================================
+# COPY helpers
+# ============================================================
+
+class _CopyStream:
+    """
+    File-like object that formats rows as CSV on demand for COPY FROM STDIN.
+
+    Only COPY_CHUNK_ROWS rows are formatted at a time, so the CSV text for
+    the whole import is never held in memory at once.
+    """
+
+    def __init__(self, rows: List[Tuple[Any, ...]]):
+        self._rows: Iterator[Tuple[Any, ...]] = iter(rows)
+        self._buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            chunk = self._next_chunk()
+            if not chunk:
+                break
+            self._buffer += chunk
+
+        if size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def _next_chunk(self) -> str:
+        lines = []
+        for row in self._rows:
+            lines.append(",".join(_csv_field(v) for v in row))
+            if len(lines) >= COPY_CHUNK_ROWS:
+                break
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _csv_field(value: Any) -> str:
+    """Format one value for COPY CSV (unquoted empty field means NULL)."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    text = str(value)
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _split_table_name(table_name: str) -> Tuple[Optional[str], str]:
+    """Split 'schema.table' into (schema, table)."""
+    if "." in table_name:
+        schema, table = table_name.split(".", 1)
+        return schema, table
+    return None, table_name
+
+
+def _get_column_metadata(cursor: Any, schema: Optional[str],
+                         table: str) -> Dict[str, Dict[str, Any]]:
+    """Read column types and constraints from information_schema."""
+    cursor.execute(
+        """
+        SELECT column_name, data_type, is_nullable, column_default,
+               character_maximum_length
+        FROM information_schema.columns
+        WHERE table_name = %s
+          AND table_schema = COALESCE(%s, current_schema())
+        """,
+        (table, schema),
+    )
+    return {
+        name: {
+            "data_type": data_type,
+            "is_nullable": is_nullable,
+            "column_default": default,
+            "character_maximum_length": max_length,
+        }
+        for name, data_type, is_nullable, default, max_length in cursor.fetchall()
+    }
+
+
+def _row_label(idx: Any) -> Any:
+    """Row label for reports (int where possible)."""
+    try:
+        return int(idx)
+    except (TypeError, ValueError):
+        return str(idx)
+
+
+def _is_nan(value: Any) -> bool:
     """Check if a value is NaN."""
     try:
-        import math
         if isinstance(value, float) and math.isnan(value):
             return True
     except (TypeError, ValueError):
@@ -8,10 +8,10 @@ Features:
 - AI column type detection
 - Automatic data cleaning
 - Column-to-DB mapping suggestions
-- Database import with multiple modes
+- Database import with multiple modes (bulk COPY + set-based merge)
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 
 from core.logging import app_logger
 from .column_detector import ColumnDetector, ColumnAnalysis, ColumnType
@@ -201,6 +201,48 @@ class ExcelAIEngine:
             self.df, table_name, column_mapping, mode, key_columns
         )
 
+    @classmethod
+    def create_import_processor(cls, table_name: str,
+                                column_mapping: Dict[str, str],
+                                mode: str = "append",
+                                key_columns: List[str] = None,
+                                clean: bool = True) -> Callable[[str], bool]:
+        """
+        Build a HotFolder processor that loads, cleans and bulk-imports a file.
+
+        Args:
+            table_name: Target table
+            column_mapping: Column mapping
+            mode: 'append', 'replace', or 'update'
+            key_columns: Key columns for upsert mode
+            clean: Run automatic cleaning before import
+
+        Returns:
+            Callable taking a file path and returning True on success
+        """
+        def process(file_path: str) -> bool:
+            engine = cls(file_path)
+            ok, message = engine.load()
+            if not ok:
+                app_logger.error(f"Hot folder import failed to load {file_path}: {message}")
+                return False
+            if clean:
+                engine.clean_data()
+
+            result = engine.import_to_database(
+                table_name, column_mapping, mode, key_columns
+            )
+            if not result.get("success"):
+                return False
+            if result.get("error_rows"):
+                app_logger.warning(
+                    f"Hot folder import of {file_path}: "
+                    f"{result['error_rows']} rows rejected"
+                )
+            return True
+
+        return process
+
     def get_data_quality_report(self) -> Dict[str, Any]:
         """Get a quality report for the loaded data."""
         return self._cleaner.get_data_quality_report()
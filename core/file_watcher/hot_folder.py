@@ -30,6 +30,18 @@ INTEGRA - نظام Hot Folder للاستيراد التلقائي
 
     # لاحقاً
     hot_folder.stop()
+
+استيراد Excel/CSV مباشرة لقاعدة البيانات (COPY دفعة واحدة):
+    from core.file_manager import ExcelAIEngine
+
+    hot_folder = HotFolder(
+        base_path="/path/to/imports",
+        processor=ExcelAIEngine.create_import_processor(
+            "employees", {"الاسم": "name_ar"}, mode="update",
+            key_columns=["employee_code"]
+        ),
+        extensions=[".xlsx", ".csv"]
+    )
 """
 
 import os
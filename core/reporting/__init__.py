@@ -71,6 +71,8 @@ from .report_engine import (
     ReportConfig,
     ReportSection,
     ReportElement,
+    BatchResult,
+    BatchItemResult,
     get_report_engine
 )
 
@@ -85,6 +87,7 @@ from .pdf_generator import (
 # Excel Generator
 from .excel_generator import (
     ExcelGenerator,
+    StreamingExcelGenerator,
     ExcelConfig,
     create_excel_report,
     EXCEL_AVAILABLE
@@ -104,6 +107,7 @@ from .template_engine import (
     TemplateConfig,
     TemplateSource,
     get_template_engine,
+    invalidate_template,
     render_template,
     render_string_template
 )
@@ -127,6 +131,15 @@ from .data_binding import (
     create_company_source
 )
 
+# Computed field expressions
+from .expressions import (
+    CompiledExpression,
+    ExpressionError,
+    EXPRESSION_FUNCTIONS,
+    compile_expression,
+    evaluate_expression
+)
+
 # Preview & Print
 from .preview import (
     ReportPreviewWindow,
@@ -201,6 +214,8 @@ __all__ = [
     'ReportConfig',
     'ReportSection',
     'ReportElement',
+    'BatchResult',
+    'BatchItemResult',
     'get_report_engine',
     # PDF
     'PDFGenerator',
@@ -209,6 +224,7 @@ __all__ = [
     'PDF_AVAILABLE',
     # Excel
     'ExcelGenerator',
+    'StreamingExcelGenerator',
     'ExcelConfig',
     'create_excel_report',
     'EXCEL_AVAILABLE',
@@ -222,6 +238,7 @@ __all__ = [
     'TemplateConfig',
     'TemplateSource',
     'get_template_engine',
+    'invalidate_template',
     'render_template',
     'render_string_template',
     'TEMPLATE_FILTERS',
@@ -238,6 +255,12 @@ __all__ = [
     'create_employee_source',
     'create_department_source',
     'create_company_source',
+    # Expressions
+    'CompiledExpression',
+    'ExpressionError',
+    'EXPRESSION_FUNCTIONS',
+    'compile_expression',
+    'evaluate_expression',
     # Preview & Print
     'ReportPreviewWindow',
     'PrintConfig',
@@ -8,18 +8,198 @@ Features:
 - Data transformations
 - Aggregation functions
 - Parameters and filters
-- Caching support
+- Caching support (bounded LRU, invalidated by table changes; only
+  results of tables with change notifications are cached by default)
 - Virtual/computed fields
 """
 
-from typing import Dict, Any, List, Optional, Callable, Union
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Callable, Union, Iterable, Set, Tuple, FrozenSet
 from dataclasses import dataclass, field
 from enum import Enum
-from datetime import datetime, date
 from decimal import Decimal
+import hashlib
+import json
 import re
+import sys
+import threading
+import time
 
 from core.logging import app_logger
+from .expressions import ExpressionError, compile_expression
+
+
+# Result cache limits
+CACHE_MAX_ENTRIES = 256
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_SIZE_SAMPLE_ROWS = 50     # Rows measured to estimate a result's size
+
+# Tables read by a raw query (FROM / JOIN targets)
+_QUERY_TABLE_RE = re.compile(
+    r'\b(?:FROM|JOIN)\s+((?:"[^"]+"|\w+)(?:\.(?:"[^"]+"|\w+))?)',
+    re.IGNORECASE
+)
+
+
+# BI views (core.bi.views_manager) are built from the employee data tables
+BI_VIEWS_SCHEMA = "bi_views"
+EMPLOYEE_DATA_TABLES = frozenset({
+    "employees", "companies", "departments", "job_titles",
+    "banks", "employee_statuses", "nationalities",
+})
+
+
+def _table_key(table: str) -> str:
+    """Normalized table name (no schema, quotes or case)."""
+    return table.strip().split()[0].split(".")[-1].strip('"').lower()
+
+
+def _base_tables(table: str) -> Set[str]:
+    """Tables actually read for a table or view name."""
+    parts = table.strip().split()[0].split(".")
+    if len(parts) > 1 and parts[0].strip('"').lower() == BI_VIEWS_SCHEMA:
+        return set(EMPLOYEE_DATA_TABLES)
+    return {_table_key(table)}
+
+
+def _dependent_tables(table: str, base_only: bool = False) -> Set[str]:
+    """
+    Tables whose changes affect a table or view name.
+
+    Only tables watched by core.database.listener (WATCHED_TABLES) evict
+    cached results when they change. Results that read any other table
+    (payroll, attendance, ...) would only expire after cache_ttl, so they
+    are not cached unless the source sets cache_unwatched=True.
+
+    Args:
+        table: Table or view name ('schema.name' allowed)
+        base_only: Leave out the view name itself (coverage checks)
+    """
+    tables = _base_tables(table)
+    if not base_only:
+        tables.add(_table_key(table))
+    return tables
+
+
+def query_tables(query: str, base_only: bool = False) -> Set[str]:
+    """Tables referenced by FROM/JOIN clauses of a query."""
+    tables: Set[str] = set()
+    for name in _QUERY_TABLE_RE.findall(query or ""):
+        tables.update(_dependent_tables(name, base_only))
+    return tables
+
+
+def _estimate_size(data: List[Dict[str, Any]]) -> int:
+    """Approximate memory used by a result (sampled)."""
+    if not data:
+        return sys.getsizeof(data)
+    sample = data[:CACHE_SIZE_SAMPLE_ROWS]
+    sampled = sum(
+        sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row.values())
+        for row in sample
+    )
+    return sys.getsizeof(data) + sampled * len(data) // len(sample)
+
+
+class _ResultCache:
+    """
+    LRU cache of fetched results, bounded by entries and estimated bytes.
+
+    Each entry is tagged with its source and the tables it read, so a
+    change to a table evicts every result built from it.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key: (data, expires, source, tables, size)
+        self._by_table: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[1] < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, data: List[Dict[str, Any]], ttl: float, source: str, tables: Iterable[str]) -> None:
+        size = _estimate_size(data)
+        if size > self.max_bytes:
+            return
+        tables = frozenset(tables)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (data, time.monotonic() + ttl, source, tables, size)
+            self._bytes += size
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, _, _, tables, size = self._entries.pop(key)
+        self._bytes -= size
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for table in tables:
+                keys.update(self._by_table.get(_table_key(table), ()))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def invalidate_source(self, source: str) -> int:
+        with self._lock:
+            keys = [k for k, entry in self._entries.items() if entry[2] == source]
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "tables": len(self._by_table),
+            }
 
 
 class DataSourceType(Enum):
@@ -150,6 +330,8 @@ class DataSourceConfig:
     # Caching
     cache_enabled: bool = True
     cache_ttl: int = 300  # seconds
+    cache_tables: List[str] = field(default_factory=list)  # Extra tables that invalidate results
+    cache_unwatched: bool = False  # Cache even if a table has no change notifications (TTL only)
 
     # Function source
     data_function: Optional[Callable] = None
@@ -165,10 +347,16 @@ class DataBindingManager:
     Handles data fetching, transformation, and formatting.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache_max_entries: int = CACHE_MAX_ENTRIES,
+        cache_max_bytes: int = CACHE_MAX_BYTES
+    ):
         """Initialize data binding manager."""
         self._sources: Dict[str, DataSourceConfig] = {}
-        self._cache: Dict[str, tuple] = {}  # key: (data, timestamp)
+        self._cache = _ResultCache(cache_max_entries, cache_max_bytes)
+        self._listener_connected = False
+        self._watched_tables: FrozenSet[str] = frozenset()  # Evicted on change
         self._formatters: Dict[str, Callable] = {}
         self._transformers: Dict[str, Callable] = {}
 
@@ -214,6 +402,8 @@ class DataBindingManager:
         Args:
             config: Data source configuration
         """
+        if config.name in self._sources:
+            self._invalidate_cache(config.name)
         self._sources[config.name] = config
         app_logger.debug(f"Registered data source: {config.name}")
 
@@ -271,18 +461,31 @@ class DataBindingManager:
         config = self._sources[source_name]
         params = {**config.parameters, **(parameters or {})}
 
+        # Build the query first: it is part of the cache key
+        query, query_params = None, ()
+        try:
+            if config.source_type == DataSourceType.DATABASE:
+                query, query_params = self._build_database_query(config, params)
+            elif config.source_type == DataSourceType.QUERY:
+                query, query_params = self._build_raw_query(config, params)
+        except Exception as e:
+            app_logger.error(f"Query build error: {e}")
+            return []
+
         # Check cache
-        cache_key = f"{source_name}:{hash(str(sorted(params.items())))}"
-        if use_cache and config.cache_enabled:
-            cached = self._get_from_cache(cache_key, config.cache_ttl)
-            if cached is not None:
-                return cached
+        caching = config.cache_enabled
+        if caching:
+            cache_key = self._cache_key(source_name, query, query_params, params)
+            if use_cache:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    return cached
 
         # Fetch based on source type
         if config.source_type == DataSourceType.DATABASE:
-            data = self._fetch_from_database(config, params)
+            data = self._fetch_from_database(config, params, query, query_params)
         elif config.source_type == DataSourceType.QUERY:
-            data = self._fetch_from_query(config, params)
+            data = self._fetch_from_query(config, params, query, query_params)
         elif config.source_type == DataSourceType.FUNCTION:
             data = self._fetch_from_function(config, params)
         elif config.source_type == DataSourceType.STATIC:
@@ -293,70 +496,125 @@ class DataBindingManager:
         # Apply transformations
         data = self._apply_transformations(data, config)
 
-        # Cache result
-        if config.cache_enabled:
-            self._cache[cache_key] = (data, datetime.now())
+        # Cache result (only if a change to its tables evicts it)
+        if caching and (config.cache_unwatched or self._is_watched(config, query)):
+            self._cache.put(
+                cache_key, data, config.cache_ttl, source_name,
+                self._source_tables(config, query)
+            )
 
         return data
 
-    def _fetch_from_database(
+    @staticmethod
+    def _cache_key(
+        source_name: str,
+        query: Optional[str],
+        query_params: tuple,
+        params: Dict[str, Any]
+    ) -> str:
+        """Stable key of a fetch (same across processes and runs)."""
+        if query is not None:
+            # Parameters that did not reach the query do not change the result
+            payload = [source_name, " ".join(query.split()), list(query_params)]
+        else:
+            payload = [source_name, sorted(params.items())]
+        raw = json.dumps(payload, default=str, ensure_ascii=False)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _source_tables(
+        config: DataSourceConfig,
+        query: Optional[str],
+        base_only: bool = False
+    ) -> Set[str]:
+        """Tables whose changes invalidate results of a source."""
+        tables = {_table_key(t) for t in config.cache_tables if t}
+        if config.source_type == DataSourceType.DATABASE:
+            if config.table:
+                tables.update(_dependent_tables(config.table, base_only))
+            for join in config.joins:
+                if join.get("table"):
+                    tables.update(_dependent_tables(join["table"], base_only))
+        elif query:
+            tables.update(query_tables(query, base_only))
+        return tables
+
+    def _is_watched(self, config: DataSourceConfig, query: Optional[str]) -> bool:
+        """Would every table a source reads evict its results on change?"""
+        tables = self._source_tables(config, query, base_only=True)
+        return bool(tables) and tables <= self._watched_tables
+
+    def _build_database_query(
         self,
         config: DataSourceConfig,
         params: Dict[str, Any]
+    ) -> Tuple[str, tuple]:
+        """Build the SELECT for a table source."""
+        # Build field list
+        fields = "*"
+        if config.field_names:
+            fields = ", ".join(config.field_names)
+        elif config.fields:
+            fields = ", ".join(f.source_field for f in config.fields)
+
+        # Build query
+        query = f"SELECT {fields} FROM {config.table}"
+
+        # Add joins
+        for join in config.joins:
+            join_type = join.get("type", "INNER")
+            query += f" {join_type} JOIN {join['table']} ON {join['on']}"
+
+        # Add filters
+        where_clauses = []
+        query_params = []
+
+        for filter_cond in config.filters:
+            clause, param = self._build_filter_clause(filter_cond, params)
+            if clause:
+                where_clauses.append(clause)
+                if param is not None:
+                    query_params.append(param)
+
+        if where_clauses:
+            query += " WHERE " + " AND ".join(where_clauses)
+
+        # Add GROUP BY
+        if config.group_by:
+            query += " GROUP BY " + ", ".join(config.group_by)
+
+        # Add ORDER BY
+        if config.order_by:
+            order_clauses = [
+                f"{o.field} {o.direction.value}"
+                for o in config.order_by
+            ]
+            query += " ORDER BY " + ", ".join(order_clauses)
+
+        # Add LIMIT/OFFSET
+        if config.limit > 0:
+            query += f" LIMIT {config.limit}"
+        if config.offset > 0:
+            query += f" OFFSET {config.offset}"
+
+        return query, tuple(query_params)
+
+    def _fetch_from_database(
+        self,
+        config: DataSourceConfig,
+        params: Dict[str, Any],
+        query: Optional[str] = None,
+        query_params: tuple = ()
     ) -> List[Dict[str, Any]]:
         """Fetch data from database table."""
         try:
             from core.database import select_all
 
-            # Build field list
-            fields = "*"
-            if config.field_names:
-                fields = ", ".join(config.field_names)
-            elif config.fields:
-                fields = ", ".join(f.source_field for f in config.fields)
-
-            # Build query
-            query = f"SELECT {fields} FROM {config.table}"
-
-            # Add joins
-            for join in config.joins:
-                join_type = join.get("type", "INNER")
-                query += f" {join_type} JOIN {join['table']} ON {join['on']}"
-
-            # Add filters
-            where_clauses = []
-            query_params = []
-
-            for filter_cond in config.filters:
-                clause, param = self._build_filter_clause(filter_cond, params)
-                if clause:
-                    where_clauses.append(clause)
-                    if param is not None:
-                        query_params.append(param)
-
-            if where_clauses:
-                query += " WHERE " + " AND ".join(where_clauses)
-
-            # Add GROUP BY
-            if config.group_by:
-                query += " GROUP BY " + ", ".join(config.group_by)
-
-            # Add ORDER BY
-            if config.order_by:
-                order_clauses = [
-                    f"{o.field} {o.direction.value}"
-                    for o in config.order_by
-                ]
-                query += " ORDER BY " + ", ".join(order_clauses)
-
-            # Add LIMIT/OFFSET
-            if config.limit > 0:
-                query += f" LIMIT {config.limit}"
-            if config.offset > 0:
-                query += f" OFFSET {config.offset}"
+            if query is None:
+                query, query_params = self._build_database_query(config, params)
 
             # Execute
-            columns, rows = select_all(query, tuple(query_params) if query_params else None)
+            columns, rows = select_all(query, query_params or None)
 
             # Convert to dicts
             return [dict(zip(columns, row)) for row in rows]
@@ -365,26 +623,36 @@ class DataBindingManager:
             app_logger.error(f"Database fetch error: {e}")
             return []
 
-    def _fetch_from_query(
+    def _build_raw_query(
         self,
         config: DataSourceConfig,
         params: Dict[str, Any]
+    ) -> Tuple[str, tuple]:
+        """Replace named parameters (:name) of a raw query."""
+        query = config.query
+        query_params = []
+        for name, value in params.items():
+            placeholder = f":{name}"
+            if placeholder in query:
+                query = query.replace(placeholder, "%s")
+                query_params.append(value)
+        return query, tuple(query_params)
+
+    def _fetch_from_query(
+        self,
+        config: DataSourceConfig,
+        params: Dict[str, Any],
+        query: Optional[str] = None,
+        query_params: tuple = ()
     ) -> List[Dict[str, Any]]:
         """Fetch data from raw query."""
         try:
             from core.database import select_all
 
-            query = config.query
+            if query is None:
+                query, query_params = self._build_raw_query(config, params)
 
-            # Replace named parameters
-            query_params = []
-            for name, value in params.items():
-                placeholder = f":{name}"
-                if placeholder in query:
-                    query = query.replace(placeholder, "%s")
-                    query_params.append(value)
-
-            columns, rows = select_all(query, tuple(query_params) if query_params else None)
+            columns, rows = select_all(query, query_params or None)
             return [dict(zip(columns, row)) for row in rows]
 
         except Exception as e:
@@ -449,28 +717,51 @@ class DataBindingManager:
         if not config.fields:
             return data
 
+        # Computed fields: evaluated per column with compiled expressions
+        computed: Dict[int, List[Any]] = {}
+        for position, binding in enumerate(config.fields):
+            if binding.is_computed and binding.expression:
+                try:
+                    computed[position] = compile_expression(binding.expression).evaluate_many(data)
+                except ExpressionError as e:
+                    app_logger.warning(f"Invalid computed field {binding.target_field}: {e}")
+                    computed[position] = [None] * len(data)
+
+        # Resolve each binding once: (target, computed column, source,
+        # default, transform, formatter, formatter options)
+        plan = [
+            (
+                binding.target_field,
+                computed.get(position),
+                binding.source_field,
+                binding.default_value,
+                binding.transform,
+                self._formatters.get(binding.format_type) if binding.format_type else None,
+                binding.format_options,
+            )
+            for position, binding in enumerate(config.fields)
+        ]
+
         result = []
-        for row in data:
+        for index, row in enumerate(data):
             transformed = {}
 
-            for binding in config.fields:
-                # Get source value
-                value = row.get(binding.source_field, binding.default_value)
-
-                # Apply transform
-                if binding.transform:
-                    value = binding.transform(value)
+            for target, column, source, default, transform, formatter, options in plan:
+                if column is not None:
+                    value = column[index]
+                else:
+                    # Get source value
+                    value = row.get(source, default)
 
-                # Compute expression
-                if binding.is_computed and binding.expression:
-                    value = self._evaluate_expression(binding.expression, row)
+                    # Apply transform
+                    if transform:
+                        value = transform(value)
 
                 # Apply formatter
-                if binding.format_type and binding.format_type in self._formatters:
-                    formatter = self._formatters[binding.format_type]
-                    value = formatter(value, **binding.format_options)
+                if formatter:
+                    value = formatter(value, **options)
 
-                transformed[binding.target_field] = value
+                transformed[target] = value
 
             # Include unmapped fields
             for key, value in row.items():
@@ -483,47 +774,74 @@ class DataBindingManager:
 
     def _evaluate_expression(self, expression: str, row: Dict[str, Any]) -> Any:
         """
-        Evaluate a computed expression.
+        Evaluate a computed expression for one row.
 
-        Supports basic math and field references.
+        See core.reporting.expressions for the supported syntax.
         """
         try:
-            # Replace field references with values
-            expr = expression
-            for key, value in row.items():
-                if isinstance(value, (int, float, Decimal)):
-                    expr = expr.replace(f"{{{key}}}", str(value))
-                elif value is None:
-                    expr = expr.replace(f"{{{key}}}", "0")
-
-            # Safe evaluation (limited operations)
-            allowed = {
-                'abs': abs, 'min': min, 'max': max,
-                'round': round, 'sum': sum
-            }
-            return eval(expr, {"__builtins__": {}}, allowed)
-
-        except Exception as e:
+            return compile_expression(expression)(row)
+        except ExpressionError as e:
             app_logger.warning(f"Expression evaluation failed: {expression} - {e}")
             return None
 
-    def _get_from_cache(self, key: str, ttl: int) -> Optional[List[Dict]]:
-        """Get data from cache if valid."""
-        if key not in self._cache:
-            return None
+    def _invalidate_cache(self, source_name: str) -> None:
+        """Invalidate cache for a source."""
+        self._cache.invalidate_source(source_name)
 
-        data, timestamp = self._cache[key]
-        if (datetime.now() - timestamp).total_seconds() > ttl:
-            del self._cache[key]
-            return None
+    def invalidate_tables(self, *tables: str) -> int:
+        """
+        Drop cached results that read any of the given tables.
 
-        return data
+        Call after writing to a table (or connect_change_listener()).
 
-    def _invalidate_cache(self, source_name: str) -> None:
-        """Invalidate cache for a source."""
-        keys_to_remove = [k for k in self._cache if k.startswith(f"{source_name}:")]
-        for key in keys_to_remove:
-            del self._cache[key]
+        Returns:
+            Number of dropped results
+        """
+        return self._cache.invalidate_tables(tables)
+
+    def connect_change_listener(self) -> bool:
+        """
+        Invalidate cached results on database change notifications.
+
+        Covers the tables watched by core.database.listener, including
+        the employee data tables (so edits from any client refresh
+        employee, department and payroll reports before the TTL). Until
+        this is called, only sources with cache_unwatched=True are cached.
+        Starts the shared listener if needed; called once at app startup.
+
+        Returns:
+            True if connected
+        """
+        if self._listener_connected:
+            return True
+        try:
+            from core.database.listener import WATCHED_TABLES, get_change_listener
+
+            listener = get_change_listener()
+            signals = listener.signals
+            for signal in (
+                signals.notifications_changed,
+                signals.tasks_changed,
+                signals.calendar_changed,
+                signals.data_changed,
+            ):
+                signal.connect(self._on_table_changed)
+            listener.start()
+            self._watched_tables = WATCHED_TABLES
+            self._listener_connected = True
+            return True
+        except Exception as e:
+            app_logger.warning(f"Data cache not connected to change listener: {e}")
+            return False
+
+    def _on_table_changed(self, payload: Dict[str, Any]) -> None:
+        table = payload.get("table")
+        if table:
+            self.invalidate_tables(table)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Cache size and hit/miss statistics."""
+        return self._cache.stats()
 
     def clear_cache(self) -> None:
         """Clear all cached data."""
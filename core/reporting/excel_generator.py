@@ -26,10 +26,17 @@ Usage:
     excel.add_sheet("المبيعات", sales_data)
     excel.add_chart("المبيعات", chart_type="bar", data_range="A1:B10")
     excel.save("sales_report.xlsx")
+
+    # Large reports (rows streamed from an iterator, flat memory)
+    excel = StreamingExcelGenerator()
+    excel.add_sheet("الرواتب", iter_payroll_rows(), headers=["الاسم", "الراتب"],
+                    total_columns=["الراتب"])
+    excel.save("payroll.xlsx")
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Tuple, Union
+from itertools import chain, islice
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple, Union
 from pathlib import Path
 from datetime import datetime
 import io
@@ -40,6 +47,7 @@ from core.logging import app_logger
 # Check openpyxl availability
 try:
     from openpyxl import Workbook, load_workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import (
         Font, Alignment, Border, Side, PatternFill,
         NamedStyle, numbers
@@ -87,6 +95,98 @@ class ExcelConfig:
     protect_password: Optional[str] = None
 
 
+WIDTH_SAMPLE_ROWS = 500      # Rows sampled for column widths when streaming
+MAX_COLUMN_WIDTH = 50
+
+
+def _named_styles(config: ExcelConfig) -> List['NamedStyle']:
+    """Named styles shared by all cells of a workbook."""
+    align = "right" if config.rtl else "left"
+    side = Side(style='thin', color=config.border_color)
+    border = Border(left=side, right=side, top=side, bottom=side)
+    alt_fill = PatternFill(
+        start_color=config.alt_row_color,
+        end_color=config.alt_row_color,
+        fill_type="solid"
+    )
+
+    # Header style
+    header_style = NamedStyle(name="header_style")
+    header_style.font = Font(
+        name=config.font_family,
+        size=config.font_size,
+        bold=True,
+        color=config.header_fg_color
+    )
+    header_style.fill = PatternFill(
+        start_color=config.header_bg_color,
+        end_color=config.header_bg_color,
+        fill_type="solid"
+    )
+    header_style.alignment = Alignment(horizontal=align, vertical="center", wrap_text=True)
+    header_style.border = border
+
+    # Data style
+    data_style = NamedStyle(name="data_style")
+    data_style.font = Font(name=config.font_family, size=config.font_size)
+    data_style.alignment = Alignment(horizontal=align, vertical="center")
+    data_style.border = border
+
+    # Alt row style
+    alt_style = NamedStyle(name="alt_row_style")
+    alt_style.font = Font(name=config.font_family, size=config.font_size)
+    alt_style.fill = alt_fill
+    alt_style.alignment = Alignment(horizontal=align, vertical="center")
+    alt_style.border = border
+
+    # Number style
+    number_style = NamedStyle(name="number_style")
+    number_style.font = Font(name=config.font_family, size=config.font_size)
+    number_style.alignment = Alignment(horizontal="center", vertical="center")
+    number_style.number_format = '#,##0.00'
+
+    # Number style on alternate rows
+    number_alt_style = NamedStyle(name="number_alt_style")
+    number_alt_style.font = Font(name=config.font_family, size=config.font_size)
+    number_alt_style.fill = alt_fill
+    number_alt_style.alignment = Alignment(horizontal="center", vertical="center")
+    number_alt_style.number_format = '#,##0.00'
+
+    # Currency style
+    currency_style = NamedStyle(name="currency_style")
+    currency_style.font = Font(name=config.font_family, size=config.font_size)
+    currency_style.alignment = Alignment(horizontal="center", vertical="center")
+    currency_style.number_format = '#,##0.00 "ر.س"'
+
+    # Title style
+    title_style = NamedStyle(name="title_style")
+    title_style.font = Font(
+        name=config.font_family,
+        size=16,
+        bold=True,
+        color=config.header_bg_color
+    )
+    title_style.alignment = Alignment(horizontal="center" if not config.rtl else "right")
+
+    return [
+        header_style, data_style, alt_style, number_style,
+        number_alt_style, currency_style, title_style,
+    ]
+
+
+def _cell_style(value: Any, is_alt: bool) -> str:
+    """Named style of a data cell."""
+    if isinstance(value, (int, float)):
+        return "number_alt_style" if is_alt else "number_style"
+    return "alt_row_style" if is_alt else "data_style"
+
+
+def _column_width(values) -> float:
+    """Column width for the given header/values."""
+    longest = max((len(str(v)) for v in values if v), default=0)
+    return min(longest + 4, MAX_COLUMN_WIDTH)
+
+
 class ExcelGenerator:
     """
     Generate Excel reports using openpyxl.
@@ -121,104 +221,12 @@ class ExcelGenerator:
 
     def _setup_styles(self) -> None:
         """Setup named styles."""
-        # Header style
-        header_style = NamedStyle(name="header_style")
-        header_style.font = Font(
-            name=self.config.font_family,
-            size=self.config.font_size,
-            bold=True,
-            color=self.config.header_fg_color
-        )
-        header_style.fill = PatternFill(
-            start_color=self.config.header_bg_color,
-            end_color=self.config.header_bg_color,
-            fill_type="solid"
-        )
-        header_style.alignment = Alignment(
-            horizontal="right" if self.config.rtl else "left",
-            vertical="center",
-            wrap_text=True
-        )
-        header_style.border = Border(
-            left=Side(style='thin', color=self.config.border_color),
-            right=Side(style='thin', color=self.config.border_color),
-            top=Side(style='thin', color=self.config.border_color),
-            bottom=Side(style='thin', color=self.config.border_color)
-        )
-
-        # Data style
-        data_style = NamedStyle(name="data_style")
-        data_style.font = Font(
-            name=self.config.font_family,
-            size=self.config.font_size
-        )
-        data_style.alignment = Alignment(
-            horizontal="right" if self.config.rtl else "left",
-            vertical="center"
-        )
-        data_style.border = Border(
-            left=Side(style='thin', color=self.config.border_color),
-            right=Side(style='thin', color=self.config.border_color),
-            top=Side(style='thin', color=self.config.border_color),
-            bottom=Side(style='thin', color=self.config.border_color)
-        )
-
-        # Alt row style
-        alt_style = NamedStyle(name="alt_row_style")
-        alt_style.font = Font(
-            name=self.config.font_family,
-            size=self.config.font_size
-        )
-        alt_style.fill = PatternFill(
-            start_color=self.config.alt_row_color,
-            end_color=self.config.alt_row_color,
-            fill_type="solid"
-        )
-        alt_style.alignment = Alignment(
-            horizontal="right" if self.config.rtl else "left",
-            vertical="center"
-        )
-        alt_style.border = Border(
-            left=Side(style='thin', color=self.config.border_color),
-            right=Side(style='thin', color=self.config.border_color),
-            top=Side(style='thin', color=self.config.border_color),
-            bottom=Side(style='thin', color=self.config.border_color)
-        )
-
-        # Number style
-        number_style = NamedStyle(name="number_style")
-        number_style.font = Font(
-            name=self.config.font_family,
-            size=self.config.font_size
-        )
-        number_style.alignment = Alignment(
-            horizontal="center",
-            vertical="center"
-        )
-        number_style.number_format = '#,##0.00'
-
-        # Currency style
-        currency_style = NamedStyle(name="currency_style")
-        currency_style.font = Font(
-            name=self.config.font_family,
-            size=self.config.font_size
-        )
-        currency_style.alignment = Alignment(
-            horizontal="center",
-            vertical="center"
-        )
-        currency_style.number_format = '#,##0.00 "ر.س"'
-
-        # Register styles
-        try:
-            self._workbook.add_named_style(header_style)
-            self._workbook.add_named_style(data_style)
-            self._workbook.add_named_style(alt_style)
-            self._workbook.add_named_style(number_style)
-            self._workbook.add_named_style(currency_style)
-        except ValueError:
-            # Styles already exist
-            pass
+        for style in _named_styles(self.config):
+            try:
+                self._workbook.add_named_style(style)
+            except ValueError:
+                # Style already exists
+                pass
 
     def add_sheet(
         self,
@@ -263,32 +271,25 @@ class ExcelGenerator:
             cell.style = "header_style"
 
         # Write data
+        widths = [len(str(header)) for header in headers]
         for row_idx, row_data in enumerate(data, start=start_row + 1):
             is_alt = (row_idx - start_row) % 2 == 0
-            style_name = "alt_row_style" if is_alt else "data_style"
 
-            for col_idx, header in enumerate(headers, start=start_col):
+            for offset, header in enumerate(headers):
                 value = row_data.get(header, "")
-                cell = sheet.cell(row=row_idx, column=col_idx, value=value)
-
-                # Apply appropriate style based on value type
-                if isinstance(value, (int, float)):
-                    cell.style = "number_style"
-                    if is_alt:
-                        cell.fill = PatternFill(
-                            start_color=self.config.alt_row_color,
-                            end_color=self.config.alt_row_color,
-                            fill_type="solid"
-                        )
-                else:
-                    cell.style = style_name
+                cell = sheet.cell(row=row_idx, column=start_col + offset, value=value)
+                cell.style = _cell_style(value, is_alt)
+                if value and len(str(value)) > widths[offset]:
+                    widths[offset] = len(str(value))
 
         # Update row count
         self._sheet_row_counts[name] = start_row + len(data)
 
         # Auto-adjust column widths
         if self.config.auto_width:
-            self._auto_adjust_columns(sheet, headers, start_col)
+            for offset, width in enumerate(widths):
+                column_letter = get_column_letter(start_col + offset)
+                sheet.column_dimensions[column_letter].width = min(width + 4, MAX_COLUMN_WIDTH)
 
         # Freeze header row
         if self.config.freeze_header:
@@ -301,32 +302,6 @@ class ExcelGenerator:
 
         return self
 
-    def _auto_adjust_columns(
-        self,
-        sheet,
-        headers: List[str],
-        start_col: int
-    ) -> None:
-        """Auto-adjust column widths based on content."""
-        for col_idx, header in enumerate(headers, start=start_col):
-            column_letter = get_column_letter(col_idx)
-
-            # Calculate max width
-            max_width = len(str(header))
-
-            for row in sheet.iter_rows(
-                min_col=col_idx,
-                max_col=col_idx,
-                min_row=2,
-                max_row=sheet.max_row
-            ):
-                for cell in row:
-                    if cell.value:
-                        max_width = max(max_width, len(str(cell.value)))
-
-            # Set width with some padding
-            sheet.column_dimensions[column_letter].width = min(max_width + 4, 50)
-
     def add_title(
         self,
         title: str,
@@ -647,6 +622,184 @@ class ExcelGenerator:
         return self._workbook
 
 
+class StreamingExcelGenerator:
+    """
+    Generate large Excel reports in openpyxl write-only mode.
+
+    Rows are taken from any iterable (dicts keyed by header, or sequences
+    in header order) and written as they are produced, so memory does not
+    grow with the row count. Cells share the workbook's named styles, and
+    column widths come from the first WIDTH_SAMPLE_ROWS rows.
+
+    Sheets are written in order: a sheet cannot be changed once added,
+    and the workbook can be saved once.
+    """
+
+    def __init__(self, config: ExcelConfig = None):
+        """
+        Initialize streaming Excel generator.
+
+        Args:
+            config: Excel configuration
+        """
+        if not EXCEL_AVAILABLE:
+            raise ImportError(
+                "openpyxl not installed. Run: pip install openpyxl"
+            )
+
+        self.config = config or ExcelConfig()
+        self._workbook = Workbook(write_only=True)
+        self._sheet_row_counts = {}
+
+        for style in _named_styles(self.config):
+            self._workbook.add_named_style(style)
+
+    def add_sheet(
+        self,
+        name: str,
+        rows: Iterable[Union[Dict, Sequence]] = None,
+        headers: List[str] = None,
+        title: str = None,
+        total_columns: List[str] = None,
+        total_label: str = "الإجمالي"
+    ) -> 'StreamingExcelGenerator':
+        """
+        Add a sheet and stream its rows.
+
+        Args:
+            name: Sheet name
+            rows: Data rows (dicts or sequences), consumed once
+            headers: Column headers (keys of the first row if not given)
+            title: Title written above the table
+            total_columns: Headers of the columns to total (SUM row)
+            total_label: Label of the totals row
+
+        Returns:
+            Self for chaining
+        """
+        sheet = self._workbook.create_sheet(title=name)
+        if self.config.rtl:
+            sheet.sheet_view.rightToLeft = True
+
+        rows = iter(rows or ())
+        sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+        if headers is None:
+            headers = list(sample[0].keys()) if sample and isinstance(sample[0], dict) else []
+        header_row = 3 if title else 1
+
+        # Column layout must be known before the first row is written
+        if self.config.auto_width:
+            for col_idx, header in enumerate(headers):
+                values = [header] + [self._value(row, header, col_idx) for row in sample]
+                sheet.column_dimensions[get_column_letter(col_idx + 1)].width = _column_width(values)
+        if self.config.freeze_header and headers:
+            sheet.freeze_panes = f'A{header_row + 1}'
+
+        if title:
+            sheet.append([self._styled(sheet, title, "title_style")])
+            sheet.append([])
+        if headers:
+            sheet.append([self._styled(sheet, h, "header_style") for h in headers])
+
+        # One reusable cell per (column, style): cells are serialized on append
+        cells: Dict[Tuple[int, str], Any] = {}
+        row_count = 0
+        for row in chain(sample, rows):
+            row_count += 1
+            is_alt = row_count % 2 == 0
+            out = []
+            for col_idx, header in enumerate(headers):
+                value = self._value(row, header, col_idx)
+                style = _cell_style(value, is_alt)
+                cell = cells.get((col_idx, style))
+                if cell is None:
+                    cell = cells[(col_idx, style)] = self._styled(sheet, None, style)
+                cell.value = value
+                out.append(cell)
+            sheet.append(out)
+
+        last_row = header_row + row_count
+
+        if total_columns and row_count:
+            totals = [self._styled(sheet, total_label, "header_style")]
+            for col_idx, header in enumerate(headers[1:], start=1):
+                if header in total_columns:
+                    letter = get_column_letter(col_idx + 1)
+                    totals.append(self._styled(
+                        sheet, f"=SUM({letter}{header_row + 1}:{letter}{last_row})", "currency_style"
+                    ))
+                else:
+                    totals.append(None)
+            sheet.append(totals)
+
+        if self.config.auto_filter and headers and row_count:
+            last_col = get_column_letter(len(headers))
+            sheet.auto_filter.ref = f"A{header_row}:{last_col}{last_row}"
+
+        self._sheet_row_counts[name] = last_row
+        return self
+
+    @staticmethod
+    def _value(row: Union[Dict, Sequence], header: str, col_idx: int) -> Any:
+        if isinstance(row, dict):
+            return row.get(header, "")
+        return row[col_idx] if col_idx < len(row) else ""
+
+    @staticmethod
+    def _styled(sheet, value: Any, style: str) -> 'WriteOnlyCell':
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.style = style
+        return cell
+
+    def get_row_count(self, sheet_name: str) -> int:
+        """Last written row of a sheet."""
+        return self._sheet_row_counts.get(sheet_name, 0)
+
+    def _set_properties(self) -> None:
+        self._workbook.properties.title = self.config.title
+        self._workbook.properties.creator = self.config.author
+        self._workbook.properties.company = self.config.company
+        self._workbook.properties.subject = self.config.subject
+
+    def save(self, output_path: str) -> bool:
+        """
+        Save Excel file.
+
+        Args:
+            output_path: Output file path
+
+        Returns:
+            True if successful
+        """
+        try:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            self._set_properties()
+            self._workbook.save(output_path)
+            app_logger.info(f"Excel saved (streaming): {output_path}")
+            return True
+
+        except Exception as e:
+            app_logger.error(f"Failed to save Excel: {e}", exc_info=True)
+            return False
+
+    def to_bytes(self) -> bytes:
+        """
+        Generate Excel as bytes.
+
+        Returns:
+            Excel content as bytes
+        """
+        try:
+            buffer = io.BytesIO()
+            self._set_properties()
+            self._workbook.save(buffer)
+            return buffer.getvalue()
+
+        except Exception as e:
+            app_logger.error(f"Failed to generate Excel bytes: {e}")
+            return b''
+
+
 def create_excel_report(
     data: List[Dict],
     output_path: str,
@@ -0,0 +1,485 @@
+"""
+Report Expressions
+==================
+Small, safe expression language for computed report fields.
+
+An expression is parsed once, checked against a whitelist of syntax
+and functions, and compiled into a plain Python function of a row.
+Evaluating it per row is then a single function call: no string
+replacement, no parsing and no eval().
+
+Syntax:
+- Field references: {salary}, {housing_allowance}
+- Numbers and strings: 12.5, 'SAR'
+- Arithmetic: + - * / // % **
+- Comparisons: == != < <= > >= (chained: 0 < {x} <= 10)
+- Logic: and, or, not
+- Conditionals: {a} if {b} > 0 else {c}, iif(cond, a, b)
+- Functions: see EXPRESSION_FUNCTIONS
+
+Usage:
+    expr = compile_expression("round({basic} * 0.25 + {housing}, 2)")
+    expr({"basic": 5000, "housing": 1250})
+    totals = expr.evaluate_many(rows)
+"""
+
+import ast
+import re
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, cast
+
+from core.logging import app_logger
+
+
+class ExpressionError(ValueError):
+    """Invalid expression (syntax or disallowed construct)."""
+
+
+# ═══════════════════════════════════════════════════════════════
+# Functions
+# ═══════════════════════════════════════════════════════════════
+
+# Bounds that keep one expression from hanging a report or exhausting memory
+MAX_POWER_EXPONENT = 1000
+MAX_POWER_BITS = 8192           # Integer results of a ** b (about 2500 digits)
+MAX_TEXT_LENGTH = 1_000_000     # Strings built by 'text' * n or '%...' % x
+MAX_ROUND_DIGITS = 100          # round(5, -10**9) computes 10 ** 10**9
+
+_FORMAT_SIZE_RE = re.compile(r"%[-+ #0]*(\d*)(?:\.(\d*))?")
+
+
+def _to_date(value: Any) -> Optional[date]:
+    # 0 is how a missing field reaches functions with null_as_zero
+    if value is None or value == 0:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value)).date()
+
+
+def _iif(condition: Any, when_true: Any, when_false: Any) -> Any:
+    return when_true if condition else when_false
+
+
+def _coalesce(*values: Any) -> Any:
+    for value in values:
+        if value is not None and value != "":
+            return value
+    return None
+
+
+def _concat(*values: Any) -> str:
+    return "".join("" if v is None else str(v) for v in values)
+
+
+def _substr(value: Any, start: int, length: Optional[int] = None) -> str:
+    text = "" if value is None else str(value)
+    return text[start:] if length is None else text[start:start + length]
+
+
+def _days_between(start: Any, end: Any) -> Optional[int]:
+    first, last = _to_date(start), _to_date(end)
+    if first is None or last is None:
+        return None
+    return (last - first).days
+
+
+def _add_days(value: Any, days: int) -> Optional[date]:
+    value = _to_date(value)
+    return value + timedelta(days=days) if value is not None else None
+
+
+def _date_part(part: str) -> Callable[[Any], Optional[int]]:
+    def extract(value: Any) -> Optional[int]:
+        value = _to_date(value)
+        return getattr(value, part) if value is not None else None
+    return extract
+
+
+def _power(base: Any, exponent: Any) -> Any:
+    if isinstance(exponent, (int, float)) and abs(exponent) > MAX_POWER_EXPONENT:
+        raise ValueError(f"Exponent too large: {exponent}")
+    # Integer powers are exact: the exponent alone does not bound the size
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+        if abs(base).bit_length() * exponent > MAX_POWER_BITS:
+            raise ValueError(f"Result too large: {base} ** {exponent}")
+    return base ** exponent
+
+
+def _multiply(left: Any, right: Any) -> Any:
+    if isinstance(left, str) or isinstance(right, str):
+        text, count = (left, right) if isinstance(left, str) else (right, left)
+        if isinstance(count, int) and len(text) * count > MAX_TEXT_LENGTH:
+            raise ValueError(f"Text too long: {len(text)} * {count} characters")
+    return left * right
+
+
+def _modulo(left: Any, right: Any) -> Any:
+    if isinstance(left, str):
+        for width, precision in _FORMAT_SIZE_RE.findall(left):
+            if int(width or 0) > MAX_TEXT_LENGTH or int(precision or 0) > MAX_TEXT_LENGTH:
+                raise ValueError(f"Format field too wide: {left[:50]}")
+    return left % right
+
+
+def _round(value: Any, ndigits: Optional[int] = None) -> Any:
+    if ndigits is None:
+        return round(value)
+    if isinstance(ndigits, int) and abs(ndigits) > MAX_ROUND_DIGITS:
+        raise ValueError(f"Too many digits for round(): {ndigits}")
+    return round(value, ndigits)
+
+
+def _date_format(value: Any, fmt: str = "%Y/%m/%d") -> str:
+    value = _to_date(value)
+    return value.strftime(fmt) if value is not None else ""
+
+
+EXPRESSION_FUNCTIONS: Dict[str, Callable] = {
+    # Numbers
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "round": _round,
+    "sum": lambda *values: sum(v for v in values if v is not None),
+    "int": int,
+    "float": float,
+    # Logic
+    "iif": _iif,
+    "coalesce": _coalesce,
+    # Strings
+    "str": str,
+    "len": lambda value: len(value) if value is not None else 0,
+    "upper": lambda value: str(value).upper() if value is not None else "",
+    "lower": lambda value: str(value).lower() if value is not None else "",
+    "strip": lambda value: str(value).strip() if value is not None else "",
+    "concat": _concat,
+    "substr": _substr,
+    # Dates
+    "today": lambda: date.today(),
+    "now": lambda: datetime.now(),
+    "year": _date_part("year"),
+    "month": _date_part("month"),
+    "day": _date_part("day"),
+    "days_between": _days_between,
+    "add_days": _add_days,
+    "date_format": _date_format,
+}
+
+
+# ═══════════════════════════════════════════════════════════════
+# Compilation
+# ═══════════════════════════════════════════════════════════════
+
+# A string literal (kept as is) or a {field} reference
+_FIELD_RE = re.compile(r"""('(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")|\{([^{}]+)\}""")
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.Constant, ast.Name, ast.Load, ast.Call,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UnaryOp, ast.UAdd, ast.USub, ast.Not,
+    ast.BoolOp, ast.And, ast.Or,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.IfExp,
+)
+
+# Field placeholders inside the compiled function
+_FIELD_PREFIX = "_f"
+_ROW_ARG = "_row"
+
+
+def _validate(tree: ast.AST, expression: str, field_count: int) -> None:
+    """Reject everything outside the expression language."""
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ExpressionError(f"Not allowed in expression: {type(node).__name__} ({expression})")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float, str, bool, type(None))):
+            raise ExpressionError(f"Unsupported constant in expression: {expression}")
+        if isinstance(node, ast.Name):
+            name = node.id
+            if name.startswith(_FIELD_PREFIX) and name[len(_FIELD_PREFIX):].isdigit():
+                if int(name[len(_FIELD_PREFIX):]) >= field_count:
+                    raise ExpressionError(f"Unknown name '{name}' in expression: {expression}")
+            elif name not in EXPRESSION_FUNCTIONS:
+                raise ExpressionError(f"Unknown name '{name}' in expression: {expression}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in EXPRESSION_FUNCTIONS:
+                raise ExpressionError(f"Only built-in functions can be called: {expression}")
+            if node.keywords:
+                raise ExpressionError(f"Keyword arguments are not supported: {expression}")
+
+
+# Calls that never return text
+_NUMERIC_FUNCTIONS = frozenset({
+    "abs", "round", "int", "float", "len", "sum", "year", "month", "day", "days_between",
+})
+
+
+def _never_text(node: ast.expr) -> bool:
+    """Can this operand be ruled out as a string without running it?"""
+    if isinstance(node, ast.Constant):
+        return not isinstance(node.value, str)
+    if isinstance(node, ast.BinOp):
+        if isinstance(node.op, (ast.Sub, ast.Div, ast.FloorDiv, ast.Pow)):
+            return True
+        return isinstance(node.op, ast.Mult) and _never_text(node.left) and _never_text(node.right)
+    if isinstance(node, (ast.UnaryOp, ast.Compare)):
+        return True
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        return node.func.id in _NUMERIC_FUNCTIONS or node.func.id in ("_power", "_builtin_round")
+    return False
+
+
+def _is_float_constant(node: ast.expr) -> bool:
+    return isinstance(node, ast.Constant) and isinstance(node.value, float)
+
+
+def _name(name: str, store: bool = False) -> ast.Name:
+    return ast.Name(id=name, ctx=ast.Store() if store else ast.Load())
+
+
+class _SizeGuard(ast.NodeTransformer):
+    """
+    Bound the size of results, so one expression cannot hang a report
+    or exhaust memory:
+
+    - a ** b -> _power(a, b)
+    - a * b -> _multiply(a, b) unless an operand is a float (checked
+      inline: float products are the common case and cannot be text)
+    - text % x -> _modulo(a, b)
+    - round(x, n) -> round() directly when n is a small constant
+
+    Operators that cannot involve text (numeric operands, or a float
+    constant: 'x' * 0.5 fails anyway) stay plain operators.
+    """
+
+    def __init__(self) -> None:
+        self._temps = 0
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            return self._call("_power", node)
+        if isinstance(node.op, ast.Mult):
+            if _is_float_constant(node.left) or _is_float_constant(node.right):
+                return node
+            if _never_text(node.left) and _never_text(node.right):
+                return node
+            return self._guarded_product(node)
+        if isinstance(node.op, ast.Mod) and not _never_text(node.left):
+            return self._call("_modulo", node)
+        return node
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        self.generic_visit(node)
+        func = cast(ast.Name, node.func)
+        if func.id == "round" and len(node.args) == 2:
+            digits = node.args[1]
+            if (isinstance(digits, ast.Constant) and type(digits.value) is int
+                    and abs(digits.value) <= MAX_ROUND_DIGITS):
+                node.func = _name("_builtin_round")
+        return node
+
+    def _guarded_product(self, node: ast.BinOp) -> ast.expr:
+        """
+        a * b ->
+            _l * b if (_l := a).__class__ is _float
+            else (_l * _r if (_r := b).__class__ is _float else _multiply(_l, _r))
+
+        Operands are evaluated once, left to right; fields are locals
+        already and are used as they are.
+        """
+        self._temps += 1
+
+        def operand(value: ast.expr, temp: str) -> Tuple[ast.expr, ast.expr]:
+            """(first use, later uses) of one operand."""
+            if isinstance(value, ast.Name):
+                return value, _name(value.id)
+            return ast.NamedExpr(target=_name(temp, store=True), value=value), _name(temp)
+
+        def is_float(value: ast.expr) -> ast.Compare:
+            return ast.Compare(
+                left=ast.Attribute(value=value, attr="__class__", ctx=ast.Load()),
+                ops=[ast.Is()],
+                comparators=[_name("_float")]
+            )
+
+        left_first, left = operand(node.left, f"_l{self._temps}")
+        right_first, right = operand(node.right, f"_r{self._temps}")
+        return ast.IfExp(
+            test=is_float(left_first),
+            body=ast.BinOp(left=left, op=ast.Mult(), right=node.right),
+            orelse=ast.IfExp(
+                test=is_float(right_first),
+                body=ast.BinOp(left=left, op=ast.Mult(), right=right),
+                orelse=ast.Call(func=_name("_multiply"), args=[left, right], keywords=[])
+            )
+        )
+
+    @staticmethod
+    def _call(name: str, node: ast.BinOp) -> ast.Call:
+        return ast.Call(func=_name(name), args=[node.left, node.right], keywords=[])
+
+
+class CompiledExpression:
+    """
+    A parsed and compiled expression.
+
+    Call it with a row dict, or use evaluate_many() for a whole column.
+    Rows whose evaluation fails (division by zero, wrong types) give
+    None; the first failure of an expression is logged.
+    """
+
+    def __init__(self, expression: str, null_as_zero: bool = True):
+        self.expression = expression
+        self.null_as_zero = null_as_zero
+        self.fields: List[str] = []
+        self._function, self._column = self._compile()
+        self._warned = False
+
+    def _compile(self) -> Tuple[Callable[[Dict[str, Any]], Any], Callable[[Iterable[Dict[str, Any]]], List[Any]]]:
+        fields = self.fields
+
+        def placeholder(match: "re.Match[str]") -> str:
+            if match.group(1) is not None:
+                # {name} inside a string literal is text, not a field
+                return match.group(1)
+            name = match.group(2).strip()
+            if name not in fields:
+                fields.append(name)
+            return f"{_FIELD_PREFIX}{fields.index(name)}"
+
+        source = _FIELD_RE.sub(placeholder, self.expression).strip()
+        if not source:
+            raise ExpressionError("Empty expression")
+        try:
+            tree = ast.parse(source, mode="eval")
+        except SyntaxError as e:
+            raise ExpressionError(f"Invalid expression: {self.expression} ({e.msg})") from None
+        _validate(tree, self.expression, len(fields))
+        tree = _SizeGuard().visit(tree)
+
+        # def _expression(_row):
+        #     _f0 = _row.get('field')       (+ None/Decimal conversion)
+        #     ...
+        #     return <expression>
+        #
+        # def _column(_rows):
+        #     _out = []
+        #     for _row in _rows:
+        #         _f0 = _row['field']       (+ same conversion)
+        #         _out.append(<expression>)
+        #     return _out
+        def bindings(subscript: bool) -> List[ast.stmt]:
+            statements: List[ast.stmt] = []
+            for i, name in enumerate(fields):
+                statements.extend(self._binding(f"{_FIELD_PREFIX}{i}", name, subscript))
+            return statements
+
+        row_function = self._function_def("_expression", _ROW_ARG, bindings(False) + [ast.Return(value=tree.body)])
+
+        column = cast(ast.FunctionDef, ast.parse(
+            "def _column(_rows):\n"
+            "    _out = []\n"
+            "    _append = _out.append\n"
+            f"    for {_ROW_ARG} in _rows:\n"
+            "        _append(None)\n"
+            "    return _out\n"
+        ).body[0])
+        loop = cast(ast.For, column.body[2])
+        # _row['field']: rows of one result share their keys, and a missing
+        # key raises, so evaluate_many() falls back to _expression (.get)
+        loop.body = bindings(True) + [ast.Expr(value=ast.Call(
+            func=ast.Name(id="_append", ctx=ast.Load()), args=[tree.body], keywords=[]
+        ))]
+        module = ast.fix_missing_locations(ast.Module(body=[row_function, column], type_ignores=[]))
+
+        namespace: Dict[str, Any] = {
+            "__builtins__": {},
+            "_float": float,
+            "_Decimal": Decimal,
+            "_power": _power,
+            "_multiply": _multiply,
+            "_modulo": _modulo,
+            "_builtin_round": round,
+            **EXPRESSION_FUNCTIONS,
+        }
+        exec(compile(module, f"<expression {self.expression!r}>", "exec"), namespace)
+        return namespace["_expression"], namespace["_column"]
+
+    @staticmethod
+    def _function_def(name: str, argument: str, body: List[ast.stmt]) -> ast.FunctionDef:
+        return ast.FunctionDef(
+            name=name,
+            args=ast.arguments(
+                posonlyargs=[], args=[ast.arg(arg=argument)], vararg=None,
+                kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[]
+            ),
+            body=body,
+            decorator_list=[],
+            returns=None
+        )
+
+    def _binding(self, variable: str, field_name: str, subscript: bool = False) -> List[ast.stmt]:
+        """Statements loading one field into a local (None -> 0, Decimal -> float)."""
+        template = (
+            f"{variable} = {_ROW_ARG}{'[0]' if subscript else '.get(0)'}\n"
+            + (f"if {variable} is None:\n    {variable} = 0\nel" if self.null_as_zero else "")
+            + f"if {variable}.__class__ is _Decimal:\n    {variable} = _float({variable})\n"
+        )
+        statements = ast.parse(template).body
+        # Field name as a constant (never parsed as code)
+        key = ast.Constant(value=field_name)
+        load = cast(ast.Assign, statements[0]).value
+        if isinstance(load, ast.Subscript):
+            load.slice = key
+        else:
+            cast(ast.Call, load).args[0] = key
+        return statements
+
+    def __call__(self, row: Dict[str, Any]) -> Any:
+        try:
+            return self._function(row)
+        except Exception as e:
+            self._failed(e)
+            return None
+
+    def evaluate_many(self, rows: Sequence[Dict[str, Any]]) -> List[Any]:
+        """Evaluate for every row (one column of results)."""
+        try:
+            return self._column(rows)
+        except Exception:
+            # Some rows fail: evaluate them one by one
+            return [self(row) for row in rows]
+
+    def _failed(self, error: Exception) -> None:
+        if not self._warned:
+            self._warned = True
+            app_logger.warning(f"Expression evaluation failed: {self.expression} - {error}")
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.expression!r})"
+
+
+@lru_cache(maxsize=512)
+def compile_expression(expression: str, null_as_zero: bool = True) -> CompiledExpression:
+    """
+    Parse and compile an expression (cached per expression).
+
+    Args:
+        expression: Expression text, fields as {name}
+        null_as_zero: Treat missing/None fields as 0
+
+    Raises:
+        ExpressionError: Invalid syntax or disallowed construct
+    """
+    return CompiledExpression(expression, null_as_zero)
+
+
+def evaluate_expression(expression: str, row: Dict[str, Any]) -> Any:
+    """Evaluate an expression for one row."""
+    return compile_expression(expression)(row)
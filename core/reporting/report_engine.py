@@ -17,14 +17,25 @@ Features:
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Dict, Any, Optional, Callable, Union
+from typing import List, Dict, Any, Optional, Callable, Union, Iterable
 from pathlib import Path
 from datetime import datetime
+import os
 import threading
+import time
 
 from core.logging import app_logger
 
 
+# Row count from which Excel reports are written in write-only mode
+EXCEL_STREAMING_THRESHOLD = 20000
+
+# Batch rendering
+DEFAULT_BATCH_WORKERS = max(1, min(8, (os.cpu_count() or 2) - 1))
+BATCH_FORMATS = ("pdf", "html")
+BATCH_BUNDLES = ("zip", "pdf")
+
+
 class ElementType(Enum):
     """Report element types."""
     TEXT = "text"
@@ -275,6 +286,151 @@ class ReportConfig:
     total_fields: List[str] = field(default_factory=list)
 
 
+@dataclass
+class BatchItemResult:
+    """Outcome of one item of a batch."""
+    index: int
+    output_path: Optional[str] = None
+    success: bool = False
+    error: Optional[str] = None
+    duration_ms: float = 0.0
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a batch (items in input order)."""
+    items: List[BatchItemResult] = field(default_factory=list)
+    bundle_path: Optional[str] = None
+    duration_ms: float = 0.0
+
+    @property
+    def succeeded(self) -> List[BatchItemResult]:
+        return [item for item in self.items if item.success]
+
+    @property
+    def failed(self) -> List[BatchItemResult]:
+        return [item for item in self.items if not item.success]
+
+
+# ═══════════════════════════════════════════════════════════════
+# Batch workers (module level so they can run in worker processes)
+# ═══════════════════════════════════════════════════════════════
+
+class _BatchRenderer:
+    """Renders the items of one batch (template compiled once)."""
+
+    def __init__(
+        self,
+        template_name: Optional[str],
+        template_string: Optional[str],
+        shared_data: Dict[str, Any],
+        template_config: Any,
+        output_format: str
+    ):
+        from dataclasses import replace
+        from .template_engine import TemplateConfig, TemplateSource, get_template_engine
+
+        config = template_config or TemplateConfig()
+        if template_string is not None:
+            config = replace(config, template_string=template_string, template_source=TemplateSource.STRING)
+        else:
+            config = replace(config, template_name=template_name or "", template_source=TemplateSource.FILE)
+
+        self.engine = get_template_engine()
+        self.template = self.engine.get_template(config)
+        self.config = config
+        self.shared_data = shared_data or {}
+        self.output_format = output_format
+
+    def render(self, index: int, params: Dict[str, Any], output_path: str) -> BatchItemResult:
+        """Render one parameter set to output_path."""
+        started = time.perf_counter()
+        try:
+            html = self.engine.render_compiled(
+                self.template, self.config, {**self.shared_data, **params}
+            )
+
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            if self.output_format == "pdf":
+                from weasyprint import HTML
+                HTML(string=html).write_pdf(output_path)
+            else:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(html)
+
+            return BatchItemResult(
+                index, output_path, True,
+                duration_ms=(time.perf_counter() - started) * 1000
+            )
+        except Exception as e:
+            return BatchItemResult(
+                index, output_path, False, f"{type(e).__name__}: {e}",
+                duration_ms=(time.perf_counter() - started) * 1000
+            )
+
+
+# Renderer of a worker process (set by the pool initializer; the calling
+# process uses its own instance)
+_worker_renderer: Optional[_BatchRenderer] = None
+
+
+def _init_batch_worker(*args: Any) -> None:
+    """Compile the template and keep the shared data, once per worker."""
+    global _worker_renderer
+    _worker_renderer = _BatchRenderer(*args)
+
+
+def _render_batch_item(index: int, params: Dict[str, Any], output_path: str) -> BatchItemResult:
+    """Render one parameter set to output_path (in a worker)."""
+    if _worker_renderer is None:
+        return BatchItemResult(index, output_path, False, "Batch worker not initialized")
+    return _worker_renderer.render(index, params, output_path)
+
+
+def _bundle_zip(paths: List[str], bundle_path: str) -> None:
+    import zipfile
+
+    with zipfile.ZipFile(bundle_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for path in paths:
+            zf.write(path, arcname=Path(path).name)
+
+
+def _bundle_pdf(paths: List[str], bundle_path: str) -> None:
+    import fitz  # PyMuPDF
+
+    merged = fitz.open()
+    try:
+        for path in paths:
+            with fitz.open(path) as doc:
+                merged.insert_pdf(doc)
+        merged.save(bundle_path)
+    finally:
+        merged.close()
+
+
+def _batch_output_paths(
+    out_dir: Path,
+    filename_pattern: str,
+    param_sets: List[Dict[str, Any]],
+    output_format: str
+) -> List[str]:
+    """One unique output path per parameter set (duplicates get the index appended)."""
+    paths = []
+    used = set()
+    for i, params in enumerate(param_sets):
+        # index is the position in the batch, even if params has an "index" key
+        name = filename_pattern.format_map({**params, "index": i})
+        if name.lower() in used:
+            unique = f"{name}_{i:04d}"
+            while unique.lower() in used:
+                unique = f"{unique}_{i:04d}"
+            app_logger.warning(f"Batch file name '{name}' is not unique, using '{unique}'")
+            name = unique
+        used.add(name.lower())
+        paths.append(str(out_dir / f"{name}.{output_format}"))
+    return paths
+
+
 class ReportEngine:
     """
     Central report generation engine.
@@ -407,6 +563,68 @@ class ReportEngine:
             app_logger.error(f"Report generation failed: {e}", exc_info=True)
             return False
 
+    def generate_from_query(
+        self,
+        query: Any,
+        output_path: str,
+        config: ReportConfig = None,
+        params: Any = None,
+        batch_size: int = 2000,
+        **kwargs
+    ) -> bool:
+        """
+        Generate report directly from a SQL query.
+
+        CSV and Excel output is streamed from a server-side cursor
+        (select_iter), so memory stays flat regardless of row count; put
+        any ordering in the query itself. Other formats need the full
+        dataset and load it first.
+
+        Args:
+            query: SQL query string (can be psycopg2.sql.Composed)
+            output_path: Output file path
+            config: Report configuration
+            params: Query parameters
+            batch_size: Rows fetched per round-trip
+            **kwargs: Additional options
+
+        Returns:
+            True if successful
+        """
+        from core.database import select_iter
+        from . import ReportFormat
+
+        def iter_rows():
+            for columns, rows in select_iter(query, params, batch_size):
+                for row in rows:
+                    yield dict(zip(columns, row))
+
+        output_format = config.output_format if config else None
+        if output_format is None:
+            output_format = {
+                '.csv': ReportFormat.CSV,
+                '.xlsx': ReportFormat.EXCEL,
+            }.get(Path(output_path).suffix.lower())
+
+        streamers = {
+            ReportFormat.CSV: self._generate_csv,
+            ReportFormat.EXCEL: self._generate_excel,
+        }
+        if output_format in streamers:
+            if config is not None and config.sort_by:
+                app_logger.warning(
+                    "sort_by is ignored for streamed reports; use ORDER BY"
+                )
+            try:
+                return streamers[output_format](
+                    iter_rows(), output_path, config or ReportConfig(), **kwargs
+                )
+            except Exception as e:
+                app_logger.error(f"Report generation failed: {e}", exc_info=True)
+                return False
+
+        return self.generate(list(iter_rows()), output_path, config, **kwargs)
+
     def _process_data(
         self,
         data: Union[List[Dict], Dict],
@@ -501,31 +719,44 @@ class ReportEngine:
 
     def _generate_excel(
         self,
-        data: List[Dict],
+        data: Iterable[Dict],
         output_path: str,
         config: ReportConfig,
         **kwargs
     ) -> bool:
-        """Generate Excel report."""
-        from .excel_generator import ExcelGenerator, ExcelConfig
+        """
+        Generate Excel report.
+
+        Iterators and lists of EXCEL_STREAMING_THRESHOLD rows or more are
+        written in write-only mode (StreamingExcelGenerator).
+        """
+        from .excel_generator import ExcelGenerator, ExcelConfig, StreamingExcelGenerator
 
         excel_config = ExcelConfig(
             title=config.title,
             author=config.author,
             rtl=config.rtl
         )
+        sheet_name = kwargs.get('sheet_name', 'البيانات')
+        total_fields = config.total_fields if config.calculate_totals else None
+
+        if not isinstance(data, list) or len(data) >= EXCEL_STREAMING_THRESHOLD:
+            generator = StreamingExcelGenerator(excel_config)
+            generator.add_sheet(
+                sheet_name, data, headers=kwargs.get('headers'), total_columns=total_fields
+            )
+            return generator.save(output_path)
 
         generator = ExcelGenerator(excel_config)
 
         # Add main sheet with data
-        sheet_name = kwargs.get('sheet_name', 'البيانات')
         headers = kwargs.get('headers', list(data[0].keys()) if data else [])
 
         generator.add_sheet(sheet_name, data, headers=headers)
 
         # Add totals if enabled
-        if config.calculate_totals and config.total_fields:
-            generator.add_totals_row(config.total_fields)
+        if total_fields:
+            generator.add_totals_row(total_fields)
 
         return generator.save(output_path)
 
@@ -590,26 +821,34 @@ class ReportEngine:
 
     def _generate_csv(
         self,
-        data: List[Dict],
+        data: Iterable[Dict],
         output_path: str,
         config: ReportConfig,
         **kwargs
     ) -> bool:
-        """Generate CSV report."""
+        """
+        Generate CSV report.
+
+        data may be any iterable of dicts (e.g. a generator fed by
+        select_iter); rows are written as they arrive.
+        """
         import csv
 
         try:
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-            if not data:
+            rows = iter(data)
+            first = next(rows, None)
+            if first is None:
                 return False
 
-            headers = kwargs.get('headers', list(data[0].keys()))
+            headers = kwargs.get('headers', list(first.keys()))
 
             with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
                 writer = csv.DictWriter(f, fieldnames=headers)
                 writer.writeheader()
-                writer.writerows(data)
+                writer.writerow(first)
+                writer.writerows(rows)
 
             app_logger.info(f"CSV report saved: {output_path}")
             return True
@@ -727,6 +966,136 @@ class ReportEngine:
 
         return html
 
+    def generate_batch(
+        self,
+        template_name: Optional[str],
+        param_sets: List[Dict[str, Any]],
+        output_dir: str,
+        shared_data: Optional[Dict[str, Any]] = None,
+        template_config: Any = None,
+        template_string: Optional[str] = None,
+        output_format: str = "pdf",
+        filename_pattern: str = "{index:04d}",
+        max_workers: Optional[int] = None,
+        bundle: Optional[str] = None,
+        bundle_path: Optional[str] = None,
+        on_progress: Optional[Callable[[int, int, BatchItemResult], None]] = None
+    ) -> BatchResult:
+        """
+        Render one template for many parameter sets (payslips, certificates).
+
+        Items are rendered in a process pool. Each worker compiles the
+        template and receives shared_data once; per item only its
+        parameter set is sent. A failing item is reported and does not
+        stop the batch. If the pool cannot start or breaks, the remaining
+        items are rendered in this process.
+
+        Args:
+            template_name: Template name (ignored if template_string is given)
+            param_sets: One dict per output file, merged over shared_data
+            output_dir: Directory for the generated files
+            shared_data: Data common to all items (fetched once)
+            template_config: TemplateConfig for all items
+            template_string: Inline template instead of template_name
+            output_format: "pdf" (WeasyPrint) or "html"
+            filename_pattern: File name (without extension), formatted
+                with the item's parameters and index (its position in
+                the batch); duplicate names get the index appended
+            max_workers: Worker processes (1 renders in this process)
+            bundle: Also write all files into one "zip" or merged "pdf"
+            bundle_path: Path of the bundle (default: output_dir/batch.<ext>)
+            on_progress: Called as (done, total, item_result) per item
+
+        Returns:
+            BatchResult with per-item results in input order
+
+        Raises:
+            ValueError: Unsupported output_format or bundle
+            jinja2.TemplateError: The template cannot be loaded or compiled
+        """
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        from concurrent.futures.process import BrokenProcessPool
+
+        if output_format not in BATCH_FORMATS:
+            raise ValueError(f"output_format must be one of {BATCH_FORMATS}")
+        if bundle is not None and bundle not in BATCH_BUNDLES:
+            raise ValueError(f"bundle must be one of {BATCH_BUNDLES}")
+        if bundle == "pdf" and output_format != "pdf":
+            raise ValueError("A merged PDF bundle needs output_format='pdf'")
+
+        started = time.perf_counter()
+        total = len(param_sets)
+        result = BatchResult(items=[None] * total)
+        if not total:
+            return result
+
+        out_dir = Path(output_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        paths = _batch_output_paths(out_dir, filename_pattern, param_sets, output_format)
+        init_args = (template_name, template_string, shared_data or {}, template_config, output_format)
+        workers = max(1, min(max_workers or DEFAULT_BATCH_WORKERS, total))
+
+        # Load the template here first: a bad template fails the call
+        # instead of every worker, and the in-process fallback is ready
+        renderer = _BatchRenderer(*init_args)
+
+        done = 0
+
+        def record(item: BatchItemResult) -> None:
+            nonlocal done
+            result.items[item.index] = item
+            done += 1
+            if not item.success:
+                app_logger.warning(f"Batch item {item.index} failed: {item.error}")
+            if on_progress:
+                on_progress(done, total, item)
+
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_batch_worker,
+                    initargs=init_args
+                ) as pool:
+                    futures = {
+                        pool.submit(_render_batch_item, i, params, paths[i]): i
+                        for i, params in enumerate(param_sets)
+                    }
+                    for future in as_completed(futures):
+                        index = futures[future]
+                        try:
+                            item = future.result()
+                        except BrokenProcessPool:
+                            raise
+                        except Exception as e:
+                            # Item could not be sent to or returned from the worker
+                            item = BatchItemResult(index, paths[index], False, f"{type(e).__name__}: {e}")
+                        record(item)
+            except (BrokenProcessPool, OSError, NotImplementedError) as e:
+                app_logger.warning(f"Process pool unavailable, rendering in-process: {e}")
+
+        # Items the pool did not finish (or all, with one worker)
+        for i, item in enumerate(result.items):
+            if item is None:
+                record(renderer.render(i, param_sets[i], paths[i]))
+
+        if bundle:
+            ok_paths = [item.output_path for item in result.items if item.success]
+            bundle_path = bundle_path or str(out_dir / f"batch.{bundle}")
+            try:
+                if ok_paths:
+                    (_bundle_zip if bundle == "zip" else _bundle_pdf)(ok_paths, bundle_path)
+                    result.bundle_path = bundle_path
+            except Exception as e:
+                app_logger.error(f"Batch bundle failed: {e}", exc_info=True)
+
+        result.duration_ms = (time.perf_counter() - started) * 1000
+        app_logger.info(
+            f"Batch rendered: {len(result.succeeded)}/{total} ok "
+            f"in {result.duration_ms / 1000:.1f}s ({workers} workers)"
+        )
+        return result
+
     def create_from_sections(
         self,
         sections: List[ReportSection],
@@ -8,11 +8,13 @@ Features:
 - Custom filters for Arabic/formatting
 - RTL support
 - Multiple template sources (file, string, database)
-- Caching for performance
+- Caching for performance (compiled templates in memory, bytecode on disk)
 - Built-in report templates
 """
 
 import os
+import threading
+import time
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Union
 from dataclasses import dataclass, field
@@ -21,7 +23,8 @@ from datetime import datetime
 
 from jinja2 import (
     Environment, FileSystemLoader, BaseLoader, TemplateNotFound,
-    select_autoescape, Template, ChoiceLoader, DictLoader
+    select_autoescape, Template, ChoiceLoader, DictLoader,
+    FileSystemBytecodeCache
 )
 
 from core.logging import app_logger
@@ -80,6 +83,39 @@ class TemplateConfig:
     extra_context: Dict[str, Any] = field(default_factory=dict)
 
 
+# Bytecode of compiled templates, shared by all processes
+DEFAULT_BYTECODE_CACHE_DIR = str(Path.home() / ".integra" / "template_cache")
+
+# Seconds a database template is trusted before updated_at is checked again
+# (saves made by this process invalidate it immediately)
+DB_TEMPLATE_RECHECK_SECONDS = 60.0
+
+
+# Template version counters, bumped on save (plus one for "everything")
+_template_versions: Dict[str, int] = {}
+_template_generation = 0
+_versions_lock = threading.Lock()
+
+
+def get_template_version(name: str) -> int:
+    """Current version of a template (changes on every invalidation)."""
+    return _template_generation + _template_versions.get(name, 0)
+
+
+def invalidate_template(name: Optional[str] = None) -> None:
+    """
+    Mark a template (or all templates) as changed.
+
+    Compiled copies are reloaded on their next use.
+    """
+    global _template_generation
+    with _versions_lock:
+        if name is None:
+            _template_generation += 1
+        else:
+            _template_versions[name] = _template_versions.get(name, 0) + 1
+
+
 class DatabaseTemplateLoader(BaseLoader):
     """
     Load templates from database.
@@ -88,17 +124,27 @@ class DatabaseTemplateLoader(BaseLoader):
     - name: Template name
     - content: Template content
     - updated_at: Last update time
+
+    Freshness is tracked with in-process version counters (see
+    invalidate_template), so rendering a loaded template does not query
+    the database. Changes saved by other processes are picked up by one
+    updated_at query per template every DB_TEMPLATE_RECHECK_SECONDS.
     """
 
-    def __init__(self, table_name: str = "report_templates"):
+    def __init__(
+        self,
+        table_name: str = "report_templates",
+        recheck_seconds: float = DB_TEMPLATE_RECHECK_SECONDS
+    ):
         self.table_name = table_name
-        self._cache: Dict[str, tuple] = {}
+        self.recheck_seconds = recheck_seconds
 
     def get_source(self, environment, template):
         """Get template source from database."""
         try:
             from core.database import select_one
 
+            version = get_template_version(template)
             columns, row = select_one(
                 f"SELECT content, updated_at FROM {self.table_name} WHERE name = %s",
                 (template,)
@@ -109,25 +155,65 @@ class DatabaseTemplateLoader(BaseLoader):
 
             content = row[0]
             mtime = row[1].timestamp() if row[1] else 0
+            checked_at = [time.monotonic()]
 
             def uptodate():
-                _, current = select_one(
-                    f"SELECT updated_at FROM {self.table_name} WHERE name = %s",
-                    (template,)
-                )
-                if not current:
+                if get_template_version(template) != version:
                     return False
-                current_mtime = current[0].timestamp() if current[0] else 0
-                return mtime == current_mtime
+                now = time.monotonic()
+                if now - checked_at[0] < self.recheck_seconds:
+                    return True
+                if self._stored_mtime(template) != mtime:
+                    return False
+                checked_at[0] = now
+                return True
 
             return content, template, uptodate
 
+        except TemplateNotFound:
+            raise
         except ImportError:
             raise TemplateNotFound(template)
         except Exception as e:
             app_logger.error(f"Error loading template from database: {e}")
             raise TemplateNotFound(template)
 
+    def _stored_mtime(self, template: str) -> Optional[float]:
+        """updated_at of a stored template (None if missing or on error)."""
+        try:
+            from core.database import select_one
+
+            _, row = select_one(
+                f"SELECT updated_at FROM {self.table_name} WHERE name = %s",
+                (template,)
+            )
+            if not row:
+                return None
+            return row[0].timestamp() if row[0] else 0
+        except Exception as e:
+            app_logger.error(f"Error checking template in database: {e}")
+            return None
+
+    def save_template(self, name: str, content: str) -> bool:
+        """
+        Insert or update a template and invalidate its compiled copy.
+
+        Returns:
+            True if saved
+        """
+        from core.database import execute_query
+
+        saved = execute_query(
+            f"INSERT INTO {self.table_name} (name, content, updated_at) "
+            "VALUES (%s, %s, CURRENT_TIMESTAMP) "
+            "ON CONFLICT (name) DO UPDATE "
+            "SET content = EXCLUDED.content, updated_at = EXCLUDED.updated_at",
+            (name, content)
+        )
+        if saved:
+            invalidate_template(name)
+        return bool(saved)
+
 
 class TemplateEngine:
     """
@@ -141,7 +227,8 @@ class TemplateEngine:
         template_dirs: Optional[List[str]] = None,
         use_database: bool = False,
         cache_size: int = 400,
-        auto_reload: bool = True
+        auto_reload: bool = True,
+        bytecode_cache_dir: Optional[str] = DEFAULT_BYTECODE_CACHE_DIR
     ):
         """
         Initialize template engine.
@@ -151,11 +238,14 @@ class TemplateEngine:
             use_database: Enable database template loader
             cache_size: LRU cache size (0 to disable)
             auto_reload: Auto-reload templates on change
+            bytecode_cache_dir: Directory for compiled template bytecode
+                (None to disable)
         """
         self._template_dirs = template_dirs or []
         self._use_database = use_database
         self._cache_size = cache_size
         self._auto_reload = auto_reload
+        self._bytecode_cache = self._create_bytecode_cache(bytecode_cache_dir)
 
         # Add default template directories
         base_path = Path(__file__).parent / "templates"
@@ -190,9 +280,47 @@ class TemplateEngine:
             trim_blocks=True,
             lstrip_blocks=True,
             cache_size=self._cache_size,
-            auto_reload=self._auto_reload
+            auto_reload=self._auto_reload,
+            bytecode_cache=self._bytecode_cache
         )
 
+    @staticmethod
+    def _create_bytecode_cache(directory: Optional[str]) -> Optional[FileSystemBytecodeCache]:
+        """
+        Disk cache of compiled templates.
+
+        Entries are keyed by template name and checked against a hash of
+        the source, so an edited template is recompiled and new processes
+        skip compiling unchanged ones.
+        """
+        if not directory:
+            return None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            return FileSystemBytecodeCache(directory, "integra-%s.cache")
+        except OSError as e:
+            app_logger.warning(f"Template bytecode cache disabled: {e}")
+            return None
+
+    def save_template(self, name: str, content: str) -> bool:
+        """
+        Save a database template and invalidate its compiled copy.
+
+        Returns:
+            True if saved
+        """
+        if not self._use_database:
+            raise RuntimeError("Database templates are not enabled")
+        return DatabaseTemplateLoader().save_template(name, content)
+
+    def clear_cache(self) -> None:
+        """Drop compiled templates from memory and disk."""
+        if self._env.cache is not None:
+            self._env.cache.clear()
+        if self._bytecode_cache is not None:
+            self._bytecode_cache.clear()
+        invalidate_template()
+
     def _register_filters(self) -> None:
         """Register custom filters."""
         for name, func in TEMPLATE_FILTERS.items():
@@ -232,17 +360,7 @@ class TemplateEngine:
             Rendered HTML string
         """
         try:
-            # Build context
-            context = self._build_context(config, data)
-
-            # Get template
-            if config.template_source == TemplateSource.STRING:
-                template = self._env.from_string(config.template_string)
-            else:
-                template = self._env.get_template(config.template_name)
-
-            # Render
-            rendered = template.render(**context)
+            rendered = self.render_compiled(self.get_template(config), config, data)
 
             app_logger.debug(f"Template rendered: {config.template_name or 'string'}")
             return rendered
@@ -251,6 +369,40 @@ class TemplateEngine:
             app_logger.error(f"Template render error: {e}")
             raise
 
+    def get_template(self, config: TemplateConfig) -> Template:
+        """
+        Load and compile the template of a configuration.
+
+        File and database templates are cached by name; a string template
+        is compiled on every call, so keep the result when rendering it
+        many times (see render_compiled()).
+
+        Raises:
+            jinja2.TemplateError: The template cannot be loaded or compiled
+        """
+        if config.template_source == TemplateSource.STRING:
+            return self._env.from_string(config.template_string)
+        return self._env.get_template(config.template_name)
+
+    def render_compiled(
+        self,
+        template: Template,
+        config: TemplateConfig,
+        data: Dict[str, Any]
+    ) -> str:
+        """
+        Render a template from get_template() with data.
+
+        Args:
+            template: Compiled template
+            config: Template configuration (context values)
+            data: Data to render
+
+        Returns:
+            Rendered HTML string
+        """
+        return template.render(**self._build_context(config, data))
+
     def render_string(
         self,
         template_string: str,
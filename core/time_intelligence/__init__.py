@@ -6,7 +6,9 @@ Provides comprehensive time awareness for AI Copilot and business operations.
 
 Components:
 - SystemTime: Core time utilities (Gregorian + Hijri)
+- HijriCalendar: Table-driven Umm al-Qura conversions (single and batch)
 - WorkingCalendar: Working days, hours, and holidays
+- WorkingDayIndex: Precomputed working-day map per country and year
 - NaturalTimeParser: Arabic natural language time expressions
 - TimeAnalytics: YoY, MoM, QoQ, YTD comparisons
 - PeriodCalculator: Date range calculations
@@ -14,16 +16,20 @@ Components:
 - PatternAnalyzer: Time-series pattern analysis
 - DeadlinePredictor: Deadline risk prediction
 - AutoScheduler: Smart task scheduling
+- BusyIndex: In-memory busy time per participant (conflicts, free slots)
 - TimeTriggers: Time-based event triggers
 """
 
 from .system_time import SystemTime, get_system_time
+from .hijri_calendar import HijriCalendar, get_hijri_calendar
 from .hijri_utils import (
     hijri_today, hijri_for_date, gregorian_from_hijri,
+    hijri_for_dates, format_hijri_dates,
     days_until_ramadan, days_until_eid_fitr, days_until_eid_adha,
     get_upcoming_islamic_events,
 )
 from .working_calendar import WorkingCalendar, get_working_calendar
+from .working_day_index import WorkingDayIndex, get_working_day_index
 from .time_parser import NaturalTimeParser, get_time_parser
 from .time_analytics import TimeAnalytics, get_time_analytics
 from .period_calculator import PeriodCalculator, get_period_calculator
@@ -37,6 +43,7 @@ from .auto_scheduler import (
     AutoScheduler, get_auto_scheduler,
     ScheduleOptimizer, get_schedule_optimizer,
 )
+from .busy_index import BusyIndex, get_busy_index
 from .time_triggers import (
     TimeTrigger, TimeTriggers, get_time_triggers,
     TriggerExecutor, get_trigger_executor,
@@ -46,11 +53,14 @@ __all__ = [
     # Core
     'SystemTime', 'get_system_time',
     # Hijri
+    'HijriCalendar', 'get_hijri_calendar',
     'hijri_today', 'hijri_for_date', 'gregorian_from_hijri',
+    'hijri_for_dates', 'format_hijri_dates',
     'days_until_ramadan', 'days_until_eid_fitr', 'days_until_eid_adha',
     'get_upcoming_islamic_events',
     # Calendar
     'WorkingCalendar', 'get_working_calendar',
+    'WorkingDayIndex', 'get_working_day_index',
     # Parser
     'NaturalTimeParser', 'get_time_parser',
     # Analytics
@@ -65,6 +75,7 @@ __all__ = [
     # Scheduler
     'AutoScheduler', 'get_auto_scheduler',
     'ScheduleOptimizer', 'get_schedule_optimizer',
+    'BusyIndex', 'get_busy_index',
     # Triggers
     'TimeTrigger', 'TimeTriggers', 'get_time_triggers',
     'TriggerExecutor', 'get_trigger_executor',
@@ -4,16 +4,17 @@ Smart Auto-Scheduler
 Automatic task rescheduling and schedule optimization.
 """
 
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 from typing import Optional
 
 
 class AutoScheduler:
     """Smart auto-rescheduling and schedule optimization."""
 
-    def __init__(self, working_calendar=None, productivity_learner=None):
+    def __init__(self, working_calendar=None, productivity_learner=None, busy_index=None):
         self._calendar = working_calendar
         self._learner = productivity_learner
+        self._busy_index = busy_index
 
     @property
     def calendar(self):
@@ -29,6 +30,26 @@ class AutoScheduler:
             self._learner = get_productivity_learner()
         return self._learner
 
+    @property
+    def busy_index(self):
+        if self._busy_index is None:
+            from .busy_index import get_busy_index
+            self._busy_index = get_busy_index()
+        return self._busy_index
+
+    def _busy_index_for(self, start: date, end: date):
+        """Busy index covering [start, end] (loaded on first use)."""
+        index = self.busy_index
+        loaded = index.loaded_range
+        if loaded is None or loaded[0] > start or loaded[1] < end:
+            loaded_rows = index.load(
+                min(start, loaded[0]) if loaded else start,
+                max(end, loaded[1]) if loaded else end
+            )
+            if loaded_rows >= 0:
+                index.attach_event_bus()
+        return index
+
     def reschedule_on_delay(self, delayed_task: dict, other_tasks: list) -> list:
         """Reschedule dependent tasks when a task is delayed."""
         rescheduled = []
@@ -128,23 +149,38 @@ class AutoScheduler:
         duration_minutes: int = 60,
         earliest_date: Optional[date] = None,
         preferred_hours: Optional[list] = None,
+        participants: Optional[list] = None,
     ) -> list:
-        """Suggest optimal meeting times."""
+        """
+        Suggest optimal meeting times.
+
+        With participants (employee ids / e-mails), only slots where all of
+        them are free are suggested; if no preferred hour is free, the first
+        free slots within working hours are offered instead.
+        """
         if earliest_date is None:
             earliest_date = date.today()
 
         if preferred_hours is None:
             preferred_hours = [10, 11, 14, 15]
 
+        duration = timedelta(minutes=duration_minutes)
+        last_date = earliest_date + timedelta(days=13)  # Look 2 weeks ahead
+        busy = self._busy_index_for(earliest_date, last_date) if participants else None
+
         suggestions = []
 
-        for day_offset in range(14):  # Look 2 weeks ahead
+        for day_offset in range(14):
             check_date = earliest_date + timedelta(days=day_offset)
 
             if not self.calendar.is_working_day(check_date):
                 continue
 
             for hour in preferred_hours:
+                if busy is not None:
+                    start = datetime.combine(check_date, time(hour))
+                    if not busy.is_free(participants, start, start + duration):
+                        continue
                 suggestions.append({
                     "date": check_date.isoformat(),
                     "time": f"{hour:02d}:00",
@@ -153,6 +189,24 @@ class AutoScheduler:
                     "score": self._score_meeting_slot(check_date, hour),
                 })
 
+        if busy is not None and not suggestions:
+            work_start = datetime.strptime(self.calendar.working_hours["start"], "%H:%M").time()
+            work_end = datetime.strptime(self.calendar.working_hours["end"], "%H:%M").time()
+            for start, _ in busy.find_free_slots(
+                participants, duration,
+                datetime.combine(earliest_date, time.min),
+                datetime.combine(last_date + timedelta(days=1), time.min),
+                count=5, day_start=work_start, day_end=work_end,
+                is_working_day=self.calendar.is_working_day,
+            ):
+                suggestions.append({
+                    "date": start.date().isoformat(),
+                    "time": start.strftime("%H:%M"),
+                    "duration": duration_minutes,
+                    "day_name": self._get_day_name(start.date()),
+                    "score": self._score_meeting_slot(start.date(), start.hour),
+                })
+
         # Sort by score (best first)
         suggestions.sort(key=lambda x: x["score"], reverse=True)
         return suggestions[:5]
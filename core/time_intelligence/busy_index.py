@@ -0,0 +1,424 @@
+"""
+Busy-Time Index
+===============
+In-memory index of busy time per participant (employee or attendee),
+used for conflict checks and free-slot search without a database round
+trip per candidate slot.
+
+- Loaded in bulk from calendar_events (owner employee), event_attendees
+  and the attendees JSON of each event
+- Kept current from the EventBus (EVENT_CREATED / UPDATED / DELETED,
+  published by the database change listener): the changed event is
+  reloaded, nothing else. Attendee changes arrive as EVENT_UPDATED with
+  the affected "event_ids" (one notification per statement)
+- Per participant, intervals are kept sorted by start with a running
+  maximum of end times (overlap test by binary search) plus the merged
+  busy blocks (next free time by binary search), both rebuilt lazily
+  after changes
+
+Participants are employee ids (int) or e-mail addresses (str, case
+insensitive) for attendees that are not employees. Declined attendees
+and cancelled events are not busy. Recurring series count through their
+stored occurrences.
+
+Usage:
+    index = get_busy_index()
+    index.load(date.today(), date.today() + timedelta(days=14))
+    index.attach_event_bus()
+
+    index.is_free([12, 15, "guest@example.com"], start, end)
+    index.find_free_slots([12, 15], timedelta(hours=1), start, end, count=5)
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+
+Participant = Union[int, str]
+
+DEFAULT_EVENT_DURATION = timedelta(hours=1)
+DEFAULT_LOAD_DAYS = 30
+SLOT_GRANULARITY_MINUTES = 15
+
+# One row per (event, participant). {where} filters calendar_events ce.
+_BUSY_ROWS_SQL = """
+    SELECT ce.id, ce.start_datetime, ce.end_datetime, ce.is_all_day,
+           ce.employee_id, NULL AS email
+    FROM calendar_events ce
+    WHERE ce.employee_id IS NOT NULL AND {where}
+    UNION ALL
+    SELECT ce.id, ce.start_datetime, ce.end_datetime, ce.is_all_day,
+           ea.employee_id, lower(ea.email)
+    FROM event_attendees ea
+    JOIN calendar_events ce ON ce.id = ea.event_id
+    WHERE COALESCE(ea.response_status, 'pending') != 'declined' AND {where}
+    UNION ALL
+    SELECT ce.id, ce.start_datetime, ce.end_datetime, ce.is_all_day,
+           (a->>'employee_id')::int, lower(a->>'email')
+    FROM calendar_events ce
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE WHEN jsonb_typeof(ce.attendees) = 'array' THEN ce.attendees ELSE '[]'::jsonb END
+    ) AS a
+    WHERE COALESCE(a->>'status', 'pending') != 'declined' AND {where}
+"""
+
+_RANGE_WHERE = (
+    "ce.status != 'cancelled' AND ce.start_datetime < %s"
+    " AND COALESCE(ce.end_datetime, ce.start_datetime) >= %s"
+)
+_EVENTS_WHERE = "ce.status != 'cancelled' AND ce.id = ANY(%s)"
+
+
+class IntervalIndex:
+    """Busy intervals of one participant (keyed by event id)."""
+
+    def __init__(self) -> None:
+        self._intervals: Dict[int, Tuple[datetime, datetime]] = {}
+        self._dirty = True
+        self._starts: List[datetime] = []
+        self._entries: List[Tuple[datetime, datetime, int]] = []
+        self._max_end: List[datetime] = []
+        self._block_starts: List[datetime] = []
+        self._block_ends: List[datetime] = []
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def add(self, key: int, start: datetime, end: datetime) -> None:
+        self._intervals[key] = (start, end)
+        self._dirty = True
+
+    def remove(self, key: int) -> bool:
+        if self._intervals.pop(key, None) is None:
+            return False
+        self._dirty = True
+        return True
+
+    def _build(self) -> None:
+        """Sort intervals, running max of ends and merged busy blocks."""
+        if not self._dirty:
+            return
+        entries = sorted((s, e, k) for k, (s, e) in self._intervals.items())
+        starts: List[datetime] = []
+        max_end: List[datetime] = []
+        block_starts: List[datetime] = []
+        block_ends: List[datetime] = []
+        running: Optional[datetime] = None
+        for start, end, _ in entries:
+            starts.append(start)
+            running = end if running is None or end > running else running
+            max_end.append(running)
+            if block_ends and start <= block_ends[-1]:
+                if end > block_ends[-1]:
+                    block_ends[-1] = end
+            else:
+                block_starts.append(start)
+                block_ends.append(end)
+        self._entries, self._starts, self._max_end = entries, starts, max_end
+        self._block_starts, self._block_ends = block_starts, block_ends
+        self._dirty = False
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """Any interval overlapping [start, end)?"""
+        self._build()
+        # Intervals starting before `end`, the first of them whose running
+        # max end passes `start` overlaps (max_end is non-decreasing)
+        upper = bisect_left(self._starts, end)
+        return bisect_right(self._max_end, start, 0, upper) < upper
+
+    def overlapping(self, start: datetime, end: datetime) -> List[int]:
+        """Keys of the intervals overlapping [start, end)."""
+        self._build()
+        upper = bisect_left(self._starts, end)
+        first = bisect_right(self._max_end, start, 0, upper)
+        return [k for s, e, k in self._entries[first:upper] if e > start]
+
+    def busy_until(self, start: datetime, end: datetime) -> Optional[datetime]:
+        """End of the busy block overlapping [start, end), None if free."""
+        self._build()
+        i = bisect_right(self._block_ends, start)
+        if i < len(self._block_starts) and self._block_starts[i] < end:
+            return self._block_ends[i]
+        return None
+
+
+class BusyIndex:
+    """Busy time of all participants, for overlap queries and free slots."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._by_participant: Dict[Participant, IntervalIndex] = {}
+        self._event_participants: Dict[int, Set[Participant]] = {}
+        self._loaded_range: Optional[Tuple[date, date]] = None
+        self._subscribed = False
+
+    @staticmethod
+    def participant_key(value: Any) -> Optional[Participant]:
+        """Normalize an employee id / e-mail address."""
+        if value is None or value == "":
+            return None
+        if isinstance(value, int):
+            return value
+        text = str(value).strip()
+        if text.isdigit():
+            return int(text)
+        return text.lower() or None
+
+    @property
+    def loaded_range(self) -> Optional[Tuple[date, date]]:
+        return self._loaded_range
+
+    # ─── Loading ──────────────────────────────────────────────────
+
+    def load(self, start: Optional[date] = None, end: Optional[date] = None) -> int:
+        """
+        (Re)load busy time of events overlapping [start, end] in one query.
+
+        Returns:
+            Number of busy intervals loaded, -1 on error
+        """
+        from core.database import select_all
+
+        start = start or date.today()
+        end = end or start + timedelta(days=DEFAULT_LOAD_DAYS)
+        range_start = datetime.combine(start, time.min)
+        range_end = datetime.combine(end + timedelta(days=1), time.min)
+
+        sql = _BUSY_ROWS_SQL.format(where=_RANGE_WHERE)
+        columns, rows = select_all(sql, (range_end, range_start) * 3)
+        if not columns:
+            return -1
+
+        with self._lock:
+            self._by_participant.clear()
+            self._event_participants.clear()
+            for row in rows:
+                self._add_row(*row)
+            self._loaded_range = (start, end)
+        return len(rows)
+
+    def refresh_event(self, event_id: int) -> None:
+        """Reload one event (after it was created or changed)."""
+        self.refresh_events([event_id])
+
+    def refresh_events(self, event_ids: Sequence[int]) -> None:
+        """Reload several events in one query (e.g. after attendee changes)."""
+        from core.database import select_all
+
+        event_ids = list(event_ids)
+        if not event_ids:
+            return
+        sql = _BUSY_ROWS_SQL.format(where=_EVENTS_WHERE)
+        columns, rows = select_all(sql, (event_ids,) * 3)
+        if not columns:
+            return
+        with self._lock:
+            for event_id in event_ids:
+                self.remove_event(event_id)
+            for row in rows:
+                self._add_row(*row)
+
+    def reload(self) -> int:
+        """Reload the currently loaded range (0 if nothing was loaded yet)."""
+        loaded = self._loaded_range
+        if loaded is None:
+            return 0
+        return self.load(*loaded)
+
+    def remove_event(self, event_id: int) -> None:
+        """Drop the busy time of one event."""
+        with self._lock:
+            for participant in self._event_participants.pop(event_id, ()):
+                index = self._by_participant.get(participant)
+                if index is not None:
+                    index.remove(event_id)
+                    if not len(index):
+                        del self._by_participant[participant]
+
+    def add_event(
+        self,
+        event_id: int,
+        start: datetime,
+        end: Optional[datetime],
+        participants: Iterable[Any],
+        is_all_day: bool = False
+    ) -> None:
+        """Add (or replace) the busy time of one event."""
+        with self._lock:
+            self.remove_event(event_id)
+            for participant in participants:
+                self._add_row(event_id, start, end, is_all_day, participant, None)
+
+    def _add_row(
+        self,
+        event_id: int,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        is_all_day: bool,
+        employee_id: Optional[int],
+        email: Optional[str]
+    ) -> None:
+        participant = self.participant_key(employee_id if employee_id is not None else email)
+        if participant is None or start is None:
+            return
+        if is_all_day:
+            start = datetime.combine(start.date(), time.min)
+            end = datetime.combine((end or start).date() + timedelta(days=1), time.min)
+        elif end is None or end <= start:
+            end = start + DEFAULT_EVENT_DURATION
+        index = self._by_participant.get(participant)
+        if index is None:
+            index = self._by_participant[participant] = IntervalIndex()
+        index.add(event_id, start, end)
+        self._event_participants.setdefault(event_id, set()).add(participant)
+
+    # ─── EventBus ─────────────────────────────────────────────────
+
+    def attach_event_bus(self) -> None:
+        """Follow calendar changes published on the EventBus."""
+        if self._subscribed:
+            return
+        from core.ai.orchestration import EventType, get_event_bus
+
+        bus = get_event_bus()
+        for event_type in (EventType.EVENT_CREATED, EventType.EVENT_UPDATED):
+            bus.subscribe(event_type, self._on_event_changed, handler_id=f"busy_index_{event_type.name}")
+        bus.subscribe(EventType.EVENT_DELETED, self._on_event_deleted, handler_id="busy_index_EVENT_DELETED")
+        self._subscribed = True
+
+    def _on_event_changed(self, event: Any) -> None:
+        data = event.data or {}
+        if data.get("table") == "event_attendees":
+            event_ids = data.get("event_ids")
+            if event_ids is None:
+                # Too many events for one payload, or TRUNCATE
+                self.reload()
+            else:
+                self.refresh_events(event_ids)
+            return
+        event_id = data.get("id")
+        if event_id is not None:
+            self.refresh_event(event_id)
+
+    def _on_event_deleted(self, event: Any) -> None:
+        event_id = (event.data or {}).get("id")
+        if event_id is not None:
+            self.remove_event(event_id)
+
+    # ─── Queries ──────────────────────────────────────────────────
+
+    def _indexes(self, participants: Iterable[Any]) -> List[IntervalIndex]:
+        keys = {self.participant_key(p) for p in participants}
+        return [
+            self._by_participant[k] for k in keys
+            if k is not None and k in self._by_participant
+        ]
+
+    def is_free(self, participants: Iterable, start: datetime, end: datetime) -> bool:
+        """True if none of the participants is busy in [start, end)."""
+        with self._lock:
+            return not any(index.overlaps(start, end) for index in self._indexes(participants))
+
+    def conflicts(
+        self,
+        participants: Iterable,
+        start: datetime,
+        end: datetime
+    ) -> Dict[Participant, List[int]]:
+        """Conflicting event ids per busy participant in [start, end)."""
+        result: Dict[Participant, List[int]] = {}
+        with self._lock:
+            for participant in participants:
+                key = self.participant_key(participant)
+                if key is None:
+                    continue
+                index = self._by_participant.get(key)
+                if index is not None:
+                    event_ids = index.overlapping(start, end)
+                    if event_ids:
+                        result[key] = event_ids
+        return result
+
+    def find_free_slots(
+        self,
+        participants: Iterable,
+        duration: timedelta,
+        start: datetime,
+        end: datetime,
+        count: int = 5,
+        day_start: time = time(8, 0),
+        day_end: time = time(16, 0),
+        is_working_day: Optional[Callable[[date], bool]] = None,
+        granularity_minutes: int = SLOT_GRANULARITY_MINUTES
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        First `count` slots in [start, end) where all participants are free.
+
+        Slots lie within [day_start, day_end] on working days and start on
+        the granularity grid. Busy blocks are skipped in one step each.
+        """
+        slots: List[Tuple[datetime, datetime]] = []
+        step = timedelta(minutes=max(granularity_minutes, 1))
+
+        with self._lock:
+            indexes = self._indexes(participants)
+            current = start
+            while current < end and len(slots) < count:
+                current = self._align(current, step)
+                day = current.date()
+                opens = datetime.combine(day, day_start)
+                closes = datetime.combine(day, day_end)
+
+                if (is_working_day and not is_working_day(day)) or current + duration > closes:
+                    current = datetime.combine(day + timedelta(days=1), day_start)
+                    continue
+                if current < opens:
+                    current = opens
+                    continue
+
+                slot_end = current + duration
+                if slot_end > end:
+                    break
+                blocked = None
+                for index in indexes:
+                    until = index.busy_until(current, slot_end)
+                    if until is not None and (blocked is None or until > blocked):
+                        blocked = until
+                if blocked is None:
+                    slots.append((current, slot_end))
+                    current = slot_end
+                else:
+                    current = blocked
+
+        return slots
+
+    @staticmethod
+    def _align(value: datetime, step: timedelta) -> datetime:
+        """Round up to the slot grid (from midnight)."""
+        midnight = datetime.combine(value.date(), time.min, tzinfo=value.tzinfo)
+        offset = value - midnight
+        remainder = offset % step
+        return value if not remainder else value + (step - remainder)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "participants": len(self._by_participant),
+                "events": len(self._event_participants),
+                "intervals": sum(len(i) for i in self._by_participant.values()),
+                "loaded_range": [d.isoformat() for d in self._loaded_range] if self._loaded_range else None,
+            }
+
+
+# Singleton
+_busy_index: Optional[BusyIndex] = None
+
+
+def get_busy_index() -> BusyIndex:
+    """Get singleton BusyIndex instance."""
+    global _busy_index
+    if _busy_index is None:
+        _busy_index = BusyIndex()
+    return _busy_index
@@ -0,0 +1,259 @@
+"""
+Hijri Calendar
+==============
+Table-driven Umm al-Qura calendar.
+
+The start of every Hijri month from 1 Muharram 1343 (1924-08-01) to the
+end of 1500 (2077-11-16) is precomputed once as a Gregorian ordinal, so:
+
+- Gregorian -> Hijri: binary search in the month starts + day offset
+- Hijri -> Gregorian: month start + day offset
+
+Dates outside the table use the arithmetic (tabular) Islamic calendar,
+which may differ from the observed calendar by a day or two. An LRU layer caches the dict results used by the UI, and the
+batch helpers convert whole date columns for reports and exports.
+
+Usage:
+    calendar = get_hijri_calendar()
+    calendar.to_hijri(date(2026, 3, 20))          # (1447, 10, 1)
+    calendar.from_hijri(1447, 9, 1)               # date(2026, 2, 18)
+    calendar.to_hijri_many(df_dates)
+"""
+
+from array import array
+from bisect import bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+HijriDate = Tuple[int, int, int]
+
+UMM_AL_QURA_FIRST_YEAR = 1343
+UMM_AL_QURA_EPOCH = date(1924, 8, 1)      # 1 Muharram 1343
+
+# Month lengths per Hijri year from 1343, one digit per month:
+# 8 = 28, 9 = 29, 0 = 30, 1 = 31 days (the early years have irregular months)
+UMM_AL_QURA_MONTH_LENGTHS = (
+    "090090008000", "990909090909", "090919080090", "990090099009", "990090090099", "090909009918",
+    "090909000810", "909099090090", "090909990090", "090909090909", "090090900990", "909090090909",
+    "090909090090", "990909009909", "090909090900", "009099099009", "000909909909", "090909090900",
+    "090909090909", "090909090909", "090909090900", "090909080009", "090909090900", "090909090909",
+    "090909090909", "090909090900", "090909009009", "090909090909", "090990909000", "909090990900",
+    "909090909090", "090909009900", "090909099009", "909900090909", "099090900900", "090909090909",
+    "909090909090", "090909090909", "090090990909", "090090099090", "909009090909", "090909090909",
+    "090099090009", "009909090900", "990909090900", "900909090909", "090909090900", "090909009099",
+    "090909090900", "990909090900", "090999090900", "090909099009", "090090990909", "090009099090",
+    "909009090909", "090909009090", "909090909009", "009099090900", "909090990909", "000909099090",
+    "900090909909", "900900090990", "990090090909", "090909090090", "909090909090", "090909099090",
+    "090090909909", "090009090990", "909009009099", "099009000909", "909900900900", "990990900090",
+    "909099090090", "090909099090", "090900909099", "090900090909", "909090090090", "909909000090",
+    "990999000090", "099099900090", "090909909090", "090090990909", "090090900909", "909090090090",
+    "990909009009", "099099000900", "909909900900", "900990909090", "900909090990", "900090909099",
+    "090090090909", "909090090099", "090909090090", "909090909090", "090099090990", "090009909909",
+    "090009090990", "909000909099", "090900900909", "909090900909", "090909090900", "909009909090",
+    "900090990990", "900090099099", "090009090909", "909009009090", "990909009009", "090990909009",
+    "009099090909", "000909909090", "900099090909", "900090909090", "990090900909", "099090900090",
+    "909909900900", "090990990090", "009099099009", "009090909900", "909009090909", "090909090090",
+    "909909009009", "090990909000", "909099099000", "090909909090", "090090990909", "090090909090",
+    "990090090099", "099009090009", "909909009009", "090909909009", "090090990909", "009009099090",
+    "909000909909", "909000900990", "990900900099", "099090090090", "909909090090", "900990909090",
+    "900900909909", "090090090990", "990090009099", "099009009009", "909900909000", "990909090900",
+    "909090990900", "900909099090", "900090909909", "090090090990", "909090090900", "990909090090",
+    "099090990090", "009909909090", "009090990909", "000909099090", "900900990909", "090900909090",
+    "909090909009", "009909909000",
+)
+
+_LENGTH_DIGITS = {"8": 28, "9": 29, "0": 30, "1": 31}
+
+# 1 Muharram 1 AH of the tabular calendar (16 July 622 Julian)
+_TABULAR_EPOCH = date(622, 7, 19).toordinal()
+
+CACHE_SIZE = 4096
+
+
+def _tabular_to_ordinal(year: int, month: int, day: int) -> int:
+    """Gregorian ordinal of a date in the tabular Islamic calendar."""
+    return (
+        _TABULAR_EPOCH - 1 + day + (59 * (month - 1) + 1) // 2
+        + (year - 1) * 354 + (3 + 11 * year) // 30
+    )
+
+
+def _tabular_month_length(year: int, month: int) -> int:
+    if month == 12:
+        return _tabular_to_ordinal(year + 1, 1, 1) - _tabular_to_ordinal(year, 12, 1)
+    return 30 if month % 2 else 29
+
+
+def _tabular_from_ordinal(ordinal: int) -> HijriDate:
+    """Tabular Islamic date of a Gregorian ordinal."""
+    year = (30 * (ordinal - _TABULAR_EPOCH) + 10646) // 10631
+    month = min(12, (2 * (ordinal - _tabular_to_ordinal(year, 1, 1)) + 59) // 59)
+    return year, month, ordinal - _tabular_to_ordinal(year, month, 1) + 1
+
+
+class HijriCalendar:
+    """Umm al-Qura conversions from a precomputed month-start table."""
+
+    def __init__(self, cache_size: int = CACHE_SIZE):
+        starts = array("l", [UMM_AL_QURA_EPOCH.toordinal()])
+        for year in UMM_AL_QURA_MONTH_LENGTHS:
+            for digit in year:
+                starts.append(starts[-1] + _LENGTH_DIGITS[digit])
+        # starts[i] = ordinal of the first day of month i (0 = Muharram 1343);
+        # the last entry is the day after the table
+        self._starts = starts
+        self.first_year = UMM_AL_QURA_FIRST_YEAR
+        self.last_year = UMM_AL_QURA_FIRST_YEAR + len(UMM_AL_QURA_MONTH_LENGTHS) - 1
+        self.first_date = UMM_AL_QURA_EPOCH
+        self.last_date = date.fromordinal(starts[-1] - 1)
+        self._hijri_dict = lru_cache(maxsize=cache_size)(self._build_hijri_dict)
+
+    def in_range(self, gregorian_date: date) -> bool:
+        """True if the date is covered by the table."""
+        return self._starts[0] <= gregorian_date.toordinal() < self._starts[-1]
+
+    def _month_index(self, year: int, month: int) -> int:
+        if not 1 <= month <= 12:
+            raise ValueError(f"Hijri month must be in 1..12, got {month}")
+        return (year - self.first_year) * 12 + month - 1
+
+    # ─── Conversions ──────────────────────────────────────────────
+
+    def to_hijri(self, gregorian_date: date) -> HijriDate:
+        """Gregorian date -> (year, month, day)."""
+        ordinal = gregorian_date.toordinal()
+        starts = self._starts
+        if not starts[0] <= ordinal < starts[-1]:
+            return _tabular_from_ordinal(ordinal)
+        index = bisect_right(starts, ordinal) - 1
+        year, month = divmod(index, 12)
+        return self.first_year + year, month + 1, ordinal - starts[index] + 1
+
+    def from_hijri(self, year: int, month: int, day: int) -> date:
+        """(year, month, day) -> Gregorian date."""
+        index = self._month_index(year, month)
+        if not 0 <= index < len(self._starts) - 1:
+            length = _tabular_month_length(year, month)
+            if not 1 <= day <= length:
+                raise ValueError(f"day must be in 1..{length} for month {month} of {year}")
+            return date.fromordinal(_tabular_to_ordinal(year, month, day))
+        length = self._starts[index + 1] - self._starts[index]
+        if not 1 <= day <= length:
+            raise ValueError(f"day must be in 1..{length} for month {month} of {year}")
+        return date.fromordinal(self._starts[index] + day - 1)
+
+    def month_start(self, year: int, month: int) -> date:
+        """First Gregorian day of a Hijri month."""
+        return self.from_hijri(year, month, 1)
+
+    def month_length(self, year: int, month: int) -> int:
+        """Days in a Hijri month."""
+        index = self._month_index(year, month)
+        if not 0 <= index < len(self._starts) - 1:
+            return _tabular_month_length(year, month)
+        return self._starts[index + 1] - self._starts[index]
+
+    def month_range(self, year: int, month: int) -> Tuple[date, date]:
+        """First and last Gregorian day of a Hijri month."""
+        start = self.month_start(year, month)
+        return start, start + timedelta(days=self.month_length(year, month) - 1)
+
+    def next_occurrence(self, month: int, day: int, from_date: date, inclusive: bool = True) -> date:
+        """
+        Next Gregorian date that falls on Hijri day/month.
+
+        from_date itself counts unless inclusive is False.
+        """
+        year, current_month, current_day = self.to_hijri(from_date)
+        current = (current_month, current_day)
+        if current > (month, day) or (not inclusive and current == (month, day)):
+            year += 1
+        return self._clamped(year, month, day)
+
+    def _clamped(self, year: int, month: int, day: int) -> date:
+        """from_hijri with the day limited to the month length (30 -> 29)."""
+        return self.from_hijri(year, month, min(day, self.month_length(year, month)))
+
+    # ─── Cached dict form ─────────────────────────────────────────
+
+    def to_hijri_dict(self, gregorian_date: date) -> dict:
+        """to_hijri() as the dict returned by SystemTime.to_hijri (cached)."""
+        if type(gregorian_date) is not date:
+            gregorian_date = date(gregorian_date.year, gregorian_date.month, gregorian_date.day)
+        return dict(self._hijri_dict(gregorian_date))
+
+    def _build_hijri_dict(self, gregorian_date: date) -> dict:
+        from .system_time import HIJRI_MONTHS_AR
+
+        year, month, day = self.to_hijri(gregorian_date)
+        month_name = HIJRI_MONTHS_AR[month - 1] if 1 <= month <= 12 else ""
+        return {
+            "year": year,
+            "month": month,
+            "day": day,
+            "month_name": month_name,
+            "formatted": f"{day} {month_name} {year}",
+        }
+
+    def cache_info(self):
+        return self._hijri_dict.cache_info()
+
+    # ─── Batch ────────────────────────────────────────────────────
+
+    def to_hijri_many(self, dates: Iterable[Optional[date]]) -> List[Optional[HijriDate]]:
+        """to_hijri() for a column of dates (None stays None)."""
+        starts = self._starts
+        low, high = starts[0], starts[-1]
+        first_year = self.first_year
+        to_hijri = self.to_hijri
+        result: List[Optional[HijriDate]] = []
+        append = result.append
+        for value in dates:
+            if value is None:
+                append(None)
+                continue
+            ordinal = value.toordinal()
+            if low <= ordinal < high:
+                index = bisect_right(starts, ordinal) - 1
+                append((first_year + index // 12, index % 12 + 1, ordinal - starts[index] + 1))
+            else:
+                append(to_hijri(value))
+        return result
+
+    def from_hijri_many(self, hijri_dates: Iterable[Optional[Sequence[int]]]) -> List[Optional[date]]:
+        """from_hijri() for a column of (year, month, day) (None stays None)."""
+        from_hijri = self.from_hijri
+        return [None if h is None else from_hijri(*h) for h in hijri_dates]
+
+    def format_many(
+        self,
+        dates: Iterable[Optional[date]],
+        fmt: str = "{year:04d}-{month:02d}-{day:02d}"
+    ) -> List[Optional[str]]:
+        """Hijri text for a column of dates; fmt may also use {month_name}."""
+        from .system_time import HIJRI_MONTHS_AR
+
+        with_name = "{month_name" in fmt
+        result: List[Optional[str]] = []
+        for hijri in self.to_hijri_many(dates):
+            if hijri is None:
+                result.append(None)
+                continue
+            year, month, day = hijri
+            month_name = HIJRI_MONTHS_AR[month - 1] if with_name and 1 <= month <= 12 else ""
+            result.append(fmt.format(year=year, month=month, day=day, month_name=month_name))
+        return result
+
+
+# Singleton
+_hijri_calendar: Optional[HijriCalendar] = None
+
+
+def get_hijri_calendar() -> HijriCalendar:
+    """Get singleton HijriCalendar instance."""
+    global _hijri_calendar
+    if _hijri_calendar is None:
+        _hijri_calendar = HijriCalendar()
+    return _hijri_calendar
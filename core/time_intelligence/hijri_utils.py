@@ -2,80 +2,67 @@
 Hijri Utilities
 ===============
 Hijri calendar utilities and helpers.
+
+Conversions go through the precomputed Umm al-Qura table of
+HijriCalendar (see hijri_calendar.py).
 """
 
 from datetime import date, timedelta
-from typing import Optional
+from typing import Iterable, List, Optional
 
-from .system_time import get_system_time, HIJRI_MONTHS_AR
+from .system_time import HIJRI_MONTHS_AR
+from .hijri_calendar import get_hijri_calendar
 
 
 def hijri_today() -> dict:
     """Get today's Hijri date."""
-    return get_system_time().to_hijri()
+    return get_hijri_calendar().to_hijri_dict(date.today())
 
 
 def hijri_for_date(d: date) -> dict:
     """Get Hijri date for a Gregorian date."""
-    return get_system_time().to_hijri(d)
+    return get_hijri_calendar().to_hijri_dict(d)
 
 
 def gregorian_from_hijri(year: int, month: int, day: int) -> date:
     """Convert Hijri to Gregorian."""
-    return get_system_time().from_hijri(year, month, day)
+    return get_hijri_calendar().from_hijri(year, month, day)
 
 
-def days_until_ramadan(from_date: Optional[date] = None) -> int:
-    """Calculate days until next Ramadan."""
-    if from_date is None:
-        from_date = date.today()
+def hijri_for_dates(dates: Iterable[Optional[date]]) -> List[Optional[tuple]]:
+    """Convert a column of Gregorian dates to (year, month, day) tuples."""
+    return get_hijri_calendar().to_hijri_many(dates)
 
-    st = get_system_time()
-    hijri = st.to_hijri(from_date)
 
-    if hijri["month"] < 9:
-        # Ramadan is in the current Hijri year
-        ramadan_start = st.from_hijri(hijri["year"], 9, 1)
-    else:
-        # Ramadan next year
-        ramadan_start = st.from_hijri(hijri["year"] + 1, 9, 1)
+def format_hijri_dates(
+    dates: Iterable[Optional[date]],
+    fmt: str = "{year:04d}-{month:02d}-{day:02d}"
+) -> List[Optional[str]]:
+    """Format a column of Gregorian dates as Hijri text (reports, exports)."""
+    return get_hijri_calendar().format_many(dates, fmt)
 
-    delta = (ramadan_start - from_date).days
-    return max(0, delta)
 
-
-def days_until_eid_fitr(from_date: Optional[date] = None) -> int:
-    """Calculate days until next Eid Al-Fitr (1 Shawwal)."""
+def _days_until(month: int, day: int, from_date: Optional[date]) -> int:
+    """Days until the next day/month strictly after the current Hijri day."""
     if from_date is None:
         from_date = date.today()
+    target = get_hijri_calendar().next_occurrence(month, day, from_date, inclusive=False)
+    return max(0, (target - from_date).days)
+
 
-    st = get_system_time()
-    hijri = st.to_hijri(from_date)
+def days_until_ramadan(from_date: Optional[date] = None) -> int:
+    """Calculate days until next Ramadan."""
+    return _days_until(9, 1, from_date)
 
-    if hijri["month"] < 10:
-        eid_date = st.from_hijri(hijri["year"], 10, 1)
-    else:
-        eid_date = st.from_hijri(hijri["year"] + 1, 10, 1)
 
-    delta = (eid_date - from_date).days
-    return max(0, delta)
+def days_until_eid_fitr(from_date: Optional[date] = None) -> int:
+    """Calculate days until next Eid Al-Fitr (1 Shawwal)."""
+    return _days_until(10, 1, from_date)
 
 
 def days_until_eid_adha(from_date: Optional[date] = None) -> int:
     """Calculate days until next Eid Al-Adha (10 Dhul Hijjah)."""
-    if from_date is None:
-        from_date = date.today()
-
-    st = get_system_time()
-    hijri = st.to_hijri(from_date)
-
-    if hijri["month"] < 12 or (hijri["month"] == 12 and hijri["day"] < 10):
-        eid_date = st.from_hijri(hijri["year"], 12, 10)
-    else:
-        eid_date = st.from_hijri(hijri["year"] + 1, 12, 10)
-
-    delta = (eid_date - from_date).days
-    return max(0, delta)
+    return _days_until(12, 10, from_date)
 
 
 def get_hijri_month_name(month: int) -> str:
@@ -91,9 +78,8 @@ def get_upcoming_islamic_events(from_date: Optional[date] = None, count: int = 5
         from_date = date.today()
 
     events = []
-    st = get_system_time()
-    hijri = st.to_hijri(from_date)
-    current_year = hijri["year"]
+    calendar = get_hijri_calendar()
+    current_year = calendar.to_hijri(from_date)[0]
 
     # Key Islamic dates (Hijri month, day, name)
     islamic_dates = [
@@ -114,7 +100,7 @@ def get_upcoming_islamic_events(from_date: Optional[date] = None, count: int = 5
         check_year = current_year + year_offset
         for h_month, h_day, name in islamic_dates:
             try:
-                greg_date = st.from_hijri(check_year, h_month, h_day)
+                greg_date = calendar.from_hijri(check_year, h_month, h_day)
                 if greg_date >= from_date:
                     days_away = (greg_date - from_date).days
                     events.append({
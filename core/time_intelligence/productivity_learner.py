@@ -2,15 +2,68 @@
 Productivity Pattern Learning
 =============================
 Learns user productivity patterns from task completion data.
+
+The learner keeps the last MAX_TASKS task completions (and MAX_SESSIONS
+work sessions) and, alongside, running aggregates of that window:
+count / sum / sum of squares of durations per hour, weekday and task
+type, plus delay counts. Recording an event updates the aggregates in
+O(1) (adding the new event and subtracting the one leaving the window),
+and all queries read the aggregates instead of rescanning events.
+
+Events are appended to a per-user JSON-lines log in batches, flushed
+FLUSH_DELAY_SECONDS after the first unsaved event (or when
+FLUSH_BATCH_SIZE events are pending). The log is compacted to the
+current window when it grows past COMPACT_LINES.
 """
 
+import atexit
 import json
+import math
 import os
+import threading
+from collections import deque
 from datetime import datetime, date
-from typing import Optional
+from typing import Dict, Optional
 from pathlib import Path
 
 
+MAX_TASKS = 500
+MAX_SESSIONS = 200
+FLUSH_DELAY_SECONDS = 5.0
+FLUSH_BATCH_SIZE = 100
+COMPACT_LINES = 4 * (MAX_TASKS + MAX_SESSIONS)
+DEFAULT_DURATION_MINUTES = 30
+
+
+class _Stats:
+    """Running count / sum / sum of squares of durations."""
+
+    __slots__ = ("count", "total", "total_sq", "delayed")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.total_sq = 0
+        self.delayed = 0
+
+    def add(self, duration: int, delayed: bool, sign: int = 1):
+        self.count += sign
+        self.total += sign * duration
+        self.total_sq += sign * duration * duration
+        self.delayed += sign if delayed else 0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def stddev(self) -> float:
+        if self.count < 2:
+            return 0.0
+        variance = (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
 class ProductivityLearner:
     """Learns and predicts user productivity patterns."""
 
@@ -19,37 +72,146 @@ class ProductivityLearner:
         if data_dir is None:
             data_dir = str(Path.home() / ".integra" / "productivity")
         self.data_dir = data_dir
-        self.patterns = {"tasks": [], "sessions": []}
+        self._lock = threading.RLock()
+        self._tasks: deque = deque()
+        self._sessions: deque = deque(maxlen=MAX_SESSIONS)
+        self._totals = _Stats()
+        self._by_hour: Dict[int, _Stats] = {}
+        self._by_day: Dict[int, _Stats] = {}
+        self._by_type: Dict[str, _Stats] = {}
+        self._pending: list = []
+        self._log_lines = 0
+        self._flush_timer: Optional[threading.Timer] = None
         self._ensure_data_dir()
         self._load_patterns()
 
+    @property
+    def patterns(self) -> dict:
+        """Current window of raw events."""
+        with self._lock:
+            return {"tasks": list(self._tasks), "sessions": list(self._sessions)}
+
     def _ensure_data_dir(self):
         """Ensure data directory exists."""
         os.makedirs(self.data_dir, exist_ok=True)
 
     def _get_data_file(self) -> str:
-        """Get path to user's data file."""
+        """Get path to user's event log."""
+        return os.path.join(self.data_dir, f"user_{self.user_id}_events.jsonl")
+
+    def _get_legacy_file(self) -> str:
+        """Get path to the former JSON patterns file."""
         return os.path.join(self.data_dir, f"user_{self.user_id}_patterns.json")
 
     def _load_patterns(self):
-        """Load patterns from disk."""
+        """Rebuild the window and aggregates from disk."""
+        events = []
+        legacy_file = self._get_legacy_file()
+        if os.path.exists(legacy_file):
+            try:
+                with open(legacy_file, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+                events += [{"kind": "task", **t} for t in legacy.get("tasks", [])]
+                events += [{"kind": "session", **s} for s in legacy.get("sessions", [])]
+            except (json.JSONDecodeError, IOError, AttributeError):
+                pass
+
         data_file = self._get_data_file()
         if os.path.exists(data_file):
             try:
                 with open(data_file, 'r', encoding='utf-8') as f:
-                    self.patterns = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                self.patterns = {"tasks": [], "sessions": []}
-
-    def _save_patterns(self):
-        """Save patterns to disk."""
+                    for line in f:
+                        self._log_lines += 1
+                        try:
+                            events.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            continue    # Torn last line after a crash
+            except IOError:
+                pass
+
+        for event in events:
+            if event.get("kind") == "session":
+                self._sessions.append(event)
+            elif event.get("kind") == "task":
+                self._add_task(event)
+
+        if os.path.exists(legacy_file):
+            self._compact()
+            try:
+                os.replace(legacy_file, legacy_file + ".migrated")
+            except OSError:
+                pass
+
+    # ─── Aggregates ───────────────────────────────────────────────
+
+    def _add_task(self, task: dict):
+        """Add a task to the window (evicting the oldest beyond MAX_TASKS)."""
+        self._tasks.append(task)
+        self._apply(task, 1)
+        if len(self._tasks) > MAX_TASKS:
+            self._apply(self._tasks.popleft(), -1)
+
+    def _apply(self, task: dict, sign: int):
+        duration = task["duration"]
+        delayed = bool(task.get("was_delayed", False))
+        self._totals.add(duration, delayed, sign)
+        for table, key in (
+            (self._by_hour, task["hour"]),
+            (self._by_day, task["day_of_week"]),
+            (self._by_type, task["type"]),
+        ):
+            stats = table.get(key)
+            if stats is None:
+                stats = table[key] = _Stats()
+            stats.add(duration, delayed, sign)
+            if not stats.count:
+                del table[key]
+
+    # ─── Persistence ──────────────────────────────────────────────
+
+    def _append(self, event: dict):
+        """Queue an event for the log and arm the debounce timer."""
+        self._pending.append(event)
+        if len(self._pending) >= FLUSH_BATCH_SIZE:
+            self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = threading.Timer(FLUSH_DELAY_SECONDS, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """Append pending events to the log (compacting it when large)."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            if self._log_lines + len(pending) > COMPACT_LINES:
+                self._compact()
+                return
+            try:
+                with open(self._get_data_file(), 'a', encoding='utf-8') as f:
+                    f.writelines(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in pending)
+                self._log_lines += len(pending)
+            except IOError:
+                pass
+
+    def _compact(self):
+        """Rewrite the log with only the current window."""
         data_file = self._get_data_file()
+        events = list(self._sessions) + list(self._tasks)
         try:
-            with open(data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.patterns, f, ensure_ascii=False, indent=2, default=str)
-        except IOError:
+            with open(data_file + ".tmp", 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in events)
+            os.replace(data_file + ".tmp", data_file)
+            self._log_lines = len(events)
+        except (IOError, OSError):
             pass
 
+    # ─── Recording ────────────────────────────────────────────────
+
     def record_task_completion(
         self,
         task_type: str,
@@ -61,51 +223,49 @@ class ProductivityLearner:
         if completed_at is None:
             completed_at = datetime.now()
 
-        self.patterns["tasks"].append({
+        task = {
+            "kind": "task",
             "type": task_type,
             "duration": duration_minutes,
             "hour": completed_at.hour,
             "day_of_week": completed_at.weekday(),
             "completed_at": completed_at.isoformat(),
             "was_delayed": was_delayed,
-        })
-
-        # Keep last 500 tasks
-        if len(self.patterns["tasks"]) > 500:
-            self.patterns["tasks"] = self.patterns["tasks"][-500:]
-
-        self._save_patterns()
+        }
+        with self._lock:
+            self._add_task(task)
+            self._append(task)
 
     def record_session(self, start_time: datetime, end_time: datetime, actions_count: int = 0):
         """Record a work session."""
         duration = (end_time - start_time).total_seconds() / 60
 
-        self.patterns["sessions"].append({
+        session = {
+            "kind": "session",
             "start_hour": start_time.hour,
             "end_hour": end_time.hour,
             "day_of_week": start_time.weekday(),
             "duration_minutes": round(duration),
             "actions_count": actions_count,
             "date": start_time.date().isoformat(),
-        })
+        }
+        with self._lock:
+            self._sessions.append(session)
+            self._append(session)
 
-        # Keep last 200 sessions
-        if len(self.patterns["sessions"]) > 200:
-            self.patterns["sessions"] = self.patterns["sessions"][-200:]
+    # ─── Queries ──────────────────────────────────────────────────
 
-        self._save_patterns()
+    @staticmethod
+    def _ranked(table: Dict, top_n: int) -> list:
+        """(key, stats) by task count, most first."""
+        return sorted(table.items(), key=lambda x: (-x[1].count, x[0]))[:top_n]
 
     def get_best_hours(self, top_n: int = 5) -> list:
         """Get the most productive hours for the user."""
-        hour_stats = {}
-        for task in self.patterns["tasks"]:
-            hour = task["hour"]
-            if hour not in hour_stats:
-                hour_stats[hour] = {"count": 0, "total_duration": 0}
-            hour_stats[hour]["count"] += 1
-            hour_stats[hour]["total_duration"] += task["duration"]
-
-        if not hour_stats:
+        with self._lock:
+            ranked = self._ranked(self._by_hour, top_n)
+
+        if not ranked:
             # Default productive hours
             return [
                 {"hour": 10, "label": "10:00", "productivity": "افتراضي"},
@@ -113,65 +273,56 @@ class ProductivityLearner:
                 {"hour": 9, "label": "09:00", "productivity": "افتراضي"},
             ]
 
-        sorted_hours = sorted(
-            hour_stats.items(),
-            key=lambda x: x[1]["count"],
-            reverse=True
-        )
-
         return [
             {
                 "hour": h,
                 "label": f"{h:02d}:00",
-                "tasks_completed": stats["count"],
-                "avg_duration": round(stats["total_duration"] / stats["count"]),
+                "tasks_completed": stats.count,
+                "avg_duration": round(stats.mean),
             }
-            for h, stats in sorted_hours[:top_n]
+            for h, stats in ranked
         ]
 
     def get_best_days(self, top_n: int = 5) -> list:
         """Get the most productive days of the week."""
         from .system_time import DAYS_AR
 
-        day_stats = {}
-        for task in self.patterns["tasks"]:
-            day = task["day_of_week"]
-            if day not in day_stats:
-                day_stats[day] = {"count": 0, "total_duration": 0}
-            day_stats[day]["count"] += 1
-            day_stats[day]["total_duration"] += task["duration"]
-
-        if not day_stats:
-            return []
-
-        sorted_days = sorted(
-            day_stats.items(),
-            key=lambda x: x[1]["count"],
-            reverse=True
-        )
+        with self._lock:
+            ranked = self._ranked(self._by_day, top_n)
 
         return [
             {
                 "day": d,
                 "day_name": DAYS_AR[d],
-                "tasks_completed": stats["count"],
-                "avg_duration": round(stats["total_duration"] / stats["count"]),
+                "tasks_completed": stats.count,
+                "avg_duration": round(stats.mean),
             }
-            for d, stats in sorted_days[:top_n]
+            for d, stats in ranked
         ]
 
     def get_average_duration(self, task_type: str) -> int:
         """Get average duration for a task type in minutes."""
-        tasks = [t for t in self.patterns["tasks"] if t["type"] == task_type]
-        if not tasks:
-            return 30  # Default 30 minutes
-        return sum(t["duration"] for t in tasks) // len(tasks)
+        stats = self._by_type.get(task_type)
+        if stats is None or not stats.count:
+            return DEFAULT_DURATION_MINUTES
+        return stats.total // stats.count
+
+    def get_duration_stats(self, task_type: str) -> dict:
+        """Count, mean and standard deviation of a task type's durations."""
+        with self._lock:
+            stats = self._by_type.get(task_type) or _Stats()
+            return {
+                "count": stats.count,
+                "mean": round(stats.mean, 1) if stats.count else float(DEFAULT_DURATION_MINUTES),
+                "stddev": round(stats.stddev, 1),
+            }
 
     def predict_completion_time(self, task_type: str) -> dict:
         """Predict how long a task will take and best time to start."""
         avg_duration = self.get_average_duration(task_type)
         best_hours = self.get_best_hours(3)
-        task_count = len([t for t in self.patterns["tasks"] if t["type"] == task_type])
+        duration_stats = self.get_duration_stats(task_type)
+        task_count = duration_stats["count"]
 
         if task_count >= 20:
             confidence = "high"
@@ -183,6 +334,7 @@ class ProductivityLearner:
         return {
             "estimated_minutes": avg_duration,
             "estimated_label": self._format_duration(avg_duration),
+            "stddev_minutes": duration_stats["stddev"],
             "best_time_to_start": best_hours[0]["hour"] if best_hours else 10,
             "confidence": confidence,
             "based_on_tasks": task_count,
@@ -190,19 +342,16 @@ class ProductivityLearner:
 
     def get_delay_patterns(self) -> list:
         """Detect patterns in task delays."""
-        delayed_tasks = [t for t in self.patterns["tasks"] if t.get("was_delayed", False)]
-
-        if len(delayed_tasks) < 3:
-            return []
+        with self._lock:
+            if self._totals.delayed < 3:
+                return []
+            day_delays = {d: s.delayed for d, s in self._by_day.items() if s.delayed}
+            hour_delays = {h: s.delayed for h, s in self._by_hour.items() if s.delayed}
+            type_delays = {t: (s.delayed, s.count) for t, s in self._by_type.items() if s.delayed}
 
         patterns = []
 
         # Check if delays happen on specific days
-        day_delays = {}
-        for task in delayed_tasks:
-            day = task["day_of_week"]
-            day_delays[day] = day_delays.get(day, 0) + 1
-
         if day_delays:
             from .system_time import DAYS_AR
             worst_day = max(day_delays, key=day_delays.get)
@@ -215,11 +364,6 @@ class ProductivityLearner:
                 })
 
         # Check if delays happen at specific hours
-        hour_delays = {}
-        for task in delayed_tasks:
-            hour = task["hour"]
-            hour_delays[hour] = hour_delays.get(hour, 0) + 1
-
         if hour_delays:
             worst_hour = max(hour_delays, key=hour_delays.get)
             if hour_delays[worst_hour] >= 3:
@@ -231,13 +375,7 @@ class ProductivityLearner:
                 })
 
         # Check if specific task types are always delayed
-        type_delays = {}
-        for task in delayed_tasks:
-            task_type = task["type"]
-            type_delays[task_type] = type_delays.get(task_type, 0) + 1
-
-        for task_type, count in type_delays.items():
-            total_of_type = len([t for t in self.patterns["tasks"] if t["type"] == task_type])
+        for task_type, (count, total_of_type) in type_delays.items():
             if total_of_type > 0 and count / total_of_type > 0.5:
                 patterns.append({
                     "type": "task_type_pattern",
@@ -250,19 +388,18 @@ class ProductivityLearner:
 
     def get_productivity_summary(self) -> dict:
         """Get overall productivity summary."""
-        tasks = self.patterns["tasks"]
-        sessions = self.patterns["sessions"]
+        with self._lock:
+            total_tasks = self._totals.count
+            total_duration = self._totals.total
+            delayed_count = self._totals.delayed
+            sessions_count = len(self._sessions)
 
-        if not tasks:
+        if not total_tasks:
             return {
                 "total_tasks": 0,
                 "message": "لا توجد بيانات كافية بعد. سيبدأ التعلم مع استخدامك للبرنامج.",
             }
 
-        total_tasks = len(tasks)
-        total_duration = sum(t["duration"] for t in tasks)
-        delayed_count = len([t for t in tasks if t.get("was_delayed", False)])
-
         return {
             "total_tasks": total_tasks,
             "total_hours": round(total_duration / 60, 1),
@@ -271,7 +408,7 @@ class ProductivityLearner:
             "best_hours": self.get_best_hours(3),
             "best_days": self.get_best_days(3),
             "delay_patterns": self.get_delay_patterns(),
-            "sessions_count": len(sessions),
+            "sessions_count": sessions_count,
         }
 
     @staticmethod
@@ -286,13 +423,27 @@ class ProductivityLearner:
         return f"{hours} ساعة و {remaining_mins} دقيقة"
 
 
-# Singleton
-_learner: Optional[ProductivityLearner] = None
+
+# Per-user learners
+_learners: Dict[int, ProductivityLearner] = {}
+_learners_lock = threading.Lock()
 
 
 def get_productivity_learner(user_id: int = 1) -> ProductivityLearner:
-    """Get singleton ProductivityLearner instance."""
-    global _learner
-    if _learner is None or _learner.user_id != user_id:
-        _learner = ProductivityLearner(user_id=user_id)
-    return _learner
+    """Get the shared ProductivityLearner of a user."""
+    learner = _learners.get(user_id)
+    if learner is None:
+        with _learners_lock:
+            learner = _learners.get(user_id)
+            if learner is None:
+                learner = _learners[user_id] = ProductivityLearner(user_id=user_id)
+    return learner
+
+
+def flush_productivity_learners():
+    """Write pending events of all learners (runs at exit)."""
+    for learner in list(_learners.values()):
+        learner.flush()
+
+
+atexit.register(flush_productivity_learners)
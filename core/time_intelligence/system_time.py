@@ -122,120 +122,17 @@ class SystemTime:
         return start, end
 
     def to_hijri(self, gregorian_date: Optional[date] = None) -> dict:
-        """Convert Gregorian date to Hijri."""
+        """Convert Gregorian date to Hijri (Umm al-Qura table, cached)."""
         if gregorian_date is None:
             gregorian_date = self.today
 
-        try:
-            from hijri_converter import Gregorian
-            hijri = Gregorian(
-                gregorian_date.year,
-                gregorian_date.month,
-                gregorian_date.day
-            ).to_hijri()
-            return {
-                "year": hijri.year,
-                "month": hijri.month,
-                "day": hijri.day,
-                "month_name": HIJRI_MONTHS_AR[hijri.month - 1],
-                "formatted": f"{hijri.day} {HIJRI_MONTHS_AR[hijri.month - 1]} {hijri.year}"
-            }
-        except ImportError:
-            return self._approximate_hijri(gregorian_date)
+        from .hijri_calendar import get_hijri_calendar
+        return get_hijri_calendar().to_hijri_dict(gregorian_date)
 
     def from_hijri(self, hijri_year: int, hijri_month: int, hijri_day: int) -> date:
         """Convert Hijri date to Gregorian."""
-        try:
-            from hijri_converter import Hijri
-            greg = Hijri(hijri_year, hijri_month, hijri_day).to_gregorian()
-            return date(greg.year, greg.month, greg.day)
-        except ImportError:
-            return self._approximate_from_hijri(hijri_year, hijri_month, hijri_day)
-
-    def _approximate_hijri(self, gregorian_date: date) -> dict:
-        """Approximate Hijri date when hijri_converter is not available."""
-        # Approximate: Hijri year ~ (Gregorian - 622) * (33/32)
-        jd = self._gregorian_to_jd(gregorian_date)
-        hijri_year, hijri_month, hijri_day = self._jd_to_hijri(jd)
-        month_name = HIJRI_MONTHS_AR[hijri_month - 1] if 1 <= hijri_month <= 12 else ""
-        return {
-            "year": hijri_year,
-            "month": hijri_month,
-            "day": hijri_day,
-            "month_name": month_name,
-            "formatted": f"{hijri_day} {month_name} {hijri_year}"
-        }
-
-    def _approximate_from_hijri(self, h_year: int, h_month: int, h_day: int) -> date:
-        """Approximate Gregorian date from Hijri when library is not available."""
-        jd = self._hijri_to_jd(h_year, h_month, h_day)
-        return self._jd_to_gregorian(jd)
-
-    @staticmethod
-    def _gregorian_to_jd(d: date) -> int:
-        """Convert Gregorian date to Julian Day Number."""
-        y, m, day = d.year, d.month, d.day
-        if m <= 2:
-            y -= 1
-            m += 12
-        A = y // 100
-        B = 2 - A + A // 4
-        return int(365.25 * (y + 4716)) + int(30.6001 * (m + 1)) + day + B - 1524
-
-    @staticmethod
-    def _jd_to_hijri(jd: int) -> tuple:
-        """Convert Julian Day to approximate Hijri date."""
-        jd = int(jd) + 0.5
-        y = 10631.0 / 30.0
-        epoch = 1948439.5
-        shift = 8.01 / 60.0
-
-        z = jd - epoch
-        cyc = int(z / 10631.0)
-        z = z - 10631 * cyc
-        j = int((z - shift) / 29.5305882353)
-        if j == 12:
-            j = 11
-        z = z - int(29.5305882353 * j + shift)
-        day = int(z)
-        month = j + 1
-        year = 30 * cyc + int((11 * j + 3) / 325.0) + 1
-
-        if day <= 0:
-            day = 30
-            month -= 1
-        if month <= 0:
-            month = 12
-            year -= 1
-
-        return int(year), int(month), int(day)
-
-    @staticmethod
-    def _hijri_to_jd(year: int, month: int, day: int) -> int:
-        """Convert Hijri date to Julian Day Number."""
-        return int(
-            day + 29.5001 * (month - 1) + 0.99
-            + (year - 1) * 354.36667
-            + 1948439.5
-        )
-
-    @staticmethod
-    def _jd_to_gregorian(jd: int) -> date:
-        """Convert Julian Day Number to Gregorian date."""
-        jd = jd + 0.5
-        z = int(jd)
-        a = int((z - 1867216.25) / 36524.25)
-        a = z + 1 + a - int(a / 4)
-        b = a + 1524
-        c = int((b - 122.1) / 365.25)
-        d = int(365.25 * c)
-        e = int((b - d) / 30.6001)
-
-        day = b - d - int(30.6001 * e)
-        month = e - 1 if e < 14 else e - 13
-        year = c - 4716 if month > 2 else c - 4715
-
-        return date(int(year), int(month), int(day))
+        from .hijri_calendar import get_hijri_calendar
+        return get_hijri_calendar().from_hijri(hijri_year, hijri_month, hijri_day)
 
     def get_full_context(self) -> dict:
         """Get comprehensive time context for AI Copilot."""
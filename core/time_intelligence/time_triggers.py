@@ -2,16 +2,31 @@
 Time-based Triggers
 ===================
 Automatic event triggers based on time conditions.
+
+Triggers are kept in a min-heap keyed by their next fire date, so a
+check only touches the triggers that are due. Each fired trigger gets
+its next fire date recomputed and pushed back. State is stored in a
+SQLite table (one row per trigger, updated in place). With start(), the
+SchedulerManager wakes the engine when the earliest trigger is due
+instead of polling.
+
+Usage:
+    triggers = get_time_triggers()
+    triggers.register_handler("notify_contract_expiry", notify)
+    triggers.create_contract_expiry_trigger(12, "Ahmad", date(2026, 12, 31))
+    triggers.start()            # or call check_triggers() periodically
 """
 
+import heapq
 import json
 import os
+import sqlite3
+import threading
 import uuid
-from datetime import date, datetime, timedelta
-from typing import Optional, Callable
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Callable, Tuple
 from pathlib import Path
 
-
 class TimeTrigger:
     """Represents a single time-based trigger."""
 
@@ -50,6 +65,39 @@ class TimeTrigger:
             "last_fired_at": self.last_fired_at.isoformat() if self.last_fired_at else None,
         }
 
+    def next_fire_date(self) -> Optional[date]:
+        """
+        First date the trigger fires on from its current state.
+
+        None if it will not fire again (disabled, one-off already fired).
+        date.min means "as soon as checked" (recurring, never fired).
+        """
+        if not self.enabled:
+            return None
+        last = self.last_fired_at.date() if self.last_fired_at else None
+
+        if self.type == "before_date" and self.target_date:
+            start = self.target_date - timedelta(days=self.offset_days)
+            return start if last is None or last < start else last + timedelta(days=1)
+
+        if self.type == "on_date" and self.target_date:
+            return self.target_date if last is None or last < self.target_date else None
+
+        if self.type == "after_date" and self.target_date:
+            start = self.target_date + timedelta(days=1)
+            return start if last is None or last < start else last + timedelta(days=1)
+
+        if self.type == "recurring":
+            if last is None:
+                return date.min if self.recurring_interval in ("daily", "weekly", "monthly") else None
+            if self.recurring_interval == "daily":
+                return last + timedelta(days=1)
+            if self.recurring_interval == "weekly":
+                return last + timedelta(days=7)
+            if self.recurring_interval == "monthly":
+                return date(last.year + last.month // 12, last.month % 12 + 1, 1)
+        return None
+
     @classmethod
     def from_dict(cls, d: dict) -> "TimeTrigger":
         """Deserialize trigger from dict."""
@@ -68,6 +116,40 @@ class TimeTrigger:
         return trigger
 
 
+_TRIGGERS_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS time_triggers (
+        id TEXT PRIMARY KEY,
+        type TEXT NOT NULL,
+        action TEXT NOT NULL,
+        target_date TEXT,
+        offset_days INTEGER DEFAULT 0,
+        data TEXT,
+        enabled INTEGER DEFAULT 1,
+        recurring_interval TEXT,
+        last_fired_at TEXT
+    )
+"""
+
+_TRIGGER_COLUMNS = (
+    "id", "type", "action", "target_date", "offset_days",
+    "data", "enabled", "recurring_interval", "last_fired_at",
+)
+
+_UPSERT_TRIGGER_SQL = (
+    f"INSERT OR REPLACE INTO time_triggers ({', '.join(_TRIGGER_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _TRIGGER_COLUMNS)})"
+)
+
+SCHEDULER_JOB_ID = "time_triggers_next"
+
+
+def _trigger_row(trigger: "TimeTrigger") -> tuple:
+    d = trigger.to_dict()
+    d["data"] = json.dumps(d["data"], ensure_ascii=False)
+    d["enabled"] = 1 if d["enabled"] else 0
+    return tuple(d[c] for c in _TRIGGER_COLUMNS)
+
+
 class TimeTriggers:
     """Manages time-based triggers."""
 
@@ -75,140 +157,250 @@ class TimeTriggers:
         if data_dir is None:
             data_dir = str(Path.home() / ".integra" / "triggers")
         self.data_dir = data_dir
-        self.triggers: list[TimeTrigger] = []
+        self._triggers: Dict[str, TimeTrigger] = {}
         self._action_handlers: dict[str, Callable] = {}
+        self._lock = threading.RLock()
+        # Min-heap of (fire date, trigger id); stale entries are skipped
+        # on pop by comparing with _next_fire
+        self._heap: List[Tuple[date, str]] = []
+        self._next_fire: Dict[str, date] = {}
+        self._scheduled_for: Optional[datetime] = None
+        self._use_scheduler = False
         self._ensure_data_dir()
+        self._conn = self._open_connection()
         self._load_triggers()
 
+    @property
+    def triggers(self) -> List[TimeTrigger]:
+        """All registered triggers."""
+        return list(self._triggers.values())
+
     def _ensure_data_dir(self):
         """Ensure data directory exists."""
         os.makedirs(self.data_dir, exist_ok=True)
 
     def _get_data_file(self) -> str:
-        """Get path to triggers data file."""
+        """Get path to triggers database."""
+        return os.path.join(self.data_dir, "triggers.db")
+
+    def _get_legacy_file(self) -> str:
+        """Get path to the former JSON triggers file."""
         return os.path.join(self.data_dir, "triggers.json")
 
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._get_data_file(), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_TRIGGERS_SCHEMA_SQL)
+        conn.commit()
+        return conn
+
     def _load_triggers(self):
-        """Load triggers from disk."""
-        data_file = self._get_data_file()
-        if os.path.exists(data_file):
+        """Load triggers from disk (importing the former JSON file once)."""
+        rows = self._conn.execute(
+            f"SELECT {', '.join(_TRIGGER_COLUMNS)} FROM time_triggers"
+        ).fetchall()
+        triggers = []
+        for row in rows:
+            d = dict(zip(_TRIGGER_COLUMNS, row))
+            try:
+                d["data"] = json.loads(d["data"]) if d["data"] else {}
+            except ValueError:
+                d["data"] = {}
+            d["enabled"] = bool(d["enabled"])
+            triggers.append(TimeTrigger.from_dict(d))
+
+        legacy_file = self._get_legacy_file()
+        if not triggers and os.path.exists(legacy_file):
             try:
-                with open(data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                self.triggers = [TimeTrigger.from_dict(t) for t in data]
-            except (json.JSONDecodeError, IOError):
-                self.triggers = []
-
-    def _save_triggers(self):
-        """Save triggers to disk."""
-        data_file = self._get_data_file()
+                with open(legacy_file, 'r', encoding='utf-8') as f:
+                    triggers = [TimeTrigger.from_dict(t) for t in json.load(f)]
+                self._save_triggers(triggers)
+                os.replace(legacy_file, legacy_file + ".migrated")
+            except (json.JSONDecodeError, IOError, KeyError, ValueError):
+                triggers = []
+
+        for trigger in triggers:
+            self._triggers[trigger.id] = trigger
+            self._schedule(trigger)
+
+    def _save_triggers(self, triggers: Iterable[TimeTrigger]):
+        """Write the given triggers (only those) to disk."""
         try:
-            with open(data_file, 'w', encoding='utf-8') as f:
-                json.dump(
-                    [t.to_dict() for t in self.triggers],
-                    f, ensure_ascii=False, indent=2
-                )
-        except IOError:
+            with self._conn:
+                self._conn.executemany(_UPSERT_TRIGGER_SQL, [_trigger_row(t) for t in triggers])
+        except sqlite3.Error:
             pass
 
+    def _delete_trigger(self, trigger_id: str):
+        try:
+            with self._conn:
+                self._conn.execute("DELETE FROM time_triggers WHERE id = ?", (trigger_id,))
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    # ─── Heap ─────────────────────────────────────────────────────
+
+    def _schedule(self, trigger: TimeTrigger):
+        """(Re)compute the trigger's next fire date and push it."""
+        fire_date = trigger.next_fire_date()
+        if fire_date is None:
+            self._next_fire.pop(trigger.id, None)
+            return
+        self._next_fire[trigger.id] = fire_date
+        heapq.heappush(self._heap, (fire_date, trigger.id))
+
+    def _peek(self) -> Optional[date]:
+        """Earliest fire date (drops stale heap entries)."""
+        heap = self._heap
+        while heap:
+            fire_date, trigger_id = heap[0]
+            if self._next_fire.get(trigger_id) == fire_date:
+                return fire_date
+            heapq.heappop(heap)
+        return None
+
+    def next_due_date(self) -> Optional[date]:
+        """Date the earliest trigger is due (None if nothing is pending)."""
+        with self._lock:
+            return self._peek()
+
+    # ─── Scheduler ────────────────────────────────────────────────
+
+    def start(self) -> bool:
+        """
+        Run checks from the SchedulerManager: one date job at the time
+        the earliest trigger is due, re-armed after every check.
+
+        Returns:
+            False if the scheduler is not available (call check_triggers
+            periodically instead)
+        """
+        try:
+            from core.scheduler import is_scheduler_available
+        except ImportError:
+            return False
+        if not is_scheduler_available():
+            return False
+        self._use_scheduler = True
+        self.check_triggers()
+        return True
+
+    def stop(self):
+        """Stop scheduler-driven checks."""
+        self._use_scheduler = False
+        self._scheduled_for = None
+        try:
+            from core.scheduler import remove_job
+            remove_job(SCHEDULER_JOB_ID)
+        except ImportError:
+            pass
+
+    def _rearm(self):
+        """Point the scheduler job at the earliest due trigger."""
+        if not self._use_scheduler:
+            return
+        due = self._peek()
+        if due is None:
+            if self._scheduled_for is not None:
+                from core.scheduler import remove_job
+                remove_job(SCHEDULER_JOB_ID)
+                self._scheduled_for = None
+            return
+
+        run_at = max(datetime.combine(due, time.min), datetime.now())
+        if self._scheduled_for is not None and self._scheduled_for <= run_at:
+            return      # Already armed for this time or earlier
+        from core.scheduler import schedule_once
+        if schedule_once(self._on_timer, SCHEDULER_JOB_ID, run_at, "Time triggers"):
+            self._scheduled_for = run_at
+
+    def _on_timer(self):
+        self._scheduled_for = None
+        self.check_triggers()
+
     def register_handler(self, action_type: str, handler: Callable):
         """Register a handler function for an action type."""
         self._action_handlers[action_type] = handler
 
     def register_trigger(self, trigger: TimeTrigger) -> str:
         """Register a new trigger. Returns trigger ID."""
-        self.triggers.append(trigger)
-        self._save_triggers()
+        self.register_triggers([trigger])
         return trigger.id
 
+    def register_triggers(self, triggers: Iterable[TimeTrigger]) -> List[str]:
+        """Register many triggers with a single write. Returns trigger IDs."""
+        triggers = list(triggers)
+        with self._lock:
+            for trigger in triggers:
+                self._triggers[trigger.id] = trigger
+                self._schedule(trigger)
+            self._save_triggers(triggers)
+            self._rearm()
+        return [t.id for t in triggers]
+
     def remove_trigger(self, trigger_id: str) -> bool:
         """Remove a trigger by ID."""
-        original_len = len(self.triggers)
-        self.triggers = [t for t in self.triggers if t.id != trigger_id]
-        if len(self.triggers) < original_len:
-            self._save_triggers()
+        with self._lock:
+            if self._triggers.pop(trigger_id, None) is None:
+                return False
+            self._next_fire.pop(trigger_id, None)
+            self._delete_trigger(trigger_id)
+            self._rearm()
+            return True
+
+    def _set_enabled(self, trigger_id: str, enabled: bool) -> bool:
+        with self._lock:
+            trigger = self._triggers.get(trigger_id)
+            if trigger is None:
+                return False
+            trigger.enabled = enabled
+            self._schedule(trigger)
+            self._save_triggers([trigger])
+            self._rearm()
             return True
-        return False
 
     def enable_trigger(self, trigger_id: str) -> bool:
         """Enable a trigger."""
-        for trigger in self.triggers:
-            if trigger.id == trigger_id:
-                trigger.enabled = True
-                self._save_triggers()
-                return True
-        return False
+        return self._set_enabled(trigger_id, True)
 
     def disable_trigger(self, trigger_id: str) -> bool:
         """Disable a trigger."""
-        for trigger in self.triggers:
-            if trigger.id == trigger_id:
-                trigger.enabled = False
-                self._save_triggers()
-                return True
-        return False
+        return self._set_enabled(trigger_id, False)
 
-    def check_triggers(self) -> list:
-        """Check all triggers and fire those that match."""
-        today = date.today()
+    def check_triggers(self, today: Optional[date] = None) -> list:
+        """Fire the triggers that are due (only those are looked at)."""
+        today = today or date.today()
         now = datetime.now()
         fired = []
 
-        for trigger in self.triggers:
-            if not trigger.enabled:
-                continue
-
-            should_fire = False
-
-            if trigger.type == "before_date" and trigger.target_date:
-                target = trigger.target_date - timedelta(days=trigger.offset_days)
-                should_fire = today >= target and (
-                    trigger.last_fired_at is None or trigger.last_fired_at.date() < today
-                )
-
-            elif trigger.type == "on_date" and trigger.target_date:
-                should_fire = today == trigger.target_date and (
-                    trigger.last_fired_at is None or trigger.last_fired_at.date() < today
-                )
-
-            elif trigger.type == "after_date" and trigger.target_date:
-                should_fire = today > trigger.target_date and (
-                    trigger.last_fired_at is None or trigger.last_fired_at.date() < today
-                )
-
-            elif trigger.type == "recurring":
-                should_fire = self._check_recurring(trigger, today)
-
-            if should_fire:
-                trigger.last_fired_at = now
-                fired.append(trigger)
-                self._execute_trigger(trigger)
-
-        if fired:
-            self._save_triggers()
+        with self._lock:
+            due = []
+            while self._peek() is not None and self._heap[0][0] <= today:
+                _, trigger_id = heapq.heappop(self._heap)
+                del self._next_fire[trigger_id]
+                due.append(self._triggers[trigger_id])
+
+            for trigger in due:
+                # A missed on_date trigger is dropped, not fired late
+                if trigger.type != "on_date" or trigger.target_date == today:
+                    trigger.last_fired_at = now
+                    fired.append(trigger)
+                    self._execute_trigger(trigger)
+                if trigger.id in self._triggers:    # A handler may remove it
+                    self._schedule(trigger)
+
+            if fired:
+                self._save_triggers([t for t in fired if t.id in self._triggers])
+            self._rearm()
 
         return [t.to_dict() for t in fired]
 
-    def _check_recurring(self, trigger: TimeTrigger, today: date) -> bool:
-        """Check if a recurring trigger should fire."""
-        if trigger.last_fired_at and trigger.last_fired_at.date() >= today:
-            return False
-
-        interval = trigger.recurring_interval
-        if interval == "daily":
-            return True
-        elif interval == "weekly":
-            if trigger.last_fired_at:
-                days_since = (today - trigger.last_fired_at.date()).days
-                return days_since >= 7
-            return True
-        elif interval == "monthly":
-            if trigger.last_fired_at:
-                last_month = trigger.last_fired_at.date().month
-                return today.month != last_month or today.year != trigger.last_fired_at.date().year
-            return True
-        return False
-
     def _execute_trigger(self, trigger: TimeTrigger):
         """Execute a trigger's action."""
         handler = self._action_handlers.get(trigger.action)
@@ -5,9 +5,10 @@ Work days, hours, and holiday-aware calendar for business operations.
 """
 
 from datetime import date, datetime, time, timedelta
-from typing import Optional
+from typing import List, Optional, Sequence
 
 from .holidays import HolidayLoader
+from .working_day_index import WorkingDayIndex, get_working_day_index
 
 
 # Default working days: Sunday-Thursday (0=Mon, 6=Sun => 6,0,1,2,3)
@@ -31,7 +32,12 @@ COUNTRY_DEFAULTS = {
 
 
 class WorkingCalendar:
-    """Working calendar - working days, hours, and holidays."""
+    """
+    Working calendar - working days, hours, and holidays.
+
+    Day arithmetic (counts, adding working days) runs on the shared
+    precomputed WorkingDayIndex of the country and weekend.
+    """
 
     def __init__(
         self,
@@ -51,21 +57,23 @@ class WorkingCalendar:
             "start": working_hours_start,
             "end": working_hours_end,
         }
+        self._day_index: Optional[WorkingDayIndex] = None
+
+    @property
+    def day_index(self) -> WorkingDayIndex:
+        """Precomputed working-day index for this country and weekend."""
+        weekend = frozenset(self.weekend_days)
+        if self._day_index is None or self._day_index.weekend_days != weekend:
+            self._day_index = get_working_day_index(self.country_code, weekend)
+        return self._day_index
 
     def is_working_day(self, check_date: Optional[date] = None) -> bool:
         """Check if a date is a working day."""
         if check_date is None:
             check_date = date.today()
 
-        # Check weekend
-        if check_date.weekday() in self.weekend_days:
-            return False
-
-        # Check official holidays
-        if self.holiday_loader.is_holiday(check_date):
-            return False
-
-        return True
+        # Weekends and official holidays
+        return self.day_index.is_working_day(check_date)
 
     def is_working_hours(self, check_time: Optional[time] = None) -> bool:
         """Check if current time is within working hours."""
@@ -83,70 +91,49 @@ class WorkingCalendar:
 
     def working_days_between(self, start: date, end: date) -> int:
         """Count working days between two dates (inclusive)."""
-        count = 0
-        current = start
-        while current <= end:
-            if self.is_working_day(current):
-                count += 1
-            current += timedelta(days=1)
-        return count
+        return self.day_index.count(start, end)
+
+    def working_days_between_many(self, starts: Sequence[date], ends: Sequence[date]) -> List[int]:
+        """Count working days for many (start, end) pairs (bulk payroll calculations)."""
+        return self.day_index.count_many(starts, ends)
 
     def next_working_day(self, from_date: Optional[date] = None) -> date:
         """Get the next working day after the given date."""
         if from_date is None:
             from_date = date.today()
 
-        next_day = from_date + timedelta(days=1)
-        while not self.is_working_day(next_day):
-            next_day += timedelta(days=1)
-        return next_day
+        return self.day_index.next_working_day(from_date)
 
     def previous_working_day(self, from_date: Optional[date] = None) -> date:
         """Get the previous working day before the given date."""
         if from_date is None:
             from_date = date.today()
 
-        prev_day = from_date - timedelta(days=1)
-        while not self.is_working_day(prev_day):
-            prev_day -= timedelta(days=1)
-        return prev_day
+        return self.day_index.previous_working_day(from_date)
 
     def add_working_days(self, from_date: date, days: int) -> date:
         """Add N working days to a date (skipping weekends and holidays)."""
-        current = from_date
-        added = 0
-        while added < days:
-            current += timedelta(days=1)
-            if self.is_working_day(current):
-                added += 1
-        return current
+        return self.day_index.add(from_date, days)
+
+    def add_working_days_many(self, dates: Sequence[date], days) -> List[date]:
+        """Add working days to many dates (days: one int or one per date)."""
+        return self.day_index.add_many(dates, days)
 
     def subtract_working_days(self, from_date: date, days: int) -> date:
         """Subtract N working days from a date."""
-        current = from_date
-        subtracted = 0
-        while subtracted < days:
-            current -= timedelta(days=1)
-            if self.is_working_day(current):
-                subtracted += 1
-        return current
+        return self.day_index.subtract(from_date, days)
 
     def first_working_day_of_month(self, year: int, month: int) -> date:
         """Get the first working day of a month."""
-        d = date(year, month, 1)
-        while not self.is_working_day(d):
-            d += timedelta(days=1)
-        return d
+        return self.day_index.next_working_day(date(year, month, 1) - timedelta(days=1))
 
     def last_working_day_of_month(self, year: int, month: int) -> date:
         """Get the last working day of a month."""
         if month == 12:
-            d = date(year, 12, 31)
+            next_month = date(year + 1, 1, 1)
         else:
-            d = date(year, month + 1, 1) - timedelta(days=1)
-        while not self.is_working_day(d):
-            d -= timedelta(days=1)
-        return d
+            next_month = date(year, month + 1, 1)
+        return self.day_index.previous_working_day(next_month)
 
     def get_working_days_in_month(self, year: int, month: int) -> int:
         """Count working days in a month."""
@@ -0,0 +1,207 @@
+"""
+Working-Day Index
+=================
+Precomputed working-day map per country, weekend and year.
+
+For every year a day map (one byte per day, 1 = working day) and the
+cumulative count of working days are built once from the weekend days
+and the country's holidays, then cached. On top of that:
+
+- is_working_day: one lookup
+- count between two dates: subtraction of two prefix counts
+- add/subtract N working days: binary search in the prefix counts
+
+Payroll-sized workloads use the bulk helpers, which take sequences of
+dates and reuse the cached year tables.
+
+Usage:
+    index = get_working_day_index("SA", [4, 5])
+    index.count(date(2026, 1, 1), date(2026, 12, 31))
+    index.add(date(2026, 3, 18), 5)
+    index.count_many(starts, ends)
+"""
+
+import threading
+from array import array
+from bisect import bisect_left
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .holidays import HolidayLoader
+
+
+MAX_YEAR_SCAN = 50      # Years searched for a working day before giving up
+
+
+class _YearTable:
+    """Day map and prefix counts of one year."""
+
+    __slots__ = ("year", "first_ordinal", "days", "prefix")
+
+    def __init__(self, year: int, days: bytearray):
+        self.year = year
+        self.first_ordinal = date(year, 1, 1).toordinal()
+        self.days = days
+        # prefix[i] = working days among the first i days of the year
+        prefix = array("H", [0])
+        running = 0
+        for flag in days:
+            running += flag
+            prefix.append(running)
+        self.prefix = prefix
+
+    @property
+    def total(self) -> int:
+        return self.prefix[-1]
+
+    def date_at(self, offset: int) -> date:
+        return date.fromordinal(self.first_ordinal + offset)
+
+
+class WorkingDayIndex:
+    """Working days of one country / weekend configuration."""
+
+    def __init__(self, country_code: str = "SA", weekend_days: Iterable[int] = (4, 5)):
+        self.country_code = country_code.upper()
+        self.weekend_days = frozenset(weekend_days)
+        self._holidays = HolidayLoader(self.country_code)
+        self._years: Dict[int, _YearTable] = {}
+        self._lock = threading.Lock()
+
+    def _year(self, year: int) -> _YearTable:
+        """Year table (built on first use)."""
+        table = self._years.get(year)
+        if table is not None:
+            return table
+
+        first = date(year, 1, 1)
+        length = (date(year + 1, 1, 1) - first).days
+        first_weekday = first.weekday()
+        days = bytearray(
+            0 if (first_weekday + i) % 7 in self.weekend_days else 1
+            for i in range(length)
+        )
+        for holiday in self._holidays.get_holidays(year):
+            start = date.fromisoformat(holiday["date"])
+            for i in range(holiday.get("days_count", 1)):
+                offset = (start - first).days + i
+                if 0 <= offset < length:
+                    days[offset] = 0
+
+        table = _YearTable(year, days)
+        with self._lock:
+            self._years.setdefault(year, table)
+        return self._years[year]
+
+    def _locate(self, day: date) -> Tuple[_YearTable, int]:
+        table = self._year(day.year)
+        return table, day.toordinal() - table.first_ordinal
+
+    # ─── Single queries ───────────────────────────────────────────
+
+    def is_working_day(self, day: date) -> bool:
+        table, offset = self._locate(day)
+        return table.days[offset] == 1
+
+    def count(self, start: date, end: date) -> int:
+        """Working days in [start, end] (0 if end < start)."""
+        if end < start:
+            return 0
+        start_table, start_offset = self._locate(start)
+        end_table, end_offset = self._locate(end)
+        if start_table is end_table:
+            return end_table.prefix[end_offset + 1] - start_table.prefix[start_offset]
+
+        total = start_table.total - start_table.prefix[start_offset]
+        for year in range(start.year + 1, end.year):
+            total += self._year(year).total
+        return total + end_table.prefix[end_offset + 1]
+
+    def add(self, from_date: date, days: int) -> date:
+        """
+        The N-th working day after from_date (before it if N < 0).
+
+        Returns from_date for N == 0.
+        """
+        if days == 0:
+            return from_date
+        if days < 0:
+            return self.subtract(from_date, -days)
+
+        table, offset = self._locate(from_date)
+        target = table.prefix[offset + 1] + days
+        for _ in range(MAX_YEAR_SCAN):
+            if target <= table.total:
+                # First day whose prefix count reaches the target
+                return table.date_at(bisect_left(table.prefix, target) - 1)
+            target -= table.total
+            table = self._year(table.year + 1)
+        raise ValueError(f"No working days within {MAX_YEAR_SCAN} years after {from_date}")
+
+    def subtract(self, from_date: date, days: int) -> date:
+        """The N-th working day before from_date."""
+        if days <= 0:
+            return self.add(from_date, -days)
+
+        table, offset = self._locate(from_date)
+        target = table.prefix[offset] - days + 1
+        for _ in range(MAX_YEAR_SCAN):
+            if target >= 1:
+                return table.date_at(bisect_left(table.prefix, target) - 1)
+            table = self._year(table.year - 1)
+            target += table.total
+        raise ValueError(f"No working days within {MAX_YEAR_SCAN} years before {from_date}")
+
+    def next_working_day(self, from_date: date) -> date:
+        return self.add(from_date, 1)
+
+    def previous_working_day(self, from_date: date) -> date:
+        return self.subtract(from_date, 1)
+
+    # ─── Bulk queries ─────────────────────────────────────────────
+
+    def count_many(self, starts: Sequence[date], ends: Sequence[date]) -> List[int]:
+        """Working days in [starts[i], ends[i]] for every i."""
+        if len(starts) != len(ends):
+            raise ValueError("starts and ends must have the same length")
+        count = self.count
+        return [count(s, e) for s, e in zip(starts, ends)]
+
+    def add_many(self, dates: Sequence[date], days) -> List[date]:
+        """add() for every date; days is one int or a sequence of ints."""
+        add = self.add
+        if isinstance(days, int):
+            return [add(d, days) for d in dates]
+        if len(dates) != len(days):
+            raise ValueError("dates and days must have the same length")
+        return [add(d, n) for d, n in zip(dates, days)]
+
+    def is_working_day_many(self, dates: Sequence[date]) -> List[bool]:
+        is_working = self.is_working_day
+        return [is_working(d) for d in dates]
+
+    def clear(self) -> None:
+        """Drop cached years (after holiday data changed)."""
+        with self._lock:
+            self._years.clear()
+        self._holidays = HolidayLoader(self.country_code)
+
+
+# Shared indexes per (country, weekend)
+_indexes: Dict[Tuple[str, frozenset], WorkingDayIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_working_day_index(
+    country_code: str = "SA",
+    weekend_days: Optional[Iterable[int]] = None
+) -> WorkingDayIndex:
+    """Get the shared WorkingDayIndex for a country and weekend."""
+    key = (country_code.upper(), frozenset(weekend_days if weekend_days is not None else (4, 5)))
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = _indexes[key] = WorkingDayIndex(key[0], key[1])
+    return index
@@ -81,6 +81,12 @@ def main():
     from core.database.connection import connect
     try:
         connect()
+        # LISTEN/NOTIFY triggers: catalog check, installed only if missing
+        from core.database.listener import setup_change_notifications
+        setup_change_notifications()
+        # Report data cache: drop results when their tables change
+        from core.reporting.data_binding import get_data_binding_manager
+        get_data_binding_manager().connect_change_listener()
         splash.set_progress(80, "تم الاتصال بقاعدة البيانات")
     except Exception:
         splash.set_progress(80, "تعذر الاتصال - سيتم المحاولة لاحقاً")
@@ -101,4 +107,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # Frozen (PyInstaller) builds: let spawned worker processes
+    # (e.g. batch report rendering) run their task instead of the GUI
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
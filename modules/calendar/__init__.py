@@ -75,6 +75,7 @@ from .models import (
 from .repository import (
     # Event CRUD
     create_event,
+    create_events,
     get_event,
     update_event,
     delete_event,
@@ -110,12 +111,23 @@ from .repository import (
 
     # Recurrence
     generate_recurring_events,
+    save_recurring_events,
+    get_expanded_events,
+    cancel_occurrence,
+    override_occurrence,
 
     # Repository class
     CalendarRepository,
     get_calendar_repository,
 )
 
+# Recurrence
+from .recurrence import (
+    RecurrenceExpander,
+    get_recurrence_expander,
+    expand_recurring_event,
+)
+
 __all__ = [
     # Enums
     "EventType",
@@ -139,6 +151,7 @@ __all__ = [
 
     # Event CRUD
     "create_event",
+    "create_events",
     "get_event",
     "update_event",
     "delete_event",
@@ -174,10 +187,19 @@ __all__ = [
 
     # Recurrence
     "generate_recurring_events",
+    "save_recurring_events",
+    "get_expanded_events",
+    "cancel_occurrence",
+    "override_occurrence",
 
     # Repository class
     "CalendarRepository",
     "get_calendar_repository",
+
+    # Recurrence Expansion
+    "RecurrenceExpander",
+    "get_recurrence_expander",
+    "expand_recurring_event",
 ]
 
 __version__ = "1.0.0"
@@ -0,0 +1,19 @@
+"""
+INTEGRA - Calendar Recurrence
+موديول التقويم - توسيع الأحداث المتكررة
+المحور I
+
+التاريخ: 4 فبراير 2026
+"""
+
+from .recurrence_expander import (
+    RecurrenceExpander,
+    get_recurrence_expander,
+    expand_recurring_event,
+)
+
+__all__ = [
+    "RecurrenceExpander",
+    "get_recurrence_expander",
+    "expand_recurring_event",
+]
@@ -0,0 +1,292 @@
+"""
+INTEGRA - Recurrence Expander
+موديول التقويم - توسيع الأحداث المتكررة
+المحور I
+
+يحسب تكرارات الحدث المتكرر داخل نافذة العرض فقط (على طريقة RRULE)
+بدلاً من توليد كل التكرارات منذ بداية السلسلة:
+- القفز مباشرة إلى أول فترة داخل النافذة (حساب، بدون مرور يوم بيوم)
+- الكلفة بعدد التكرارات الظاهرة فقط
+- ذاكرة مؤقتة للنوافذ المحسوبة لكل سلسلة
+- الاستثناءات (تكرارات ملغاة أو معدلة) تُطبق بعد الحساب ولا تُخزن في السلسلة
+
+الاستخدام:
+    expander = get_recurrence_expander()
+    start, end = month_view.get_visible_date_range()
+    occurrences = expander.expand(series_event, start, end, exceptions={date(2026, 3, 2)})
+"""
+
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import datetime, date, timedelta
+from typing import Optional, List, Set, Tuple, Iterator
+import calendar
+import threading
+
+from ..models import CalendarEvent, RecurrencePattern, RecurrenceType
+
+
+MAX_CACHED_WINDOWS = 1024       # نوافذ محفوظة (لكل السلاسل)
+DEFAULT_DURATION = timedelta(hours=1)
+
+
+def _sunday_index(day: date) -> int:
+    """رقم اليوم في الأسبوع (0=الأحد، 6=السبت)"""
+    return (day.weekday() + 1) % 7
+
+
+def _month_day(year: int, month: int, day: int) -> date:
+    """تاريخ في الشهر مع تصحيح اليوم للأشهر الأقصر"""
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+class RecurrenceExpander:
+    """
+    محرك توسيع التكرارات
+
+    القواعد (نفس نمط RecurrencePattern):
+    - يومي/أسبوعي بدون أيام: كل interval يوم/أسبوع من تاريخ البداية
+    - أسبوعي مع days_of_week: الأيام المحددة في كل interval أسبوع
+      (الأسابيع تبدأ الأحد، من أسبوع تاريخ البداية)
+    - شهري: day_of_month (أو يوم البداية) كل interval شهر
+    - سنوي: month_of_year/day_of_month (أو تاريخ البداية) كل interval سنة
+
+    end_count يعد كل تواريخ القاعدة من البداية (مثل COUNT في RRULE)،
+    والحدث الأصلي نفسه يمثل تكرار تاريخ البداية.
+    """
+
+    def __init__(self, max_windows: int = MAX_CACHED_WINDOWS):
+        self._lock = threading.Lock()
+        self._windows: "OrderedDict[tuple, List[date]]" = OrderedDict()
+        self._max_windows = max_windows
+
+    # ═══════════════════════════════════════════════════════════════
+    # Rule expansion
+    # ═══════════════════════════════════════════════════════════════
+
+    def occurrence_dates(
+        self,
+        pattern: RecurrencePattern,
+        series_start: date,
+        window_start: date,
+        window_end: date,
+        until: Optional[date] = None,
+        limit: Optional[int] = None
+    ) -> List[date]:
+        """
+        تواريخ التكرار داخل [window_start, window_end]
+
+        Args:
+            pattern: نمط التكرار
+            series_start: تاريخ بداية السلسلة
+            window_start: أول يوم في النافذة
+            window_end: آخر يوم في النافذة
+            until: آخر تاريخ مسموح (إضافة إلى end_date في النمط)
+            limit: أقصى عدد تواريخ
+
+        Returns:
+            التواريخ بالترتيب (تاريخ البداية نفسه غير مشمول)
+        """
+        last = window_end
+        for end in (pattern.end_date, until):
+            if end is not None and end < last:
+                last = end
+        first = max(window_start, series_start + timedelta(days=1))
+        if first > last or pattern.interval is None or pattern.interval < 1:
+            return []
+
+        count = pattern.end_count if pattern.end_count else None
+        result = []
+        for ordinal, day in self._iter_rule(pattern, series_start, first):
+            if day > last or (count is not None and ordinal >= count):
+                break
+            if day >= first and day != series_start:
+                result.append(day)
+                if limit is not None and len(result) >= limit:
+                    break
+        return result
+
+    def _iter_rule(
+        self,
+        pattern: RecurrencePattern,
+        start: date,
+        from_date: date
+    ) -> Iterator[Tuple[int, date]]:
+        """
+        (الترتيب، التاريخ) لتواريخ القاعدة بدءاً من الفترة التي تحوي from_date
+
+        الترتيب هو رقم التكرار منذ بداية السلسلة (0 = الأول) ويُحسب
+        حسابياً للفترة الأولى بدل العد منذ البداية.
+        """
+        interval = pattern.interval
+
+        if pattern.type == RecurrenceType.WEEKLY and pattern.days_of_week:
+            days = sorted({int(d) % 7 for d in pattern.days_of_week})
+            week0 = start - timedelta(days=_sunday_index(start))
+            period = 7 * interval
+            first_week = [d for d in days if d >= _sunday_index(start)]
+
+            k = max(0, (from_date - week0).days // period)
+            ordinal = 0 if k == 0 else len(first_week) + (k - 1) * len(days)
+            while True:
+                week_start = week0 + timedelta(days=k * period)
+                for d in (first_week if k == 0 else days):
+                    yield ordinal, week_start + timedelta(days=d)
+                    ordinal += 1
+                k += 1
+
+        elif pattern.type in (RecurrenceType.DAILY, RecurrenceType.WEEKLY):
+            step = interval * (7 if pattern.type == RecurrenceType.WEEKLY else 1)
+            k = max(0, -(-(from_date - start).days // step))
+            while True:
+                yield k, start + timedelta(days=k * step)
+                k += 1
+
+        elif pattern.type == RecurrenceType.MONTHLY:
+            day = pattern.day_of_month or start.day
+            months = (from_date.year - start.year) * 12 + from_date.month - start.month
+            skipped = 1 if _month_day(start.year, start.month, day) < start else 0
+            k = max(0, months // interval)
+            while True:
+                month_index = start.month - 1 + k * interval
+                occurrence = _month_day(start.year + month_index // 12, month_index % 12 + 1, day)
+                if occurrence >= start:
+                    yield k - skipped, occurrence
+                k += 1
+
+        elif pattern.type == RecurrenceType.YEARLY:
+            month = pattern.month_of_year or start.month
+            day = pattern.day_of_month or start.day
+            skipped = 1 if _month_day(start.year, month, day) < start else 0
+            k = max(0, (from_date.year - start.year) // interval)
+            while True:
+                occurrence = _month_day(start.year + k * interval, month, day)
+                if occurrence >= start:
+                    yield k - skipped, occurrence
+                k += 1
+
+    # ═══════════════════════════════════════════════════════════════
+    # Event expansion
+    # ═══════════════════════════════════════════════════════════════
+
+    def expand(
+        self,
+        event: CalendarEvent,
+        window_start: date,
+        window_end: date,
+        exceptions: Optional[Set[date]] = None
+    ) -> List[CalendarEvent]:
+        """
+        تكرارات الحدث الظاهرة في النافذة (أحداث افتراضية غير محفوظة)
+
+        تشمل التكرارات التي تبدأ قبل النافذة وتمتد داخلها.
+
+        Args:
+            event: الحدث المتكرر (السلسلة)
+            window_start: أول يوم ظاهر
+            window_end: آخر يوم ظاهر
+            exceptions: تواريخ التكرارات الملغاة أو المعدلة
+
+        Returns:
+            قائمة أحداث (id=None، parent_event_id = معرف السلسلة)
+        """
+        if not event.is_recurring or not event.recurrence_pattern or not event.start_datetime:
+            return []
+
+        duration = self._duration(event)
+        span_start = window_start - timedelta(days=duration.days)
+        dates = self._cached_dates(event, span_start, window_end)
+
+        return [
+            self.build_occurrence(event, day, duration)
+            for day in dates
+            if not exceptions or day not in exceptions
+        ]
+
+    def build_occurrence(
+        self,
+        event: CalendarEvent,
+        occurrence_date: date,
+        duration: Optional[timedelta] = None
+    ) -> CalendarEvent:
+        """إنشاء حدث تكرار واحد من السلسلة"""
+        duration = duration if duration is not None else self._duration(event)
+        start = datetime.combine(occurrence_date, event.start_datetime.time())
+        return replace(
+            event,
+            id=None,
+            start_datetime=start,
+            end_datetime=start + duration,
+            is_recurring=False,
+            recurrence_pattern=None,
+            recurrence_end_date=None,
+            parent_event_id=event.id,
+            metadata={**(event.metadata or {}), "occurrence_date": occurrence_date.isoformat()},
+        )
+
+    def _duration(self, event: CalendarEvent) -> timedelta:
+        if event.start_datetime and event.end_datetime:
+            return max(event.end_datetime - event.start_datetime, timedelta(0))
+        return DEFAULT_DURATION
+
+    def _cached_dates(self, event: CalendarEvent, window_start: date, window_end: date) -> List[date]:
+        """تواريخ النافذة من الذاكرة المؤقتة أو بالحساب"""
+        pattern = event.recurrence_pattern
+        key = (
+            event.id,
+            event.start_datetime.date(),
+            pattern.to_json(),
+            event.recurrence_end_date,
+            window_start,
+            window_end,
+        )
+        with self._lock:
+            dates = self._windows.get(key)
+            if dates is not None:
+                self._windows.move_to_end(key)
+                return dates
+
+        dates = self.occurrence_dates(
+            pattern, event.start_datetime.date(), window_start, window_end,
+            until=event.recurrence_end_date
+        )
+
+        with self._lock:
+            self._windows[key] = dates
+            while len(self._windows) > self._max_windows:
+                self._windows.popitem(last=False)
+        return dates
+
+    def invalidate(self, event_id: Optional[int] = None) -> None:
+        """مسح النوافذ المحفوظة لسلسلة (أو للكل)"""
+        with self._lock:
+            if event_id is None:
+                self._windows.clear()
+                return
+            for key in [k for k in self._windows if k[0] == event_id]:
+                del self._windows[key]
+
+
+# ═══════════════════════════════════════════════════════════════
+# Singleton & Quick Access Functions
+# ═══════════════════════════════════════════════════════════════
+
+_expander: Optional[RecurrenceExpander] = None
+
+
+def get_recurrence_expander() -> RecurrenceExpander:
+    """الحصول على مثيل محرك التكرار"""
+    global _expander
+    if _expander is None:
+        _expander = RecurrenceExpander()
+    return _expander
+
+
+def expand_recurring_event(
+    event: CalendarEvent,
+    window_start: date,
+    window_end: date,
+    exceptions: Optional[Set[date]] = None
+) -> List[CalendarEvent]:
+    """تكرارات الحدث الظاهرة في النافذة"""
+    return get_recurrence_expander().expand(event, window_start, window_end, exceptions)
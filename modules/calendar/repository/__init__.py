@@ -9,6 +9,7 @@ INTEGRA - Calendar Repository
 from .calendar_repository import (
     # Event CRUD
     create_event,
+    create_events,
     get_event,
     update_event,
     delete_event,
@@ -44,6 +45,10 @@ from .calendar_repository import (
 
     # Recurrence
     generate_recurring_events,
+    save_recurring_events,
+    get_expanded_events,
+    cancel_occurrence,
+    override_occurrence,
 
     # Repository class
     CalendarRepository,
@@ -53,6 +58,7 @@ from .calendar_repository import (
 __all__ = [
     # Event CRUD
     "create_event",
+    "create_events",
     "get_event",
     "update_event",
     "delete_event",
@@ -88,6 +94,10 @@ __all__ = [
 
     # Recurrence
     "generate_recurring_events",
+    "save_recurring_events",
+    "get_expanded_events",
+    "cancel_occurrence",
+    "override_occurrence",
 
     # Repository class
     "CalendarRepository",
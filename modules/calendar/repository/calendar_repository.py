@@ -10,7 +10,10 @@ from datetime import datetime, date, timedelta
 from typing import Optional, List, Tuple, Dict, Any
 import json
 
-from core.database import select_all, select_one, insert_returning_id, update, delete
+from core.database import (
+    select_all, select_one, insert_returning_id, update, delete,
+    insert_many, transaction, execute_query
+)
 from core.logging import app_logger
 
 from ..models import (
@@ -21,14 +24,94 @@ from ..models import (
     EventStatistics,
     EventType,
     EventStatus,
-    RecurrencePattern,
-    RecurrenceType,
+)
+from ..recurrence import get_recurrence_expander
+
+
+# أعمدة الإدراج في calendar_events (بنفس ترتيب _event_params)
+EVENT_INSERT_COLUMNS = [
+    "title", "description", "event_type",
+    "start_datetime", "end_datetime", "is_all_day", "timezone",
+    "task_id", "employee_id",
+    "reminders", "attendees",
+    "is_recurring", "recurrence_pattern", "recurrence_end_date", "parent_event_id",
+    "color", "category",
+    "location", "location_url",
+    "source", "external_id", "external_link",
+    "status", "is_private",
+    "metadata", "created_by",
+]
+
+EVENT_INSERT_SQL = """
+    INSERT INTO calendar_events ({columns})
+    VALUES ({placeholders})
+    RETURNING id
+""".format(
+    columns=", ".join(EVENT_INSERT_COLUMNS),
+    placeholders=", ".join(["%s"] * len(EVENT_INSERT_COLUMNS))
+)
+
+# الأحداث المتكررة التي قد يكون لها تكرارات في النطاق (بدايتها قبل نهايته)
+RECURRING_SERIES_SQL = """
+    SELECT v.*, ce.recurrence_end_date
+    FROM calendar_events_view v
+    JOIN calendar_events ce ON ce.id = v.id
+    WHERE v.is_recurring = TRUE
+      AND v.recurrence_pattern IS NOT NULL
+      AND v.start_datetime < %s
+      AND (ce.recurrence_end_date IS NULL OR ce.recurrence_end_date >= %s)
+      AND v.status != 'cancelled'
+"""
+
+# فهرس التعارضات (نفس تعريف tables/calendar_events.sql) - يُنشأ عند أول فحص
+CONFLICT_INDEX_SQL = """
+    CREATE OR REPLACE FUNCTION calendar_event_period(p_start TIMESTAMP, p_end TIMESTAMP)
+    RETURNS tsrange AS $$
+        SELECT CASE
+            WHEN p_end IS NULL OR p_end <= p_start THEN tsrange(p_start, p_start, '[]')
+            ELSE tsrange(p_start, p_end, '[)')
+        END
+    $$ LANGUAGE sql IMMUTABLE;
+
+    CREATE INDEX IF NOT EXISTS idx_calendar_events_period ON calendar_events
+        USING GIST (calendar_event_period(start_datetime, end_datetime))
+        WHERE status != 'cancelled';
+"""
+
+# تقاطع النطاقات عبر فهرس GiST
+_CONFLICT_RANGE_PREDICATE = (
+    "calendar_event_period(start_datetime, end_datetime) && tsrange(%s, %s, '[)')"
 )
 
+# الشرط القديم (بدون الدالة/الفهرس)
+_CONFLICT_LEGACY_PREDICATE = """(
+    (start_datetime >= %s AND start_datetime < %s)
+    OR (end_datetime > %s AND end_datetime <= %s)
+    OR (start_datetime <= %s AND end_datetime >= %s)
+)"""
+
+UPSERT_EXCEPTION_SQL = """
+    INSERT INTO calendar_event_exceptions (event_id, occurrence_date, override_event_id)
+    VALUES (%s, %s, %s)
+    ON CONFLICT (event_id, occurrence_date)
+    DO UPDATE SET override_event_id = EXCLUDED.override_event_id
+"""
+
+DELETE_OVERRIDE_SQL = """
+    DELETE FROM calendar_events
+    WHERE id IN (
+        SELECT override_event_id FROM calendar_event_exceptions
+        WHERE event_id = %s AND occurrence_date = %s
+    )
+"""
+
 
 class CalendarRepository:
     """مستودع بيانات التقويم"""
 
+    # None = لم يُفحص بعد، False = غير متاح (يُستخدم الشرط العادي)
+    _conflict_index_ready: Optional[bool] = None
+
     # ═══════════════════════════════════════════════════════════════
     # Event CRUD
     # ═══════════════════════════════════════════════════════════════
@@ -36,63 +119,7 @@ class CalendarRepository:
     def create_event(self, event: CalendarEvent) -> Optional[int]:
         """إنشاء حدث جديد"""
         try:
-            sql = """
-                INSERT INTO calendar_events (
-                    title, description, event_type,
-                    start_datetime, end_datetime, is_all_day, timezone,
-                    task_id, employee_id,
-                    reminders, attendees,
-                    is_recurring, recurrence_pattern, recurrence_end_date, parent_event_id,
-                    color, category,
-                    location, location_url,
-                    source, external_id, external_link,
-                    status, is_private,
-                    metadata, created_by
-                ) VALUES (
-                    %s, %s, %s,
-                    %s, %s, %s, %s,
-                    %s, %s,
-                    %s, %s,
-                    %s, %s, %s, %s,
-                    %s, %s,
-                    %s, %s,
-                    %s, %s, %s,
-                    %s, %s,
-                    %s, %s
-                )
-                RETURNING id
-            """
-
-            params = (
-                event.title,
-                event.description,
-                event.event_type.value,
-                event.start_datetime,
-                event.end_datetime,
-                event.is_all_day,
-                event.timezone,
-                event.task_id,
-                event.employee_id,
-                json.dumps([r.to_dict() for r in event.reminders], ensure_ascii=False),
-                json.dumps([a.to_dict() for a in event.attendees], ensure_ascii=False),
-                event.is_recurring,
-                event.recurrence_pattern.to_json() if event.recurrence_pattern else None,
-                event.recurrence_end_date,
-                event.parent_event_id,
-                event.color,
-                event.category,
-                event.location,
-                event.location_url,
-                event.source,
-                event.external_id,
-                event.external_link,
-                event.status.value,
-                event.is_private,
-                json.dumps(event.metadata, ensure_ascii=False) if event.metadata else "{}",
-                event.created_by
-            )
-
-            event_id = insert_returning_id(sql, params)
+            event_id = insert_returning_id(EVENT_INSERT_SQL, self._event_params(event))
             app_logger.info(f"تم إنشاء حدث جديد: {event.title} (ID: {event_id})")
             return event_id
 
@@ -100,6 +127,60 @@ class CalendarRepository:
             app_logger.error(f"خطأ في إنشاء الحدث: {e}")
             return None
 
+    def create_events(self, events: List[CalendarEvent]) -> int:
+        """
+        إنشاء عدة أحداث دفعة واحدة (INSERT متعدد الصفوف)
+
+        Returns:
+            عدد الأحداث المضافة أو -1 عند الخطأ
+        """
+        if not events:
+            return 0
+        try:
+            count = insert_many(
+                "calendar_events",
+                EVENT_INSERT_COLUMNS,
+                [self._event_params(event) for event in events]
+            )
+            if count > 0:
+                app_logger.info(f"تم إنشاء {count} حدث دفعة واحدة")
+            return count
+
+        except Exception as e:
+            app_logger.error(f"خطأ في إنشاء الأحداث: {e}")
+            return -1
+
+    def _event_params(self, event: CalendarEvent) -> tuple:
+        """قيم الحدث بترتيب EVENT_INSERT_COLUMNS"""
+        return (
+            event.title,
+            event.description,
+            event.event_type.value,
+            event.start_datetime,
+            event.end_datetime,
+            event.is_all_day,
+            event.timezone,
+            event.task_id,
+            event.employee_id,
+            json.dumps([r.to_dict() for r in event.reminders], ensure_ascii=False),
+            json.dumps([a.to_dict() for a in event.attendees], ensure_ascii=False),
+            event.is_recurring,
+            event.recurrence_pattern.to_json() if event.recurrence_pattern else None,
+            event.recurrence_end_date,
+            event.parent_event_id,
+            event.color,
+            event.category,
+            event.location,
+            event.location_url,
+            event.source,
+            event.external_id,
+            event.external_link,
+            event.status.value,
+            event.is_private,
+            json.dumps(event.metadata, ensure_ascii=False) if event.metadata else "{}",
+            event.created_by
+        )
+
     def get_event(self, event_id: int) -> Optional[CalendarEvent]:
         """جلب حدث بالمعرف"""
         try:
@@ -172,6 +253,7 @@ class CalendarRepository:
             )
 
             update(sql, params)
+            get_recurrence_expander().invalidate(event.id)
             app_logger.info(f"تم تحديث الحدث: {event.title} (ID: {event.id})")
             return True
 
@@ -184,6 +266,7 @@ class CalendarRepository:
         try:
             sql = "DELETE FROM calendar_events WHERE id = %s"
             delete(sql, (event_id,))
+            get_recurrence_expander().invalidate(event_id)
             app_logger.info(f"تم حذف الحدث: {event_id}")
             return True
         except Exception as e:
@@ -541,24 +624,45 @@ class CalendarRepository:
     # Conflict Detection
     # ═══════════════════════════════════════════════════════════════
 
+    def ensure_conflict_index(self) -> bool:
+        """إنشاء calendar_event_period وفهرس GiST الخاص بها (إن لم تكن موجودة)"""
+        if self._conflict_index_ready is None:
+            self._conflict_index_ready = execute_query(CONFLICT_INDEX_SQL)
+            if not self._conflict_index_ready:
+                app_logger.warning(
+                    "Calendar conflict index unavailable, using plain overlap query"
+                )
+        return self._conflict_index_ready
+
     def check_conflicts(
         self,
         start_datetime: datetime,
         end_datetime: datetime,
         exclude_event_id: Optional[int] = None
     ) -> List[CalendarEvent]:
-        """التحقق من تعارض الأحداث"""
+        """
+        التحقق من تعارض الأحداث
+
+        تقاطع نطاقات زمنية (&&) يستخدم فهرس GiST على
+        calendar_event_period(start_datetime, end_datetime)، ويرجع إلى
+        شرط التقاطع العادي إذا تعذر إنشاء الفهرس.
+
+        Raises:
+            ValueError: إذا كانت النهاية قبل البداية
+        """
+        if end_datetime < start_datetime:
+            raise ValueError(
+                f"end_datetime ({end_datetime}) is before start_datetime ({start_datetime})"
+            )
+
         try:
-            conditions = [
-                "status != 'cancelled'",
-                "is_all_day = FALSE",
-                """(
-                    (start_datetime >= %s AND start_datetime < %s)
-                    OR (end_datetime > %s AND end_datetime <= %s)
-                    OR (start_datetime <= %s AND end_datetime >= %s)
-                )"""
-            ]
-            params = [start_datetime, end_datetime, start_datetime, end_datetime, start_datetime, end_datetime]
+            conditions = ["status != 'cancelled'", "is_all_day = FALSE"]
+            if self.ensure_conflict_index():
+                conditions.append(_CONFLICT_RANGE_PREDICATE)
+                params = [start_datetime, end_datetime]
+            else:
+                conditions.append(_CONFLICT_LEGACY_PREDICATE)
+                params = [start_datetime, end_datetime] * 3
 
             if exclude_event_id:
                 conditions.append("id != %s")
@@ -581,99 +685,190 @@ class CalendarRepository:
     # Recurrence
     # ═══════════════════════════════════════════════════════════════
 
-    def generate_recurring_events(
+    def get_expanded_events(
         self,
-        parent_event: CalendarEvent,
-        until_date: date
+        start_date: date,
+        end_date: date,
+        category: Optional[str] = None,
+        event_type: Optional[EventType] = None
     ) -> List[CalendarEvent]:
-        """توليد الأحداث المتكررة"""
-        if not parent_event.is_recurring or not parent_event.recurrence_pattern:
-            return []
+        """
+        جلب أحداث نطاق العرض مع تكرارات الأحداث المتكررة
 
-        generated = []
-        pattern = parent_event.recurrence_pattern
-        current_date = parent_event.start_datetime.date() if parent_event.start_datetime else date.today()
-
-        # حساب المدة الأصلية
-        duration = timedelta(hours=1)
-        if parent_event.start_datetime and parent_event.end_datetime:
-            duration = parent_event.end_datetime - parent_event.start_datetime
-
-        count = 0
-        max_count = pattern.end_count or 365  # حد أقصى للتكرارات
-
-        while current_date <= until_date and count < max_count:
-            # تخطي التاريخ الأصلي
-            if parent_event.start_datetime and current_date == parent_event.start_datetime.date():
-                current_date = self._get_next_occurrence(current_date, pattern)
-                continue
-
-            # التحقق من تاريخ الانتهاء
-            if pattern.end_date and current_date > pattern.end_date:
-                break
-
-            # التحقق من أيام الأسبوع (للأسبوعي)
-            if pattern.type == RecurrenceType.WEEKLY and pattern.days_of_week:
-                day_of_week = (current_date.weekday() + 1) % 7  # تحويل إلى 0=الأحد
-                if day_of_week not in pattern.days_of_week:
-                    current_date = self._get_next_occurrence(current_date, pattern)
-                    continue
-
-            # إنشاء الحدث المتكرر
-            start_time = parent_event.start_datetime.time() if parent_event.start_datetime else datetime.min.time()
-            new_start = datetime.combine(current_date, start_time)
-            new_end = new_start + duration
-
-            new_event = CalendarEvent(
-                title=parent_event.title,
-                description=parent_event.description,
-                event_type=parent_event.event_type,
-                start_datetime=new_start,
-                end_datetime=new_end,
-                is_all_day=parent_event.is_all_day,
-                timezone=parent_event.timezone,
-                task_id=parent_event.task_id,
-                employee_id=parent_event.employee_id,
-                color=parent_event.color,
-                category=parent_event.category,
-                location=parent_event.location,
-                location_url=parent_event.location_url,
-                parent_event_id=parent_event.id,
-                is_recurring=False
+        التكرارات تُحسب للنطاق فقط (غير محفوظة، id=None) بعد استبعاد
+        الاستثناءات والتكرارات المحفوظة مسبقاً.
+
+        الاستخدام:
+            view.set_events(get_expanded_events(*view.get_visible_date_range()))
+        """
+        if isinstance(start_date, datetime):
+            start_date = start_date.date()
+        if isinstance(end_date, datetime):
+            end_date = end_date.date()
+
+        range_start = datetime.combine(start_date, datetime.min.time())
+        range_end = datetime.combine(end_date, datetime.max.time())
+        events = self.get_events_in_range(range_start, range_end, category, event_type)
+
+        try:
+            conditions = []
+            params = [range_end, start_date]
+            if category:
+                conditions.append("AND v.category = %s")
+                params.append(category)
+            if event_type:
+                conditions.append("AND v.event_type = %s")
+                params.append(event_type.value)
+
+            columns, rows = select_all(
+                RECURRING_SERIES_SQL + " ".join(conditions), tuple(params)
+            )
+            series = [CalendarEvent.from_row(row, columns) for row in rows]
+            if not series:
+                return events
+
+            # التكرارات الممتدة من قبل النطاق (أحداث متعددة الأيام)
+            longest = max(
+                ((e.end_datetime - e.start_datetime).days for e in series if e.end_datetime),
+                default=0
+            )
+            exceptions = self.get_occurrence_exceptions(
+                [e.id for e in series],
+                start_date - timedelta(days=max(longest, 0)),
+                end_date
             )
 
-            generated.append(new_event)
-            count += 1
+            stored = {
+                (e.parent_event_id, e.start_datetime.date())
+                for e in events
+                if e.parent_event_id and e.start_datetime
+            }
 
-            current_date = self._get_next_occurrence(current_date, pattern)
+            expander = get_recurrence_expander()
+            for parent in series:
+                for occurrence in expander.expand(
+                    parent, start_date, end_date, exceptions.get(parent.id)
+                ):
+                    if (parent.id, occurrence.start_datetime.date()) not in stored:
+                        events.append(occurrence)
 
-        return generated
+            events.sort(key=lambda e: e.start_datetime)
+            return events
+
+        except Exception as e:
+            app_logger.error(f"خطأ في توسيع الأحداث المتكررة: {e}")
+            return events
+
+    def get_occurrence_exceptions(
+        self,
+        event_ids: List[int],
+        start_date: date,
+        end_date: date
+    ) -> Dict[int, set]:
+        """
+        تواريخ التكرارات الملغاة أو المعدلة
+
+        Returns:
+            {معرف السلسلة: مجموعة التواريخ}
+        """
+        if not event_ids:
+            return {}
+        try:
+            sql = """
+                SELECT event_id, occurrence_date
+                FROM calendar_event_exceptions
+                WHERE event_id = ANY(%s)
+                  AND occurrence_date BETWEEN %s AND %s
+            """
+            columns, rows = select_all(sql, (list(event_ids), start_date, end_date))
+            exceptions: Dict[int, set] = {}
+            for event_id, occurrence_date in rows:
+                exceptions.setdefault(event_id, set()).add(occurrence_date)
+            return exceptions
+        except Exception as e:
+            app_logger.error(f"خطأ في جلب استثناءات التكرار: {e}")
+            return {}
+
+    def cancel_occurrence(self, event_id: int, occurrence_date: date) -> bool:
+        """إلغاء تكرار واحد من حدث متكرر (مع حذف نسخته المعدلة إن وجدت)"""
+        try:
+            with transaction():
+                delete(DELETE_OVERRIDE_SQL, (event_id, occurrence_date))
+                update(UPSERT_EXCEPTION_SQL, (event_id, occurrence_date, None))
+            app_logger.info(f"تم إلغاء تكرار {occurrence_date} للحدث {event_id}")
+            return True
+        except Exception as e:
+            app_logger.error(f"خطأ في إلغاء التكرار {occurrence_date} للحدث {event_id}: {e}")
+            return False
+
+    def override_occurrence(
+        self,
+        event_id: int,
+        occurrence_date: date,
+        occurrence: CalendarEvent
+    ) -> Optional[int]:
+        """
+        حفظ نسخة معدلة لتكرار واحد من حدث متكرر
+
+        Args:
+            event_id: معرف الحدث المتكرر
+            occurrence_date: التاريخ الأصلي للتكرار
+            occurrence: الحدث المعدل (مثلاً من RecurrenceExpander.build_occurrence)
+
+        Returns:
+            معرف الحدث المحفوظ أو None عند الخطأ
+        """
+        occurrence.parent_event_id = event_id
+        occurrence.is_recurring = False
+        occurrence.recurrence_pattern = None
+        occurrence.recurrence_end_date = None
+        try:
+            with transaction():
+                delete(DELETE_OVERRIDE_SQL, (event_id, occurrence_date))
+                override_id = insert_returning_id(EVENT_INSERT_SQL, self._event_params(occurrence))
+                update(UPSERT_EXCEPTION_SQL, (event_id, occurrence_date, override_id))
+            app_logger.info(f"تم تعديل تكرار {occurrence_date} للحدث {event_id} (ID: {override_id})")
+            return override_id
+        except Exception as e:
+            app_logger.error(f"خطأ في تعديل التكرار {occurrence_date} للحدث {event_id}: {e}")
+            return None
 
-    def _get_next_occurrence(self, current: date, pattern: RecurrencePattern) -> date:
-        """حساب التاريخ التالي للتكرار"""
-        if pattern.type == RecurrenceType.DAILY:
-            return current + timedelta(days=pattern.interval)
+    def generate_recurring_events(
+        self,
+        parent_event: CalendarEvent,
+        until_date: date
+    ) -> List[CalendarEvent]:
+        """توليد الأحداث المتكررة حتى تاريخ معين (للحفظ)"""
+        if not parent_event.is_recurring or not parent_event.recurrence_pattern:
+            return []
+        if not parent_event.start_datetime:
+            return []
 
-        elif pattern.type == RecurrenceType.WEEKLY:
-            return current + timedelta(weeks=pattern.interval)
+        pattern = parent_event.recurrence_pattern
+        series_start = parent_event.start_datetime.date()
+        expander = get_recurrence_expander()
 
-        elif pattern.type == RecurrenceType.MONTHLY:
-            # إضافة أشهر
-            month = current.month + pattern.interval
-            year = current.year + (month - 1) // 12
-            month = ((month - 1) % 12) + 1
-            day = pattern.day_of_month or current.day
-            # تصحيح اليوم إذا كان أكبر من أيام الشهر
-            while True:
-                try:
-                    return date(year, month, day)
-                except ValueError:
-                    day -= 1
+        dates = expander.occurrence_dates(
+            pattern, series_start, series_start, until_date,
+            until=parent_event.recurrence_end_date,
+            limit=None if pattern.end_count else 365  # حد أقصى للتكرارات
+        )
+        return [expander.build_occurrence(parent_event, day) for day in dates]
 
-        elif pattern.type == RecurrenceType.YEARLY:
-            return current.replace(year=current.year + pattern.interval)
+    def save_recurring_events(
+        self,
+        parent_event: CalendarEvent,
+        until_date: date
+    ) -> int:
+        """
+        توليد الأحداث المتكررة وحفظها في قاعدة البيانات دفعة واحدة
 
-        return current + timedelta(days=1)
+        Returns:
+            عدد الأحداث المحفوظة أو -1 عند الخطأ
+        """
+        return self.create_events(
+            self.generate_recurring_events(parent_event, until_date)
+        )
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -700,6 +895,11 @@ def create_event(event: CalendarEvent) -> Optional[int]:
     return get_calendar_repository().create_event(event)
 
 
+def create_events(events: List[CalendarEvent]) -> int:
+    """إنشاء عدة أحداث دفعة واحدة"""
+    return get_calendar_repository().create_events(events)
+
+
 def get_event(event_id: int) -> Optional[CalendarEvent]:
     """جلب حدث بالمعرف"""
     return get_calendar_repository().get_event(event_id)
@@ -825,3 +1025,35 @@ def generate_recurring_events(
 ) -> List[CalendarEvent]:
     """توليد الأحداث المتكررة"""
     return get_calendar_repository().generate_recurring_events(parent_event, until_date)
+
+
+def save_recurring_events(
+    parent_event: CalendarEvent,
+    until_date: date
+) -> int:
+    """توليد الأحداث المتكررة وحفظها دفعة واحدة"""
+    return get_calendar_repository().save_recurring_events(parent_event, until_date)
+
+
+def get_expanded_events(
+    start_date: date,
+    end_date: date,
+    category: Optional[str] = None,
+    event_type: Optional[EventType] = None
+) -> List[CalendarEvent]:
+    """جلب أحداث نطاق العرض مع التكرارات"""
+    return get_calendar_repository().get_expanded_events(start_date, end_date, category, event_type)
+
+
+def cancel_occurrence(event_id: int, occurrence_date: date) -> bool:
+    """إلغاء تكرار واحد"""
+    return get_calendar_repository().cancel_occurrence(event_id, occurrence_date)
+
+
+def override_occurrence(
+    event_id: int,
+    occurrence_date: date,
+    occurrence: CalendarEvent
+) -> Optional[int]:
+    """حفظ نسخة معدلة لتكرار واحد"""
+    return get_calendar_repository().override_occurrence(event_id, occurrence_date, occurrence)
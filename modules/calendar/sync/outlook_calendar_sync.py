@@ -16,7 +16,7 @@ from ..models import (
     Attendee, AttendeeStatus, Reminder, ReminderType
 )
 from ..repository import (
-    create_event, update_event, get_event, get_all_events
+    create_event, create_events, update_event, get_event, get_all_events
 )
 
 
@@ -28,6 +28,8 @@ class OutlookCalendarSync:
         self._namespace = None
         self._calendar_folder = None
         self._connected = False
+        # أحداث آخر مزامنة من Outlook التي فشلت: (entry_id، العنوان، الخطأ)
+        self.last_sync_errors: List[Tuple[str, str, str]] = []
         self._lock = threading.Lock()
 
     def connect(self) -> bool:
@@ -156,45 +158,99 @@ class OutlookCalendarSync:
         """
         مزامنة الأحداث من Outlook إلى INTEGRA
 
+        كل حدث داخل SAVEPOINT خاص به: فشل حدث يُلغي تغييراته فقط
+        ويُسجَّل في last_sync_errors، وباقي الأحداث تُحفظ.
+
         Returns:
             (أحداث جديدة، أحداث محدثة، أحداث فشلت)
         """
         added = 0
         updated = 0
-        failed = 0
+        self.last_sync_errors = []
 
         outlook_events = self.get_outlook_events(start_date, end_date)
+        new_events: List[Tuple[Dict[str, Any], CalendarEvent]] = []
 
-        for outlook_event in outlook_events:
-            try:
-                # التحقق من وجود الحدث (بواسطة external_id)
-                external_id = outlook_event.get("entry_id")
-                existing = self._find_event_by_external_id(external_id)
-
-                # تحويل إلى CalendarEvent
-                event = self._outlook_to_calendar_event(outlook_event)
-
-                if existing:
-                    # تحديث الحدث الموجود
-                    event.id = existing.id
-                    if update_event(event):
-                        updated += 1
-                    else:
-                        failed += 1
-                else:
-                    # إضافة حدث جديد
-                    if create_event(event):
-                        added += 1
-                    else:
-                        failed += 1
+        from core.database import transaction, savepoint
 
-            except Exception as e:
-                app_logger.error(f"خطأ في مزامنة حدث Outlook: {e}")
-                failed += 1
+        try:
+            # كل التحديثات على اتصال واحد مع commit واحد
+            with transaction():
+                for outlook_event in outlook_events:
+                    try:
+                        with savepoint():
+                            # التحقق من وجود الحدث (بواسطة external_id)
+                            external_id = outlook_event.get("entry_id")
+                            existing = self._find_event_by_external_id(external_id)
+
+                            # تحويل إلى CalendarEvent
+                            event = self._outlook_to_calendar_event(outlook_event)
+
+                            if existing:
+                                # تحديث الحدث الموجود
+                                event.id = existing.id
+                                if not update_event(event):
+                                    raise RuntimeError("update failed")
+                                updated += 1
+                            else:
+                                # تجميع الأحداث الجديدة لإدراجها دفعة واحدة
+                                new_events.append((outlook_event, event))
+
+                    except Exception as e:
+                        self._record_sync_error(outlook_event, e)
+
+                if new_events:
+                    added += self._insert_new_events(new_events)
 
+        except Exception as e:
+            app_logger.error(f"خطأ في حفظ أحداث Outlook: {e}")
+            self.last_sync_errors = [
+                (event.get("entry_id", ""), event.get("subject", ""), str(e))
+                for event in outlook_events
+            ]
+            return 0, 0, len(outlook_events)
+
+        failed = len(self.last_sync_errors)
         app_logger.info(f"مزامنة من Outlook: {added} جديد، {updated} محدث، {failed} فشل")
         return added, updated, failed
 
+    def _insert_new_events(self, new_events: List[Tuple[Dict[str, Any], CalendarEvent]]) -> int:
+        """
+        إدراج الأحداث الجديدة دفعة واحدة، وعند فشل الدفعة حدثاً حدثاً
+        (كل حدث في SAVEPOINT) لتحديد الأحداث الفاشلة فقط
+
+        Returns:
+            عدد الأحداث المضافة
+        """
+        from core.database import savepoint
+
+        try:
+            with savepoint():
+                count = create_events([event for _, event in new_events])
+                if count < 0:
+                    raise RuntimeError("batch insert failed")
+                return count
+        except Exception as e:
+            app_logger.warning(f"فشل الإدراج الدفعي لأحداث Outlook، إعادة المحاولة حدثاً حدثاً: {e}")
+
+        added = 0
+        for outlook_event, event in new_events:
+            try:
+                with savepoint():
+                    if create_event(event) is None:
+                        raise RuntimeError("insert failed")
+                    added += 1
+            except Exception as e:
+                self._record_sync_error(outlook_event, e)
+        return added
+
+    def _record_sync_error(self, outlook_event: Dict[str, Any], error: Exception) -> None:
+        """تسجيل حدث Outlook فشلت مزامنته"""
+        entry_id = outlook_event.get("entry_id", "")
+        subject = outlook_event.get("subject", "")
+        app_logger.error(f"خطأ في مزامنة حدث Outlook '{subject}' ({entry_id}): {error}")
+        self.last_sync_errors.append((entry_id, subject, str(error)))
+
     def sync_to_outlook(
         self,
         events: Optional[List[CalendarEvent]] = None
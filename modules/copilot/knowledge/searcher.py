@@ -6,7 +6,10 @@ Searches indexed knowledge for relevant information.
 
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
+from bisect import bisect_left, insort
 from datetime import datetime
+import heapq
+import math
 import re
 import threading
 
@@ -50,7 +53,10 @@ class KnowledgeSearcher:
 
     Features:
     - Keyword-based search
-    - Relevance scoring
+    - Relevance scoring (BM25 with title/keyword/content field weights)
+    - Prefix matching over a sorted term array (bisect, no vocabulary scan),
+      expanded to the most frequent matching terms
+    - Incremental index: adding or removing an item only touches its terms
     - Source type filtering
     - Snippet extraction
     - Arabic and English support
@@ -75,6 +81,18 @@ class KnowledgeSearcher:
         "on", "with", "at", "by", "from", "or", "and", "not", "this", "that"
     }
 
+    # Field weights (added to the term frequency of each occurrence)
+    TITLE_WEIGHT = 3.0
+    KEYWORD_WEIGHT = 2.5
+    CONTENT_WEIGHT = 1.0
+
+    # BM25 parameters
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+
+    PARTIAL_MATCH_FACTOR = 0.5      # Prefix matches count half
+    MAX_PREFIX_EXPANSIONS = 64      # Most frequent indexed terms considered per query prefix
+
     def __init__(self, items: Optional[List[KnowledgeItem]] = None):
         """
         Initialize the searcher.
@@ -82,54 +100,180 @@ class KnowledgeSearcher:
         Args:
             items: List of knowledge items to search
         """
-        self._items: List[KnowledgeItem] = items or []
         self._lock = threading.RLock()
 
-        # Build inverted index for faster search
-        self._inverted_index: Dict[str, List[Tuple[str, float]]] = {}
-        self._rebuild_index()
+        # Persistent id -> item map
+        self._items: Dict[str, KnowledgeItem] = {}
+
+        # Per-item weighted term frequencies and lengths
+        self._item_terms: Dict[str, Dict[str, float]] = {}
+        self._item_lengths: Dict[str, float] = {}
+        self._total_length = 0.0
+
+        # term -> {item_id: weighted tf}
+        self._postings: Dict[str, Dict[str, float]] = {}
+
+        # All indexed terms, kept sorted as terms are added and removed
+        self._sorted_terms: List[str] = []
+
+        # BM25 weights computed by queries, valid until the next change
+        self._generation = 0
+        self._cache_generation = -1
+        self._length_norm: Dict[str, float] = {}
+        self._weight_cache: Dict[str, Tuple[float, List[Tuple[str, float]]]] = {}
+
+        if items:
+            self.set_items(items)
 
     def set_items(self, items: List[KnowledgeItem]) -> None:
         """Set the items to search."""
         with self._lock:
-            self._items = items
-            self._rebuild_index()
+            self._items.clear()
+            self._item_terms.clear()
+            self._item_lengths.clear()
+            self._total_length = 0.0
+            self._postings.clear()
+            self._sorted_terms = []
+            for item in items:
+                self._index_item(item, bulk=True)
+            # One sort instead of an insertion per new term
+            self._sorted_terms = sorted(self._postings)
+            self._generation += 1
 
     def add_item(self, item: KnowledgeItem) -> None:
-        """Add an item to the search index."""
+        """Add (or replace) an item in the search index."""
         with self._lock:
-            self._items.append(item)
             self._index_item(item)
 
-    def _rebuild_index(self) -> None:
-        """Rebuild the inverted index."""
-        self._inverted_index.clear()
-        for item in self._items:
-            self._index_item(item)
+    def remove_item(self, item_id: str) -> bool:
+        """Remove an item from the search index."""
+        with self._lock:
+            return self._unindex_item(item_id)
 
-    def _index_item(self, item: KnowledgeItem) -> None:
-        """Add an item to the inverted index."""
-        # Extract and weight terms
-        terms_with_weights = []
+    def get_item(self, item_id: str) -> Optional[KnowledgeItem]:
+        """Get an indexed item by ID."""
+        with self._lock:
+            return self._items.get(item_id)
 
-        # Title terms (weight: 3.0)
-        title_terms = self._tokenize(item.title)
-        terms_with_weights.extend((term, 3.0) for term in title_terms)
+    def _index_item(self, item: KnowledgeItem, bulk: bool = False) -> None:
+        """
+        Add an item to the postings (replacing a previous version).
+
+        With bulk=True new terms are not inserted into the sorted term
+        array; the caller rebuilds it once.
+        """
+        if item.id in self._items:
+            self._unindex_item(item.id)
 
-        # Keyword terms (weight: 2.5)
+        terms: Dict[str, float] = {}
+        for term in self._tokenize(item.title):
+            terms[term] = terms.get(term, 0.0) + self.TITLE_WEIGHT
         for keyword in item.keywords:
-            kw_terms = self._tokenize(keyword)
-            terms_with_weights.extend((term, 2.5) for term in kw_terms)
+            for term in self._tokenize(keyword):
+                terms[term] = terms.get(term, 0.0) + self.KEYWORD_WEIGHT
+        for term in self._tokenize(item.content):
+            terms[term] = terms.get(term, 0.0) + self.CONTENT_WEIGHT
+
+        length = sum(terms.values())
+        self._items[item.id] = item
+        self._item_terms[item.id] = terms
+        self._item_lengths[item.id] = length
+        self._total_length += length
+
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                if not bulk:
+                    insort(self._sorted_terms, term)
+            postings[item.id] = tf
+
+        self._generation += 1
+
+    def _unindex_item(self, item_id: str) -> bool:
+        """Remove an item from the postings."""
+        if item_id not in self._items:
+            return False
+
+        for term in self._item_terms.pop(item_id, {}):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(item_id, None)
+                if not postings:
+                    del self._postings[term]
+                    self._remove_sorted_term(term)
+
+        self._total_length -= self._item_lengths.pop(item_id, 0.0)
+        del self._items[item_id]
+        self._generation += 1
+        return True
+
+    def _remove_sorted_term(self, term: str) -> None:
+        """Drop a term that no longer has postings from the sorted array."""
+        terms = self._sorted_terms
+        i = bisect_left(terms, term)
+        if i < len(terms) and terms[i] == term:
+            del terms[i]
+
+    def _term_weights(self, term: str) -> Tuple[float, List[Tuple[str, float]]]:
+        """
+        BM25 weights of a term's postings.
 
-        # Content terms (weight: 1.0)
-        content_terms = self._tokenize(item.content)
-        terms_with_weights.extend((term, 1.0) for term in content_terms)
+        Computed when a query first needs the term and cached until the
+        index changes, so adding an item never rebuilds the whole index.
 
-        # Add to inverted index
-        for term, weight in terms_with_weights:
-            if term not in self._inverted_index:
-                self._inverted_index[term] = []
-            self._inverted_index[term].append((item.id, weight))
+        Returns:
+            (upper bound of the term's contribution, [(item_id, weight)])
+        """
+        if self._cache_generation != self._generation:
+            doc_count = len(self._items)
+            avg_length = self._total_length / doc_count if doc_count else 0.0
+            k1, b = self.BM25_K1, self.BM25_B
+            self._length_norm = {
+                item_id: k1 * (1 - b + b * (length / avg_length if avg_length else 0.0))
+                for item_id, length in self._item_lengths.items()
+            }
+            self._weight_cache = {}
+            self._cache_generation = self._generation
+
+        cached = self._weight_cache.get(term)
+        if cached is not None:
+            return cached
+
+        postings = self._postings.get(term)
+        if not postings:
+            return 0.0, []
+
+        k1 = self.BM25_K1
+        df = len(postings)
+        idf = math.log(1 + (len(self._items) - df + 0.5) / (df + 0.5))
+        norm = self._length_norm
+        weights = [
+            (item_id, idf * tf * (k1 + 1) / (tf + norm[item_id]))
+            for item_id, tf in postings.items()
+        ]
+        # Upper bound of a single term's contribution (tf -> infinity)
+        cached = self._weight_cache[term] = (idf * (k1 + 1), weights)
+        return cached
+
+    def _prefix_terms(self, prefix: str) -> List[str]:
+        """Indexed terms starting with prefix (binary search on the sorted array)."""
+        terms = self._sorted_terms
+        start = bisect_left(terms, prefix)
+        result = []
+        for i in range(start, len(terms)):
+            term = terms[i]
+            if not term.startswith(prefix):
+                break
+            result.append(term)
+        return result
+
+    def _prefix_expansions(self, prefix: str, limit: int) -> List[str]:
+        """The `limit` most frequent indexed terms extending prefix."""
+        candidates = [t for t in self._prefix_terms(prefix) if t != prefix]
+        if len(candidates) <= limit:
+            return candidates
+        return heapq.nlargest(limit, candidates, key=lambda t: len(self._postings[t]))
 
     def _tokenize(self, text: str) -> List[str]:
         """Tokenize text into searchable terms."""
@@ -171,53 +315,52 @@ class KnowledgeSearcher:
 
         options = options or SearchOptions()
 
-        with self._lock:
-            # Tokenize query
-            query_terms = self._tokenize(query)
-
-            if not query_terms:
-                return []
+        # Tokenize query (unique terms, in order)
+        query_terms = list(dict.fromkeys(self._tokenize(query)))
+        if not query_terms:
+            return []
 
-            # Calculate scores for each item
-            scores: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            scores: Dict[str, float] = {}
+            matched: Dict[str, List[str]] = {}
+            best_possible = 0.0
 
             for term in query_terms:
-                # Find exact matches
-                if term in self._inverted_index:
-                    for item_id, weight in self._inverted_index[term]:
-                        if item_id not in scores:
-                            scores[item_id] = {"score": 0.0, "matched": []}
-                        scores[item_id]["score"] += weight
-                        if term not in scores[item_id]["matched"]:
-                            scores[item_id]["matched"].append(term)
-
-                # Find partial matches (prefix)
-                for indexed_term, items in self._inverted_index.items():
-                    if indexed_term.startswith(term) and indexed_term != term:
-                        for item_id, weight in items:
-                            if item_id not in scores:
-                                scores[item_id] = {"score": 0.0, "matched": []}
-                            scores[item_id]["score"] += weight * 0.5  # Partial match penalty
-                            if term not in scores[item_id]["matched"]:
-                                scores[item_id]["matched"].append(term)
+                # Exact matches
+                term_best, weights = self._term_weights(term)
+                for item_id, weight in weights:
+                    scores[item_id] = scores.get(item_id, 0.0) + weight
+                    matched.setdefault(item_id, []).append(term)
+
+                # Partial matches (prefix)
+                for indexed_term in self._prefix_expansions(term, self.MAX_PREFIX_EXPANSIONS):
+                    max_weight, weights = self._term_weights(indexed_term)
+                    for item_id, weight in weights:
+                        scores[item_id] = scores.get(item_id, 0.0) + weight * self.PARTIAL_MATCH_FACTOR
+                        item_matched = matched.setdefault(item_id, [])
+                        if not item_matched or item_matched[-1] != term:
+                            item_matched.append(term)
+                    term_best = max(term_best, max_weight * self.PARTIAL_MATCH_FACTOR)
+
+                best_possible += term_best
+
+            if not scores or best_possible <= 0:
+                return []
 
             # Build results
-            results = []
-            items_dict = {item.id: item for item in self._items}
-
-            for item_id, score_data in scores.items():
-                item = items_dict.get(item_id)
+            now = datetime.now()
+            candidates = []
+            for item_id, raw_score in scores.items():
+                item = self._items.get(item_id)
                 if not item:
                     continue
 
-                score = score_data["score"]
-
                 # Apply source type filter
                 if options.source_types and item.source_type not in options.source_types:
                     continue
 
                 # Normalize score
-                score = min(score / (len(query_terms) * 3.0), 1.0)
+                score = min(raw_score / best_possible, 1.0)
 
                 # Apply minimum score filter
                 if score < options.min_score:
@@ -225,27 +368,28 @@ class KnowledgeSearcher:
 
                 # Boost recent items
                 if options.boost_recent and item.indexed_at:
-                    days_old = (datetime.now() - item.indexed_at).days
+                    days_old = (now - item.indexed_at).days
                     if days_old < 7:
                         score *= 1.1
 
-                # Extract snippet
-                snippet = ""
-                if options.include_snippets:
-                    snippet = self._extract_snippet(item.content, query_terms)
+                candidates.append((score, item_id, item))
 
-                results.append(SearchResult(
-                    item=item,
-                    score=score,
-                    matched_keywords=score_data["matched"],
-                    snippet=snippet
-                ))
+        # Top results only; snippets for those only
+        top = heapq.nlargest(options.max_results, candidates, key=lambda c: c[0])
 
-            # Sort by score (descending)
-            results.sort(key=lambda r: r.score, reverse=True)
+        results = []
+        for score, item_id, item in top:
+            snippet = ""
+            if options.include_snippets:
+                snippet = self._extract_snippet(item.content, query_terms)
+            results.append(SearchResult(
+                item=item,
+                score=score,
+                matched_keywords=matched.get(item_id, []),
+                snippet=snippet
+            ))
 
-            # Limit results
-            return results[:options.max_results]
+        return results
 
     def _extract_snippet(self, content: str, terms: List[str], context_size: int = 100) -> str:
         """Extract a relevant snippet from content."""
@@ -281,7 +425,10 @@ class KnowledgeSearcher:
 
     def suggest(self, partial_query: str, limit: int = 5) -> List[str]:
         """
-        Suggest completions for a partial query.
+        Suggest completions for a partial query (autocomplete).
+
+        Completes the last word of the query from the indexed terms,
+        most frequent first.
 
         Args:
             partial_query: The partial query
@@ -290,21 +437,21 @@ class KnowledgeSearcher:
         Returns:
             List of suggested terms
         """
-        if not partial_query or len(partial_query) < 2:
+        if not partial_query or len(partial_query.strip()) < 2:
             return []
 
-        partial = partial_query.lower()
-        suggestions = []
+        words = re.findall(r'[\u0600-\u06FF]+|[a-z0-9]+', partial_query.lower())
+        if not words or len(words[-1]) < 2:
+            return []
+        partial = words[-1]
 
         with self._lock:
-            # Find terms that start with the partial query
-            for term in self._inverted_index.keys():
-                if term.startswith(partial) and term != partial:
-                    suggestions.append(term)
-                    if len(suggestions) >= limit:
-                        break
+            completions = [t for t in self._prefix_terms(partial) if t != partial]
+            ranked = heapq.nlargest(
+                limit, completions, key=lambda t: len(self._postings[t])
+            )
 
-        return suggestions
+        return ranked
 
     def get_related(self, item_id: str, limit: int = 5) -> List[SearchResult]:
         """
@@ -319,11 +466,7 @@ class KnowledgeSearcher:
         """
         with self._lock:
             # Find the source item
-            source_item = None
-            for item in self._items:
-                if item.id == item_id:
-                    source_item = item
-                    break
+            source_item = self._items.get(item_id)
 
             if not source_item:
                 return []
@@ -27,6 +27,7 @@ except ImportError:
 
 try:
     from core.email import Email, get_email_cache
+    from core.email.search_normalizer import normalize_search_text, query_terms
     EMAIL_AVAILABLE = True
 except ImportError:
     EMAIL_AVAILABLE = False
@@ -181,6 +182,7 @@ class EmailSearchEngine:
         folder: Optional[str] = None,
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
+        offset: int = 0,
     ) -> List[SearchResult]:
         """
         بحث ذكي في الإيميلات.
@@ -190,6 +192,9 @@ class EmailSearchEngine:
         - بحث بالمعنى (إذا AI متوفر)
         - فلترة بالتاريخ والمجلد
 
+        بدون قائمة إيميلات يتم البحث في كامل الـ cache عبر فهرس FTS5
+        (ترتيب BM25 + أولوية الحداثة والأهمية داخل SQL) مع دعم الصفحات.
+
         Args:
             query: نص البحث
             emails: قائمة إيميلات (إذا None يبحث في الـ cache)
@@ -197,15 +202,12 @@ class EmailSearchEngine:
             folder: تصفية بالمجلد
             date_from: من تاريخ
             date_to: إلى تاريخ
+            offset: عدد النتائج المتخطاة (للصفحات التالية)
         """
-        # Get emails from cache if not provided
-        if emails is None and EMAIL_AVAILABLE:
-            try:
-                cache = get_email_cache()
-                emails = cache.get_emails(folder_name=folder, limit=500)
-            except Exception as e:
-                app_logger.error(f"Failed to get emails from cache: {e}")
+        if emails is None:
+            if not EMAIL_AVAILABLE:
                 return []
+            return self._search_cache(query, limit, offset, folder, date_from, date_to)
 
         if not emails:
             return []
@@ -228,7 +230,7 @@ class EmailSearchEngine:
 
         # Sort by relevance
         results.sort(key=lambda r: r.relevance_score, reverse=True)
-        return results[:limit]
+        return results[offset:offset + limit]
 
     def search_by_sender(
         self, sender_email: str, emails: Optional[List['Email']] = None, limit: int = 50
@@ -362,6 +364,55 @@ class EmailSearchEngine:
 
     # --- Private methods ---
 
+    def _search_cache(
+        self,
+        query: str,
+        limit: int,
+        offset: int,
+        folder: Optional[str],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+    ) -> List[SearchResult]:
+        """بحث في الـ cache عبر FTS5 (بدون تحميل الإيميلات في الذاكرة)."""
+        try:
+            cache = get_email_cache()
+            ranked = cache.search_ranked(
+                query,
+                limit=limit,
+                offset=offset,
+                folder_name=folder,
+                date_from=date_from,
+                date_to=date_to,
+            )
+        except Exception as e:
+            app_logger.error(f"Failed to search email cache: {e}")
+            return []
+
+        terms = query_terms(query)
+        return [
+            SearchResult(
+                email=email,
+                relevance_score=score,
+                match_reason=self._match_reason(email, terms),
+                highlighted_text=snippet,
+            )
+            for email, score, snippet in ranked
+        ]
+
+    def _match_reason(self, email: 'Email', terms: List[str]) -> str:
+        """سبب التطابق لنتيجة من الفهرس."""
+        fields = (
+            ("تطابق في الموضوع", email.subject),
+            ("تطابق في المرسل", f"{email.sender_name or ''} {email.sender_email or ''}"),
+            ("تطابق في المحتوى", email.body),
+        )
+        reasons = []
+        for label, text in fields:
+            folded = normalize_search_text(text).lower()
+            if any(term in folded for term in terms):
+                reasons.append(label)
+        return " | ".join(reasons)
+
     def _score_email(self, email: 'Email', query: str) -> Tuple[float, str]:
         """حساب درجة تطابق إيميل مع البحث."""
         query_lower = query.lower()
@@ -6,7 +6,7 @@ Audit Log Screen
 Features:
 - View all INSERT / UPDATE / DELETE operations
 - Filter by table, action type, date range
-- Pagination for large result sets
+- Keyset pagination for large result sets (no OFFSET scans)
 - Detail dialog showing old vs new values
 - Statistics summary cards
 - Background data loading (Rule 13)
@@ -15,7 +15,7 @@ Features:
 
 import json
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
@@ -126,6 +126,9 @@ class AuditLogScreen(QWidget):
         self._total_count = 0
         self._loading = False
 
+        # Keyset cursor of every visited page (index = page number)
+        self._page_cursors: List[Optional[Tuple[datetime, int]]] = [None]
+
         self._setup_ui()
         self._load_data()
 
@@ -400,28 +403,37 @@ class AuditLogScreen(QWidget):
         self._set_loading_state(True)
 
         filters = self._get_filters()
-        page = self._current_page
+        after = self._page_cursors[self._current_page]
+        # Count and stats once per search, not on every page turn
+        first_page = self._current_page == 0
 
         def _fetch():
             """Run DB queries in background thread."""
             mgr = get_audit_manager()
-            total = mgr.get_total_count(
-                table_name=filters["table_name"],
-                action_type=filters["action_type"],
-                from_date=filters["from_date"],
-                to_date=filters["to_date"],
-            )
-            offset = page * RECORDS_PER_PAGE
-            records = mgr.get_audit_history(
+            total = None
+            stats = None
+            if first_page:
+                total = mgr.get_total_count(
+                    table_name=filters["table_name"],
+                    action_type=filters["action_type"],
+                    from_date=filters["from_date"],
+                    to_date=filters["to_date"],
+                )
+                stats = mgr.get_audit_statistics(days=30)
+            records, next_cursor = mgr.get_audit_page(
                 table_name=filters["table_name"],
                 action_type=filters["action_type"],
                 from_date=filters["from_date"],
                 to_date=filters["to_date"],
+                after=after,
                 limit=RECORDS_PER_PAGE,
-                offset=offset,
             )
-            stats = mgr.get_audit_statistics(days=30)
-            return {"total": total, "records": records, "stats": stats}
+            return {
+                "total": total,
+                "records": records,
+                "next_cursor": next_cursor,
+                "stats": stats,
+            }
 
         run_in_background(
             _fetch,
@@ -434,10 +446,17 @@ class AuditLogScreen(QWidget):
         self._loading = False
         self._set_loading_state(False)
 
-        self._total_count = result["total"]
+        if result["total"] is not None:
+            self._total_count = result["total"]
+
+        del self._page_cursors[self._current_page + 1:]
+        if result["next_cursor"] is not None:
+            self._page_cursors.append(result["next_cursor"])
+
         self._populate_table(result["records"])
         self._update_pagination()
-        self._apply_stats(result["stats"])
+        if result["stats"] is not None:
+            self._apply_stats(result["stats"])
 
     def _on_data_error(self, exc_type, message, traceback_str) -> None:
         """Handle background data load failure (called on main thread)."""
@@ -519,6 +538,8 @@ class AuditLogScreen(QWidget):
             1, (self._total_count + RECORDS_PER_PAGE - 1) // RECORDS_PER_PAGE
         )
         current_display = self._current_page + 1
+        # Rows logged since the count was taken can add pages
+        total_pages = max(total_pages, current_display)
 
         self._lbl_page_info.setText(
             f"صفحة {current_display} من {total_pages}  |  "
@@ -526,7 +547,16 @@ class AuditLogScreen(QWidget):
         )
 
         self._btn_prev.setEnabled(self._current_page > 0)
-        self._btn_next.setEnabled(current_display < total_pages)
+        self._btn_next.setEnabled(self._has_next_page())
+
+    def _has_next_page(self) -> bool:
+        """Did the current page return a cursor for the next one?"""
+        return len(self._page_cursors) > self._current_page + 1
+
+    def _reset_paging(self) -> None:
+        """Go back to the first page (filters changed)."""
+        self._current_page = 0
+        self._page_cursors = [None]
 
     def _apply_stats(self, stats: Dict[str, Any]) -> None:
         """Update the statistics cards with pre-fetched data."""
@@ -550,7 +580,7 @@ class AuditLogScreen(QWidget):
 
     def _on_search(self) -> None:
         """Handle search button click."""
-        self._current_page = 0
+        self._reset_paging()
         self._load_data()
 
     def _on_reset_filters(self) -> None:
@@ -559,7 +589,7 @@ class AuditLogScreen(QWidget):
         self._cmb_action.setCurrentIndex(0)
         self._date_from.setDate(QDate.currentDate().addDays(-30))
         self._date_to.setDate(QDate.currentDate())
-        self._current_page = 0
+        self._reset_paging()
         self._load_data()
 
     def _on_prev_page(self) -> None:
@@ -570,10 +600,7 @@ class AuditLogScreen(QWidget):
 
     def _on_next_page(self) -> None:
         """Go to next page."""
-        total_pages = max(
-            1, (self._total_count + RECORDS_PER_PAGE - 1) // RECORDS_PER_PAGE
-        )
-        if self._current_page + 1 < total_pages:
+        if self._has_next_page():
             self._current_page += 1
             self._load_data()
 
@@ -13,6 +13,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 
+from core.database.connection import get_health_monitor
 from core.themes import get_current_palette, get_font, FONT_SIZE_DISPLAY, FONT_SIZE_BODY, FONT_WEIGHT_BOLD
 from ui.windows.base import BaseWindow
 from ui.components.notifications import toast_info
@@ -321,6 +322,23 @@ class MostahaqatWindow(BaseWindow):
             }}
         """)
         status.showMessage("جاهز")
+
+        # Connection indicator fed by the shared background monitor
+        self._conn_label = QLabel()
+        status.addPermanentWidget(self._conn_label)
+        monitor = get_health_monitor()
+        monitor.signals.status_changed.connect(self._on_connection_changed)
+        monitor.start()
+        self._on_connection_changed(monitor.is_connected)
+
+    def _on_connection_changed(self, connected):
+        """Update the status bar connection indicator."""
+        p = get_current_palette()
+        if connected is None:
+            return
+        color = p['success'] if connected else p['danger']
+        self._conn_label.setText("● متصل" if connected else "● غير متصل")
+        self._conn_label.setStyleSheet(f"color: {color}; background: transparent;")
     
     def _create_action(self, text, shortcut, slot):
         """Create a menu/toolbar action."""
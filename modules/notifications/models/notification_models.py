@@ -591,14 +591,18 @@ def mark_all_as_read(user_id: Optional[int] = None) -> int:
     """
     تحديد كل الإشعارات كمقروءة
 
+    تحديث واحد على مستوى المجموعة (بدون حلقة على الإشعارات).
+
     Args:
         user_id: معرف المستخدم (اختياري)
 
     Returns:
         عدد الإشعارات المحدثة
     """
-    select_all, select_one, insert_returning_id, update, delete = _get_db()
-    if not update:
+    try:
+        from core.database import update_returning_count
+    except ImportError:
+        app_logger.error("Could not import database module")
         return 0
 
     try:
@@ -609,17 +613,18 @@ def mark_all_as_read(user_id: Optional[int] = None) -> int:
                 WHERE is_read = FALSE AND deleted_at IS NULL
                 AND (user_id = %s OR user_id IS NULL)
             """
-            update(query, (user_id,))
+            count = update_returning_count(query, (user_id,))
         else:
             query = """
                 UPDATE notifications
                 SET is_read = TRUE, read_at = CURRENT_TIMESTAMP
                 WHERE is_read = FALSE AND deleted_at IS NULL
             """
-            update(query, ())
+            count = update_returning_count(query, ())
 
-        app_logger.info("Marked all notifications as read")
-        return 1  # TODO: Return actual count
+        count = max(count, 0)
+        app_logger.info(f"Marked {count} notifications as read")
+        return count
     except Exception as e:
         app_logger.error(f"Error marking all as read: {e}")
         return 0
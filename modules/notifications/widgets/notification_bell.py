@@ -20,6 +20,10 @@ from core.logging import app_logger
 from core.themes import get_current_palette, get_font, FONT_SIZE_SMALL, FONT_WEIGHT_BOLD
 
 
+# مهلة تجميع إشعارات قاعدة البيانات قبل تحديث القائمة المنبثقة
+POPUP_REFRESH_DELAY_MS = 300
+
+
 class NotificationBadge(QLabel):
     """Badge يعرض عدد الإشعارات"""
 
@@ -85,8 +89,10 @@ class NotificationBell(QWidget):
         super().__init__(parent)
         self._popup = None
         self._refresh_timer = None
+        self._popup_refresh_timer = None
         self._setup_ui()
         self._setup_timer()
+        self._setup_listener()
 
     def _setup_ui(self):
         """إعداد الواجهة"""
@@ -132,10 +138,56 @@ class NotificationBell(QWidget):
         self.setFixedSize(44, 44)
 
     def _setup_timer(self):
-        """إعداد مؤقت التحديث التلقائي"""
+        """إعداد مؤقت التحديث الاحتياطي (يعمل فقط عند انقطاع LISTEN)"""
         self._refresh_timer = QTimer(self)
         self._refresh_timer.timeout.connect(self.refresh_count)
-        self._refresh_timer.start(30000)  # كل 30 ثانية
+
+        # تجميع إشعارات قاعدة البيانات المتتالية في تحديث واحد للقائمة
+        self._popup_refresh_timer = QTimer(self)
+        self._popup_refresh_timer.setSingleShot(True)
+        self._popup_refresh_timer.setInterval(POPUP_REFRESH_DELAY_MS)
+        self._popup_refresh_timer.timeout.connect(self._refresh_popup)
+
+    def _setup_listener(self):
+        """الاشتراك في إشعارات قاعدة البيانات (LISTEN/NOTIFY) بدل الاستطلاع"""
+        try:
+            from core.database.listener import get_change_listener, connect_until_destroyed
+            listener = get_change_listener()
+            connect_until_destroyed(
+                listener.signals.notifications_changed, self._on_notification_changed, self
+            )
+            connect_until_destroyed(
+                listener.signals.listening_changed, self._on_listening_changed, self
+            )
+            listener.start()
+            self._on_listening_changed(listener.is_listening)
+        except Exception as e:
+            app_logger.debug(f"Notification listener unavailable, polling instead: {e}")
+            self._refresh_timer.start(30000)
+
+    def _on_listening_changed(self, listening: bool):
+        """إيقاف الاستطلاع أثناء اتصال LISTEN وتشغيله عند انقطاعه"""
+        if listening:
+            self._refresh_timer.stop()
+            # مزامنة العدد مرة واحدة بعد (إعادة) الاتصال
+            self.refresh_count()
+        elif not self._refresh_timer.isActive():
+            self._refresh_timer.start(30000)  # كل 30 ثانية
+
+    def _on_notification_changed(self, payload: dict):
+        """تحديث العدد تدريجياً من إشعار قاعدة البيانات"""
+        from core.database.listener import unread_delta
+        delta = unread_delta(payload)
+        if delta:
+            self.badge.set_count(max(0, self.badge.count + delta))
+        if self._popup is not None and self._popup.isVisible():
+            # إعادة تشغيل المؤقت: دفعة من الإشعارات = استعلام واحد
+            self._popup_refresh_timer.start()
+
+    def _refresh_popup(self):
+        """تحديث القائمة المنبثقة إن كانت ظاهرة"""
+        if self._popup is not None and self._popup.isVisible():
+            self._popup.refresh()
 
     def _on_bell_clicked(self):
         """معالجة النقر على الجرس"""
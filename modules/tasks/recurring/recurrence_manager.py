@@ -8,20 +8,84 @@ INTEGRA - Recurrence Manager
 التاريخ: 4 فبراير 2026
 """
 
+from collections import deque
 from datetime import datetime, date, timedelta
 from dateutil.relativedelta import relativedelta
 from typing import Optional, List, Tuple
 import calendar
+import json
 
 from ..models import (
     Task, TaskStatus, RecurrencePattern, RecurrenceType
 )
 from ..repository import (
-    get_task_repository, get_all_tasks, create_task, update_task
+    get_task_repository, create_task
+)
+from core.database import (
+    select_all, update_returning_count, execute_query, transaction
 )
 from core.logging import app_logger
 
 
+RECURRENCE_BATCH_SIZE = 500      # المهام المتكررة المعالجة في كل معاملة
+RECURRENCE_MAX_CATCH_UP = 366    # أقصى عدد نسخ تعويضية لكل مهمة في التشغيل الواحد
+
+# Indexes the batch generator relies on (also in tables/tasks.sql)
+RECURRENCE_INDEXES_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_tasks_next_occurrence
+        ON tasks(next_occurrence, id) WHERE is_recurring = TRUE;
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_recurring_occurrence
+        ON tasks(parent_task_id, (metadata->>'occurrence_date'))
+        WHERE metadata ? 'occurrence_date';
+"""
+
+# One page of due recurrences; rows taken by a concurrent run are skipped
+_DUE_RECURRING_SQL = """
+    SELECT id, recurrence_pattern, next_occurrence
+    FROM tasks
+    WHERE is_recurring = TRUE
+      AND next_occurrence <= %s
+      AND (next_occurrence, id) > (%s, %s)
+    ORDER BY next_occurrence, id
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+"""
+
+# All instances of a page in one statement; existing occurrences are kept
+_INSERT_INSTANCES_SQL = """
+    INSERT INTO tasks (
+        title, description, status, priority, category,
+        parent_task_id, employee_id, assigned_to, due_date, tags, metadata
+    )
+    SELECT
+        p.title, p.description, %s, p.priority, p.category,
+        p.id, p.employee_id, p.assigned_to, o.occurrence::timestamp, p.tags,
+        jsonb_build_object(
+            'recurring_instance', TRUE,
+            'parent_id', p.id,
+            'occurrence_date', o.occurrence
+        )
+    FROM unnest(%s::int[], %s::date[]) AS o(parent_id, occurrence)
+    JOIN tasks p ON p.id = o.parent_id
+    ON CONFLICT (parent_task_id, (metadata->>'occurrence_date'))
+        WHERE metadata ? 'occurrence_date'
+    DO NOTHING
+"""
+
+# Advance next_occurrence of a page; NULL ends the recurrence
+_ADVANCE_OCCURRENCES_SQL = """
+    UPDATE tasks AS t SET
+        next_occurrence = v.next_occurrence,
+        is_recurring = v.next_occurrence IS NOT NULL,
+        recurrence_pattern = CASE
+            WHEN v.next_occurrence IS NULL THEN NULL
+            ELSE t.recurrence_pattern
+        END
+    FROM unnest(%s::int[], %s::date[]) AS v(id, next_occurrence)
+    WHERE t.id = v.id
+"""
+
+
 class RecurrenceManager:
     """
     مدير المهام المتكررة
@@ -162,7 +226,11 @@ class RecurrenceManager:
                 assigned_to=parent_task.assigned_to,
                 due_date=datetime.combine(occurrence_date, datetime.min.time()),
                 tags=parent_task.tags.copy() if parent_task.tags else [],
-                metadata={"recurring_instance": True, "parent_id": parent_task.id}
+                metadata={
+                    "recurring_instance": True,
+                    "parent_id": parent_task.id,
+                    "occurrence_date": occurrence_date.isoformat()
+                }
             )
 
             task_id = create_task(new_task)
@@ -177,59 +245,147 @@ class RecurrenceManager:
             app_logger.error(f"Failed to create recurring instance: {e}")
             return None
 
-    def process_due_recurring_tasks(self) -> Tuple[int, int]:
+    def plan_occurrences(
+        self,
+        pattern: RecurrencePattern,
+        next_occurrence: date,
+        today: date,
+        max_catch_up: int = RECURRENCE_MAX_CATCH_UP
+    ) -> Tuple[List[date], Optional[date]]:
+        """
+        حساب كل التكرارات المستحقة حتى اليوم (بما فيها الأيام الفائتة)
+
+        Args:
+            pattern: نمط التكرار
+            next_occurrence: أول تاريخ مستحق
+            today: تاريخ المعالجة
+            max_catch_up: أقصى عدد نسخ (تُحفظ الأحدث فقط)
+
+        Returns:
+            (تواريخ النسخ المطلوبة، التاريخ التالي بعد اليوم أو None إذا انتهى التكرار)
+        """
+        occurrences = deque(maxlen=max(max_catch_up, 1))
+        current = next_occurrence
+
+        while current is not None and current <= today:
+            occurrences.append(current)
+            following = self.calculate_next_occurrence(pattern, current)
+            if following is not None and following <= current:
+                # Pattern does not move forward (e.g. interval 0)
+                following = None
+            current = following
+
+        return list(occurrences), current
+
+    def ensure_indexes(self) -> bool:
+        """إنشاء الفهارس التي يعتمد عليها المعالج الدفعي (إن لم تكن موجودة)"""
+        if getattr(self, "_indexes_ready", False):
+            return True
+        self._indexes_ready = execute_query(RECURRENCE_INDEXES_SQL)
+        return self._indexes_ready
+
+    def process_due_recurring_tasks(
+        self,
+        today: Optional[date] = None,
+        batch_size: int = RECURRENCE_BATCH_SIZE,
+        max_catch_up: int = RECURRENCE_MAX_CATCH_UP
+    ) -> Tuple[int, int]:
         """
         معالجة المهام المتكررة المستحقة
 
-        تفحص كل المهام المتكررة وتنشئ نسخ جديدة إذا لزم الأمر.
+        تمر على كل المهام المستحقة (next_occurrence <= اليوم) على دفعات
+        مرتبة بـ (next_occurrence, id). لكل دفعة، في معاملة واحدة:
+        تنشئ كل النسخ بجملة INSERT واحدة (بما فيها الأيام الفائتة)
+        وتقدّم next_occurrence لكل المهام بجملة UPDATE واحدة.
+        الفهرس الفريد على (parent_task_id, occurrence_date) يمنع إنشاء
+        نسخة مكررة لنفس التاريخ حتى عند إعادة التشغيل.
+        المهمة ذات نمط التكرار التالف تُسجَّل وتُتخطى دون إيقاف الدفعة.
+
+        Args:
+            today: تاريخ المعالجة (افتراضي: اليوم)
+            batch_size: عدد المهام في كل دفعة
+            max_catch_up: أقصى عدد نسخ تعويضية لكل مهمة
 
         Returns:
             (عدد المهام المعالجة، عدد النسخ المنشأة)
         """
-        try:
-            # Get all recurring tasks
-            recurring_tasks = get_all_tasks(is_recurring=True)
-
-            processed = 0
-            created = 0
-            today = date.today()
-
-            for task in recurring_tasks:
-                if not task.recurrence_pattern:
-                    continue
-
-                # Check if we need to create new instance
-                if task.next_occurrence and task.next_occurrence <= today:
-                    # Create instance for today
-                    instance_id = self.create_recurring_instance(task, today)
-                    if instance_id:
-                        created += 1
-
-                    # Calculate and update next occurrence
-                    next_date = self.calculate_next_occurrence(
-                        task.recurrence_pattern,
-                        today
-                    )
-
-                    if next_date:
-                        task.next_occurrence = next_date
-                        update_task(task)
-                    else:
-                        # Recurrence ended
-                        task.is_recurring = False
-                        task.recurrence_pattern = None
-                        update_task(task)
+        today = today or date.today()
+        processed = 0
+        created = 0
+        skipped = 0
 
-                    processed += 1
+        if not self.ensure_indexes():
+            app_logger.error("Recurring task indexes are missing, skipping run")
+            return 0, 0
 
-            app_logger.info(
-                f"Processed {processed} recurring tasks, created {created} instances"
-            )
-            return processed, created
+        last_key = (date.min, 0)
+        try:
+            while True:
+                with transaction():
+                    _, rows = select_all(
+                        _DUE_RECURRING_SQL,
+                        (today, last_key[0], last_key[1], batch_size)
+                    )
+                    if not rows:
+                        break
+
+                    parent_ids, occurrence_dates = [], []
+                    task_ids, next_dates = [], []
+
+                    for task_id, pattern_data, next_occurrence in rows:
+                        try:
+                            pattern = None
+                            if pattern_data:
+                                if isinstance(pattern_data, str):
+                                    pattern_data = json.loads(pattern_data)
+                                pattern = RecurrencePattern.from_dict(pattern_data)
+
+                            if pattern is None:
+                                occurrences, next_date = [], None
+                            else:
+                                occurrences, next_date = self.plan_occurrences(
+                                    pattern, next_occurrence, today, max_catch_up
+                                )
+                        except Exception as e:
+                            # Left as is (retried next run); the rest of the page goes on
+                            app_logger.error(
+                                f"Invalid recurrence pattern for task {task_id}, skipped: {e}"
+                            )
+                            skipped += 1
+                            continue
+
+                        parent_ids.extend([task_id] * len(occurrences))
+                        occurrence_dates.extend(occurrences)
+                        task_ids.append(task_id)
+                        next_dates.append(next_date)
+
+                    inserted = 0
+                    if parent_ids:
+                        inserted = update_returning_count(
+                            _INSERT_INSTANCES_SQL,
+                            (TaskStatus.PENDING.value, parent_ids, occurrence_dates)
+                        )
+
+                    if task_ids:
+                        update_returning_count(
+                            _ADVANCE_OCCURRENCES_SQL, (task_ids, next_dates)
+                        )
+
+                # Counted only once the page is committed
+                processed += len(task_ids)
+                created += max(inserted, 0)
+                last_key = (rows[-1][2], rows[-1][0])
+                if len(rows) < batch_size:
+                    break
 
         except Exception as e:
             app_logger.error(f"Failed to process recurring tasks: {e}")
-            return 0, 0
+
+        app_logger.info(
+            f"Processed {processed} recurring tasks, created {created} instances"
+            + (f", skipped {skipped} with invalid patterns" if skipped else "")
+        )
+        return processed, created
 
     def get_upcoming_occurrences(
         self,
@@ -297,6 +453,6 @@ def create_recurring_instance(
     return get_recurrence_manager().create_recurring_instance(parent_task, occurrence_date)
 
 
-def process_due_recurring_tasks() -> Tuple[int, int]:
+def process_due_recurring_tasks(today: Optional[date] = None) -> Tuple[int, int]:
     """معالجة المهام المتكررة المستحقة"""
-    return get_recurrence_manager().process_due_recurring_tasks()
+    return get_recurrence_manager().process_due_recurring_tasks(today)
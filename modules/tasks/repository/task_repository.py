@@ -16,7 +16,8 @@ from core.database import (
     insert, insert_returning_id,
     update, update_returning_count,
     delete, delete_returning_count,
-    get_scalar, get_count
+    get_scalar, get_count,
+    insert_many, transaction
 )
 from core.logging import app_logger
 
@@ -320,62 +321,68 @@ class TaskRepository:
             معرف المهمة الجديدة أو None
         """
         try:
-            task_id = insert_returning_id(
-                """
-                INSERT INTO tasks (
-                    title, description, status, priority, category,
-                    parent_task_id, source_email_id, employee_id, assigned_to,
-                    due_date, reminder_date, start_date,
-                    is_recurring, recurrence_pattern, next_occurrence,
-                    ai_analysis, ai_suggested_action, ai_priority_score,
-                    tags, metadata, created_by
-                ) VALUES (
-                    %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s,
-                    %s, %s, %s,
-                    %s, %s, %s,
-                    %s, %s, %s,
-                    %s, %s, %s
-                )
-                """,
-                (
-                    task.title,
-                    task.description,
-                    task.status.value,
-                    task.priority.value,
-                    task.category,
-                    task.parent_task_id,
-                    task.source_email_id,
-                    task.employee_id,
-                    task.assigned_to,
-                    task.due_date,
-                    task.reminder_date,
-                    task.start_date,
-                    task.is_recurring,
-                    json.dumps(task.recurrence_pattern.to_dict()) if task.recurrence_pattern else None,
-                    task.next_occurrence,
-                    json.dumps(task.ai_analysis.to_dict()) if task.ai_analysis else None,
-                    task.ai_suggested_action,
-                    task.ai_priority_score,
-                    task.tags or [],
-                    json.dumps(task.metadata) if task.metadata else None,
-                    task.created_by
-                )
-            )
+            with transaction():
+                task_id = self._insert_task(task)
+
+                # إضافة عناصر قائمة التحقق دفعة واحدة
+                if task_id and task.checklist:
+                    self.add_checklist_items(task_id, task.checklist)
 
             if task_id:
                 app_logger.info(f"Task created: {task_id} - {task.title}")
 
-                # إضافة عناصر قائمة التحقق
-                for item in task.checklist:
-                    self.add_checklist_item(task_id, item.title, item.sort_order)
-
             return task_id
 
         except Exception as e:
             app_logger.error(f"Failed to create task: {e}")
             return None
 
+    def _insert_task(self, task: Task) -> Optional[int]:
+        """إدراج صف المهمة فقط (بدون قائمة التحقق)"""
+        return insert_returning_id(
+            """
+            INSERT INTO tasks (
+                title, description, status, priority, category,
+                parent_task_id, source_email_id, employee_id, assigned_to,
+                due_date, reminder_date, start_date,
+                is_recurring, recurrence_pattern, next_occurrence,
+                ai_analysis, ai_suggested_action, ai_priority_score,
+                tags, metadata, created_by
+            ) VALUES (
+                %s, %s, %s, %s, %s,
+                %s, %s, %s, %s,
+                %s, %s, %s,
+                %s, %s, %s,
+                %s, %s, %s,
+                %s, %s, %s
+            )
+            RETURNING id
+            """,
+            (
+                task.title,
+                task.description,
+                task.status.value,
+                task.priority.value,
+                task.category,
+                task.parent_task_id,
+                task.source_email_id,
+                task.employee_id,
+                task.assigned_to,
+                task.due_date,
+                task.reminder_date,
+                task.start_date,
+                task.is_recurring,
+                json.dumps(task.recurrence_pattern.to_dict()) if task.recurrence_pattern else None,
+                task.next_occurrence,
+                json.dumps(task.ai_analysis.to_dict()) if task.ai_analysis else None,
+                task.ai_suggested_action,
+                task.ai_priority_score,
+                task.tags or [],
+                json.dumps(task.metadata) if task.metadata else None,
+                task.created_by
+            )
+        )
+
     def create_from_email(
         self,
         email_id: str,
@@ -618,6 +625,7 @@ class TaskRepository:
                 """
                 INSERT INTO task_checklist (task_id, title, sort_order)
                 VALUES (%s, %s, %s)
+                RETURNING id
                 """,
                 (task_id, title, sort_order)
             )
@@ -626,6 +634,23 @@ class TaskRepository:
             app_logger.error(f"Failed to add checklist item: {e}")
             return None
 
+    def add_checklist_items(
+        self,
+        task_id: int,
+        items: List[ChecklistItem]
+    ) -> int:
+        """
+        إضافة عدة عناصر لقائمة التحقق في عبارة واحدة
+
+        Returns:
+            عدد العناصر المضافة أو -1 عند الخطأ
+        """
+        return insert_many(
+            "task_checklist",
+            ["task_id", "title", "sort_order"],
+            [(task_id, item.title, item.sort_order) for item in items]
+        )
+
     def toggle_checklist_item(self, item_id: int) -> bool:
         """تبديل حالة عنصر قائمة التحقق"""
         try:
@@ -340,9 +340,38 @@ class KanbanBoard(QWidget):
         super().__init__(parent)
         self.columns: Dict[str, KanbanColumn] = {}
         self.tasks: List[Task] = []
+        # Coalesces bursts of database change notifications into one reload
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(300)
+        self._reload_timer.timeout.connect(self.load_tasks)
         self._setup_ui()
+        self._connect_change_listener()
         QTimer.singleShot(100, self.load_tasks)
 
+    def _connect_change_listener(self):
+        """إعادة التحميل عند تغيّر المهام في قاعدة البيانات (LISTEN/NOTIFY)"""
+        self._disconnect_listener = None
+        try:
+            from core.database.listener import get_change_listener, connect_until_destroyed
+            listener = get_change_listener()
+            self._disconnect_listener = connect_until_destroyed(
+                listener.signals.tasks_changed, self._on_tasks_changed, self
+            )
+            listener.start()
+        except Exception as e:
+            app_logger.debug(f"Task change listener unavailable: {e}")
+
+    def _on_tasks_changed(self, _payload: dict):
+        """تجميع الإشعارات المتتالية في تحميل واحد"""
+        self._reload_timer.start()
+
+    def closeEvent(self, event):
+        """فصل الاشتراك في المستمع المشترك عند الإغلاق"""
+        if self._disconnect_listener:
+            self._disconnect_listener()
+        super().closeEvent(event)
+
     def _setup_ui(self):
         """إعداد واجهة المستخدم"""
         self.setObjectName("kanbanBoard")
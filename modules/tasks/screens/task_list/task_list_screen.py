@@ -56,6 +56,7 @@ class TaskListScreen(QWidget):
         self._search_timer.timeout.connect(self.load_tasks)
         self._setup_ui()
         self._connect_signals()
+        self._connect_change_listener()
         QTimer.singleShot(100, self.load_tasks)
 
     def _setup_ui(self):
@@ -257,6 +258,29 @@ class TaskListScreen(QWidget):
         """ربط الإشارات"""
         pass
 
+    def _connect_change_listener(self):
+        """إعادة التحميل عند تغيّر المهام في قاعدة البيانات (LISTEN/NOTIFY)"""
+        self._disconnect_listener = None
+        try:
+            from core.database.listener import get_change_listener, connect_until_destroyed
+            listener = get_change_listener()
+            self._disconnect_listener = connect_until_destroyed(
+                listener.signals.tasks_changed, self._on_tasks_changed, self
+            )
+            listener.start()
+        except Exception as e:
+            app_logger.debug(f"Task change listener unavailable: {e}")
+
+    def _on_tasks_changed(self, _payload: dict):
+        """نفس مؤقت البحث: يجمع الإشعارات المتتالية في تحميل واحد"""
+        self._search_timer.start()
+
+    def closeEvent(self, event):
+        """فصل الاشتراك في المستمع المشترك عند الإغلاق"""
+        if self._disconnect_listener:
+            self._disconnect_listener()
+        super().closeEvent(event)
+
     # ═══════════════════════════════════════════════════════════════
     # Data Loading
     # ═══════════════════════════════════════════════════════════════
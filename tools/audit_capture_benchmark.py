@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# tools/audit_capture_benchmark.py
+"""
+INTEGRA - Audit Capture Mode Benchmark
+======================================
+Compares write overhead and audit storage of the audit capture modes
+(none / full / diff / statement) on a wide, employees-like table:
+single-row updates of one field and one bulk UPDATE of every row.
+
+Everything runs in one transaction on temporary tables and is rolled
+back at the end, so the audit log is left untouched.
+
+Usage:
+    python tools/audit_capture_benchmark.py
+    python tools/audit_capture_benchmark.py --rows 20000 --updates 2000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import psycopg2  # noqa: E402
+from psycopg2 import sql as psycopg2_sql  # noqa: E402
+
+from core.database.connection import get_connection_params  # noqa: E402
+from core.database.audit.audit_manager import (  # noqa: E402
+    AUDIT_CAPTURE_FUNCTIONS_SQL,
+    AUDIT_CAPTURE_MODES,
+    AUDIT_PARTITION_FUNCTIONS_SQL,
+    AUDIT_SCHEMA_SQL,
+    AUDIT_TRIGGER_FUNCTION_SQL,
+    build_audit_trigger_sql,
+)
+
+
+TEXT_COLUMNS = 24       # Wide table, like employees
+NUMERIC_COLUMNS = 10
+DATE_COLUMNS = 6
+
+
+def _column_defs() -> List[str]:
+    cols = [f"text_{i:02d} TEXT" for i in range(TEXT_COLUMNS)]
+    cols += [f"num_{i:02d} NUMERIC(12, 2)" for i in range(NUMERIC_COLUMNS)]
+    cols += [f"date_{i:02d} DATE" for i in range(DATE_COLUMNS)]
+    return cols
+
+
+def _column_values() -> List[str]:
+    vals = ["md5(random()::text) || md5(random()::text)" for _ in range(TEXT_COLUMNS)]
+    vals += ["round((random() * 100000)::numeric, 2)" for _ in range(NUMERIC_COLUMNS)]
+    vals += ["current_date - (random() * 3000)::int" for _ in range(DATE_COLUMNS)]
+    return vals
+
+
+def prepare_audit(cursor) -> None:
+    """Make sure the audit table and all capture functions exist (in this transaction)."""
+    cursor.execute("SELECT to_regclass('audit.logged_actions') IS NOT NULL")
+    if not cursor.fetchone()[0]:
+        cursor.execute(AUDIT_SCHEMA_SQL)
+        cursor.execute(AUDIT_PARTITION_FUNCTIONS_SQL)
+        cursor.execute("SELECT audit.ensure_partitions(0)")
+    cursor.execute(AUDIT_TRIGGER_FUNCTION_SQL)
+    cursor.execute(AUDIT_CAPTURE_FUNCTIONS_SQL)
+
+
+def run_mode(cursor, mode: str, rows: int, updates: int, seed: int) -> Dict[str, float]:
+    """Create a wide temp table, audit it in `mode` and time the updates."""
+    table = f"audit_bench_{mode}"
+    ident = psycopg2_sql.Identifier(table)
+
+    cursor.execute(psycopg2_sql.SQL(
+        "CREATE TEMP TABLE {} (id SERIAL PRIMARY KEY, status TEXT, salary NUMERIC(12, 2), "
+        + ", ".join(_column_defs()) + ")"
+    ).format(ident))
+    cursor.execute(psycopg2_sql.SQL(
+        "INSERT INTO {} (status, salary, "
+        + ", ".join(d.split()[0] for d in _column_defs()) + ")"
+        " SELECT 'active', 5000, " + ", ".join(_column_values())
+        + " FROM generate_series(1, %s)"
+    ).format(ident), (rows,))
+
+    if mode != "none":
+        cursor.execute(build_audit_trigger_sql(table, "pg_temp", mode))
+
+    rng = random.Random(seed)
+    update_sql = psycopg2_sql.SQL(
+        "UPDATE {} SET salary = salary + 1 WHERE id = %s"
+    ).format(ident)
+    started = time.perf_counter()
+    for _ in range(updates):
+        cursor.execute(update_sql, (rng.randint(1, rows),))
+    single_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    cursor.execute(psycopg2_sql.SQL("UPDATE {} SET status = 'reviewed'").format(ident))
+    bulk_seconds = time.perf_counter() - started
+
+    cursor.execute(
+        "SELECT COUNT(*),"
+        " COALESCE(SUM(COALESCE(pg_column_size(old_data), 0)"
+        " + COALESCE(pg_column_size(new_data), 0)), 0)"
+        " FROM audit.logged_actions WHERE table_name = %s",
+        (table,)
+    )
+    audit_rows, audit_bytes = cursor.fetchone()
+
+    return {
+        "single_ms": single_seconds * 1000 / max(updates, 1),
+        "bulk_s": bulk_seconds,
+        "audit_rows": audit_rows,
+        "audit_kb": audit_bytes / 1024,
+        "bytes_per_row": audit_bytes / audit_rows if audit_rows else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="INTEGRA - Audit capture mode benchmark (rolled back)"
+    )
+    parser.add_argument("--rows", type=int, default=10000,
+                        help="Rows in the benchmark table (default: 10000)")
+    parser.add_argument("--updates", type=int, default=1000,
+                        help="Single-row updates per mode (default: 1000)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Random seed (default: 42)")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**get_connection_params())
+    results = {}
+    try:
+        cursor = conn.cursor()
+        prepare_audit(cursor)
+        for mode in ("none",) + AUDIT_CAPTURE_MODES:
+            results[mode] = run_mode(cursor, mode, args.rows, args.updates, args.seed)
+        cursor.close()
+    finally:
+        conn.rollback()
+        conn.close()
+
+    baseline = results["none"]
+    print(f"\n{'═' * 78}")
+    print("  INTEGRA - Audit capture modes")
+    print(f"{'═' * 78}")
+    print(f"  table: {3 + TEXT_COLUMNS + NUMERIC_COLUMNS + DATE_COLUMNS} columns, "
+          f"{args.rows:,} rows; {args.updates:,} single-row updates + 1 bulk update\n")
+    print(f"  {'mode':<10} {'update ms':>10} {'overhead':>9} {'bulk s':>8} "
+          f"{'audit rows':>11} {'audit KB':>10} {'B/row':>8}")
+    for mode, r in results.items():
+        overhead = r["single_ms"] / baseline["single_ms"] if baseline["single_ms"] else 0.0
+        print(f"  {mode:<10} {r['single_ms']:>10.3f} {overhead:>8.1f}x {r['bulk_s']:>8.2f} "
+              f"{r['audit_rows']:>11,} {r['audit_kb']:>10,.0f} {r['bytes_per_row']:>8,.0f}")
+    print(f"{'═' * 78}\n")
+
+
+if __name__ == "__main__":
+    main()
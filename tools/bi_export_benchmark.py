@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# tools/bi_export_benchmark.py
+"""
+INTEGRA - BI CSV Export Benchmark
+=================================
+Exports BI views to CSV twice - through the native COPY path and through
+the Python row formatter - and compares time, rows and file size.
+
+The run fails (exit status 1) if a native export did not actually go
+through COPY: export_to_csv() silently falls back to the formatter, so a
+broken COPY path would otherwise only show up as a slower export.
+
+Files are written to a temporary directory that is removed at the end.
+
+Usage:
+    python tools/bi_export_benchmark.py
+    python tools/bi_export_benchmark.py --views employees_summary payroll_analysis
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.database.connection import connect  # noqa: E402
+from core.bi.data_exporter import BIDataExporter, ExportResult  # noqa: E402
+from core.bi.views_manager import SQL_VIEWS  # noqa: E402
+
+
+def run_export(exporter: BIDataExporter, view: str,
+               native: bool) -> Tuple[ExportResult, float]:
+    """Export one view and return (result, seconds)."""
+    started = time.perf_counter()
+    result = exporter.export_to_csv(view, native=native)
+    return result, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="INTEGRA - BI CSV export benchmark (COPY vs Python formatter)"
+    )
+    parser.add_argument("--views", nargs="+", default=None,
+                        help="Views to export (default: all BI views)")
+    args = parser.parse_args()
+
+    if not connect():
+        print("Database connection failed")
+        sys.exit(2)
+
+    views: List[str] = args.views or list(SQL_VIEWS.keys())
+    failures: List[str] = []
+
+    print(f"\n{'═' * 78}")
+    print("  INTEGRA - BI CSV export (COPY vs Python formatter)")
+    print(f"{'═' * 78}")
+    print(f"  {'view':<32} {'rows':>9} {'copy s':>8} {'python s':>9} "
+          f"{'speedup':>8} {'path':>7}")
+
+    with tempfile.TemporaryDirectory(prefix="integra_bi_export_") as tmp:
+        exporter = BIDataExporter(export_path=tmp)
+        for view in views:
+            native, native_s = run_export(exporter, view, native=True)
+            formatted, formatted_s = run_export(exporter, view, native=False)
+
+            if not native.success or native.method != "copy":
+                failures.append(
+                    f"{view}: COPY path not used "
+                    f"(method={native.method or '-'}, error={native.error or '-'})"
+                )
+            elif formatted.success and native.row_count != formatted.row_count:
+                failures.append(
+                    f"{view}: row count differs "
+                    f"(copy={native.row_count}, python={formatted.row_count})"
+                )
+
+            speedup = formatted_s / native_s if native_s else 0.0
+            print(f"  {view:<32} {native.row_count:>9,} {native_s:>8.2f} "
+                  f"{formatted_s:>9.2f} {speedup:>7.1f}x {native.method or '-':>7}")
+
+    print(f"{'═' * 78}")
+    if failures:
+        for failure in failures:
+            print(f"  FAIL {failure}")
+        print(f"{'═' * 78}\n")
+        sys.exit(1)
+    print("  OK: every native export went through COPY")
+    print(f"{'═' * 78}\n")
+
+
+if __name__ == "__main__":
+    main()
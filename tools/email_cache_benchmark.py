@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# tools/email_cache_benchmark.py
+"""
+INTEGRA - Email Cache Micro-Benchmark
+=====================================
+Measures search latency while a background "sync" writes pages of
+emails, comparing the legacy access pattern (new connection per call,
+rollback journal, one commit per email) with the pooled WAL cache
+(per-thread connections, one transaction per page).
+
+Usage:
+    python tools/email_cache_benchmark.py
+    python tools/email_cache_benchmark.py --pages 40 --page-size 200 --seed-emails 5000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.email.email_cache import EmailCache  # noqa: E402
+from core.email.email_models import Email  # noqa: E402
+from core.email.search_normalizer import normalize_search_text  # noqa: E402
+
+
+WORDS = [
+    "إجازة", "طلب", "اجتماع", "تقرير", "راتب", "موظف", "عقد", "مشروع",
+    "invoice", "report", "meeting", "contract", "budget", "review",
+    "approval", "schedule", "الموافقة", "السنوية", "المالية", "الإدارة",
+]
+
+QUERIES = ["اجازه", "تقرير", "meeting", "budget review", "الموافقه", "عقد"]
+
+
+class PooledCache(EmailCache):
+    """Current cache (own singleton slot so both variants can coexist)."""
+    _instance = None
+
+
+class LegacyCache(EmailCache):
+    """Previous behaviour: new connection per call, no WAL, row-by-row saves."""
+    _instance = None
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.create_function(
+            "integra_normalize", 1, normalize_search_text, deterministic=True
+        )
+        return conn
+
+    def save_emails(self, emails: List[Email]) -> int:
+        return sum(1 for email in emails if self.save_email(email))
+
+
+def _make_emails(count: int, start: int, rng: random.Random) -> List[Email]:
+    """Generate synthetic emails."""
+    now = datetime.now()
+    emails = []
+    for i in range(start, start + count):
+        emails.append(Email(
+            entry_id=f"bench-{i}",
+            conversation_id=f"conv-{i // 5}",
+            subject=" ".join(rng.choices(WORDS, k=5)),
+            body=" ".join(rng.choices(WORDS, k=120)),
+            sender_name=rng.choice(["أحمد", "سارة", "Omar", "Lina"]),
+            sender_email=f"user{i % 50}@example.com",
+            received_time=now - timedelta(minutes=i),
+            folder_name="Inbox",
+        ))
+    return emails
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_scenario(cache: EmailCache, seed_emails: int, pages: int,
+                 page_size: int, seed: int) -> Dict[str, float]:
+    """Seed the cache, then search continuously while a writer syncs pages."""
+    rng = random.Random(seed)
+    cache.save_emails(_make_emails(seed_emails, 0, rng))
+
+    write_rng = random.Random(seed + 1)
+    batches = [
+        _make_emails(page_size, seed_emails + p * page_size, write_rng)
+        for p in range(pages)
+    ]
+
+    done = threading.Event()
+    write_time = {}
+
+    def writer():
+        started = time.perf_counter()
+        for batch in batches:
+            cache.save_emails(batch)
+        write_time["seconds"] = time.perf_counter() - started
+        done.set()
+
+    latencies = []
+    errors = 0
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    i = 0
+    while not done.is_set():
+        query = QUERIES[i % len(QUERIES)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            cache.search_ranked(query, limit=20)
+        except sqlite3.Error:
+            errors += 1
+        latencies.append((time.perf_counter() - started) * 1000)
+    thread.join()
+
+    return {
+        "searches": len(latencies),
+        "search_errors": errors,
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p95_ms": _percentile(latencies, 95) if latencies else 0.0,
+        "max_ms": max(latencies) if latencies else 0.0,
+        "sync_seconds": write_time.get("seconds", 0.0),
+        "emails_per_second": pages * page_size / max(write_time.get("seconds", 1e-9), 1e-9),
+    }
+
+
+def _print_result(label: str, result: Dict[str, float]) -> None:
+    print(f"\n  {label}")
+    print(f"    searches during sync : {result['searches']} ({result['search_errors']} failed)")
+    print(f"    search p50 / p95     : {result['p50_ms']:.1f} / {result['p95_ms']:.1f} ms")
+    print(f"    search max           : {result['max_ms']:.1f} ms")
+    print(f"    sync time            : {result['sync_seconds']:.2f} s "
+          f"({result['emails_per_second']:,.0f} emails/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="INTEGRA - Email cache sync-while-searching benchmark"
+    )
+    parser.add_argument("--seed-emails", type=int, default=2000,
+                        help="Emails in the cache before the sync starts (default: 2000)")
+    parser.add_argument("--pages", type=int, default=20,
+                        help="Sync pages written during the run (default: 20)")
+    parser.add_argument("--page-size", type=int, default=100,
+                        help="Emails per sync page (default: 100)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Random seed (default: 42)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = LegacyCache(os.path.join(tmp, "legacy.db"))
+        legacy_result = run_scenario(
+            legacy, args.seed_emails, args.pages, args.page_size, args.seed
+        )
+
+        pooled = PooledCache(os.path.join(tmp, "pooled.db"))
+        pooled_result = run_scenario(
+            pooled, args.seed_emails, args.pages, args.page_size, args.seed
+        )
+        pooled.close()
+
+    print(f"\n{'═' * 56}")
+    print("  INTEGRA - Email Cache: search latency during sync")
+    print(f"{'═' * 56}")
+    print(f"  seed={args.seed_emails} emails, sync={args.pages} x {args.page_size} emails")
+    _print_result("Before (connection per call, no WAL, row-by-row)", legacy_result)
+    _print_result("After  (pooled WAL, batched save_emails)", pooled_result)
+    print(f"{'═' * 56}\n")
+
+
+if __name__ == "__main__":
+    main()
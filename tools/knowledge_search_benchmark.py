@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# tools/knowledge_search_benchmark.py
+"""
+INTEGRA - Copilot Knowledge Search Benchmark
+============================================
+Builds a KnowledgeSearcher over synthetic knowledge items and measures
+index build time, search latency (exact and prefix queries), suggest()
+latency and add_item() followed by a search. For comparison it also times the previous prefix
+lookup, a scan over the whole vocabulary per query term.
+
+Usage:
+    python tools/knowledge_search_benchmark.py
+    python tools/knowledge_search_benchmark.py --items 50000 --queries 200
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.copilot.knowledge.searcher import KnowledgeSearcher, SearchOptions  # noqa: E402
+from modules.copilot.knowledge.sources import KnowledgeItem, SourceType  # noqa: E402
+
+
+ARABIC_ROOTS = [
+    "موظف", "راتب", "اجاز", "عقد", "قسم", "ادار", "تقرير", "مستحق", "حضور",
+    "انصراف", "مكافا", "خصم", "بدل", "سكن", "نقل", "تامين", "تقييم", "تدريب",
+]
+ENGLISH_ROOTS = [
+    "employee", "salary", "leave", "contract", "department", "report",
+    "payroll", "attendance", "bonus", "deduction", "allowance", "housing",
+    "transport", "insurance", "evaluation", "training", "calendar", "task",
+]
+SUFFIXES = ["", "ين", "ات", "ه", "s", "ing", "ed", "_2024", "_total", "_id"]
+
+
+def _word(rng: random.Random) -> str:
+    root = rng.choice(ARABIC_ROOTS if rng.random() < 0.5 else ENGLISH_ROOTS)
+    return root + rng.choice(SUFFIXES) + (str(rng.randint(0, 300)) if rng.random() < 0.3 else "")
+
+
+def make_items(count: int, seed: int) -> List[KnowledgeItem]:
+    """Generate synthetic knowledge items."""
+    rng = random.Random(seed)
+    source_types = list(SourceType)
+    return [
+        KnowledgeItem(
+            id=f"item-{i}",
+            source_type=rng.choice(source_types),
+            title=" ".join(_word(rng) for _ in range(4)),
+            content=" ".join(_word(rng) for _ in range(60)),
+            keywords=[_word(rng) for _ in range(3)],
+        )
+        for i in range(count)
+    ]
+
+
+def _time_ms(fn: Callable[[], object], runs: List[float]) -> None:
+    started = time.perf_counter()
+    fn()
+    runs.append((time.perf_counter() - started) * 1000)
+
+
+def _report(label: str, runs: List[float]) -> None:
+    ordered = sorted(runs)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * (len(ordered) - 1)))]
+    print(f"    {label:<28} p50 {statistics.median(runs):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="INTEGRA - Copilot knowledge search benchmark"
+    )
+    parser.add_argument("--items", type=int, default=50000,
+                        help="Synthetic knowledge items (default: 50000)")
+    parser.add_argument("--queries", type=int, default=100,
+                        help="Queries per measurement (default: 100)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Random seed (default: 42)")
+    args = parser.parse_args()
+
+    items = make_items(args.items, args.seed)
+    rng = random.Random(args.seed + 1)
+
+    # The last items are added one by one after the initial build
+    added = items[-args.queries:] if len(items) > args.queries else []
+    initial = items[:len(items) - len(added)]
+
+    started = time.perf_counter()
+    searcher = KnowledgeSearcher(initial)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    exact_queries = [f"{rng.choice(ENGLISH_ROOTS)} {rng.choice(ARABIC_ROOTS)}" for _ in range(args.queries)]
+    prefix_queries = [rng.choice(ENGLISH_ROOTS + ARABIC_ROOTS)[:3] for _ in range(args.queries)]
+    options = SearchOptions(max_results=10)
+
+    exact_runs: List[float] = []
+    prefix_runs: List[float] = []
+    suggest_runs: List[float] = []
+    scan_runs: List[float] = []
+    add_runs: List[float] = []
+
+    for query in exact_queries:
+        _time_ms(lambda: searcher.search(query, options), exact_runs)
+    for query in prefix_queries:
+        _time_ms(lambda: searcher.search(query, options), prefix_runs)
+    for query in prefix_queries:
+        _time_ms(lambda: searcher.suggest(query, 5), suggest_runs)
+    for item, query in zip(added, exact_queries):
+        _time_ms(lambda: (searcher.add_item(item), searcher.search(query, options)), add_runs)
+
+    # Previous implementation: every prefix lookup scanned the vocabulary
+    vocabulary = list(searcher._postings)
+    for query in prefix_queries:
+        _time_ms(lambda: [t for t in vocabulary if t.startswith(query) and t != query], scan_runs)
+
+    print(f"\n{'═' * 64}")
+    print("  INTEGRA - Copilot Knowledge Search")
+    print(f"{'═' * 64}")
+    print(f"  items: {len(items):,}   vocabulary: {len(vocabulary):,} terms")
+    print(f"  index build: {build_ms:,.0f} ms ({len(initial):,} items)\n")
+    _report("search (exact terms)", exact_runs)
+    _report("search (3-char prefix)", prefix_runs)
+    _report("suggest (3-char prefix)", suggest_runs)
+    if add_runs:
+        _report("add_item + search", add_runs)
+    _report("old prefix scan (step only)", scan_runs)
+    print(f"{'═' * 64}\n")
+
+
+if __name__ == "__main__":
+    main()
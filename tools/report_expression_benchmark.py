@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# tools/report_expression_benchmark.py
+"""
+INTEGRA - Report Expression Benchmark
+=====================================
+Times computed report fields on synthetic payroll rows: the compiled
+expression evaluator (per row and per column) against the previous
+evaluator, which replaced {field} references in the expression text
+and called eval() for every row.
+
+The compiled evaluators are timed --repeat times and the best run is
+reported (a single 100k-row run is mostly garbage-collector noise).
+
+Usage:
+    python tools/report_expression_benchmark.py
+    python tools/report_expression_benchmark.py --rows 100000 --repeat 10
+"""
+
+import argparse
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.reporting.expressions import compile_expression  # noqa: E402
+
+
+EXPRESSIONS = [
+    "{basic} * 0.1 + {transport}",
+    "round(({basic} + {housing} + {transport}) * (1 - {gosi}) + {hours} * {rate}, 2)",
+    "max({basic} - {absence_days} * {basic} / 30, 0)",
+]
+
+
+def make_rows(count: int, seed: int) -> List[Dict[str, Any]]:
+    """Generate payroll-like rows (NUMERIC columns arrive as Decimal)."""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "name": f"employee_{i}",
+            "basic": Decimal(rng.randint(3000, 30000)),
+            "housing": rng.choice([None, Decimal("1250.50"), Decimal("2500.00")]),
+            "transport": 500,
+            "gosi": 0.0975,
+            "hours": rng.randint(0, 40),
+            "rate": 12.5,
+            "absence_days": rng.randint(0, 5),
+        }
+        for i in range(count)
+    ]
+
+
+def previous_evaluate(expression: str, row: Dict[str, Any]) -> Any:
+    """The evaluator before compiled expressions (string replace + eval per row)."""
+    try:
+        expr = expression
+        for key, value in row.items():
+            if isinstance(value, (int, float, Decimal)):
+                expr = expr.replace(f"{{{key}}}", str(value))
+            elif value is None:
+                expr = expr.replace(f"{{{key}}}", "0")
+        allowed = {'abs': abs, 'min': min, 'max': max, 'round': round, 'sum': sum}
+        return eval(expr, {"__builtins__": {}}, allowed)
+    except Exception:
+        return None
+
+
+def best_of(repeat: int, run: Callable[[], List[Any]]) -> Tuple[List[Any], float]:
+    """Run repeat times; return (last result, fastest seconds)."""
+    best = float("inf")
+    result: List[Any] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="INTEGRA - Report expression benchmark"
+    )
+    parser.add_argument("--rows", type=int, default=100000,
+                        help="Synthetic rows (default: 100000)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Random seed (default: 42)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Runs per compiled evaluator, best is reported (default: 5)")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.seed)
+
+    print(f"\n{'═' * 78}")
+    print("  INTEGRA - Report expressions")
+    print(f"{'═' * 78}")
+    print(f"  rows: {len(rows):,}\n")
+    print(f"  {'expression':<44} {'old s':>7} {'row s':>7} {'column s':>9} {'speedup':>8}")
+
+    for expression in EXPRESSIONS:
+        started = time.perf_counter()
+        expected = [previous_evaluate(expression, row) for row in rows]
+        old_seconds = time.perf_counter() - started
+
+        compiled = compile_expression(expression)
+        per_row, row_seconds = best_of(args.repeat, lambda: [compiled(row) for row in rows])
+        column, column_seconds = best_of(args.repeat, lambda: compiled.evaluate_many(rows))
+
+        if per_row != expected or column != expected:
+            print(f"  !! results differ from the previous evaluator: {expression}")
+
+        label = expression if len(expression) <= 44 else expression[:41] + "..."
+        print(f"  {label:<44} {old_seconds:>7.2f} {row_seconds:>7.3f} {column_seconds:>9.3f} "
+              f"{old_seconds / column_seconds:>7.0f}x")
+    print(f"{'═' * 78}\n")
+
+
+if __name__ == "__main__":
+    main()
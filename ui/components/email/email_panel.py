@@ -16,7 +16,7 @@ from .email_viewer import EmailViewerWidget
 from core.email import (
     Email, EmailFolder, FolderType,
     get_outlook, is_outlook_available, get_emails,
-    get_email_cache, cache_emails
+    get_email_cache, EmailSyncEngine, OutlookTransport
 )
 from core.logging import app_logger
 from core.themes import get_current_palette
@@ -41,70 +41,37 @@ class EmailLoadWorker(QThread):
         self.limit = limit
 
     def run(self):
-        """Load emails in background."""
+        """Sync new/changed emails into the cache, then read from the cache."""
         try:
             # Import COM libraries
             import pythoncom
-            import win32com.client
 
             # Initialize COM for this thread
             pythoncom.CoInitialize()
 
             try:
-                # Create new Outlook connection in this thread
-                outlook = win32com.client.Dispatch("Outlook.Application")
-                namespace = outlook.GetNamespace("MAPI")
-
-                # Get folder
-                folder = namespace.GetDefaultFolder(self.folder_type.value)
-                folder_name = folder.Name
-                app_logger.info(f"Loading emails from folder: {folder_name}")
-
-                # Get items
-                items = folder.Items
-                total_items = items.Count
-                app_logger.info(f"Folder has {total_items} total items")
-
-                if total_items == 0:
-                    self.finished.emit([])
+                # Transport dispatches its own Outlook connection in this thread
+                cache = get_email_cache()
+                engine = EmailSyncEngine(cache, OutlookTransport())
+                result = engine.sync_folder(self.folder_type)
+                if not result.success:
+                    self.error.emit(result.error)
                     return
 
-                # Sort by received time (newest first)
-                items.Sort("[ReceivedTime]", True)
-
-                emails = []
-                count = 0
-                skipped = 0
-
-                # Use index-based iteration (1-based index in COM)
-                max_check = min(total_items, self.limit * 2)
-                for i in range(1, max_check + 1):
-                    if count >= self.limit:
-                        break
-
-                    try:
-                        item = items.Item(i)
-
-                        # Only process mail items (Class 43 = olMail)
-                        if item.Class != 43:
-                            skipped += 1
-                            continue
-
-                        # Parse email
-                        email = self._parse_item(item, folder_name)
-                        if email:
-                            emails.append(email)
-                            count += 1
-                    except Exception as e:
-                        app_logger.debug(f"Error processing item {i}: {e}")
-                        continue
-
-                app_logger.info(f"Loaded {len(emails)} emails, skipped {skipped} non-mail items")
-
-                # Cache emails
-                cache_emails(emails)
+                app_logger.info(
+                    f"Synced {result.saved} new/changed emails from {result.folder_name}, "
+                    f"{result.removed} removed"
+                )
+                emails = cache.get_emails(folder_name=result.folder_name, limit=self.limit)
                 self.finished.emit(emails)
 
+                # Backfill bodies after the list is shown, so body search finds them
+                loaded = engine.load_pending_bodies(
+                    should_stop=self.isInterruptionRequested
+                )
+                if loaded:
+                    app_logger.info(f"Loaded {loaded} email bodies")
+
             finally:
                 pythoncom.CoUninitialize()
 
@@ -112,79 +79,6 @@ class EmailLoadWorker(QThread):
             app_logger.error(f"Email load error: {e}")
             self.error.emit(str(e))
 
-    def _parse_item(self, item, folder_name: str) -> Email:
-        """Parse Outlook item to Email object."""
-        from core.email import Email, EmailImportance, EmailAttachment
-
-        # Get attachments info
-        attachments = []
-        has_attachments = item.Attachments.Count > 0
-
-        if has_attachments:
-            for att in item.Attachments:
-                try:
-                    attachments.append(EmailAttachment(
-                        filename=att.FileName,
-                        size=att.Size,
-                    ))
-                except Exception:
-                    continue
-
-        # Get recipients
-        to_list = []
-        cc_list = []
-        try:
-            for recipient in item.Recipients:
-                if recipient.Type == 1:
-                    to_list.append(recipient.Address or recipient.Name)
-                elif recipient.Type == 2:
-                    cc_list.append(recipient.Address or recipient.Name)
-        except Exception:
-            pass
-
-        # Get categories
-        categories = []
-        try:
-            if item.Categories:
-                categories = [c.strip() for c in item.Categories.split(',')]
-        except Exception:
-            pass
-
-        # Parse datetime
-        def parse_dt(pytime):
-            if pytime is None:
-                return None
-            try:
-                from datetime import datetime
-                return datetime(
-                    pytime.year, pytime.month, pytime.day,
-                    pytime.hour, pytime.minute, pytime.second
-                )
-            except Exception:
-                return None
-
-        return Email(
-            entry_id=item.EntryID,
-            conversation_id=getattr(item, 'ConversationID', None),
-            subject=item.Subject or "(بدون موضوع)",
-            body=item.Body or "",
-            body_html=getattr(item, 'HTMLBody', None),
-            sender_name=getattr(item, 'SenderName', ''),
-            sender_email=getattr(item, 'SenderEmailAddress', ''),
-            to=to_list,
-            cc=cc_list,
-            received_time=parse_dt(item.ReceivedTime),
-            sent_time=parse_dt(getattr(item, 'SentOn', None)),
-            created_time=parse_dt(getattr(item, 'CreationTime', None)),
-            is_read=not item.UnRead,
-            is_flagged=item.FlagStatus == 2,
-            importance=EmailImportance(item.Importance),
-            attachments=attachments,
-            has_attachments=has_attachments,
-            folder_name=folder_name,
-            categories=categories
-        )
-
 
 class AIAnalyzeWorker(QThread):
     """Worker thread for AI analysis."""
@@ -488,6 +382,7 @@ class EmailPanel(QWidget):
 
     def _on_email_selected(self, email: Email):
         """Handle email selection."""
+        self._ensure_body(email)
         self._current_email = email
         self.email_viewer.set_email(email)
 
@@ -500,6 +395,18 @@ class EmailPanel(QWidget):
             except Exception as e:
                 app_logger.error(f"Failed to mark as read: {e}")
 
+    def _ensure_body(self, email: Email):
+        """Bodies are synced lazily: fetch it the first time it is needed."""
+        if email.body_loaded:
+            return
+        try:
+            engine = EmailSyncEngine(
+                get_email_cache(), OutlookTransport(get_outlook().namespace)
+            )
+            engine.ensure_body(email)
+        except Exception as e:
+            app_logger.error(f"Failed to load email body: {e}")
+
     def _on_email_double_clicked(self, email: Email):
         """Handle email double-click."""
         self.email_opened.emit(email)
@@ -511,6 +418,7 @@ class EmailPanel(QWidget):
             return
 
         self.status_label.setText("🤖 جاري التحليل...")
+        self._ensure_body(email)
 
         if self._ai_worker and self._ai_worker.isRunning():
             self._ai_worker.requestInterruption()
@@ -568,6 +476,7 @@ class EmailPanel(QWidget):
         try:
             outlook = get_outlook()
             if outlook.delete_email(email.entry_id):
+                get_email_cache().delete_email(email.entry_id)
                 self.status_label.setText("🗑️ تم حذف الرسالة")
                 self.load_emails()
         except Exception as e:
@@ -62,7 +62,7 @@ class ExportWorker(QThread):
             else:
                 self.progress.emit(30, "جاري التصدير إلى CSV...")
                 if self.views:
-                    results = [exporter.export_to_csv(v) for v in self.views]
+                    results = exporter.export_views_csv(self.views)
                 else:
                     results = exporter.export_all_views_csv()
 
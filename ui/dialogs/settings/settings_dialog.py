@@ -12,7 +12,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QSize
 
 from core.themes import get_stylesheet, get_current_palette
-from core.database.connection import is_connected
+from core.database.connection import get_health_monitor
 from core.config import DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
 from core.utils.icons import icon
 from ui.components.fluent import (
@@ -83,6 +83,7 @@ class SettingsDialog(QDialog):
         status_widget.addWidget(self._status_text)
         status_widget.addStretch()
         self._update_status()
+        get_health_monitor().signals.status_changed.connect(self._on_connection_changed)
         layout.addLayout(status_widget)
 
         layout.addStretch()
@@ -168,9 +169,22 @@ class SettingsDialog(QDialog):
             toast_error(self, "خطأ", f"فشل حفظ الإعدادات!\n{e}")
 
     def _update_status(self):
-        """Update connection status label."""
+        """Update connection status label from the cached monitor state."""
+        monitor = get_health_monitor()
+        monitor.start()
+        monitor.check_now()
+        self._on_connection_changed(monitor.is_connected)
+
+    def _on_connection_changed(self, connected):
+        """Update connection status label (None: not checked yet)."""
         palette = get_current_palette()
-        if is_connected():
+        if connected is None:
+            self._status_icon.setPixmap(
+                icon('fa5s.sync', color=palette['warning']).pixmap(16, 16)
+            )
+            self._status_text.setText("جاري التحقق...")
+            self._status_text.setStyleSheet(f"color: {palette['warning']}; font-weight: bold;")
+        elif connected:
             self._status_icon.setPixmap(
                 icon('fa5s.check-circle', color=palette['success']).pixmap(16, 16)
             )
@@ -5,10 +5,10 @@ Status bar for the launcher window with QtAwesome icons.
 """
 
 from PyQt5.QtWidgets import QStatusBar, QLabel, QHBoxLayout, QWidget
-from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtCore import Qt
 
 from core.config.app import APP_VERSION
-from core.database.connection import is_connected
+from core.database.connection import get_health_monitor
 from core.themes import get_current_palette
 from core.utils.icons import icon
 
@@ -55,15 +55,25 @@ class LauncherStatusBar(QStatusBar):
         self.addPermanentWidget(ver_widget)
 
     def _start_monitoring(self):
-        """Start connection monitoring."""
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self._update_connection_status)
-        self.timer.start(5000)  # Check every 5 seconds
+        """Subscribe to the shared background connection monitor."""
+        monitor = get_health_monitor()
+        monitor.signals.status_changed.connect(self._on_connection_changed)
+        monitor.start()
 
     def _update_connection_status(self):
+        """Update connection status display from the cached state."""
+        self._on_connection_changed(get_health_monitor().is_connected)
+
+    def _on_connection_changed(self, connected):
         """Update connection status display."""
         palette = get_current_palette()
-        if is_connected():
+        if connected is None:
+            self._conn_icon.setPixmap(
+                icon('fa5s.sync', color=palette['warning']).pixmap(14, 14)
+            )
+            self._conn_text.setText("جاري التحقق...")
+            self._conn_text.setStyleSheet(f"color: {palette['warning']}; font-weight: bold;")
+        elif connected:
             self._conn_icon.setPixmap(
                 icon('fa5s.check-circle', color=palette['success']).pixmap(14, 14)
             )